@@ -12,6 +12,7 @@ We use an estimated model to calculate revenues.
 
 import sys
 import numpy as np
+import pandas as pd
 
 try:
     import matplotlib.pyplot as plt
@@ -19,11 +20,12 @@ try:
     can_plot = True
 except ModuleNotFoundError:
     can_plot = False
-from tqdm import tqdm
 from biogeme import models
 import biogeme.exceptions as excep
 import biogeme.biogeme as bio
 import biogeme.results as res
+from biogeme.expressions import Beta
+from biogeme.simulation_aggregates import Aggregate
 from optima_data import database, normalized_weight
 from scenarios import scenario
 
@@ -40,52 +42,71 @@ except excep.BiogemeError:
 
 
 # %%
-# Function calculating the revenues
-def revenues(factor: float) -> tuple[float, float, float]:
-    """Calculate the total revenues generated by public transportation,
-        when the price is multiplied by a factor.
+# The factor multiplying the current cost of public transportation is
+# a parameter that is not estimated. Therefore, its value can be
+# changed for each scenario, without preparing the model again.
+price_factor = Beta('price_factor', 1.0, None, None, 1)
 
-    :param factor: factor that multiplies the current cost of public
-        transportation
+# %%
+# Obtain the specification as a function of the factor.
+V, nests, _, marginal_cost_scenario = scenario(factor=price_factor)
 
-    :return: total revenues, followed by the lower and upper bound of
-        the confidence interval.
+# %%
+# Obtain the expression for the choice probability of each alternative
+prob_pt = models.nested(V, None, nests, 0)
 
-    """
-    # Obtain the specification for the default scenario
-    V, nests, _, marginal_cost_scenario = scenario(factor=factor)
+# %%
+# We now simulate the choice probabilities,the weight and the
+# price variable
+simulate = {
+    'weight': normalized_weight,
+    'Revenue public transportation': prob_pt * marginal_cost_scenario,
+}
 
-    # Obtain the expression for the choice probability of each alternative
-    prob_pt = models.nested(V, None, nests, 0)
+the_biogeme = bio.BIOGEME(database, simulate)
 
-    # We now simulate the choice probabilities,the weight and the
-    # price variable
+# %%
+# Only the total revenues are needed, and not the values for each row.
+aggregates = {
+    'revenues': Aggregate(formula='Revenue public transportation', weight='weight')
+}
 
-    simulate = {
-        'weight': normalized_weight,
-        'Revenue public transportation': prob_pt * marginal_cost_scenario,
-    }
 
-    the_biogeme = bio.BIOGEME(database, simulate)
-    simulated_values = the_biogeme.simulate(results.get_beta_values())
+# %%
+# Function calculating the revenues
+def revenues(factors: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Calculate the total revenues generated by public transportation,
+        when the price is multiplied by each factor.
 
-    # We also calculate confidence intervals for the calculated quantities
+    :param factors: factors that multiply the current cost of public
+        transportation
+
+    :return: total revenues, followed by the lower and upper bound of
+        the confidence interval, for each factor.
 
+    """
+    scenarios = pd.DataFrame({'price_factor': factors})
+
+    # We also calculate confidence intervals for the revenues, from
+    # the confidence intervals of the values simulated for each row.
     betas = the_biogeme.free_beta_names()
     beta_bootstrap = results.get_betas_for_sensitivity_analysis(betas)
-    left, right = the_biogeme.confidence_intervals(beta_bootstrap, 0.9)
-
-    revenues_pt = (
-        simulated_values['Revenue public transportation'] * simulated_values['weight']
-    ).sum()
-    revenues_pt_left = (left['Revenue public transportation'] * left['weight']).sum()
-    revenues_pt_right = (right['Revenue public transportation'] * right['weight']).sum()
+    revenues_pt, revenues_pt_left, revenues_pt_right = (
+        simulated['revenues'].to_numpy()
+        for simulated in the_biogeme.simulate_scenarios(
+            results.get_beta_values(),
+            scenarios,
+            aggregates=aggregates,
+            beta_draws=beta_bootstrap,
+            interval_size=0.9,
+        )
+    )
     return revenues_pt, revenues_pt_left, revenues_pt_right
 
 
 # %%
 # Current revenues for public transportation
-r, r_left, r_right = revenues(factor=1.0)
+r, r_left, r_right = (value[0] for value in revenues(np.array([1.0])))
 print(
     f'Total revenues for public transportation (for the sample): {r:.1f} CHF '
     f'[{r_left:.1f} CHF, '
@@ -93,14 +114,12 @@ print(
 )
 
 # %%
-# We now investigate how the revenues vary with the multiplicative factor
+# We now investigate how the revenues vary with the multiplicative
+# factor. All the scenarios are simulated with the same model.
 
 factors = np.arange(0.0, 5.0, 0.05)
-plot_revenues = [revenues(s) for s in tqdm(factors)]
-zipped = zip(*plot_revenues)
-rev = next(zipped)
-lower = next(zipped)
-upper = next(zipped)
+rev, lower, upper = revenues(factors)
+rev = list(rev)
 
 largest_revenue = max(rev)
 max_index = rev.index(largest_revenue)
@@ -60,13 +60,15 @@ notfulltime = OccupStat != 1
 # Model specification as a function of the multiplication factor for
 # the price of public transportation.
 def scenario(
-    factor: float = 1.0,
+    factor: float | Expression = 1.0,
 ) -> tuple[dict[int, Expression], NestsForNestedLogit, Expression, float]:
     """Provide the model specification for a scenario with the price of
         public transportation is multiplied by a factor
 
-    :param factor: factor that multiples the price of public transportation.
-    :type factor: float
+    :param factor: factor that multiples the price of public
+        transportation. It can be a parameter, so that its value can be
+        changed without building the model again.
+    :type factor: float or biogeme.expressions.Expression
 
     :return: a dict with the utility functions, the nesting structure,
         and the choice expression.
@@ -73,9 +73,11 @@ results = the_biogeme.estimate()
 # validation set (i.e. the slice). The value of the log likelihood for
 # each observation in the validation set is reported in a
 # dataframe. As this is done for each slice, the output is a list of
-# dataframes, each corresponding to one of these exercises.
+# dataframes, each corresponding to one of these exercises. The
+# slices are identified by the positions of their rows in the data,
+# so that the data is not copied.
 
-validation_data = database.split(slices=5)
+validation_data = database.split_indices(slices=5)
 
 validation_results = the_biogeme.validate(results, validation_data)
 
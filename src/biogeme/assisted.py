@@ -5,10 +5,18 @@
 
 New version of the assisted specification using Catalogs
 
+If several processes are available, the neighbors of a solution are
+generated and estimated by batches, in a pool of processes. The VNS
+algorithm then considers them one at a time, as in the sequential case.
 """
 
+from __future__ import annotations
+
 import logging
-from typing import Callable
+import math
+import multiprocessing as mp
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from typing import Callable, NamedTuple, TYPE_CHECKING
 
 from biogeme_optimization.neighborhood import Neighborhood, Operator as VnsOperator
 from biogeme_optimization.pareto import Pareto, SetElement, DATE_TIME_STRING
@@ -22,12 +30,53 @@ from biogeme.configuration import Configuration
 from biogeme.controller import ControllerOperator
 from biogeme.exceptions import BiogemeError
 from biogeme.parameters import Parameters
-from biogeme.results import bioResults
+from biogeme.results import bioResults, RawResults
+from biogeme.results_store import ResultsStore
 from biogeme.specification import Specification
 
+if TYPE_CHECKING:
+    from biogeme.database import Database
+    from biogeme.expressions import Expression
+
 logger = logging.getLogger(__name__)
 
 
+class SpecificationContext(NamedTuple):
+    """Information needed to estimate specifications in another process."""
+
+    expression: Expression
+    database: Database
+    generic_name: str
+    results_store: ResultsStore | None
+
+
+def _initialize_worker(context: SpecificationContext) -> None:
+    """Prepares the specifications in a worker process."""
+    logging.getLogger('biogeme').setLevel(logging.WARNING)
+    Specification.expression = context.expression
+    Specification.database = context.database
+    Specification.generic_name = context.generic_name
+    Specification.results_store = context.results_store
+    # The C++ model of the main process is not shared.
+    Specification.estimation_context = None
+
+
+def _estimate_specification(config_id: str) -> tuple[str, RawResults | None]:
+    """Estimates a specification in a worker process.
+
+    :param config_id: identifier of the configuration.
+    :type config_id: str
+
+    :return: the identifier, and the raw estimation results. None if
+        the specification has not been estimated, because it has too
+        many parameters.
+    :rtype: tuple(str, biogeme.results.RawResults)
+    """
+    _ = Specification.from_string_id(config_id)
+    results = Specification.all_results.get(config_id)
+    return config_id, None if results is None else results.data
+
+
 # Operators
 
 
@@ -76,6 +125,7 @@ class ParetoPostProcessing:
                 expression=self.expression,
                 database=self.database,
                 parameter_file=self.biogeme_object.parameter_file,
+                estimation_context=self.biogeme_object.estimation_context,
             )
             _ = Configuration.from_string(config_id)
             the_biogeme.modelName = self.model_names(config_id)
@@ -188,11 +238,39 @@ class AssistedSpecification(Neighborhood):
         self.database = biogeme_object.database
         Specification.expression = self.expression
         Specification.database = self.database
+        Specification.estimation_context = biogeme_object.estimation_context
+        results_file = self.biogeme_parameters.get_value(
+            name='results_file', section='AssistedSpecification'
+        )
+        Specification.results_store = (
+            ResultsStore(
+                file_name=results_file,
+                database=self.database,
+                maximum_size=self.biogeme_parameters.get_value(
+                    name='maximum_number_of_results', section='AssistedSpecification'
+                ),
+            )
+            if results_file
+            else None
+        )
+        self.controller_operators: dict[str, ControllerOperator] = (
+            self.central_controller.prepare_operators()
+        )
         self.operators = {
             name: self.generate_operator(operator)
-            for name, operator in self.central_controller.prepare_operators().items()
+            for name, operator in self.controller_operators.items()
         }
         super().__init__(self.operators)
+        # Pool of processes used to estimate the neighbors, if any.
+        self.executor: Executor | None = None
+        self.number_of_neighbors: int = self.biogeme_parameters.get_value(
+            name='number_of_neighbors', section='AssistedSpecification'
+        )
+        # Neighbors already estimated, for each operator.
+        self.prepared_neighbors: dict[str, list[tuple[Configuration, int]]] = {}
+        self.prepared_for: tuple[str, int] | None = None
+        # Configurations not estimated, because of too many parameters.
+        self.not_estimated: set[str] = set()
 
     def generate_operator(self, function: ControllerOperator) -> VnsOperator:
         """Defines an operator that takes a SetElement as an argument, to
@@ -208,11 +286,25 @@ class AssistedSpecification(Neighborhood):
         """
 
         def the_operator(element: SetElement, step: int) -> tuple[SetElement, int]:
-            the_new_configuration, number_of_modifications = function(
-                Configuration.from_string(element.element_id),
-                step,
-            )
+            if self.executor is None:
+                the_new_configuration, number_of_modifications = function(
+                    Configuration.from_string(element.element_id),
+                    step,
+                )
+            else:
+                the_new_configuration, number_of_modifications = (
+                    self.prepared_neighbor(element, step, function)
+                )
             new_specification = Specification(configuration=the_new_configuration)
+            config_id = new_specification.config_id
+            if config_id not in Specification.all_results:
+                # The specification has too many parameters, and has
+                # not been estimated. As its objectives are unknown,
+                # they are set to infinity. It is rejected by is_valid.
+                return (
+                    SetElement(config_id, [math.inf] * len(element.objectives)),
+                    number_of_modifications,
+                )
             return (
                 new_specification.get_element(self.multi_objectives),
                 number_of_modifications,
@@ -237,9 +329,143 @@ class AssistedSpecification(Neighborhood):
         specification = Specification.from_string_id(element.element_id)
         return specification.validity
 
+    def estimate_in_parallel(
+        self, executor: Executor, configurations: list[Configuration]
+    ) -> None:
+        """Estimates the configurations that have not been estimated
+        yet, and stores the results in ``Specification.all_results``.
+
+        :param executor: pool of processes.
+        :type executor: concurrent.futures.Executor
+
+        :param configurations: configurations to estimate.
+        :type configurations: list(biogeme.configuration.Configuration)
+        """
+        to_estimate = (
+            {configuration.get_string_id() for configuration in configurations}
+            - set(Specification.all_results)
+            - self.not_estimated
+        )
+        futures = [
+            executor.submit(_estimate_specification, config_id)
+            for config_id in sorted(to_estimate)
+        ]
+        for future in as_completed(futures):
+            config_id, raw_results = future.result()
+            if raw_results is None:
+                self.not_estimated.add(config_id)
+            else:
+                Specification.all_results[config_id] = bioResults(
+                    raw_results,
+                    identification_threshold=self.biogeme_object.identification_threshold,
+                )
+
+    def generate_neighbors(
+        self, element: SetElement, neighborhood_size: int, number_of_neighbors: int
+    ) -> list[tuple[Configuration, str, int]]:
+        """Generates distinct neighbors of a solution, without
+        estimating them.
+
+        :param element: current solution
+        :type element: SetElement
+
+        :param neighborhood_size: size of the neighborhood
+        :type neighborhood_size: int
+
+        :param number_of_neighbors: number of attempts to generate a neighbor.
+        :type number_of_neighbors: int
+
+        :return: list of neighbors, with the name of the operator that
+            generated them, and the number of modifications.
+        :rtype: list(tuple(biogeme.configuration.Configuration, str, int))
+        """
+        current_configuration = Configuration.from_string(element.element_id)
+        neighbors = {}
+        for _ in range(number_of_neighbors):
+            # As in Neighborhood.generate_neighbor, several operators
+            # are tried until one of them actually modifies the solution.
+            for _ in range(5):
+                self.operators_management.select_operator()
+                name = self.operators_management.last_operator_name
+                the_new_configuration, number_of_modifications = (
+                    self.controller_operators[name](
+                        current_configuration, neighborhood_size
+                    )
+                )
+                if number_of_modifications > 0:
+                    neighbors.setdefault(
+                        the_new_configuration.get_string_id(),
+                        (the_new_configuration, name, number_of_modifications),
+                    )
+                    break
+        return list(neighbors.values())
+
+    def prepare_neighbors(self, element: SetElement, neighborhood_size: int) -> None:
+        """Generates a batch of neighbors of a solution, and estimates
+        them in parallel. They are then provided to the VNS algorithm
+        by the operators that generated them.
+
+        :param element: current solution
+        :type element: SetElement
+
+        :param neighborhood_size: size of the neighborhood
+        :type neighborhood_size: int
+        """
+        neighbors = self.generate_neighbors(
+            element, neighborhood_size, self.number_of_neighbors
+        )
+        self.estimate_in_parallel(
+            self.executor, [configuration for configuration, _, _ in neighbors]
+        )
+        self.prepared_neighbors = {}
+        for configuration, name, number_of_modifications in neighbors:
+            self.prepared_neighbors.setdefault(name, []).append(
+                (configuration, number_of_modifications)
+            )
+        self.prepared_for = (element.element_id, neighborhood_size)
+
+    def prepared_neighbor(
+        self,
+        element: SetElement,
+        neighborhood_size: int,
+        function: ControllerOperator,
+    ) -> tuple[Configuration, int]:
+        """Provides a neighbor generated by the current operator, among
+        those that have been estimated in parallel.
+
+        :param element: current solution
+        :type element: SetElement
+
+        :param neighborhood_size: size of the neighborhood
+        :type neighborhood_size: int
+
+        :param function: the current operator, used if no prepared
+            neighbor is available.
+        :type function: function(Configuration, int) --> Configuration, int
+
+        :return: the neighbor, and the number of modifications.
+        :rtype: tuple(biogeme.configuration.Configuration, int)
+        """
+        name = self.operators_management.last_operator_name
+        key = (element.element_id, neighborhood_size)
+        if self.prepared_for != key or not self.prepared_neighbors.get(name):
+            self.prepare_neighbors(element, neighborhood_size)
+            # The statistics must be updated for the operator selected
+            # by the VNS algorithm.
+            self.operators_management.last_operator_name = name
+        neighbors = self.prepared_neighbors.get(name)
+        if neighbors:
+            return neighbors.pop(0)
+        return function(
+            Configuration.from_string(element.element_id), neighborhood_size
+        )
+
     def run(self) -> dict[str, bioResults]:
         """Runs the VNS algorithm
 
+        If the parameter ``number_of_processes`` is larger than one,
+        the specifications are estimated in parallel.
+
         :return: doct with the estimation results of the Pareto optimal models
         :rtype: dict[biogeme.results.bioResults]
 
@@ -266,37 +492,35 @@ class AssistedSpecification(Neighborhood):
             self.biogeme_object.log_like.number_of_multiple_expressions()
         )
         maximum_number = self.biogeme_object.maximum_number_catalog_expressions
-        if number_of_specifications <= maximum_number:
-            logger.info('We consider all possible combinations of the catalogs.')
-            for index, configuration in enumerate(self.biogeme_object.log_like):
-                logger.info(f'Model {index}/{number_of_specifications}')
-                the_config = configuration.current_configuration()
-                the_specification = Specification(the_config)
-                the_element = the_specification.get_element(self.multi_objectives)
-                Specification.pareto.add(the_element)
-                Specification.pareto.dump()
-        else:
-            logger.info(
-                f'The number of possible specifications [{number_of_specifications}] '
-                f'exceeds the maximum number [{maximum_number}]. '
-                f'A heuristic algorithm is applied.'
+        number_of_processes = self.biogeme_object.number_of_processes
+        executor = None
+        if number_of_processes > 1:
+            # With "fork", the database is inherited by the workers
+            # instead of being pickled.
+            methods = mp.get_all_start_methods()
+            executor = ProcessPoolExecutor(
+                max_workers=number_of_processes,
+                mp_context=mp.get_context('fork' if 'fork' in methods else None),
+                initializer=_initialize_worker,
+                initargs=(
+                    SpecificationContext(
+                        expression=self.expression,
+                        database=self.database,
+                        generic_name=Specification.generic_name,
+                        results_store=Specification.results_store,
+                    ),
+                ),
             )
-
-            default_element = default_specification.get_element(self.multi_objectives)
-            number_of_neighbors = self.biogeme_parameters.get_value(
-                name='number_of_neighbors', section='AssistedSpecification'
-            )
-            maximum_attempts = self.biogeme_parameters.get_value(
-                name='maximum_attempts', section='AssistedSpecification'
-            )
-            logger.debug(f'{default_element=}')
-            self.pareto = vns(
-                problem=self,
-                first_solutions=[default_element],
-                pareto=self.pareto,
-                number_of_neighbors=number_of_neighbors,
-                maximum_attempts=maximum_attempts,
+        try:
+            self._explore(
+                executor,
+                default_specification,
+                number_of_specifications,
+                maximum_number,
             )
+        finally:
+            if executor is not None:
+                executor.shutdown()
         logger.debug('Pareto solutions AFTER')
         for elem in self.pareto.pareto:
             logger.debug(elem.element_id)
@@ -325,3 +549,69 @@ class AssistedSpecification(Neighborhood):
         estimation_results = post_processing.reestimate()
         post_processing.log_statistics()
         return estimation_results
+
+    def _explore(
+        self,
+        executor: Executor | None,
+        default_specification: Specification,
+        number_of_specifications: int,
+        maximum_number: int,
+    ) -> None:
+        """Explores the specifications, either exhaustively or with the
+        VNS algorithm.
+
+        :param executor: pool of processes. If None, the
+            specifications are estimated sequentially.
+        :type executor: concurrent.futures.Executor
+
+        :param default_specification: default specification of the model.
+        :type default_specification: biogeme.specification.Specification
+
+        :param number_of_specifications: number of possible specifications.
+        :type number_of_specifications: int
+
+        :param maximum_number: maximum number of specifications for an
+            exhaustive exploration.
+        :type maximum_number: int
+        """
+        if number_of_specifications <= maximum_number:
+            logger.info('We consider all possible combinations of the catalogs.')
+            configurations = [
+                expression.current_configuration()
+                for expression in self.biogeme_object.log_like
+            ]
+            if executor is not None:
+                self.estimate_in_parallel(executor, configurations)
+            for index, the_config in enumerate(configurations):
+                logger.info(f'Model {index}/{number_of_specifications}')
+                the_specification = Specification(the_config)
+                the_element = the_specification.get_element(self.multi_objectives)
+                Specification.pareto.add(the_element)
+                Specification.pareto.dump()
+        else:
+            logger.info(
+                f'The number of possible specifications [{number_of_specifications}] '
+                f'exceeds the maximum number [{maximum_number}]. '
+                f'A heuristic algorithm is applied.'
+            )
+
+            default_element = default_specification.get_element(self.multi_objectives)
+            maximum_attempts = self.biogeme_parameters.get_value(
+                name='maximum_attempts', section='AssistedSpecification'
+            )
+            logger.debug(f'{default_element=}')
+            # If a pool of processes is available, the operators
+            # provide neighbors estimated in parallel.
+            self.executor = executor
+            try:
+                self.pareto = vns(
+                    problem=self,
+                    first_solutions=[default_element],
+                    pareto=self.pareto,
+                    number_of_neighbors=self.number_of_neighbors,
+                    maximum_attempts=maximum_attempts,
+                )
+            finally:
+                self.executor = None
+                self.prepared_neighbors = {}
+                self.prepared_for = None
@@ -14,12 +14,11 @@ import logging
 import multiprocessing as mp
 import pickle
 from datetime import datetime
-from typing import NamedTuple
+from typing import Iterable, Iterator, NamedTuple
 
 import cythonbiogeme.cythonbiogeme as cb
 import numpy as np
 import pandas as pd
-import tqdm
 
 import biogeme.database as db
 import biogeme.filenames as bf
@@ -27,8 +26,13 @@ import biogeme.optimization as opt
 import biogeme.results as res
 import biogeme.tools.derivatives
 import biogeme.tools.unique_ids
+from biogeme.bootstrap import BootstrapRunner
+from biogeme.catalog_estimation import CatalogRunner, ConfigurationToEstimate
 from biogeme.configuration import Configuration
+from biogeme.cross_validation import CrossValidationRunner
+from biogeme.data_chunks import ChunkWriter, read_chunks
 from biogeme.deprecated import deprecated
+from biogeme.estimation_context import EstimationContext
 from biogeme.exceptions import BiogemeError, ValueOutOfRange
 from biogeme.expressions import (
     IdManager,
@@ -37,6 +41,7 @@ from biogeme.expressions import (
     log,
     bioMultSum,
     SelectedExpressionsIterator,
+    TypeOfElementaryExpression,
 )
 from biogeme.function_output import FunctionOutput, BiogemeFunctionOutput
 from biogeme.negative_likelihood import NegativeLikelihood
@@ -44,6 +49,12 @@ from biogeme.parameters import (
     Parameters,
     DEFAULT_FILE_NAME as DEFAULT_PARAMETER_FILE_NAME,
 )
+from biogeme.simulation_accumulators import (
+    ExactQuantilesAccumulator,
+    SimulationAccumulator,
+    StreamingQuantilesAccumulator,
+)
+from biogeme.simulation_aggregates import Aggregate, AggregatesCalculator
 
 DEFAULT_MODEL_NAME = 'biogemeModelDefaultName'
 logger = logging.getLogger(__name__)
@@ -70,6 +81,7 @@ class BIOGEME:
         user_notes: str | None = None,
         parameter_file: str | None = None,
         skip_audit: bool = False,
+        estimation_context: EstimationContext | None = None,
         **kwargs,
     ):
         """Constructor
@@ -98,6 +110,13 @@ class BIOGEME:
                  the default values of the parameters are used
         :type parameter_file: str
 
+        :param skip_audit: if True, no auditing is performed.
+        :type skip_audit: bool
+
+        :param estimation_context: C++ model shared with other models
+            estimated on the same database. If None, a new one is created.
+        :type estimation_context: biogeme.estimation_context.EstimationContext
+
         :raise BiogemeError: an audit of the formulas is performed.
            If a formula has issues, an error is detected and an
            exception is raised.
@@ -153,7 +172,11 @@ class BIOGEME:
         self.function_parameters = None
 
         if not self.skip_audit:
-            database.data = database.data.replace({True: 1, False: 0})
+            # Numeric columns are not affected by the replacement. The
+            # data frame is replaced only if needed, so that it is not
+            # transferred again to a shared estimation context.
+            if len(database.data.select_dtypes(include=['bool', 'object']).columns):
+                database.data = database.data.replace({True: 1, False: 0})
             list_of_errors, list_of_warnings = database._audit()
             if list_of_warnings:
                 logger.warning("\n".join(list_of_warnings))
@@ -181,6 +204,23 @@ class BIOGEME:
             np.random.seed(self.seed_param)
 
         self.database = database
+        self.database.seed = self.seed_param
+        self.database.draws_directory = (
+            self.biogeme_parameters.get_value(
+                name="draws_directory", section="MonteCarlo"
+            )
+            or None
+        )
+        self.database.draws_dtype = (
+            np.float32
+            if self.biogeme_parameters.get_value(
+                name="single_precision_draws", section="MonteCarlo"
+            )
+            else np.float64
+        )
+        self.database.generated_draws = self.biogeme_parameters.get_value(
+            name="generated_draws", section="MonteCarlo"
+        )
 
         self.short_names: biogeme.tools.unique_ids.ModelNames | None = None
         if not isinstance(formulas, dict):
@@ -263,18 +303,23 @@ class BIOGEME:
 
         self.reset_id_manager()
 
-        self.theC = cb.pyBiogeme(self.id_manager.number_of_free_betas)
-        if self.database.is_panel():
-            self.theC.setPanel(True)
-            self.theC.setDataMap(self.database.individualMap)
-        # Transfer the data to the C++ formula
-        self.theC.setData(self.database.data)
-        self.theC.setMissingData(self.missingData)
+        self.estimation_context: EstimationContext = (
+            EstimationContext(self.database)
+            if estimation_context is None
+            else estimation_context
+        )
+        """C++ model, possibly shared with other models. The data, the
+        draws and the formulas are transferred to it before each
+        calculation, unless they are already there."""
+        self.theC: cb.pyBiogeme | None = None
 
         start_time = datetime.now()
         self._generate_draws(self.number_of_draws)
-        if self.monte_carlo:
-            self.theC.setDraws(self.database.theDraws)
+        self.draws: np.ndarray | None = (
+            self.database.theDraws if self.monte_carlo else None
+        )
+        """ Draws used by the model. The draws of the database may be
+        replaced by another model sharing the same database."""
         self.drawsProcessingTime = datetime.now() - start_time
         """ Time needed to generate the draws. """
 
@@ -283,16 +328,13 @@ class BIOGEME:
             self.loglikeSignatures: list[bytes] = self.log_like.get_signature()
             """Internal signature of the formula for the
             loglikelihood."""
-            if self.weight is None:
-                self.theC.setExpressions(self.loglikeSignatures, self.number_of_threads)
-            else:
+            if self.weight is not None:
                 self.weightSignatures: list[bytes] = self.weight.get_signature()
                 """ Internal signature of the formula for the weight."""
-                self.theC.setExpressions(
-                    self.loglikeSignatures,
-                    self.number_of_threads,
-                    self.weightSignatures,
-                )
+            if self.draws is not None or not self.monte_carlo:
+                # Otherwise, the draws are generated when needed, and
+                # stored only if the model is estimated.
+                self.theC = self.estimation_context.activate(self)
 
         self.bootstrap_time = None
         """ Time needed to calculate the bootstrap standard errors"""
@@ -320,6 +362,7 @@ class BIOGEME:
         user_notes: str | None = None,
         parameter_file: str | None = None,
         skip_audit: bool = False,
+        estimation_context: EstimationContext | None = None,
     ) -> BIOGEME:
         """Obtain the Biogeme object corresponding to the
         configuration of a multiple expression
@@ -341,6 +384,10 @@ class BIOGEME:
 
         :param skip_audit: if True, no auditing is performed.
         :type skip_audit: bool
+
+        :param estimation_context: C++ model shared with other models
+            estimated on the same database. If None, a new one is created.
+        :type estimation_context: biogeme.estimation_context.EstimationContext
         """
         if expression.set_of_configurations():
             # We verify that the configuration is valid
@@ -370,6 +417,7 @@ class BIOGEME:
             user_notes=user_notes,
             parameter_file=parameter_file,
             skip_audit=skip_audit,
+            estimation_context=estimation_context,
         )
 
     @staticmethod
@@ -560,6 +608,20 @@ class BIOGEME:
             name="number_of_threads", value=value, section="MultiThreading"
         )
 
+    @property
+    def number_of_processes(self) -> int:
+        """Number of processes used for independent estimations, such as
+        bootstrapping. Default: 1.
+        """
+        nbr_processes = self.biogeme_parameters.get_value("number_of_processes")
+        return mp.cpu_count() if nbr_processes == 0 else nbr_processes
+
+    @number_of_processes.setter
+    def number_of_processes(self, value: int) -> None:
+        self.biogeme_parameters.set_value(
+            name="number_of_processes", value=value, section="MultiThreading"
+        )
+
     @property
     def numberOfDraws(self) -> int:
         """Number of draws for Monte-Carlo integration."""
@@ -813,6 +875,21 @@ class BIOGEME:
         """
         return f"__{self.modelName}.iter"
 
+    def _save_bootstrap_file_name(self) -> str:
+        """
+        :return: The name of the file where the bootstrap replications are saved.
+        :rtype: str
+        """
+        return f"__{self.modelName}.boot"
+
+    def _save_catalog_file_name(self) -> str:
+        """
+        :return: The name of the file where the results of the catalog
+            configurations are saved.
+        :rtype: str
+        """
+        return f"__{self.modelName}.catalog"
+
     def _audit(self) -> None:
         """Each expression provides an audit function, that verifies its
         validity. Each formula is audited, and the list of errors
@@ -1025,6 +1102,7 @@ class BIOGEME:
             raise ValueError(error_msg)
 
         self._prepare_database_for_formula()
+        self.theC = self.estimation_context.activate(self)
         f = self.theC.calculateLikelihood(x, self.id_manager.fixed_betas_values)
 
         logger.debug(
@@ -1125,6 +1203,11 @@ class BIOGEME:
             )
             raise ValueError(error_msg)
         self._prepare_database_for_formula()
+        if scaled:
+            sample_size = float(self.database.get_sample_size())
+            if sample_size == 0:
+                raise BiogemeError(f"Sample size is {sample_size}")
+        self.theC = self.estimation_context.activate(self)
 
         g = np.empty(n)
         h = np.empty([n, n])
@@ -1177,10 +1260,6 @@ class BIOGEME:
                         )
 
         if scaled:
-            sample_size = float(self.database.get_sample_size())
-            if sample_size == 0:
-                raise BiogemeError(f"Sample size is {sample_size}")
-
             return BiogemeFunctionOutput(
                 function=f / sample_size,
                 gradient=np.asarray(g) / sample_size,
@@ -1370,6 +1449,10 @@ class BIOGEME:
             description of each configuration
         :rtype: dict(str: bioResults)
 
+        The configurations are estimated by a pool of
+        `number_of_processes` processes. If the iterations are saved, the
+        results of each configuration are saved on file as well, so
+        that an interrupted run can be resumed.
         """
         if self.short_names is None:
             self.short_names = biogeme.tools.unique_ids.ModelNames(
@@ -1406,24 +1489,25 @@ class BIOGEME:
             the_iterator = SelectedExpressionsIterator(
                 self.log_like, selected_configurations
             )
-        configurations = {}
+        configurations = []
         for expression in the_iterator:
-            config = expression.current_configuration()
-            config_id = config.get_string_id()
-            b = BIOGEME.from_configuration(
-                config_id=config_id, expression=expression, database=self.database
+            config_id = expression.current_configuration().get_string_id()
+            configurations.append(
+                ConfigurationToEstimate(
+                    config_id=config_id, model_name=self.short_names(config_id)
+                )
             )
-            b.modelName = self.short_names(config_id)
-            b.generate_html = self.generate_html
-            b.generate_pickle = self.generate_pickle
-            if quick_estimate:
-                results = b.quick_estimate(recycle=recycle)
-            else:
-                results = b.estimate(recycle=recycle, run_bootstrap=run_bootstrap)
-
-            configurations[config_id] = results
-
-        return configurations
+        runner = CatalogRunner(
+            the_biogeme=self,
+            configurations=configurations,
+            quick_estimate=quick_estimate,
+            recycle=recycle,
+            run_bootstrap=run_bootstrap,
+            file_name=(
+                self._save_catalog_file_name() if self.saveIterations else None
+            ),
+        )
+        return runner.run()
 
     def estimate(
         self,
@@ -1587,31 +1671,25 @@ class BIOGEME:
         #        - K is the number pf parameters to estimate
         self.bootstrap_results = None
         if run_bootstrap:
-            # Temporarily stop reporting log messages
             start_time = datetime.now()
 
             logger.info(
                 f"Re-estimate the model {self.bootstrap_samples} "
                 f"times for bootstrapping"
             )
-            self.bootstrap_results = np.empty(
-                shape=[self.bootstrap_samples, len(xstar)]
+            # If the iterations are saved, so are the bootstrap
+            # replications, so that an interrupted run can be resumed.
+            runner = BootstrapRunner(
+                the_biogeme=self,
+                starting_values=xstar,
+                file_name=(
+                    self._save_bootstrap_file_name() if self.saveIterations else None
+                ),
             )
-            current_logger_level = logger.level
-            logger.setLevel(logging.WARNING)
-            for b in tqdm.tqdm(range(self.bootstrap_samples), disable=False):
-                if self.database.is_panel():
-                    sample = self.database.sample_individual_map_with_replacement()
-                    self.theC.setDataMap(sample)
-                else:
-                    sample = self.database.sample_with_replacement()
-                    self.theC.setData(sample)
-                x_br, _, _ = self.optimize(xstar)
-                self.bootstrap_results[b] = x_br
+            self.bootstrap_results = runner.run()
 
             # Time needed to generate the bootstrap results
             self.bootstrap_time = datetime.now() - start_time
-            logger.setLevel(current_logger_level)
         raw_results = res.RawResults(
             self, xstar, f_g_h_b, bootstrap=self.bootstrap_results
         )
@@ -1742,7 +1820,7 @@ class BIOGEME:
     def validate(
         self,
         estimation_results: res.bioResults,
-        validation_data: list[db.EstimationValidation],
+        validation_data: list[db.EstimationValidation | db.EstimationValidationIndices],
     ) -> list[pd.DataFrame]:
         """Perform out-of-sample validation.
 
@@ -1750,49 +1828,53 @@ class BIOGEME:
 
           - each slice defines a validation set (the slice itself)
             and an estimation set (the rest of the data),
-          - the model is re-estimated on the estimation set,
+          - the model is re-estimated on the estimation set, starting
+            from the estimates on the full data,
           - the estimated model is applied on the validation set,
           - the value of the log likelihood for each observation is reported.
 
+        The slices are estimated in parallel by `number_of_processes`
+        processes. No report is generated for the re-estimations.
+
         :param estimation_results: results of the model estimation based on the
             full data.
         :type estimation_results: biogeme.results.bioResults
 
-        :param validation_data: list of estimation and validation data sets
+        :param validation_data: list of estimation and validation data
+            sets, extracted from the database of the model, typically by
+            :meth:`biogeme.database.Database.split`, or the positions of
+            their rows, as generated by
+            :meth:`biogeme.database.Database.split_indices`, which avoids
+            copying the data. For panel data, all the observations of an
+            individual must belong to the same set.
         :type validation_data: list(tuple(pandas.DataFrame, pandas.DataFrame))
+            or list(tuple(numpy.array, numpy.array))
 
         :return: a list containing as many items as slices. Each item
-                 is the result of the simulation on the validation set.
+                 is the result of the simulation on the validation set,
+                 with one row per observation, or per individual for
+                 panel data.
         :rtype: list(pandas.DataFrame)
 
-        :raises BiogemeError: An error is raised if the database is structured
-            as panel data.
+        :raises BiogemeError: if the data sets have not been extracted
+            from the database of the model, or if, for panel data, an
+            individual belongs to both sets of a slice.
         """
-        if self.database.is_panel():
-            raise BiogemeError("Validation for panel data is not yet implemented")
-
-        keep_database = self.database
-
-        all_simulation_results = []
-        count = 0
-        for v in validation_data:
-            count += 1
-            # v[0] is the estimation data set
-            database = db.Database("Estimation data", v.estimation)
-            self.log_like.change_init_values(estimation_results.get_beta_values())
-            est_biogeme = BIOGEME(database, self.log_like)
-            est_biogeme.modelName = f"{self.modelName}_val_est_{count}"
-            results = est_biogeme.estimate()
-            simulate = {"Loglikelihood": self.log_like}
-            sim_biogeme = BIOGEME(
-                db.Database("Validation data", v.validation),
-                simulate,
-            )
-            sim_biogeme.modelName = f"{self.modelName}_val_sim_{count}"
-            sim_result = sim_biogeme.simulate(results.get_beta_values())
-            all_simulation_results.append(sim_result)
+        self._set_function_parameters()
+        self._set_algorithm_parameters()
+        self._prepare_database_for_formula()
+        if self.monte_carlo and self.draws is None:
+            self.draws = self.database.materialize_draws()
+        starting_values = self.beta_values_dict_to_list(
+            estimation_results.get_beta_values()
+        )
+        runner = CrossValidationRunner(
+            the_biogeme=self,
+            starting_values=np.array(starting_values),
+            validation_data=validation_data,
+        )
+        all_simulation_results = runner.run()
 
-        self.database = keep_database
         if self.generate_pickle:
             fname = f'{self.modelName}_validation'
             pickle_file_name = bf.get_new_file_name(fname, 'pickle')
@@ -1892,7 +1974,12 @@ class BIOGEME:
             beta_list.append(v)
         return beta_list
 
-    def simulate(self, the_beta_values: dict[str, float]) -> pd.DataFrame:
+    def simulate(
+        self,
+        the_beta_values: dict[str, float],
+        aggregates: dict[str, Aggregate] | None = None,
+        group_by: str | None = None,
+    ) -> pd.DataFrame:
         """Applies the formulas to each row of the database.
 
         :param the_beta_values: values of the parameters to be used in
@@ -1900,9 +1987,27 @@ class BIOGEME:
                 used. Default: None.
         :type the_beta_values: dict(str, float)
 
+        :param aggregates: if not None, only these aggregates of the
+            simulated values are returned, such as market shares or
+            revenues. They are weighted sums or weighted means of
+            formulas, or of columns of the database. Except for panel
+            data and Monte-Carlo integration, the rows of the database
+            are simulated by chunks of simulation_chunk_size rows, and
+            the aggregates are updated with each chunk, so that the
+            simulated values of all rows are never stored.
+        :type aggregates: dict(str: biogeme.simulation_aggregates.Aggregate)
+
+        :param group_by: name of a formula, or of a column of the
+            database, defining the segments for which the aggregates
+            are calculated. If None, they are calculated over all rows.
+            Ignored if aggregates is None.
+        :type group_by: str
+
         :return: a pandas data frame with the simulated value. Each
               row corresponds to a row in the database, and each
-              column to a formula.
+              column to a formula. If aggregates are requested, each
+              row corresponds to a segment, or is labeled 'total',
+              and each column to an aggregate.
 
         :rtype: Pandas data frame
 
@@ -1912,12 +2017,86 @@ class BIOGEME:
               results = res.bioResults(pickle_file = 'myModel.pickle')
               # Simulate the formulas using the nominal values
               simulatedValues = biogeme.simulate(beta_values)
+              # Market share of the first alternative, by segment
+              shares = biogeme.simulate(
+                  beta_values,
+                  aggregates={
+                      'share': Aggregate(formula='Prob. 1', weight='weight', mean=True)
+                  },
+                  group_by='segment',
+              )
 
         :raises BiogemeError: if the number of parameters is incorrect
 
         :raises BiogemeError: if theBetaValues is None.
+
+        :raises BiogemeError: if an aggregate involves a name that is
+            neither a formula nor a column of the database.
+        """
+        if aggregates is not None:
+            return self._simulate_aggregates(the_beta_values, aggregates, group_by)
+        beta_values = self._simulation_beta_values(the_beta_values)
+        formulas_signature, data = self._prepare_simulation()
+        result = self._simulate_formulas(formulas_signature, beta_values, data)
+        output = pd.DataFrame(index=self._simulation_index())
+        for key, r in zip(self.formulas.keys(), result):
+            output[key] = r
+        return output
+
+    def _simulate_aggregates(
+        self,
+        the_beta_values: dict[str, float],
+        aggregates: dict[str, Aggregate],
+        group_by: str | None,
+    ) -> pd.DataFrame:
+        """Calculates aggregates of the simulated values. See
+        :meth:`~biogeme.biogeme.BIOGEME.simulate`.
+
+        :param the_beta_values: values of the parameters.
+        :type the_beta_values: dict(str, float)
+
+        :param aggregates: definition of the aggregates.
+        :type aggregates: dict(str: biogeme.simulation_aggregates.Aggregate)
+
+        :param group_by: name of the formula or column defining the
+            segments.
+        :type group_by: str
+
+        :return: values of the aggregates.
+        :rtype: pandas.DataFrame
         """
+        calculator = AggregatesCalculator(aggregates, group_by=group_by)
+        if self.database.is_panel() or self.monte_carlo:
+            # The draws and the panel structure are associated with the
+            # complete database. For panel data, the simulated values
+            # are associated with individuals, and not with rows.
+            simulated = self.simulate(the_beta_values)
+            data = None if self.database.is_panel() else self.database.data
+            calculator.add(simulated, data)
+            return calculator.results()
+        chunk_size = self.biogeme_parameters.get_value(
+            name="simulation_chunk_size", section="Simulation"
+        )
+        data = self.database.data
+        chunks = (
+            data.iloc[first : first + chunk_size]
+            for first in range(0, len(data), chunk_size)
+        )
+        for _ in self.simulate_chunks(the_beta_values, chunks, aggregates=calculator):
+            pass
+        return calculator.results()
+
+    def _simulation_beta_values(self, the_beta_values: dict[str, float]) -> list[float]:
+        """Values of the free parameters used for the simulation.
+
+        :param the_beta_values: values of the parameters.
+        :type the_beta_values: dict(str, float)
 
+        :return: values of the free parameters.
+        :rtype: list(float)
+
+        :raises BiogemeError: if the_beta_values is None.
+        """
         if the_beta_values is None:
             err = (
                 "Contrarily to previous versions of Biogeme, "
@@ -1926,9 +2105,484 @@ class BIOGEME:
                 "results.getBetaValues()"
             )
             raise BiogemeError(err)
+        return self.beta_values_dict_to_list(the_beta_values)
+
+    def simulate_chunks(
+        self,
+        the_beta_values: dict[str, float],
+        chunks: Iterable[pd.DataFrame] | str,
+        separator: str = ",",
+        aggregates: AggregatesCalculator | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Applies the formulas to data provided chunk by chunk, so that
+        the memory needed does not depend on the number of rows. The
+        formulas are prepared once, and applied to each chunk. The data
+        of the database of this object is not used.
+
+        :param the_beta_values: values of the parameters to be used in
+                the calculations.
+        :type the_beta_values: dict(str, float)
+
+        :param chunks: either an iterable on data frames, or the name of
+            a CSV or Parquet file, read by chunks of
+            simulation_chunk_size rows. The chunks must contain the
+            variables involved in the formulas.
+        :type chunks: iterable(pandas.DataFrame) or str
+
+        :param separator: separator of the columns of a CSV file.
+        :type separator: str
+
+        :param aggregates: if not None, the aggregates are updated with
+            each chunk of simulated values.
+        :type aggregates: biogeme.simulation_aggregates.AggregatesCalculator
+
+        :return: iterator on the simulated values. Each data frame has
+            the same index as the corresponding chunk, and one column
+            per formula.
+        :rtype: iterator(pandas.DataFrame)
+
+        :raises BiogemeError: if the data is panel, or if the formulas
+            involve Monte-Carlo integration, as the draws are associated
+            with the individuals of the database.
+
+        :raises BiogemeError: if a chunk does not contain a variable
+            involved in the formulas.
+        """
+        if self.database.is_panel() or self.monte_carlo:
+            err = (
+                "The simulation by chunks of data is not available for panel "
+                "data, nor for Monte-Carlo integration."
+            )
+            raise BiogemeError(err)
+        beta_values = self._simulation_beta_values(the_beta_values)
+        if isinstance(chunks, str):
+            chunk_size = self.biogeme_parameters.get_value(
+                name="simulation_chunk_size", section="Simulation"
+            )
+            chunks = read_chunks(chunks, chunk_size, separator)
+        formulas_signature = [v.get_signature() for v in self.formulas.values()]
+        self._audit_formulas()
+        variables = set()
+        for formula in self.formulas.values():
+            variables |= formula.set_of_elementary_expression(
+                TypeOfElementaryExpression.VARIABLE
+            )
+        return self._simulated_chunks(
+            chunks, formulas_signature, beta_values, variables, aggregates
+        )
+
+    def _simulated_chunks(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        formulas_signature: list[list[bytes]],
+        beta_values: list[float],
+        variables: set[str],
+        aggregates: AggregatesCalculator | None,
+    ) -> Iterator[pd.DataFrame]:
+        """Simulates the prepared formulas on each chunk of data.
+
+        :param chunks: chunks of data.
+        :type chunks: iterable(pandas.DataFrame)
+
+        :param formulas_signature: signatures of the formulas.
+        :type formulas_signature: list(list(bytes))
+
+        :param beta_values: values of the free parameters.
+        :type beta_values: list(float)
+
+        :param variables: names of the variables involved in the formulas.
+        :type variables: set(str)
+
+        :param aggregates: if not None, the aggregates are updated with
+            each chunk of simulated values.
+        :type aggregates: biogeme.simulation_aggregates.AggregatesCalculator
+
+        :return: iterator on the simulated values.
+        :rtype: iterator(pandas.DataFrame)
+
+        :raises BiogemeError: if a chunk does not contain a variable
+            involved in the formulas.
+        """
+        the_cpp = self._simulation_engine()
+        columns = self.database.data.columns
+        for chunk in chunks:
+            if len(chunk) == 0:
+                continue
+            missing_variables = variables - set(chunk.columns)
+            if missing_variables:
+                err = (
+                    f"The following variables are missing in the chunk of "
+                    f"data: {sorted(missing_variables)}"
+                )
+                raise BiogemeError(err)
+            # The variables are identified by their position in the
+            # columns of the database. The columns that are not
+            # involved in the formulas may be absent from the chunk.
+            data = np.ascontiguousarray(
+                chunk.reindex(columns=columns, fill_value=0.0), dtype=np.float64
+            )
+            the_cpp.setData(data)
+            result = the_cpp.simulateSeveralFormulas(
+                formulas_signature,
+                beta_values,
+                self.id_manager.fixed_betas_values,
+                data,
+                self.number_of_threads,
+                len(chunk),
+            )
+            output = pd.DataFrame(
+                np.asarray(result).T, index=chunk.index, columns=list(self.formulas)
+            )
+            if aggregates is not None:
+                aggregates.add(output, chunk)
+            yield output
 
-        beta_values = self.beta_values_dict_to_list(the_beta_values)
+    def simulate_to_file(
+        self,
+        the_beta_values: dict[str, float],
+        chunks: Iterable[pd.DataFrame] | str,
+        file_name: str,
+        separator: str = ",",
+        aggregates: AggregatesCalculator | None = None,
+    ) -> int:
+        """Applies the formulas to data provided chunk by chunk, and
+        writes the simulated values in a file, chunk by chunk. See
+        :meth:`~biogeme.biogeme.BIOGEME.simulate_chunks`.
+
+        :param the_beta_values: values of the parameters to be used in
+                the calculations.
+        :type the_beta_values: dict(str, float)
+
+        :param chunks: either an iterable on data frames, or the name of
+            a CSV or Parquet file.
+        :type chunks: iterable(pandas.DataFrame) or str
+
+        :param file_name: name of the output file. If its extension is
+            .parquet or .pq, a Parquet file is written. Otherwise, a CSV
+            file is written.
+        :type file_name: str
+
+        :param separator: separator of the columns of the CSV files.
+        :type separator: str
+
+        :param aggregates: if not None, the aggregates are updated with
+            each chunk of simulated values.
+        :type aggregates: biogeme.simulation_aggregates.AggregatesCalculator
+
+        :return: number of rows written.
+        :rtype: int
+        """
+        simulated_chunks = self.simulate_chunks(
+            the_beta_values, chunks, separator=separator, aggregates=aggregates
+        )
+        with ChunkWriter(file_name, separator=separator) as writer:
+            for simulated in simulated_chunks:
+                writer.write(simulated)
+        logger.info(
+            f"Simulated values of {writer.number_of_rows} rows saved in {file_name}"
+        )
+        return writer.number_of_rows
+
+    def simulate_scenarios(
+        self,
+        the_beta_values: dict[str, float],
+        scenarios: pd.DataFrame | Iterable[dict[str, float | np.ndarray]],
+        aggregates: dict[str, Aggregate] | None = None,
+        group_by: str | None = None,
+        beta_draws: list[dict[str, float]] | None = None,
+        interval_size: float = 0.9,
+    ) -> pd.DataFrame | tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """Applies the formulas to each row of the database, for
+        several scenarios. The formulas are checked, and transferred
+        to the C++ engine with the data, only once. The inputs of a
+        scenario are
+
+            - the values of parameters of the formulas that are not
+              estimated (Beta with status 1), such as a factor
+              multiplying a price,
+            - new values of columns of the database, either a scalar
+              or one value per row.
+
+        The other parameters, and the other columns, keep their
+        values.
+
+        Example::
+
+              factor = Beta('factor', 1.0, None, None, 1)
+              the_biogeme = BIOGEME(database, {'revenue': prob * price * factor})
+              revenues = the_biogeme.simulate_scenarios(
+                  beta_values,
+                  pd.DataFrame({'factor': np.arange(0.0, 5.0, 0.05)}),
+                  aggregates={'revenue': Aggregate(formula='revenue')},
+              )
+
+        :param the_beta_values: values of the estimated parameters.
+        :type the_beta_values: dict(str, float)
+
+        :param scenarios: either a data frame, with one row per
+            scenario and one column per input, or an iterable of
+            dictionaries mapping the names of the inputs with their
+            values.
+        :type scenarios: pandas.DataFrame or list(dict(str: float))
+
+        :param aggregates: if not None, only these aggregates of the
+            simulated values are returned for each scenario. See
+            :meth:`~biogeme.biogeme.BIOGEME.simulate`.
+        :type aggregates: dict(str: biogeme.simulation_aggregates.Aggregate)
+
+        :param group_by: name of a formula, or of a column of the
+            database, defining the segments for which the aggregates
+            are calculated.
+        :type group_by: str
+
+        :param beta_draws: if not None, values of the parameters,
+            typically drawn from their distribution, used to calculate
+            the confidence intervals of the simulated values of each
+            scenario, as :meth:`~biogeme.biogeme.BIOGEME.confidence_intervals`.
+        :type beta_draws: list(dict(str: float))
+
+        :param interval_size: size of the confidence intervals. See
+            :meth:`~biogeme.biogeme.BIOGEME.confidence_intervals`.
+        :type interval_size: float
+
+        :return: the simulated values, or the aggregates, of all
+            scenarios. The first level of the index identifies the
+            scenario: the index of the data frame of scenarios, or the
+            position of the scenario in the iterable. If beta_draws is
+            not None, the left and the right values of the confidence
+            intervals follow, in data frames of the same dimensions. If
+            aggregates are requested, they are calculated from these
+            values.
+        :rtype: pandas.DataFrame, or tuple of three pandas.DataFrame
+
+        :raises BiogemeError: if no scenario is provided.
+
+        :raises BiogemeError: if an input is neither a fixed parameter
+            of the formulas, nor a column of the database.
+        """
+        beta_values = self._simulation_beta_values(the_beta_values)
+        if isinstance(scenarios, pd.DataFrame):
+            labels = list(scenarios.index)
+            scenarios = scenarios.to_dict(orient="records")
+        else:
+            scenarios = list(scenarios)
+            labels = list(range(len(scenarios)))
+        if not scenarios:
+            raise BiogemeError("No scenario has been provided.")
+        fixed_indices = {
+            name: index for index, name in enumerate(self.id_manager.fixed_betas.names)
+        }
+        column_indices = {
+            name: index for index, name in enumerate(self.database.data.columns)
+        }
+        for scenario in scenarios:
+            unknown_inputs = [
+                name
+                for name in scenario
+                if name not in fixed_indices and name not in column_indices
+            ]
+            if unknown_inputs:
+                err = (
+                    f"The inputs {unknown_inputs} of the scenario are neither "
+                    f"parameters that are not estimated, nor columns of the "
+                    f"database."
+                )
+                raise BiogemeError(err)
+
+        with_intervals = beta_draws is not None
+        draw_vectors = (
+            [self.beta_values_dict_to_list(b) for b in beta_draws]
+            if with_intervals
+            else []
+        )
+        formulas_signature = self._simulation_signatures()
+        self._audit_formulas()
+        # A dedicated engine is used, as the data is modified by the
+        # scenarios.
+        the_cpp = self._simulation_engine()
+        data = np.array(self.database.data, dtype=np.float64)
+        the_cpp.setData(data)
+        if self.database.is_panel():
+            the_cpp.setDataMap(self.database.individualMap)
+        if self.monte_carlo:
+            the_cpp.setDraws(
+                self.database.materialize_draws() if self.draws is None else self.draws
+            )
+        index = self._simulation_index()
+        r = (1.0 - interval_size) / 2.0
+        probabilities = [r, 1.0 - r]
+        number_of_values = len(draw_vectors) * len(self.formulas) * len(index)
+        max_stored_values = self.biogeme_parameters.get_value(
+            name="max_stored_simulated_values", section="Simulation"
+        )
+
+        def simulate(vector: list[float], fixed_values: list[float]) -> np.ndarray:
+            return np.asarray(
+                the_cpp.simulateSeveralFormulas(
+                    formulas_signature,
+                    vector,
+                    fixed_values,
+                    data,
+                    self.number_of_threads,
+                    self.database.get_sample_size(),
+                )
+            )
+
+        modified_columns: set[str] = set()
+        results = []
+        lefts = []
+        rights = []
+        for scenario in scenarios:
+            fixed_beta_values = list(self.id_manager.fixed_betas_values)
+            new_columns = {}
+            for name, value in scenario.items():
+                if name in fixed_indices:
+                    fixed_beta_values[fixed_indices[name]] = value
+                else:
+                    new_columns[name] = value
+            if new_columns or modified_columns:
+                for name in modified_columns - new_columns.keys():
+                    data[:, column_indices[name]] = self.database.data[name].to_numpy()
+                for name, value in new_columns.items():
+                    data[:, column_indices[name]] = value
+                modified_columns = set(new_columns)
+                the_cpp.setData(data)
+            values = [simulate(beta_values, fixed_beta_values)]
+            if with_intervals:
+                accumulator = (
+                    ExactQuantilesAccumulator(probabilities)
+                    if number_of_values <= max_stored_values
+                    else StreamingQuantilesAccumulator(probabilities)
+                )
+                for vector in draw_vectors:
+                    accumulator.add(simulate(vector, fixed_beta_values))
+                values += accumulator.quantiles()
+            frames = [
+                pd.DataFrame(value.T, index=index, columns=list(self.formulas))
+                for value in values
+            ]
+            if aggregates is not None:
+                scenario_data = (
+                    None
+                    if self.database.is_panel()
+                    else (
+                        self.database.data.assign(**new_columns)
+                        if new_columns
+                        else self.database.data
+                    )
+                )
+                for i, simulated in enumerate(frames):
+                    calculator = AggregatesCalculator(aggregates, group_by=group_by)
+                    if scenario_data is None:
+                        calculator.add(simulated)
+                    else:
+                        calculator.add(simulated, scenario_data)
+                    frames[i] = calculator.results()
+            results.append(frames[0])
+            if with_intervals:
+                lefts.append(frames[1])
+                rights.append(frames[2])
+        if not with_intervals:
+            return pd.concat(results, keys=labels, names=["scenario"])
+        left, right = (
+            pd.concat(bounds, keys=labels, names=["scenario"])
+            for bounds in (lefts, rights)
+        )
+        return pd.concat(results, keys=labels, names=["scenario"]), left, right
+
+    def simulate_batch(
+        self,
+        beta_values: Iterable[dict[str, float]] | np.ndarray,
+        accumulators: Iterable[SimulationAccumulator],
+    ) -> None:
+        """Applies the formulas to each row of the database, for
+        several vectors of parameters. The formulas are checked, and
+        the data is prepared for the C++ engine, only once. The values
+        simulated for each vector are passed to the accumulators, and
+        are not stored.
+
+        :param beta_values: vectors of values of the parameters. Either
+            an iterable of dictionaries, as for
+            :meth:`~biogeme.biogeme.BIOGEME.simulate`, or an array with
+            one row per vector, and one column per free parameter, in
+            the order of :attr:`id_manager.free_betas.names`.
+        :type beta_values: list(dict(str: float)) or numpy.array
+
+        :param accumulators: accumulators receiving the values
+            simulated for each vector. They are arrays with one row per
+            formula, in the order of :attr:`formulas`, and one column
+            per row of the database, or per individual for panel data.
+        :type accumulators: list(biogeme.simulation_accumulators.SimulationAccumulator)
+
+        :raises BiogemeError: if the number of columns of the array
+            does not match the number of free parameters.
+        """
+        if isinstance(beta_values, np.ndarray):
+            number_of_betas = self.id_manager.number_of_free_betas
+            if beta_values.ndim != 2 or beta_values.shape[1] != number_of_betas:
+                err = (
+                    f"The array of parameters must have {number_of_betas} "
+                    f"columns, and not shape {beta_values.shape}."
+                )
+                raise BiogemeError(err)
+            vectors = (list(row) for row in beta_values)
+        else:
+            vectors = (self.beta_values_dict_to_list(b) for b in beta_values)
+        accumulators = list(accumulators)
+        formulas_signature, data = self._prepare_simulation()
+        for vector in vectors:
+            result = np.asarray(
+                self._simulate_formulas(formulas_signature, vector, data)
+            )
+            for accumulator in accumulators:
+                accumulator.add(result)
 
+    def _simulation_index(self) -> pd.Index:
+        """Index of the simulated values.
+
+        :return: index of the individuals for panel data, and of the
+            rows of the database otherwise.
+        :rtype: pandas.Index
+        """
+        if self.database.is_panel():
+            return self.database.individualMap.index
+        return self.database.data.index
+
+    def _prepare_simulation(self) -> tuple[list[list[bytes]], np.ndarray | None]:
+        """Checks the formulas to simulate, and prepares the C++ engine.
+
+        :return: the signatures of the formulas, and the data in the
+            format expected by the C++ engine, or None if the formulas
+            are simulated by chunks of individuals.
+        :rtype: tuple(list(list(bytes)), numpy.array)
+
+        :raises BiogemeError: if a formula for panel data does not
+            contain exactly one PanelLikelihoodTrajectory operator.
+        """
+        formulas_signature = self._simulation_signatures()
+        if self.monte_carlo and self.draws is None:
+            self._audit_formulas()
+            return formulas_signature, None
+
+        self.theC = self.estimation_context.prepare_simulation(
+            self, formulas_signature
+        )
+        self._audit_formulas()
+        # The conversion is performed once, and not at each call of the
+        # C++ engine.
+        data = np.ascontiguousarray(self.database.data, dtype=np.float64)
+        return formulas_signature, data
+
+    def _simulation_signatures(self) -> list[list[bytes]]:
+        """Checks the formulas to simulate, and calculates their
+        signatures.
+
+        :return: the signatures of the formulas.
+        :rtype: list(list(bytes))
+
+        :raises BiogemeError: if a formula for panel data does not
+            contain exactly one PanelLikelihoodTrajectory operator.
+        """
         if self.database.is_panel():
             for f in self.formulas.values():
                 count = f.count_panel_trajectory_expressions()
@@ -1939,15 +2593,48 @@ class BIOGEME:
                         f"operator. It contains {count}: {f}"
                     )
                     raise BiogemeError(the_error)
-            output = pd.DataFrame(index=self.database.individualMap.index)
-        else:
-            output = pd.DataFrame(index=self.database.data.index)
         formulas_signature = [v.get_signature() for v in self.formulas.values()]
+        self._prepare_database_for_formula()
+        return formulas_signature
 
-        if self.database.is_panel():
-            self.database.build_panel_map()
-            self.theC.setDataMap(self.database.individualMap)
+    def _simulate_formulas(
+        self,
+        formulas_signature: list[list[bytes]],
+        beta_values: list[float],
+        data: np.ndarray | None,
+    ) -> list[np.ndarray]:
+        """Simulates the formulas for one vector of parameters, once the
+        simulation has been prepared.
+
+        :param formulas_signature: signatures of the formulas.
+        :type formulas_signature: list(list(bytes))
+
+        :param beta_values: values of the free parameters.
+        :type beta_values: list(float)
+
+        :param data: data prepared for the C++ engine, or None if the
+            formulas are simulated by chunks of individuals.
+        :type data: numpy.array
 
+        :return: simulated values of each formula.
+        :rtype: list(numpy.array)
+        """
+        if data is None:
+            return self._simulate_by_chunks(formulas_signature, beta_values)
+        return self.theC.simulateSeveralFormulas(
+            formulas_signature,
+            beta_values,
+            self.id_manager.fixed_betas_values,
+            data,
+            self.number_of_threads,
+            self.database.get_sample_size(),
+        )
+
+    def _audit_formulas(self) -> None:
+        """Audits the formulas to simulate.
+
+        :raises BiogemeError: if one formula is not valid.
+        """
         for v in self.formulas.values():
             list_of_errors, list_of_warnings = v.audit(database=self.database)
             if list_of_warnings:
@@ -1956,17 +2643,68 @@ class BIOGEME:
                 logger.warning("\n".join(list_of_errors))
                 raise BiogemeError("\n".join(list_of_errors))
 
-        result = self.theC.simulateSeveralFormulas(
-            formulas_signature,
-            beta_values,
-            self.id_manager.fixed_betas_values,
-            self.database.data,
-            self.number_of_threads,
-            self.database.get_sample_size(),
+    def _simulate_by_chunks(
+        self, formulas_signature: list[list[bytes]], beta_values: list[float]
+    ) -> list[np.ndarray]:
+        """Simulates the formulas by chunks of individuals, when the
+        draws are not stored. The draws of each chunk are generated, and
+        transferred to the C++ engine together with the corresponding
+        rows of the data.
+
+        :param formulas_signature: signatures of the formulas.
+        :type formulas_signature: list(list(bytes))
+
+        :param beta_values: values of the free parameters.
+        :type beta_values: list(float)
+
+        :return: simulated values of each formula, for each individual.
+        :rtype: list(numpy.array)
+        """
+        chunk_size = self.biogeme_parameters.get_value(
+            name="draws_chunk_size", section="MonteCarlo"
         )
-        for key, r in zip(self.formulas.keys(), result):
-            output[key] = r
-        return output
+        sample_size = self.database.get_sample_size()
+        panel = self.database.is_panel()
+        the_cpp = self._simulation_engine()
+        results = [np.empty(sample_size) for _ in formulas_signature]
+        for first in range(0, sample_size, chunk_size):
+            last = min(first + chunk_size, sample_size)
+            if panel:
+                first_row = self.database.individual_starts[first]
+                last_row = self.database.individual_ends[last - 1] + 1
+            else:
+                first_row, last_row = first, last
+            data = self.database.data.iloc[first_row:last_row]
+            the_cpp.setData(data)
+            if panel:
+                the_cpp.setDataMap(
+                    self.database.individualMap.iloc[first:last] - first_row
+                )
+            the_cpp.setDraws(self.database.draws_of_individuals(first, last))
+            chunk_results = the_cpp.simulateSeveralFormulas(
+                formulas_signature,
+                beta_values,
+                self.id_manager.fixed_betas_values,
+                data,
+                self.number_of_threads,
+                last - first,
+            )
+            for r, chunk_result in zip(results, chunk_results):
+                r[first:last] = chunk_result
+        return results
+
+    def _simulation_engine(self) -> cb.pyBiogeme:
+        """C++ engine dedicated to a simulation by chunks, which does
+        not modify the engine shared with the estimation.
+
+        :return: the C++ engine.
+        :rtype: cythonbiogeme.cythonbiogeme.pyBiogeme
+        """
+        the_cpp = cb.pyBiogeme(self.id_manager.number_of_free_betas)
+        the_cpp.setMissingData(self.missing_data)
+        if self.database.is_panel():
+            the_cpp.setPanel(True)
+        return the_cpp
 
     def confidence_intervals(
         self, beta_values: list[dict[str, float]], interval_size: float = 0.9
@@ -2009,17 +2747,34 @@ class BIOGEME:
                 # Calculate the confidence intervals for each formula
                 left, right = biogeme.confidenceIntervals(b, 0.9)
 
+        The simulated values are stored, and the quantiles calculated
+        exactly, only if their number does not exceed the parameter
+        max_stored_simulated_values. Otherwise, the quantiles are
+        estimated by
+        :class:`~biogeme.simulation_accumulators.StreamingQuantilesAccumulator`,
+        which requires a memory independent of the number of parameter
+        vectors.
+
         :rtype: tuple of two Pandas dataframes.
 
         """
-        list_of_results = []
-        for b in beta_values:
-            r = self.simulate(b)
-            list_of_results += [r]
-        all_results = pd.concat(list_of_results)
         r = (1.0 - interval_size) / 2.0
-        left = all_results.groupby(level=0).quantile(r)
-        right = all_results.groupby(level=0).quantile(1.0 - r)
+        probabilities = [r, 1.0 - r]
+        index = self._simulation_index()
+        number_of_values = len(beta_values) * len(self.formulas) * len(index)
+        max_stored_values = self.biogeme_parameters.get_value(
+            name="max_stored_simulated_values", section="Simulation"
+        )
+        accumulator = (
+            ExactQuantilesAccumulator(probabilities)
+            if number_of_values <= max_stored_values
+            else StreamingQuantilesAccumulator(probabilities)
+        )
+        self.simulate_batch(beta_values, [accumulator])
+        left, right = (
+            pd.DataFrame(quantiles.T, index=index, columns=list(self.formulas))
+            for quantiles in accumulator.quantiles()
+        )
         return left, right
 
     @deprecated(confidence_intervals)
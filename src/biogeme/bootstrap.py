@@ -0,0 +1,456 @@
+"""Re-estimation of a model on bootstrap samples, possibly in parallel.
+
+:author: Michel Bierlaire
+:date: Sun Oct 18 09:12:40 2026
+
+Each bootstrap replication is associated with its own random stream,
+derived from a base seed and the index of the replication. Therefore,
+the results do not depend on the number of processes, nor on the order
+in which the replications are performed. The replications that have
+been completed are saved on file, so that an interrupted run can be
+resumed.
+
+The data is transferred once to the C++ model of each process, and
+never resampled. Each replication only transfers a resampled map of the
+individuals. Cross-sectional data is treated as panel data where each
+observation is an individual. As the engine does not accept weights in
+this context, the weight of the model, if any, multiplies the log
+likelihood of each observation. Note also that the draws of a
+Monte-Carlo integration are then associated with the position of the
+observation in the resampled map, as for panel data.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import NamedTuple, TYPE_CHECKING
+
+import cythonbiogeme.cythonbiogeme as cb
+import numpy as np
+import pandas as pd
+import tqdm
+
+import biogeme.optimization as opt
+from biogeme.exceptions import BiogemeError
+from biogeme.function_output import BiogemeFunctionOutput
+from biogeme.negative_likelihood import NegativeLikelihood
+from biogeme.random_streams import BOOTSTRAP, get_generator
+
+if TYPE_CHECKING:
+    from biogeme.biogeme import BIOGEME
+
+logger = logging.getLogger(__name__)
+
+
+class BootstrapContext(NamedTuple):
+    """All the information needed to re-estimate the model in another
+    process. It involves only picklable objects."""
+
+    loglike_signatures: list[bytes]
+    weight_signatures: list[bytes] | None
+    weighted_loglike_signatures: list[bytes] | None
+    data: pd.DataFrame
+    individual_map: pd.DataFrame
+    draws: np.ndarray | None
+    missing_data: float
+    number_of_threads: int
+    number_of_free_betas: int
+    fixed_betas_values: list[float]
+    free_betas_indices: list[int]
+    bounds: list[tuple[float, float]]
+    algorithm_name: str
+    algo_parameters: dict | None
+    function_parameters: dict | None
+    starting_values: np.ndarray
+    base_seed: int
+
+
+class BootstrapWorker:
+    """Owns a C++ model and re-estimates it on bootstrap samples."""
+
+    def __init__(self, context: BootstrapContext):
+        """Constructor
+
+        :param context: description of the model and the data.
+        :type context: BootstrapContext
+        """
+        self.context = context
+        self.theC = cb.pyBiogeme(context.number_of_free_betas)
+        self.theC.setPanel(True)
+        self.theC.setDataMap(context.individual_map)
+        self.theC.setData(context.data)
+        self.theC.setMissingData(context.missing_data)
+        if context.draws is not None:
+            self.theC.setDraws(context.draws)
+        if context.weighted_loglike_signatures is not None:
+            self.theC.setExpressions(
+                context.weighted_loglike_signatures, context.number_of_threads
+            )
+        elif context.weight_signatures is None:
+            self.theC.setExpressions(
+                context.loglike_signatures, context.number_of_threads
+            )
+        else:
+            self.theC.setExpressions(
+                context.loglike_signatures,
+                context.number_of_threads,
+                context.weight_signatures,
+            )
+
+    def calculate_likelihood(
+        self, x: np.ndarray, scaled: bool, batch: float | None = None
+    ) -> float:
+        """Calculates the value of the log likelihood function on the
+        current sample.
+
+        :param x: vector of values for the parameters.
+        :param scaled: ignored. Included to comply with the syntax.
+        :param batch: ignored. Included to comply with the syntax.
+        :return: value of the log likelihood.
+        """
+        return self.theC.calculateLikelihood(x, self.context.fixed_betas_values)
+
+    def calculate_likelihood_and_derivatives(
+        self,
+        x: np.ndarray,
+        scaled: bool,
+        hessian: bool = False,
+        bhhh: bool = False,
+        batch: float | None = None,
+    ) -> BiogemeFunctionOutput:
+        """Calculates the value of the log likelihood function and its
+        derivatives on the current sample.
+
+        :param x: vector of values for the parameters.
+        :param scaled: ignored. Included to comply with the syntax.
+        :param hessian: if True, the hessian is calculated.
+        :param bhhh: if True, the BHHH matrix is calculated.
+        :param batch: ignored. Included to comply with the syntax.
+        :return: value of the function and its derivatives.
+        """
+        n = len(x)
+        g = np.empty(n)
+        h = np.empty([n, n])
+        bh = np.empty([n, n])
+        f, g, h, bh = self.theC.calculateLikelihoodAndDerivatives(
+            x,
+            self.context.fixed_betas_values,
+            self.context.free_betas_indices,
+            g,
+            h,
+            bh,
+            hessian,
+            bhhh,
+        )
+        return BiogemeFunctionOutput(
+            function=f,
+            gradient=np.asarray(g),
+            hessian=np.asarray(h),
+            bhhh=np.asarray(bh),
+        )
+
+    def replication(self, index: int) -> np.ndarray:
+        """Re-estimates the model on the bootstrap sample associated with
+        a given replication.
+
+        :param index: index of the replication. It determines the
+            random stream used to draw the sample.
+        :type index: int
+
+        :return: estimated values of the free parameters.
+        :rtype: numpy.array
+        """
+        rng = replication_generator(self.context.base_seed, index)
+        size = len(self.context.individual_map)
+        sample = self.context.individual_map.iloc[rng.integers(0, size, size)]
+        self.theC.setDataMap(sample)
+        return self.estimate()
+
+    def reset_sample(self) -> None:
+        """Restores the map of all the individuals in the C++ model."""
+        self.theC.setDataMap(self.context.individual_map)
+
+    def estimate(self) -> np.ndarray:
+        """Estimates the model on the current sample, starting from the
+        starting values of the context.
+
+        :return: estimated values of the free parameters.
+        :rtype: numpy.array
+        """
+        the_function = NegativeLikelihood(
+            dimension=self.context.number_of_free_betas,
+            like=self.calculate_likelihood,
+            like_derivatives=self.calculate_likelihood_and_derivatives,
+            parameters=self.context.function_parameters,
+        )
+        algorithm = opt.algorithms.get(self.context.algorithm_name)
+        x_br, _, _ = algorithm(
+            fct=the_function,
+            init_betas=self.context.starting_values,
+            bounds=self.context.bounds,
+            variable_names=None,
+            parameters=self.context.algo_parameters,
+        )
+        return np.asarray(x_br)
+
+
+def replication_generator(base_seed: int, index: int) -> np.random.Generator:
+    """Generator of pseudo-random numbers dedicated to one replication.
+
+    :param base_seed: seed common to all replications.
+    :type base_seed: int
+
+    :param index: index of the replication.
+    :type index: int
+
+    :return: the random number generator.
+    :rtype: numpy.random.Generator
+    """
+    return get_generator(base_seed, BOOTSTRAP, index)
+
+
+def make_context(
+    the_biogeme: BIOGEME,
+    starting_values: np.ndarray,
+    number_of_processes: int,
+    base_seed: int = 0,
+) -> BootstrapContext:
+    """Gathers the information needed to re-estimate a model on
+    samples of the individuals in other processes. For cross-sectional
+    data, each observation is considered as an individual.
+
+    :param the_biogeme: model to re-estimate.
+    :type the_biogeme: biogeme.biogeme.BIOGEME
+
+    :param starting_values: starting point of each re-estimation.
+    :type starting_values: numpy.array
+
+    :param number_of_processes: number of processes sharing the
+        available threads.
+    :type number_of_processes: int
+
+    :param base_seed: seed of the random streams.
+    :type base_seed: int
+
+    :return: the context.
+    :rtype: BootstrapContext
+    """
+    database = the_biogeme.database
+    weight_signatures = (
+        None if the_biogeme.weight is None else the_biogeme.weightSignatures
+    )
+    weighted_loglike_signatures = None
+    if database.is_panel():
+        individual_map = database.individualMap
+    else:
+        positions = np.arange(database.get_number_of_observations())
+        individual_map = pd.DataFrame(
+            {0: positions, 1: positions}, index=database.data.index
+        )
+        if the_biogeme.weight is not None:
+            weighted_loglike_signatures = _weighted_loglike_signatures(the_biogeme)
+            weight_signatures = None
+
+    threads = max(1, the_biogeme.number_of_threads // number_of_processes)
+    return BootstrapContext(
+        loglike_signatures=the_biogeme.loglikeSignatures,
+        weight_signatures=weight_signatures,
+        weighted_loglike_signatures=weighted_loglike_signatures,
+        data=database.data,
+        individual_map=individual_map,
+        draws=the_biogeme.draws,
+        missing_data=the_biogeme.missing_data,
+        number_of_threads=threads,
+        number_of_free_betas=the_biogeme.id_manager.number_of_free_betas,
+        fixed_betas_values=list(the_biogeme.id_manager.fixed_betas_values),
+        free_betas_indices=list(the_biogeme.id_manager.free_betas.indices.values()),
+        bounds=the_biogeme.id_manager.bounds,
+        algorithm_name=the_biogeme.algorithm_name,
+        algo_parameters=the_biogeme.algo_parameters,
+        function_parameters=the_biogeme.function_parameters,
+        starting_values=np.asarray(starting_values),
+        base_seed=base_seed,
+    )
+
+
+def _weighted_loglike_signatures(the_biogeme: BIOGEME) -> list[bytes]:
+    """Signatures of the log likelihood of each observation, multiplied
+    by its weight.
+
+    :param the_biogeme: estimated model, involving a weight.
+    :type the_biogeme: biogeme.biogeme.BIOGEME
+
+    :return: signatures of the weighted log likelihood.
+    :rtype: list(bytes)
+    """
+    weighted_loglike = the_biogeme.weight * the_biogeme.log_like
+    weighted_loglike.set_id_manager(the_biogeme.id_manager)
+    return weighted_loglike.get_signature()
+
+
+_worker: BootstrapWorker | None = None
+"""C++ model owned by the current worker process."""
+
+
+def _initialize_worker(context: BootstrapContext) -> None:
+    """Builds the C++ model of a worker process, once for all the
+    replications that it performs."""
+    global _worker
+    logging.getLogger('biogeme').setLevel(logging.WARNING)
+    _worker = BootstrapWorker(context)
+
+
+def _run_replication(index: int) -> tuple[int, np.ndarray]:
+    """Performs one replication in a worker process."""
+    return index, _worker.replication(index)
+
+
+class BootstrapRunner:
+    """Performs the bootstrap replications of an estimated model."""
+
+    def __init__(
+        self,
+        the_biogeme: BIOGEME,
+        starting_values: np.ndarray,
+        file_name: str | None = None,
+    ):
+        """Constructor
+
+        :param the_biogeme: estimated model.
+        :type the_biogeme: biogeme.biogeme.BIOGEME
+
+        :param starting_values: starting point of each re-estimation,
+            typically the estimated parameters.
+        :type starting_values: numpy.array
+
+        :param file_name: name of the file where the completed
+            replications are saved. If None, they are not saved, and
+            the run cannot be resumed.
+        :type file_name: str
+        """
+        self.number_of_samples: int = the_biogeme.bootstrap_samples
+        self.number_of_processes: int = min(
+            the_biogeme.number_of_processes, max(1, self.number_of_samples)
+        )
+        self.file_name: str | None = file_name
+        self.beta_names: list[str] = the_biogeme.free_beta_names()
+        self.results: np.ndarray = np.full(
+            (self.number_of_samples, len(starting_values)), np.nan
+        )
+        """Results of the replications. Each row corresponds to a
+        replication, and each column to a free parameter."""
+
+        self.completed: set[int] = set()  #: Indices of the completed replications
+
+        base_seed = the_biogeme.seed_param
+        if base_seed == 0:
+            base_seed = np.random.SeedSequence().entropy
+        base_seed = self._load_completed(base_seed)
+        self.context = make_context(
+            the_biogeme, starting_values, self.number_of_processes, base_seed
+        )
+
+    def _load_completed(self, base_seed: int) -> int:
+        """Reads the replications saved by a previous, interrupted, run.
+
+        :param base_seed: seed to be used if no previous run is found.
+        :type base_seed: int
+
+        :return: seed of the run to be continued.
+        :rtype: int
+        """
+        if self.file_name is None or not os.path.exists(self.file_name):
+            return base_seed
+        with open(self.file_name, encoding='utf-8') as f:
+            header = f.readline().split('\t')
+            saved_seed = int(header[0])
+            saved_names = [name.strip() for name in header[1:]]
+            if saved_names != self.beta_names:
+                warning_msg = (
+                    f'File {self.file_name} does not correspond to the model. '
+                    f'It is ignored.'
+                )
+                logger.warning(warning_msg)
+                return base_seed
+            for line in f:
+                values = line.split('\t')
+                index = int(values[0])
+                if index < self.number_of_samples:
+                    self.results[index] = [float(v) for v in values[1:]]
+                    self.completed.add(index)
+        if self.completed:
+            logger.info(
+                f'{len(self.completed)} bootstrap replications read from '
+                f'{self.file_name}'
+            )
+        return saved_seed
+
+    def _record(self, index: int, values: np.ndarray) -> None:
+        """Stores the result of one replication, and saves it on file."""
+        self.results[index] = values
+        self.completed.add(index)
+        if self.file_name is not None:
+            with open(self.file_name, 'a', encoding='utf-8') as f:
+                print('\t'.join([str(index)] + [repr(v) for v in values]), file=f)
+
+    def run(self) -> np.ndarray:
+        """Performs the replications that have not been completed yet.
+
+        :return: numpy array of size B x K, where
+
+            - B is the number of bootstrap replications,
+            - K is the number of parameters to estimate.
+
+        :rtype: numpy.array
+        """
+        if self.file_name is not None and not os.path.exists(self.file_name):
+            with open(self.file_name, 'w', encoding='utf-8') as f:
+                print(
+                    '\t'.join([str(self.context.base_seed)] + self.beta_names),
+                    file=f,
+                )
+        remaining = [
+            index
+            for index in range(self.number_of_samples)
+            if index not in self.completed
+        ]
+        if self.number_of_processes <= 1:
+            current_logger_level = logging.getLogger('biogeme').level
+            logging.getLogger('biogeme').setLevel(logging.WARNING)
+            try:
+                worker = BootstrapWorker(self.context)
+                for index in tqdm.tqdm(remaining):
+                    self._record(index, worker.replication(index))
+                worker.reset_sample()
+            finally:
+                logging.getLogger('biogeme').setLevel(current_logger_level)
+        else:
+            # With "fork", the data is inherited by the workers instead
+            # of being pickled.
+            methods = mp.get_all_start_methods()
+            context = mp.get_context('fork' if 'fork' in methods else None)
+            with ProcessPoolExecutor(
+                max_workers=self.number_of_processes,
+                mp_context=context,
+                initializer=_initialize_worker,
+                initargs=(self.context,),
+            ) as executor:
+                futures = [
+                    executor.submit(_run_replication, index) for index in remaining
+                ]
+                for future in tqdm.tqdm(as_completed(futures), total=len(futures)):
+                    index, values = future.result()
+                    self._record(index, values)
+
+        if len(self.completed) != self.number_of_samples:
+            error_msg = (
+                f'Only {len(self.completed)} bootstrap replications out of '
+                f'{self.number_of_samples} have been performed.'
+            )
+            raise BiogemeError(error_msg)
+        if self.file_name is not None:
+            os.remove(self.file_name)
+        return self.results
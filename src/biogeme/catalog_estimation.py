@@ -0,0 +1,293 @@
+"""Estimation of the configurations of a model with Catalogs, possibly in
+parallel.
+
+:author: Michel Bierlaire
+:date: Sun Oct 18 14:25:09 2026
+
+The configurations are distributed among a pool of processes. The
+database is transferred once to each worker process, and is shared by
+all the configurations that it estimates, as well as the C++ model
+where the data has been transferred. The estimation results are
+saved on file as soon as they are available, so that an interrupted run
+can be resumed.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing as mp
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import NamedTuple, TYPE_CHECKING
+
+import tqdm
+
+import biogeme.results as res
+from biogeme.configuration import Configuration
+from biogeme.estimation_context import EstimationContext
+from biogeme.exceptions import BiogemeError
+
+if TYPE_CHECKING:
+    from biogeme.biogeme import BIOGEME
+    from biogeme.database import Database
+    from biogeme.expressions import Expression
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigurationToEstimate(NamedTuple):
+    """Identification of a configuration to be estimated."""
+
+    config_id: str
+    model_name: str
+
+
+class CatalogContext(NamedTuple):
+    """All the information needed to estimate a configuration in
+    another process."""
+
+    expression: Expression
+    database: Database
+    quick_estimate: bool
+    recycle: bool
+    run_bootstrap: bool
+    generate_html: bool
+    generate_pickle: bool
+    number_of_threads: int | None
+    """If not None, overrides the number of threads of each estimation."""
+
+
+def estimate_configuration(
+    context: CatalogContext,
+    configuration: ConfigurationToEstimate,
+    estimation_context: EstimationContext | None = None,
+) -> res.bioResults:
+    """Estimates one configuration of the multiple expression.
+
+    :param context: information shared by all configurations.
+    :type context: CatalogContext
+
+    :param configuration: configuration to estimate.
+    :type configuration: ConfigurationToEstimate
+
+    :param estimation_context: C++ model where the data has already
+        been transferred.
+    :type estimation_context: biogeme.estimation_context.EstimationContext
+
+    :return: estimation results.
+    :rtype: biogeme.results.bioResults
+    """
+    # Imported here to avoid a circular import.
+    from biogeme.biogeme import BIOGEME
+
+    # The configuration has been generated from the expression
+    # itself. Therefore, there is no need to verify its validity.
+    the_configuration = Configuration.from_string(configuration.config_id)
+    context.expression.configure_catalogs(the_configuration)
+    the_biogeme = BIOGEME(
+        database=context.database,
+        formulas=context.expression,
+        user_notes=the_configuration.get_html(),
+        estimation_context=estimation_context,
+    )
+    the_biogeme.modelName = configuration.model_name
+    the_biogeme.generate_html = context.generate_html
+    the_biogeme.generate_pickle = context.generate_pickle
+    if context.number_of_threads is not None:
+        the_biogeme.number_of_threads = context.number_of_threads
+        # The processes are already used by the catalog.
+        the_biogeme.number_of_processes = 1
+    if context.quick_estimate:
+        return the_biogeme.quick_estimate(recycle=context.recycle)
+    return the_biogeme.estimate(
+        recycle=context.recycle, run_bootstrap=context.run_bootstrap
+    )
+
+
+_context: CatalogContext | None = None
+"""Information shared by the configurations estimated by the current
+worker process."""
+
+_estimation_context: EstimationContext | None = None
+"""C++ model of the current worker process."""
+
+
+def _initialize_worker(context: CatalogContext) -> None:
+    """Stores the shared information in a worker process."""
+    global _context, _estimation_context
+    logging.getLogger('biogeme').setLevel(logging.WARNING)
+    _context = context
+    _estimation_context = EstimationContext(context.database)
+
+
+def _run_estimation(
+    configuration: ConfigurationToEstimate,
+) -> tuple[str, res.RawResults]:
+    """Estimates one configuration in a worker process. Only the raw
+    results are sent back to the main process."""
+    results = estimate_configuration(_context, configuration, _estimation_context)
+    return configuration.config_id, results.data
+
+
+class CatalogRunner:
+    """Estimates a list of configurations of a multiple expression."""
+
+    def __init__(
+        self,
+        the_biogeme: BIOGEME,
+        configurations: list[ConfigurationToEstimate],
+        quick_estimate: bool = False,
+        recycle: bool = False,
+        run_bootstrap: bool = False,
+        file_name: str | None = None,
+    ):
+        """Constructor
+
+        :param the_biogeme: Biogeme object containing the multiple
+            expression and the database.
+        :type the_biogeme: biogeme.biogeme.BIOGEME
+
+        :param configurations: configurations to estimate.
+        :type configurations: list(ConfigurationToEstimate)
+
+        :param quick_estimate: if True, the final statistics are not calculated.
+        :type quick_estimate: bool
+
+        :param recycle: if True, the results are read from the pickle
+            file, if it exists. If False, the estimation is performed.
+        :type recycle: bool
+
+        :param run_bootstrap: if True, bootstrapping is applied.
+        :type run_bootstrap: bool
+
+        :param file_name: name of the file where the results of the
+            completed configurations are saved. If None, they are not
+            saved, and the run cannot be resumed.
+        :type file_name: str
+        """
+        self.configurations: list[ConfigurationToEstimate] = configurations
+        self.number_of_processes: int = min(
+            the_biogeme.number_of_processes, max(1, len(configurations))
+        )
+        self.file_name: str | None = file_name
+        self.estimation_context: EstimationContext = the_biogeme.estimation_context
+        self.identification_threshold: float = the_biogeme.identification_threshold
+        self.results: dict[str, res.bioResults] = {}
+        """Results of the completed configurations."""
+
+        if the_biogeme.database.is_panel():
+            # Built once here, and inherited by all the estimations.
+            the_biogeme.database.build_panel_map()
+
+        self.context = CatalogContext(
+            expression=the_biogeme.log_like,
+            database=the_biogeme.database,
+            quick_estimate=quick_estimate,
+            recycle=recycle,
+            run_bootstrap=run_bootstrap,
+            generate_html=the_biogeme.generate_html,
+            generate_pickle=the_biogeme.generate_pickle,
+            number_of_threads=(
+                None
+                if self.number_of_processes <= 1
+                else max(1, the_biogeme.number_of_threads // self.number_of_processes)
+            ),
+        )
+        self._load_completed()
+
+    def _load_completed(self) -> None:
+        """Reads the results saved by a previous, interrupted, run."""
+        if self.file_name is None or not os.path.exists(self.file_name):
+            return
+        requested = {
+            configuration.config_id for configuration in self.configurations
+        }
+        with open(self.file_name, 'rb') as f:
+            while True:
+                try:
+                    config_id, raw_results = pickle.load(f)
+                except EOFError:
+                    break
+                except pickle.UnpicklingError:
+                    # The last record may have been truncated by the
+                    # interruption.
+                    logger.warning(f'Incomplete record in {self.file_name}')
+                    break
+                if config_id in requested:
+                    self.results[config_id] = res.bioResults(
+                        raw_results,
+                        identification_threshold=self.identification_threshold,
+                    )
+        if self.results:
+            logger.info(
+                f'Results of {len(self.results)} configurations read from '
+                f'{self.file_name}'
+            )
+
+    def _record(self, config_id: str, results: res.bioResults) -> None:
+        """Stores the results of one configuration, and saves them on file."""
+        self.results[config_id] = results
+        if self.file_name is not None:
+            with open(self.file_name, 'ab') as f:
+                pickle.dump((config_id, results.data), f)
+
+    def run(self) -> dict[str, res.bioResults]:
+        """Estimates the configurations that have not been completed yet.
+
+        :return: estimation results of each configuration, in the order
+            of the list of configurations.
+        :rtype: dict(str: biogeme.results.bioResults)
+        """
+        remaining = [
+            configuration
+            for configuration in self.configurations
+            if configuration.config_id not in self.results
+        ]
+        if self.number_of_processes <= 1:
+            for configuration in remaining:
+                self._record(
+                    configuration.config_id,
+                    estimate_configuration(
+                        self.context, configuration, self.estimation_context
+                    ),
+                )
+        else:
+            # With "fork", the database is inherited by the workers
+            # instead of being pickled.
+            methods = mp.get_all_start_methods()
+            context = mp.get_context('fork' if 'fork' in methods else None)
+            with ProcessPoolExecutor(
+                max_workers=self.number_of_processes,
+                mp_context=context,
+                initializer=_initialize_worker,
+                initargs=(self.context,),
+            ) as executor:
+                futures = [
+                    executor.submit(_run_estimation, configuration)
+                    for configuration in remaining
+                ]
+                for future in tqdm.tqdm(as_completed(futures), total=len(futures)):
+                    config_id, raw_results = future.result()
+                    self._record(
+                        config_id,
+                        res.bioResults(
+                            raw_results,
+                            identification_threshold=self.identification_threshold,
+                        ),
+                    )
+
+        missing = [
+            configuration.config_id
+            for configuration in self.configurations
+            if configuration.config_id not in self.results
+        ]
+        if missing:
+            error_msg = f'The following configurations have not been estimated: {missing}'
+            raise BiogemeError(error_msg)
+        if self.file_name is not None:
+            os.remove(self.file_name)
+        return {
+            configuration.config_id: self.results[configuration.config_id]
+            for configuration in self.configurations
+        }
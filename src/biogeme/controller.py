@@ -115,6 +115,12 @@ class Controller:
             )
             raise BiogemeError(error_msg)
 
+        if index != self.current_index:
+            # The expressions containing the controlled catalogs are
+            # modified.
+            from biogeme.expressions.base_expressions import invalidate_metadata
+
+            invalidate_metadata()
         self.current_index = index
         for catalog in self.controlled_catalogs:
             catalog.current_index = index
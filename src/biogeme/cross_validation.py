@@ -0,0 +1,292 @@
+"""Out-of-sample validation of a model, possibly in parallel.
+
+:author: Michel Bierlaire
+:date: Mon Oct 19 15:02:44 2026
+
+Each fold is defined by an estimation set and a validation set. The
+model is re-estimated on the estimation set, starting from the
+estimates obtained on the full sample, and the log likelihood of each
+observation of the validation set is calculated with the re-estimated
+parameters. No report is generated for the re-estimations.
+
+As for the bootstrap, the data is transferred once to the C++ model of
+each process, and never copied. The map of the individuals, or of the
+observations for cross-sectional data, is restricted to the estimation
+set.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import NamedTuple, TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+import tqdm
+
+from biogeme.bootstrap import BootstrapContext, BootstrapWorker, make_context
+from biogeme.database import EstimationValidationIndices
+from biogeme.exceptions import BiogemeError
+
+if TYPE_CHECKING:
+    from biogeme.biogeme import BIOGEME
+    from biogeme.database import Database, EstimationValidation
+
+logger = logging.getLogger(__name__)
+
+LOGLIKELIHOOD = 'Loglikelihood'
+"""Name of the column containing the out-of-sample log likelihood."""
+
+
+class Fold(NamedTuple):
+    """Positions of the observations, or of the individuals for panel
+    data, of the estimation and the validation sets of one fold."""
+
+    estimation: np.ndarray
+    validation: np.ndarray
+
+
+class ValidationWorker(BootstrapWorker):
+    """Owns a C++ model and re-estimates it on the folds."""
+
+    def __init__(self, context: BootstrapContext, folds: list[Fold]):
+        """Constructor
+
+        :param context: description of the model and the data.
+        :type context: biogeme.bootstrap.BootstrapContext
+
+        :param folds: definition of the folds.
+        :type folds: list(Fold)
+        """
+        super().__init__(context)
+        self.folds = folds
+
+    def fold(self, index: int) -> np.ndarray:
+        """Re-estimates the model on the estimation set of a fold, and
+        calculates the log likelihood of the validation set.
+
+        :param index: index of the fold.
+        :type index: int
+
+        :return: log likelihood of each observation, or of each
+            individual for panel data, of the validation set.
+        :rtype: numpy.array
+        """
+        the_fold = self.folds[index]
+        individual_map = self.context.individual_map
+        self.theC.setDataMap(individual_map.iloc[the_fold.estimation])
+        betas = self.estimate()
+        self.reset_sample()
+        loglikelihood = self.theC.simulateSeveralFormulas(
+            [self.context.loglike_signatures],
+            betas,
+            self.context.fixed_betas_values,
+            self.context.data,
+            self.context.number_of_threads,
+            len(individual_map),
+        )
+        return np.asarray(loglikelihood[0])[the_fold.validation]
+
+
+_worker: ValidationWorker | None = None
+"""C++ model owned by the current worker process."""
+
+
+def _initialize_worker(context: BootstrapContext, folds: list[Fold]) -> None:
+    """Builds the C++ model of a worker process, once for all the folds
+    that it estimates."""
+    global _worker
+    logging.getLogger('biogeme').setLevel(logging.WARNING)
+    _worker = ValidationWorker(context, folds)
+
+
+def _run_fold(index: int) -> tuple[int, np.ndarray]:
+    """Estimates one fold in a worker process."""
+    return index, _worker.fold(index)
+
+
+class CrossValidationRunner:
+    """Performs the out-of-sample validation of an estimated model."""
+
+    def __init__(
+        self,
+        the_biogeme: BIOGEME,
+        starting_values: np.ndarray,
+        validation_data: list[EstimationValidation | EstimationValidationIndices],
+    ):
+        """Constructor
+
+        :param the_biogeme: estimated model. The estimation and
+            validation sets must be extracted from its database.
+        :type the_biogeme: biogeme.biogeme.BIOGEME
+
+        :param starting_values: starting point of each re-estimation,
+            typically the parameters estimated on the full sample.
+        :type starting_values: numpy.array
+
+        :param validation_data: estimation and validation sets of each
+            fold, as generated by :meth:`biogeme.database.Database.split`,
+            or the positions of their rows, as generated by
+            :meth:`biogeme.database.Database.split_indices`. The latter
+            avoids copying the data.
+        :type validation_data: list(biogeme.database.EstimationValidation or
+            biogeme.database.EstimationValidationIndices)
+
+        :raise BiogemeError: if a set contains observations that are not
+            in the database, or positions that are out of range, or if,
+            for panel data, an individual belongs to both sets of a fold.
+        """
+        database = the_biogeme.database
+        self.panel: bool = database.is_panel()
+        self.index: pd.Index = (
+            database.individualMap.index if self.panel else database.data.index
+        )
+        """Labels of the observations, or of the individuals."""
+        self.folds: list[Fold] = [
+            self._fold(database, sets) for sets in validation_data
+        ]
+        self.number_of_processes: int = min(
+            the_biogeme.number_of_processes, max(1, len(self.folds))
+        )
+        self.context = make_context(
+            the_biogeme, starting_values, self.number_of_processes
+        )
+
+    def _positions(self, labels: pd.Index) -> np.ndarray:
+        """Positions of observations, or individuals, in the database.
+
+        :param labels: labels of the observations, or of the individuals.
+        :type labels: pandas.Index
+
+        :return: positions.
+        :rtype: numpy.array
+
+        :raise BiogemeError: if a label is not in the database.
+        """
+        positions = self.index.get_indexer(labels)
+        if (positions < 0).any():
+            error_msg = (
+                'The estimation and validation sets must be extracted from '
+                'the database of the model.'
+            )
+            raise BiogemeError(error_msg)
+        return positions
+
+    @staticmethod
+    def _rows(database: Database, positions: np.ndarray) -> np.ndarray:
+        """Verifies the positions of rows of the database.
+
+        :param database: database of the model.
+        :type database: biogeme.database.Database
+
+        :param positions: positions of rows.
+        :type positions: numpy.array
+
+        :return: the positions, as an array of integers.
+        :rtype: numpy.array
+
+        :raise BiogemeError: if a position is out of range.
+        """
+        positions = np.asarray(positions, dtype=int)
+        number_of_rows = len(database.data)
+        if ((positions < 0) | (positions >= number_of_rows)).any():
+            error_msg = (
+                f'The positions of the rows of the estimation and validation '
+                f'sets must be between 0 and {number_of_rows - 1}.'
+            )
+            raise BiogemeError(error_msg)
+        return positions
+
+    def _fold(
+        self,
+        database: Database,
+        sets: EstimationValidation | EstimationValidationIndices,
+    ) -> Fold:
+        """Positions of the estimation and validation sets of one fold.
+
+        :param database: database of the model.
+        :type database: biogeme.database.Database
+
+        :param sets: estimation and validation sets, or the positions of
+            their rows.
+        :type sets: biogeme.database.EstimationValidation or
+            biogeme.database.EstimationValidationIndices
+
+        :return: the fold.
+        :rtype: Fold
+
+        :raise BiogemeError: if, for panel data, an individual belongs
+            to both sets.
+        """
+        if isinstance(sets, EstimationValidationIndices):
+            estimation_rows = self._rows(database, sets.estimation)
+            validation_rows = self._rows(database, sets.validation)
+            if not self.panel:
+                return Fold(estimation=estimation_rows, validation=validation_rows)
+            panel_ids = database.data[database.panelColumn].to_numpy()
+            estimation_ids = pd.Index(pd.unique(panel_ids[estimation_rows]))
+            validation_ids = pd.Index(pd.unique(panel_ids[validation_rows]))
+        elif not self.panel:
+            return Fold(
+                estimation=self._positions(sets.estimation.index),
+                validation=self._positions(sets.validation.index),
+            )
+        else:
+            estimation_ids = pd.Index(sets.estimation[database.panelColumn].unique())
+            validation_ids = pd.Index(sets.validation[database.panelColumn].unique())
+        common = estimation_ids.intersection(validation_ids)
+        if not common.empty:
+            error_msg = (
+                f'For panel data, the observations of each individual must '
+                f'belong to the same set. Individuals {list(common)} belong '
+                f'to both the estimation and the validation sets.'
+            )
+            raise BiogemeError(error_msg)
+        return Fold(
+            estimation=self._positions(estimation_ids),
+            validation=self._positions(validation_ids),
+        )
+
+    def run(self) -> list[pd.DataFrame]:
+        """Estimates the folds.
+
+        :return: for each fold, the log likelihood of each observation,
+            or of each individual for panel data, of the validation set.
+        :rtype: list(pandas.DataFrame)
+        """
+        results: list[np.ndarray | None] = [None] * len(self.folds)
+        if self.number_of_processes <= 1:
+            current_logger_level = logging.getLogger('biogeme').level
+            logging.getLogger('biogeme').setLevel(logging.WARNING)
+            try:
+                worker = ValidationWorker(self.context, self.folds)
+                for index in tqdm.tqdm(range(len(self.folds))):
+                    results[index] = worker.fold(index)
+            finally:
+                logging.getLogger('biogeme').setLevel(current_logger_level)
+        else:
+            # With "fork", the data is inherited by the workers instead
+            # of being pickled.
+            methods = mp.get_all_start_methods()
+            context = mp.get_context('fork' if 'fork' in methods else None)
+            with ProcessPoolExecutor(
+                max_workers=self.number_of_processes,
+                mp_context=context,
+                initializer=_initialize_worker,
+                initargs=(self.context, self.folds),
+            ) as executor:
+                futures = [
+                    executor.submit(_run_fold, index)
+                    for index in range(len(self.folds))
+                ]
+                for future in tqdm.tqdm(as_completed(futures), total=len(futures)):
+                    index, values = future.result()
+                    results[index] = values
+        return [
+            pd.DataFrame(
+                {LOGLIKELIHOOD: values}, index=self.index[the_fold.validation]
+            )
+            for the_fold, values in zip(self.folds, results)
+        ]
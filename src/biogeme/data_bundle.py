@@ -0,0 +1,172 @@
+"""Storage of data frames in a binary columnar format
+
+:author: Michel Bierlaire
+:date: Mon Oct 19 17:48:21 2026
+
+A data frame is stored in a directory. The columns of the same type
+are stored together in a .npy file, in column-major order, so that
+each column is contiguous in the file. A manifest, in JSON format,
+describes the columns. Contrarily to a CSV file, no text has to be
+parsed to read the data, and the types of the columns are
+preserved. The files are mapped in memory when the data is read, so
+that only the columns actually used are loaded from the disk.
+
+Parquet files would serve the same purpose, but require the package
+pyarrow, which is not installed with Biogeme.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from biogeme.exceptions import BiogemeError
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = 'manifest.json'
+"""Name of the file describing the content of the directory."""
+
+INDEX_FILE = 'index.npy'
+"""Name of the file containing the index of the data frame, if it is
+not the default one."""
+
+
+def _remove_bundle(directory: str) -> None:
+    """Removes the files of a bundle previously stored in a directory.
+    Other files are left untouched.
+
+    :param directory: name of the directory.
+    :type directory: str
+    """
+    manifest_file = os.path.join(directory, MANIFEST)
+    if not os.path.exists(manifest_file):
+        return
+    with open(manifest_file, encoding='utf-8') as f:
+        manifest = json.load(f)
+    os.remove(manifest_file)
+    file_names = {column['file'] for column in manifest['columns']}
+    if manifest['index'] is not None:
+        file_names.add(INDEX_FILE)
+    for file_name in file_names:
+        full_name = os.path.join(directory, file_name)
+        if os.path.exists(full_name):
+            os.remove(full_name)
+
+
+def save_bundle(data: pd.DataFrame, directory: str, key: str | None = None) -> None:
+    """Stores a data frame in a directory, in binary format. A bundle
+    previously stored in the directory is replaced.
+
+    :param data: data frame to store. The names of the columns must be
+        strings, and the columns must be numeric or boolean.
+    :type data: pandas.DataFrame
+
+    :param directory: name of the directory. It is created if needed.
+    :type directory: str
+
+    :param key: identification of the data, verified when it is read.
+    :type key: str
+
+    :raise BiogemeError: if the name of a column is not a string, or if
+        a column is neither numeric nor boolean.
+    """
+    for column, dtype in data.dtypes.items():
+        if not isinstance(column, str):
+            error_msg = f'The name of column {column} is not a string.'
+            raise BiogemeError(error_msg)
+        # Boolean, integer and floating point numpy types.
+        if not isinstance(dtype, np.dtype) or dtype.kind not in 'biuf':
+            error_msg = f'Column {column} of type {dtype} cannot be stored.'
+            raise BiogemeError(error_msg)
+
+    os.makedirs(directory, exist_ok=True)
+    _remove_bundle(directory)
+
+    dtypes = list(dict.fromkeys(str(dtype) for dtype in data.dtypes))
+    columns = []
+    for block, dtype in enumerate(dtypes):
+        names = [
+            column for column, the_type in data.dtypes.items() if str(the_type) == dtype
+        ]
+        file_name = f'block_{block}.npy'
+        np.save(
+            os.path.join(directory, file_name),
+            np.asfortranarray(data[names].to_numpy(dtype=dtype)),
+        )
+        columns += [
+            {'name': name, 'file': file_name, 'position': position}
+            for position, name in enumerate(names)
+        ]
+    # The order of the columns of the data frame is restored when read.
+    order = {name: position for position, name in enumerate(data.columns)}
+    columns.sort(key=lambda column: order[column['name']])
+
+    index = None
+    if not data.index.equals(pd.RangeIndex(len(data))):
+        np.save(os.path.join(directory, INDEX_FILE), data.index.to_numpy())
+        index = {'name': data.index.name}
+
+    manifest = {
+        'key': key,
+        'number_of_rows': len(data),
+        'columns': columns,
+        'index': index,
+    }
+    # The manifest is written last, so that an interrupted writing is
+    # never mistaken for a complete bundle.
+    with open(os.path.join(directory, MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+
+
+def load_bundle(directory: str, key: str | None = None) -> pd.DataFrame | None:
+    """Reads a data frame stored by :func:`save_bundle`. The files are
+    mapped in memory in copy-on-write mode: the data frame can be
+    modified, but the modifications are not written in the files.
+
+    :param directory: name of the directory.
+    :type directory: str
+
+    :param key: expected identification of the data.
+    :type key: str
+
+    :return: the data frame, or None if the directory does not contain
+        a bundle, or if it contains a bundle with another key.
+    :rtype: pandas.DataFrame
+    """
+    manifest_file = os.path.join(directory, MANIFEST)
+    if not os.path.exists(manifest_file):
+        return None
+    with open(manifest_file, encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest['key'] != key:
+        logger.info(f'The data in {directory} has been generated in another context.')
+        return None
+
+    # The memory maps are viewed as plain numpy arrays.
+    blocks = {
+        file_name: np.asarray(
+            np.load(os.path.join(directory, file_name), mmap_mode='c')
+        )
+        for file_name in {column['file'] for column in manifest['columns']}
+    }
+    if manifest['index'] is None:
+        index = pd.RangeIndex(manifest['number_of_rows'])
+    else:
+        index = pd.Index(
+            np.load(os.path.join(directory, INDEX_FILE)),
+            name=manifest['index']['name'],
+        )
+    # The columns are views of the mapped files.
+    return pd.DataFrame(
+        {
+            column['name']: blocks[column['file']][:, column['position']]
+            for column in manifest['columns']
+        },
+        index=index,
+        copy=False,
+    )
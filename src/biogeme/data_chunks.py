@@ -0,0 +1,152 @@
+"""Reading and writing data by chunks of rows
+
+:author: Michel Bierlaire
+:date: Mon Oct 19 10:14:52 2026
+
+Large data files are processed chunk by chunk, so that the memory
+needed does not depend on the size of the file. CSV files are handled
+by pandas. Parquet files require the package pyarrow, which is not
+installed with Biogeme.
+"""
+
+from __future__ import annotations
+
+import os
+from types import ModuleType
+from typing import Iterator
+
+import pandas as pd
+
+from biogeme.exceptions import BiogemeError
+
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+
+
+def is_parquet(file_name: str) -> bool:
+    """Checks if a file is in Parquet format, based on its extension.
+
+    :param file_name: name of the file.
+    :type file_name: str
+
+    :return: True if the file is a Parquet file.
+    :rtype: bool
+    """
+    return os.path.splitext(file_name)[1].lower() in PARQUET_EXTENSIONS
+
+
+def _parquet_module() -> ModuleType:
+    """Imports the module of pyarrow handling Parquet files.
+
+    :return: the module pyarrow.parquet
+
+    :raise BiogemeError: if pyarrow is not installed.
+    """
+    try:
+        import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+    except ImportError as e:
+        error_msg = 'The package pyarrow is required to process Parquet files.'
+        raise BiogemeError(error_msg) from e
+    return pyarrow.parquet
+
+
+def read_chunks(
+    file_name: str, chunk_size: int, separator: str = ','
+) -> Iterator[pd.DataFrame]:
+    """Reads a data file by chunks of rows.
+
+    :param file_name: name of the file. If its extension is .parquet or
+        .pq, it is read as a Parquet file. Otherwise, it is read as a
+        CSV file.
+    :type file_name: str
+
+    :param chunk_size: number of rows of each chunk.
+    :type chunk_size: int
+
+    :param separator: separator of the columns of a CSV file.
+    :type separator: str
+
+    :return: iterator on the chunks. The index of the rows is their
+        position in the file.
+    :rtype: iterator(pandas.DataFrame)
+
+    :raise BiogemeError: if the file does not exist.
+    """
+    if not os.path.exists(file_name):
+        error_msg = f'File {file_name} does not exist.'
+        raise BiogemeError(error_msg)
+    if not is_parquet(file_name):
+        with pd.read_csv(file_name, sep=separator, chunksize=chunk_size) as reader:
+            yield from reader
+        return
+    parquet_file = _parquet_module().ParquetFile(file_name)
+    first_row = 0
+    for batch in parquet_file.iter_batches(batch_size=chunk_size):
+        chunk = batch.to_pandas()
+        chunk.index = pd.RangeIndex(first_row, first_row + len(chunk))
+        first_row += len(chunk)
+        yield chunk
+
+
+class ChunkWriter:
+    """Writes a data frame in a file, chunk by chunk. It is used as a
+    context manager::
+
+        with ChunkWriter('results.csv') as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+
+    """
+
+    def __init__(self, file_name: str, separator: str = ','):
+        """Constructor
+
+        :param file_name: name of the file. If its extension is
+            .parquet or .pq, a Parquet file is written. Otherwise, a CSV
+            file is written. If the file exists, it is overwritten.
+        :type file_name: str
+
+        :param separator: separator of the columns of a CSV file.
+        :type separator: str
+        """
+        self.file_name = file_name
+        self.separator = separator
+        self.number_of_rows = 0  #: Number of rows written so far.
+        self._parquet_writer = None
+        self._parquet = _parquet_module() if is_parquet(file_name) else None
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        """Appends a chunk to the file. The index is written as well.
+
+        :param chunk: rows to write. All chunks must have the same columns.
+        :type chunk: pandas.DataFrame
+        """
+        if self._parquet is None:
+            chunk.to_csv(
+                self.file_name,
+                sep=self.separator,
+                mode='w' if self.number_of_rows == 0 else 'a',
+                header=self.number_of_rows == 0,
+            )
+        else:
+            # pylint: disable=import-outside-toplevel
+            import pyarrow
+
+            table = pyarrow.Table.from_pandas(chunk, preserve_index=True)
+            if self._parquet_writer is None:
+                self._parquet_writer = self._parquet.ParquetWriter(
+                    self.file_name, table.schema
+                )
+            self._parquet_writer.write_table(table)
+        self.number_of_rows += len(chunk)
+
+    def close(self) -> None:
+        """Completes the file."""
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+    def __enter__(self) -> ChunkWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
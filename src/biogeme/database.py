@@ -9,7 +9,11 @@ for specific services to Biogeme
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import os
+import tempfile
+from functools import partial
 from typing import NamedTuple, TYPE_CHECKING
 
 import numpy as np
@@ -24,11 +28,15 @@ from biogeme.expressions import (
     Expression,
     validate_and_convert,
 )
+from biogeme.expressions.calculator import calculate_several_functions
 from biogeme.native_draws import (
     RandomNumberGeneratorTuple,
+    ChunkGenerator,
+    JointGenerator,
     RandomNumberGenerator,
     native_random_number_generators,
 )
+from biogeme.random_streams import DRAWS, SPLIT, get_generator, name_key
 from biogeme.segmentation import DiscreteSegmentationTuple
 
 if TYPE_CHECKING:
@@ -40,6 +48,13 @@ class EstimationValidation(NamedTuple):
     validation: pd.DataFrame
 
 
+class EstimationValidationIndices(NamedTuple):
+    """Positions of the rows of the estimation and the validation sets."""
+
+    estimation: np.ndarray
+    validation: np.ndarray
+
+
 logger = logging.getLogger(__name__)
 """Logger that controls the output of
         messages to the screen and log file.
@@ -108,6 +123,23 @@ class Database:
         approximate the log likelihood function.
         """
 
+        self.individual_starts: np.ndarray | None = None
+        """index of the first observation of each individual in a panel
+        data context. None if data is not panel, or if the panel map has
+        not been built yet.
+        """
+
+        self.individual_ends: np.ndarray | None = None
+        """index of the last observation of each individual in a panel
+        data context. None if data is not panel, or if the panel map has
+        not been built yet.
+        """
+
+        self._panel_map_source: pd.DataFrame | None = None
+        """data frame for which the panel map has been built. The map is
+        rebuilt only if the data has been modified or replaced since.
+        """
+
         self.userRandomNumberGenerators: dict[str, RandomNumberGeneratorTuple] = {}
         """Dictionary containing user defined random number
         generators. Defined by the function
@@ -126,6 +158,40 @@ class Database:
 
         self.theDraws = None  #: Draws for Monte-Carlo integration
 
+        self.seed: int = 0
+        """Seed used to generate the draws and to split the data. If 0,
+        they are not reproducible. Otherwise, the pseudo-random draws of
+        each variable are generated by a stream that depends only on the
+        seed and on the name of the variable. It is set by the BIOGEME
+        object using the database.
+        """
+
+        self.draws_directory: str | None = None
+        """If not None, the draws are stored in a memory-mapped file in
+        this directory, instead of being kept in memory. The draws
+        generated with a seed are read from the file by the next runs.
+        """
+
+        self.draws_dtype: type = np.float64
+        """Type of the floating point numbers storing the draws. Using
+        numpy.float32 halves the size of the table.
+        """
+
+        self._draws_key: tuple | None = None
+        """Identification of the draws currently stored in theDraws.
+        They are generated again only if the key changes.
+        """
+
+        self.generated_draws: bool = False
+        """If True, and if all the types of draws can be generated for
+        any range of individuals, the draws are not stored. They are
+        generated when needed by
+        :meth:`~biogeme.database.Database.draws_of_individuals`.
+        """
+
+        self._chunk_generators: list[ChunkGenerator] | None = None
+        """Generators of the draws, if they are not stored."""
+
         self._avail = None  #: Availability expression to check
 
         self._choice = None  #: Choice expression to check
@@ -379,7 +445,9 @@ class Database:
     ):
         pass
 
-    def sample_with_replacement(self, size: int | None = None) -> pd.DataFrame:
+    def sample_with_replacement(
+        self, size: int | None = None, generator: np.random.Generator | None = None
+    ) -> pd.DataFrame:
         """Extract a random sample from the database, with replacement.
 
         Useful for bootstrapping.
@@ -389,13 +457,21 @@ class Database:
                Default: None.
         :type size: int
 
+        :param generator: generator of the pseudo-random numbers. If
+            None, the global numpy generator is used.
+        :type generator: numpy.random.Generator
+
         :return: pandas dataframe with the sample.
         :rtype: pandas.DataFrame
 
         """
         if size is None:
             size = len(self.data)
-        sample = self.data.iloc[np.random.randint(0, len(self.data), size=size)]
+        if generator is None:
+            indices = np.random.randint(0, len(self.data), size=size)
+        else:
+            indices = generator.integers(0, len(self.data), size=size)
+        sample = self.data.iloc[indices]
         return sample
 
     @deprecated
@@ -403,7 +479,7 @@ class Database:
         pass
 
     def sample_individual_map_with_replacement(
-        self, size: int | None = None
+        self, size: int | None = None, generator: np.random.Generator | None = None
     ) -> pd.DataFrame:
         """Extract a random sample of the individual map
         from a panel data database, with replacement.
@@ -415,6 +491,10 @@ class Database:
                    Default: None.
         :type size: int
 
+        :param generator: generator of the pseudo-random numbers. If
+            None, the global numpy generator is used.
+        :type generator: numpy.random.Generator
+
         :return: pandas dataframe with the sample.
         :rtype: pandas.DataFrame
 
@@ -429,9 +509,11 @@ class Database:
 
         if size is None:
             size = len(self.individualMap)
-        sample = self.individualMap.iloc[
-            np.random.randint(0, len(self.individualMap), size=size)
-        ]
+        if generator is None:
+            indices = np.random.randint(0, len(self.individualMap), size=size)
+        else:
+            indices = generator.integers(0, len(self.individualMap), size=size)
+        sample = self.individualMap.iloc[indices]
         return sample
 
     @deprecated
@@ -556,17 +638,79 @@ class Database:
         )
         self.data[column] = new_column
         self.variables[column] = Variable(column)
+        if column == self.panelColumn:
+            self._invalidate_panel_map()
         return self.data[column]
 
     @deprecated
     def addColumn(self, expression: Expression, column: str) -> pd.Series:
         pass
 
+    def add_columns(self, expressions: dict[str, Expression]) -> pd.DataFrame:
+        """Add several new columns in the database, calculated from
+        expressions. The expressions are calculated together, with one
+        pass over the data shared by all available threads, and the
+        columns are inserted at once.
+
+        :param expressions: expressions to evaluate, indexed by the
+            names of the columns to add.
+        :type expressions: dict(str: biogeme.expressions.Expression)
+
+        :return: the added columns
+        :rtype: pandas.DataFrame
+
+        :raises ValueError: if a column name already exists.
+        :raise BiogemeError: if the database is empty.
+
+        """
+        if len(self.data.index) == 0:
+            error_msg = 'Database has no entry'
+            raise BiogemeError(error_msg)
+
+        existing = [column for column in expressions if column in self.data.columns]
+        if existing:
+            raise ValueError(
+                f'Columns {existing} already exist in the database {self.name}'
+            )
+        if not expressions:
+            return pd.DataFrame(index=self.data.index)
+
+        values = calculate_several_functions(
+            list(expressions.values()),
+            self,
+            number_of_threads=os.cpu_count() or 1,
+        )
+        new_columns = pd.DataFrame(
+            dict(zip(expressions.keys(), values)), index=self.data.index
+        )
+        self.data = pd.concat([self.data, new_columns], axis='columns')
+        for column in expressions:
+            self.variables[column] = Variable(column)
+        if self.panelColumn in expressions:
+            self._invalidate_panel_map()
+        return new_columns
+
     def define_variable(self, name: str, expression: Expression) -> Variable:
         """Insert a new column in the database and define it as a variable."""
         self.add_column(expression, name)
         return Variable(name)
 
+    def define_variables(
+        self, expressions: dict[str, Expression]
+    ) -> dict[str, Variable]:
+        """Insert several new columns in the database, calculated
+        together, and define them as variables.
+
+        :param expressions: expressions to evaluate, indexed by the
+            names of the new variables.
+        :type expressions: dict(str: biogeme.expressions.Expression)
+
+        :return: the new variables, indexed by their names.
+        :rtype: dict(str: biogeme.expressions.Variable)
+        """
+        self.add_columns(expressions)
+        return {name: Variable(name) for name in expressions}
+
     @deprecated
     def DefineVariable(self, name: str, expression: Expression) -> Variable:
         pass
@@ -585,6 +729,7 @@ class Database:
         self.excludedData = len(self.data[self.data[column_name] != 0].index)
         self.data.drop(self.data[self.data[column_name] != 0].index, inplace=True)
         self.data.drop(columns=[column_name], inplace=True)
+        self._invalidate_panel_map()
 
     def check_segmentation(
         self, segmentation_tuple: DiscreteSegmentationTuple
@@ -680,6 +825,8 @@ class Database:
                 raise ValueError(error_msg)
 
         self.userRandomNumberGenerators = rng
+        # The cached draws may have been generated by a replaced generator.
+        self._draws_key = None
 
     @deprecated
     def setRandomNumberGenerators(
@@ -692,9 +839,23 @@ class Database:
         draw_types: dict[str, str],
         names: list[str],
         number_of_draws: int,
-    ) -> np.ndarray:
-        """Generate draws for each variable.
-
+    ) -> np.ndarray | None:
+        """Generate draws for each variable. If draws with the same types,
+        the same dimensions and the same seed have already been generated,
+        they are reused.
+
+        If the seed is not 0, the draws of each native type are
+        generated by a stream of pseudo-random numbers that depends
+        only on the seed and on the name of the variable. Therefore,
+        the draws of a variable do not depend on the other variables.
+
+        If :attr:`generated_draws` is True, and all the types can be
+        generated for any range of individuals, such as the Halton
+        draws and the Modified Latin Hypercube draws, the draws are not
+        generated here. They are generated by chunks of individuals
+        when they are needed. In that case, the Modified Latin
+        Hypercube draws of each individual are stratified over its own
+        draws, and not over the whole sample.
 
         :param draw_types: A dict indexed by the names of the variables,
                       describing the draws. Each of them can
@@ -739,7 +900,24 @@ class Database:
                       - ``'NORMAL_MLHS'``: Normal draws from Modified
                         Latin Hypercube Sampling,
                       - ``'NORMAL_MLHS_ANTI'``: Antithetic normal draws
-                        from Modified Latin Hypercube Sampling]
+                        from Modified Latin Hypercube Sampling,
+                      - ``'UNIFORM_SOBOL'``, ``'UNIFORMSYM_SOBOL'``,
+                        ``'NORMAL_SOBOL'``: draws on [0, 1], on [-1, 1]
+                        and normal draws from the Sobol sequence,
+                      - ``'UNIFORM_SOBOL_OWEN'``,
+                        ``'UNIFORMSYM_SOBOL_OWEN'``,
+                        ``'NORMAL_SOBOL_OWEN'``: same, from the
+                        scrambled Sobol sequence,
+                      - ``'UNIFORM_HALTON_RANDOMIZED'``,
+                        ``'UNIFORMSYM_HALTON_RANDOMIZED'``,
+                        ``'NORMAL_HALTON_RANDOMIZED'``: same, from
+                        Halton sequences with permuted digits and a
+                        random shift, with one prime base per variable.]
+
+                      The variables using the Sobol types, the
+                      scrambled Sobol types, or the randomized Halton
+                      types, are generated jointly: each of them is one
+                      dimension of the same sequence.
 
                       For an updated description of the native types, call the function
                       :func:`~biogeme.database.Database.descriptionOfNativeDraws`.
@@ -761,6 +939,8 @@ class Database:
               2. number of draws
               3. number of variables
 
+            None if the draws are generated when needed.
+
         :rtype: numpy.array
 
         Example::
@@ -779,13 +959,9 @@ class Database:
 
         """
         self.number_of_draws: int = number_of_draws
-        # Dimensions of the draw table:
-        # 1. number of variables
-        # 2. number of individuals
-        # 3. number of draws
-        list_of_draws = [None] * len(names)
-        for i, v in enumerate(names):
-            name = v
+        sample_size = self.get_sample_size()
+        generators = []
+        for name in names:
             draw_type: str = draw_types[name]
             self.typesOfDraws[name] = draw_type
             the_generator: RandomNumberGeneratorTuple | None = (
@@ -804,27 +980,245 @@ class Database:
                         f'User defined: {user}'
                     )
                     raise BiogemeError(error_msg)
-            list_of_draws[i] = the_generator.generator(
-                self.get_sample_size(), number_of_draws
+                # User-defined generators may be provided as plain tuples.
+                the_generator = RandomNumberGeneratorTuple(*the_generator)
+            generators.append(the_generator)
+
+        if self.generated_draws and all(
+            the_generator.chunk_generator is not None for the_generator in generators
+        ):
+            self.theDraws = None
+            self._draws_key = None
+            # The draws of an individual must be the same for any
+            # chunk. Without seed, the streams are chosen at random.
+            seed = (
+                self.seed
+                if self.seed != 0
+                else int(np.random.randint(np.iinfo(np.int64).max))
             )
-            if list_of_draws[i].shape != (self.get_sample_size(), number_of_draws):
-                error_msg = (
-                    f'The draw generator for {name} must'
-                    f' generate a numpy array of dimensions'
-                    f' ({self.get_sample_size()}, {number_of_draws})'
-                    f' instead of {list_of_draws[i].shape}'
+            self._chunk_generators = [
+                (
+                    partial(
+                        the_generator.chunk_generator,
+                        key=(seed, DRAWS, name_key(name)),
+                    )
+                    if draw_types[name] in native_random_number_generators
+                    else the_generator.chunk_generator
                 )
-                raise BiogemeError(error_msg)
+                for name, the_generator in zip(names, generators)
+            ]
+            return None
+        self._chunk_generators = None
+
+        # The draws depend only on the variables and their types, on
+        # the dimensions, and on the seed. If they have already been
+        # generated, they are reused.
+        key = (
+            tuple(names),
+            tuple(draw_types[name] for name in names),
+            sample_size,
+            number_of_draws,
+            self.seed,
+            np.dtype(self.draws_dtype).name,
+        )
+        if key == self._draws_key:
+            return self.theDraws
+        self._draws_key = None
 
-        self.theDraws = np.array(list_of_draws)
-        # Draws as a three-dimensional numpy series. The dimensions
-        # are organized to be more suited for calculation.
+        # Dimensions of the draw table:
         # 1. number of individuals
         # 2. number of draws
         # 3. number of variables
-        self.theDraws = np.moveaxis(self.theDraws, 0, -1)
+        shape = (sample_size, number_of_draws, len(names))
+        file_name = self._draws_file_name(key)
+        if file_name is not None and os.path.exists(file_name):
+            the_draws = np.load(file_name, mmap_mode='r')
+            if the_draws.shape == shape and the_draws.dtype == self.draws_dtype:
+                logger.info(f'Draws read from {file_name}')
+                self.theDraws = the_draws
+                self._draws_key = key
+                return self.theDraws
+
+        # Each draw table is stored directly in its slice of the
+        # three-dimensional table, to avoid intermediate copies. If the
+        # draws are saved for the next runs, the table is written under
+        # another name, so that an interrupted run does not leave an
+        # incomplete file.
+        if self.draws_directory is None:
+            the_draws = np.empty(shape, dtype=self.draws_dtype)
+            temporary_file_name = None
+        else:
+            os.makedirs(self.draws_directory, exist_ok=True)
+            file_descriptor, temporary_file_name = tempfile.mkstemp(
+                suffix='.npy', prefix='draws_', dir=self.draws_directory
+            )
+            os.close(file_descriptor)
+            the_draws = np.lib.format.open_memmap(
+                temporary_file_name, mode='w+', dtype=self.draws_dtype, shape=shape
+            )
+        try:
+            self._generate_joint_draws(the_draws, names, generators)
+            for i, (name, the_generator) in enumerate(zip(names, generators)):
+                if the_generator.joint_generator is not None:
+                    continue
+                native = draw_types[name] in native_random_number_generators
+                if self.seed == 0 or not native:
+                    draws = the_generator.generator(sample_size, number_of_draws)
+                else:
+                    draws = the_generator.generator(
+                        sample_size,
+                        number_of_draws,
+                        generator=get_generator(self.seed, DRAWS, name_key(name)),
+                    )
+                if draws.shape != (sample_size, number_of_draws):
+                    error_msg = (
+                        f'The draw generator for {name} must'
+                        f' generate a numpy array of dimensions'
+                        f' ({sample_size}, {number_of_draws})'
+                        f' instead of {draws.shape}'
+                    )
+                    raise BiogemeError(error_msg)
+                the_draws[:, :, i] = draws
+                del draws
+        except BaseException:
+            if temporary_file_name is not None:
+                del the_draws
+                os.remove(temporary_file_name)
+            raise
+
+        if temporary_file_name is not None:
+            the_draws.flush()
+            del the_draws
+            if file_name is None:
+                the_draws = np.load(temporary_file_name, mmap_mode='r')
+                # The draws are not reproducible, and cannot be used by
+                # another run. The mapping remains valid after the file
+                # is removed, where the system allows it.
+                try:
+                    os.remove(temporary_file_name)
+                except OSError:
+                    logger.warning(f'Draws are stored in {temporary_file_name}')
+            else:
+                os.replace(temporary_file_name, file_name)
+                logger.info(f'Draws saved in {file_name}')
+                the_draws = np.load(file_name, mmap_mode='r')
+        self.theDraws = the_draws
+        self._draws_key = key
         return self.theDraws
 
+    def _generate_joint_draws(
+        self,
+        the_draws: np.ndarray,
+        names: list[str],
+        generators: list[RandomNumberGeneratorTuple],
+    ) -> None:
+        """Generate the draws of the variables whose type relies on a
+        joint generator. The variables sharing the same joint generator
+        are the dimensions of the same low-discrepancy sequence.
+
+        :param the_draws: 3-dimensional table where the draws are stored.
+        :type the_draws: numpy.array
+
+        :param names: the list of names of the variables.
+        :type names: list of strings
+
+        :param generators: generators of the variables.
+        :type generators: list(RandomNumberGeneratorTuple)
+        """
+        sample_size, number_of_draws, _ = the_draws.shape
+        groups: dict[JointGenerator, list[int]] = {}
+        for i, the_generator in enumerate(generators):
+            if the_generator.joint_generator is not None:
+                groups.setdefault(the_generator.joint_generator, []).append(i)
+        for joint_generator, indices in groups.items():
+            generator = (
+                None
+                if self.seed == 0
+                else get_generator(
+                    self.seed, DRAWS, name_key(','.join(names[i] for i in indices))
+                )
+            )
+            uniform_numbers = joint_generator(
+                sample_size, number_of_draws, len(indices), generator=generator
+            )
+            for dimension, i in enumerate(indices):
+                transform = generators[i].transform
+                the_draws[:, :, i] = (
+                    uniform_numbers[:, :, dimension]
+                    if transform is None
+                    else transform(uniform_numbers[:, :, dimension])
+                )
+            del uniform_numbers
+
+    def draws_of_individuals(
+        self, first_individual: int, last_individual: int
+    ) -> np.ndarray:
+        """Draws of a range of individuals. If the draws are not
+        stored, they are generated.
+
+        :param first_individual: index of the first individual of the range.
+        :type first_individual: int
+
+        :param last_individual: index following the last individual of
+            the range.
+        :type last_individual: int
+
+        :return: a 3-dimensional table with draws, with the same
+            dimensions as the table generated by
+            :meth:`~biogeme.database.Database.generate_draws`, except
+            for the number of individuals.
+        :rtype: numpy.array
+
+        :raise BiogemeError: if no draws have been generated.
+        """
+        if self.theDraws is not None:
+            return self.theDraws[first_individual:last_individual]
+        if self._chunk_generators is None:
+            error_msg = 'No draws have been generated.'
+            raise BiogemeError(error_msg)
+        the_draws = np.empty(
+            (
+                last_individual - first_individual,
+                self.number_of_draws,
+                len(self._chunk_generators),
+            ),
+            dtype=self.draws_dtype,
+        )
+        for i, the_generator in enumerate(self._chunk_generators):
+            the_draws[:, :, i] = the_generator(
+                first_individual, last_individual, self.number_of_draws
+            )
+        return the_draws
+
+    def materialize_draws(self) -> np.ndarray:
+        """Stores the draws of all individuals, if they are generated
+        when needed. It is necessary for the estimation, as the C++
+        engine needs the complete table.
+
+        :return: a 3-dimensional table with draws.
+        :rtype: numpy.array
+
+        :raise BiogemeError: if no draws have been generated.
+        """
+        if self.theDraws is None:
+            self.theDraws = self.draws_of_individuals(0, self.get_sample_size())
+            self._chunk_generators = None
+        return self.theDraws
+
+    def _draws_file_name(self, key: tuple) -> str | None:
+        """Name of the file where the draws are saved between runs.
+
+        :param key: identification of the draws.
+        :type key: tuple
+
+        :return: name of the file, or None if the draws are not saved.
+        :rtype: str
+        """
+        if self.draws_directory is None or self.seed == 0:
+            return None
+        the_hash = hashlib.sha256(repr(key).encode()).hexdigest()[:16]
+        return os.path.join(self.draws_directory, f'draws_{the_hash}.npy')
+
     @deprecated
     def generateDraws(
         self,
@@ -875,10 +1269,17 @@ class Database:
         pass
 
     def split(
-        self, slices: int, groups: str | None = None
+        self,
+        slices: int,
+        groups: str | None = None,
+        generator: np.random.Generator | None = None,
     ) -> list[EstimationValidation]:
         """Prepare estimation and validation sets for validation.
 
+        Each set is a copy of the corresponding rows of the data. To
+        avoid these copies, use
+        :meth:`~biogeme.database.Database.split_indices`.
+
         :param slices: number of slices
         :type slices: int
 
@@ -887,11 +1288,59 @@ class Database:
             together.
         :type groups: str
 
+        :param generator: generator of the pseudo-random numbers used
+            to shuffle the data. If None, and the seed is not 0, a
+            stream depending only on the seed is used, so that the
+            split is reproducible. Otherwise, the global numpy
+            generator is used.
+        :type generator: numpy.random.Generator
+
         :return: list of estimation and validation data sets
         :rtype: list(tuple(pandas.DataFrame, pandas.DataFrame))
 
         :raise BiogemeError: if the number of slices is less than two
 
+        """
+        return [
+            EstimationValidation(
+                estimation=self.data.iloc[indices.estimation],
+                validation=self.data.iloc[indices.validation],
+            )
+            for indices in self.split_indices(slices, groups, generator)
+        ]
+
+    def split_indices(
+        self,
+        slices: int,
+        groups: str | None = None,
+        generator: np.random.Generator | None = None,
+    ) -> list[EstimationValidationIndices]:
+        """Prepare estimation and validation sets for validation,
+        identified by the positions of their rows in the data. The data
+        itself is not copied. The sets are the same as the ones
+        generated by :meth:`~biogeme.database.Database.split`.
+
+        :param slices: number of slices
+        :type slices: int
+
+        :param groups: name of the column that defines the ID of the
+            groups. Data belonging to the same groups will be maintained
+            together.
+        :type groups: str
+
+        :param generator: generator of the pseudo-random numbers used
+            to shuffle the data. If None, and the seed is not 0, a
+            stream depending only on the seed is used, so that the
+            split is reproducible. Otherwise, the global numpy
+            generator is used.
+        :type generator: numpy.random.Generator
+
+        :return: list of the positions of the rows of the estimation and
+            validation data sets.
+        :rtype: list(EstimationValidationIndices)
+
+        :raise BiogemeError: if the number of slices is less than two
+
         """
         if slices < 2:
             error_msg = (
@@ -912,24 +1361,33 @@ class Database:
         if self.is_panel():
             groups = self.panelColumn
 
+        if generator is None and self.seed != 0:
+            generator = get_generator(self.seed, SPLIT)
+
         if groups is None:
-            shuffled = self.data.sample(frac=1)
+            # The rows are shuffled as by DataFrame.sample, without
+            # copying the data.
+            shuffled = (
+                pd.Series(np.arange(len(self.data)))
+                .sample(frac=1, random_state=generator)
+                .to_numpy()
+            )
             the_slices = np.array_split(shuffled, slices)
         else:
             ids = self.data[groups].unique()
-            np.random.shuffle(ids)
-            the_slices_ids = np.array_split(ids, slices)
-            the_slices = [
-                self.data[self.data[groups].isin(ids)] for ids in the_slices_ids
-            ]
-        estimation_sets = []
-        validation_sets = []
-        for i, v in enumerate(the_slices):
-            estimation_sets.append(pd.concat(the_slices[:i] + the_slices[i + 1 :]))
-            validation_sets.append(v)
+            (np.random if generator is None else generator).shuffle(ids)
+            # Slice of each group, and then of each row, in one pass.
+            slice_of_ids = np.repeat(
+                np.arange(slices), [len(s) for s in np.array_split(ids, slices)]
+            )
+            slice_of_rows = slice_of_ids[pd.Index(ids).get_indexer(self.data[groups])]
+            the_slices = [np.flatnonzero(slice_of_rows == i) for i in range(slices)]
         return [
-            EstimationValidation(estimation=e, validation=v)
-            for e, v in zip(estimation_sets, validation_sets)
+            EstimationValidationIndices(
+                estimation=np.concatenate(the_slices[:i] + the_slices[i + 1 :]),
+                validation=v,
+            )
+            for i, v in enumerate(the_slices)
         ]
 
     def is_panel(self) -> bool:
@@ -956,6 +1414,7 @@ class Database:
         """
 
         self.panelColumn = column_name
+        self._invalidate_panel_map()
 
         # Check if the data is organized in consecutive entries
         # Number of groups of data
@@ -980,18 +1439,42 @@ class Database:
         """Sorts the data so that the observations for each individuals are
         contiguous, and builds a map that identifies the range of indices of
         the observations of each individuals.
+
+        The map is calculated in one pass over the panel column, and
+        kept as long as the data is not modified. Calling this function
+        again on unchanged data has no effect.
+        """
+        if self.panelColumn is None:
+            return
+        if self._panel_map_source is self.data and self.individualMap is not None:
+            return
+        # It is necessary to renumber the row to reflect the new ordering
+        if not self.data[self.panelColumn].is_monotonic_increasing:
+            self.data = self.data.sort_values(
+                by=self.panelColumn, kind='stable', ignore_index=True
+            )
+        elif not self.data.index.equals(pd.RangeIndex(len(self.data.index))):
+            self.data = self.data.reset_index(drop=True)
+        ids = self.data[self.panelColumn].to_numpy()
+        # Position of the first observation of each new individual
+        boundaries = np.flatnonzero(ids[1:] != ids[:-1]) + 1
+        self.individual_starts = np.concatenate(([0], boundaries)).astype(np.int64)
+        self.individual_ends = np.concatenate(
+            (boundaries - 1, [len(ids) - 1])
+        ).astype(np.int64)
+        self.individualMap = pd.DataFrame(
+            {0: self.individual_starts, 1: self.individual_ends},
+            index=ids[self.individual_starts],
+        )
+        self.fullIndividualMap = self.individualMap
+        self._panel_map_source = self.data
+
+    def _invalidate_panel_map(self) -> None:
+        """Forces the panel map to be rebuilt at the next call of
+        :meth:`build_panel_map`. Must be called when the rows of the data
+        are modified in place.
         """
-        if self.panelColumn is not None:
-            self.data = self.data.sort_values(by=self.panelColumn)
-            # It is necessary to renumber the row to reflect the new ordering
-            self.data.index = range(len(self.data.index))
-            local_map = {}
-            individuals = self.data[self.panelColumn].unique()
-            for i in individuals:
-                indices = self.data.loc[self.data[self.panelColumn] == i].index
-                local_map[i] = [min(indices), max(indices)]
-            self.individualMap = pd.DataFrame(local_map).T
-            self.fullIndividualMap = self.individualMap
+        self._panel_map_source = None
 
     @deprecated
     def buildPanelMap(self) -> None:
@@ -89,6 +89,19 @@ def all_parameters_tuple() -> tuple[ParameterTuple, ...]:
             ),
             check=(cp.is_integer, cp.is_non_negative),
         ),
+        ParameterTuple(
+            name='number_of_processes',
+            value=1,
+            type=int,
+            section='MultiThreading',
+            description=(
+                'int: Number of processes to be used for tasks involving '
+                'several independent estimations, such as bootstrapping. If '
+                'the parameter is 0, the number of available processors is '
+                'calculated using cpu_count().'
+            ),
+            check=(cp.is_integer, cp.is_non_negative),
+        ),
         ParameterTuple(
             name='number_of_draws',
             value=20000,
@@ -121,6 +134,82 @@ def all_parameters_tuple() -> tuple[ParameterTuple, ...]:
             ),
             check=(cp.is_integer, cp.is_non_negative),
         ),
+        ParameterTuple(
+            name='draws_directory',
+            value='',
+            type=str,
+            section='MonteCarlo',
+            description=(
+                'str: directory where the draws are stored in memory-mapped '
+                'files, instead of being kept in memory. If the seed is not 0, '
+                'the files are kept, so that the draws are generated only once '
+                'by all the runs using the same seed. If empty, the draws are '
+                'kept in memory.'
+            ),
+            check=(),
+        ),
+        ParameterTuple(
+            name='single_precision_draws',
+            value=False,
+            type=bool,
+            section='MonteCarlo',
+            description=(
+                'bool: "True" if the draws are stored in single precision, '
+                'which halves the memory that they use.'
+            ),
+            check=(cp.is_boolean,),
+        ),
+        ParameterTuple(
+            name='generated_draws',
+            value=False,
+            type=bool,
+            section='MonteCarlo',
+            description=(
+                'bool: "True" if the draws are not stored, but generated by '
+                'chunks of individuals when the formulas are simulated. It '
+                'applies only if all the types of draws support it, such as '
+                'the Halton and the Modified Latin Hypercube draws. The draws '
+                'are stored anyway if the model is estimated.'
+            ),
+            check=(cp.is_boolean,),
+        ),
+        ParameterTuple(
+            name='draws_chunk_size',
+            value=1000,
+            type=int,
+            section='MonteCarlo',
+            description=(
+                'int: number of individuals for which the draws are generated '
+                'at once, when they are not stored.'
+            ),
+            check=(cp.is_integer, cp.is_positive),
+        ),
+        ParameterTuple(
+            name='simulation_chunk_size',
+            value=100000,
+            type=int,
+            section='Simulation',
+            description=(
+                'int: number of rows read and simulated at once, when the '
+                'formulas are simulated chunk by chunk.'
+            ),
+            check=(cp.is_integer, cp.is_positive),
+        ),
+        ParameterTuple(
+            name='max_stored_simulated_values',
+            value=50000000,
+            type=int,
+            section='Simulation',
+            description=(
+                'int: when the formulas are simulated for several parameter '
+                'vectors, for instance to calculate confidence intervals, all '
+                'the simulated values are stored if their number does not '
+                'exceed this value, and the quantiles are calculated exactly. '
+                'Otherwise, the quantiles are estimated without storing the '
+                'values.'
+            ),
+            check=(cp.is_integer, cp.is_positive),
+        ),
         ParameterTuple(
             name='bootstrap_samples',
             value=100,
@@ -309,4 +398,28 @@ def all_parameters_tuple() -> tuple[ParameterTuple, ...]:
             ),
             check=(cp.is_integer, cp.is_non_negative),
         ),
+        ParameterTuple(
+            name='results_file',
+            value='',
+            type=str,
+            section='AssistedSpecification',
+            description=(
+                'str: name of the SQLite file where the estimation results of '
+                'the specifications are stored, so that they can be reused by '
+                'later runs. If empty, the results are kept in memory only.'
+            ),
+            check=(),
+        ),
+        ParameterTuple(
+            name='maximum_number_of_results',
+            value=100000,
+            type=int,
+            section='AssistedSpecification',
+            description=(
+                'int: maximum number of estimation results stored in the '
+                'results file. The least recently used results are removed '
+                'first. If 0, there is no limit.'
+            ),
+            check=(cp.is_integer, cp.is_non_negative),
+        ),
     )
@@ -5,18 +5,72 @@
 :date: Tue Jun 18 19:05:13 2019
 """
 
+import warnings
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable
 
 # Too constraining
 # pylint: disable=invalid-name, too-many-arguments, too-many-locals, too-many-statements
 
 import numpy as np
+from scipy.stats import qmc
+
 import biogeme.exceptions as excep
 from biogeme.deprecated import deprecated
+from biogeme.random_streams import get_generator
+from biogeme.tools.primes import get_prime_numbers
+
+CHUNK_SIZE = 1000000
+"""Number of draws generated by each task, when a large request is
+split into chunks generated in parallel."""
+
+BLOCK_SIZE = 1000
+"""Number of consecutive individuals whose pseudo-random draws are
+generated by the same stream, when the draws are generated for a range
+of individuals."""
+
+
+def _fill_by_chunks(
+    fill: Callable[[int, int], None],
+    number_of_rows: int,
+    row_size: int,
+    number_of_threads: int | None = None,
+) -> None:
+    """Splits a table of draws into chunks of rows, and fills them in
+    parallel. Numpy releases the GIL during the calculations on large
+    arrays, so that the threads actually run concurrently.
+
+    :param fill: function filling the rows [first, last[ of the table.
+    :type fill: fct(int, int)
+
+    :param number_of_rows: number of rows of the table.
+    :type number_of_rows: int
+
+    :param row_size: number of draws in each row.
+    :type row_size: int
+
+    :param number_of_threads: number of threads. If None, the default
+        of :class:`concurrent.futures.ThreadPoolExecutor` is used.
+    :type number_of_threads: int
+    """
+    rows_per_chunk = max(1, CHUNK_SIZE // row_size)
+    if number_of_threads == 1 or number_of_rows <= rows_per_chunk:
+        fill(0, number_of_rows)
+        return
+    with ThreadPoolExecutor(max_workers=number_of_threads) as executor:
+        futures = [
+            executor.submit(fill, first, min(first + rows_per_chunk, number_of_rows))
+            for first in range(0, number_of_rows, rows_per_chunk)
+        ]
+        for future in futures:
+            future.result()
 
 
 def get_uniform(
-    sample_size: int, number_of_draws: int, symmetric: bool = False
+    sample_size: int,
+    number_of_draws: int,
+    symmetric: bool = False,
+    generator: np.random.Generator | None = None,
 ) -> np.ndarray:
     """Uniform [0, 1] or [-1, 1] numbers
 
@@ -30,6 +84,9 @@ def get_uniform(
     :param symmetric: if True, draws from [-1: 1] are generated.
         If False, draws from [0: 1] are generated.  Default: False
     :type symmetric: bool
+    :param generator: generator of the pseudo-random numbers. If
+        None, the global numpy generator is used.
+    :type generator: numpy.random.Generator
     :return: numpy array with the draws
     :rtype: numpy.array
 
@@ -68,7 +125,9 @@ def get_uniform(
         )
     total_size = number_of_draws * sample_size
 
-    uniform_numbers = np.random.uniform(size=total_size)
+    uniform_numbers = (np.random if generator is None else generator).uniform(
+        size=total_size
+    )
     if symmetric:
         uniform_numbers = 2.0 * uniform_numbers - 1.0
 
@@ -86,6 +145,7 @@ def get_latin_hypercube_draws(
     number_of_draws: int,
     symmetric: bool = False,
     uniform_numbers: np.ndarray | None = None,
+    generator: np.random.Generator | None = None,
 ) -> np.ndarray:
     """Implementation of the Modified Latin Hypercube Sampling proposed
     by `Hess et al., (2006)`_.
@@ -106,6 +166,9 @@ def get_latin_hypercube_draws(
     :param uniform_numbers: numpy with uniformly distributed numbers.
        If None, the numpy uniform number generator is used.
     :type uniform_numbers: numpy.array
+    :param generator: generator of the pseudo-random numbers. If
+        None, the global numpy generator is used.
+    :type generator: numpy.random.Generator
 
     :return: numpy array with the draws
     :rtype: numpy.array
@@ -136,8 +199,10 @@ def get_latin_hypercube_draws(
         )
     totalSize = number_of_draws * sample_size
 
+    if generator is None:
+        generator = np.random
     if uniform_numbers is None:
-        uniform_numbers = np.random.uniform(size=totalSize)
+        uniform_numbers = generator.uniform(size=totalSize)
     else:
         if uniform_numbers.size != totalSize:
             errorMsg = (
@@ -146,18 +211,86 @@ def get_latin_hypercube_draws(
             )
             raise excep.BiogemeError(errorMsg)
 
-    uniform_numbers.shape = (totalSize,)
-    numbers = np.array(
-        [(float(i) + uniform_numbers[i]) / float(totalSize) for i in range(totalSize)]
+    numbers = (np.arange(totalSize, dtype=float) + uniform_numbers.ravel()) / float(
+        totalSize
     )
     if symmetric:
         numbers = 2.0 * numbers - 1.0
 
-    np.random.shuffle(numbers)
+    generator.shuffle(numbers)
     numbers.shape = (sample_size, number_of_draws)
     return numbers
 
 
+def get_latin_hypercube_draws_of_individuals(
+    first_individual: int,
+    last_individual: int,
+    number_of_draws: int,
+    key: tuple[int, ...],
+    symmetric: bool = False,
+) -> np.ndarray:
+    """Generate the Modified Latin Hypercube draws of a range of
+    individuals. Contrarily to :func:`get_latin_hypercube_draws`, the
+    draws of each individual are stratified over its own draws, as
+    proposed by `Hess et al., (2006)`_. The pseudo-random numbers of
+    each block of :data:`BLOCK_SIZE` individuals are generated by their
+    own stream, so that the draws of an individual do not depend on the
+    range for which they are generated.
+
+    :param first_individual: index of the first individual of the range.
+    :type first_individual: int
+
+    :param last_individual: index following the last individual of the
+        range.
+    :type last_individual: int
+
+    :param number_of_draws: number of draws per individual.
+    :type number_of_draws: int
+
+    :param key: seed and identification of the streams, completed by
+        the index of the block of individuals. See
+        :func:`biogeme.random_streams.get_generator`.
+    :type key: tuple(int)
+
+    :param symmetric: if True, draws from [-1: 1] are generated.
+           If False, draws from [0: 1] are generated.  Default: False
+    :type symmetric: bool
+
+    :return: numpy array with the draws, with one row per individual.
+    :rtype: numpy.array
+
+    :raise BiogemeError: if the number of draws is not positive.
+
+    :raise BiogemeError: if the range of individuals is empty.
+    """
+    if number_of_draws <= 0:
+        raise excep.BiogemeError(f'Invalid number of draws: {number_of_draws}.')
+
+    if first_individual < 0 or last_individual <= first_individual:
+        raise excep.BiogemeError(
+            f'Invalid range of individuals [{first_individual}, {last_individual}['
+            f' when generating draws.'
+        )
+    out = np.empty((last_individual - first_individual, number_of_draws))
+    first_block = first_individual // BLOCK_SIZE
+    last_block = (last_individual - 1) // BLOCK_SIZE
+    for block in range(first_block, last_block + 1):
+        generator = get_generator(*key, block)
+        # The whole block is generated, whatever the range.
+        uniform_numbers = generator.uniform(size=(BLOCK_SIZE, number_of_draws))
+        numbers = (np.arange(number_of_draws) + uniform_numbers) / number_of_draws
+        numbers = generator.permuted(numbers, axis=1)
+        block_start = block * BLOCK_SIZE
+        first = max(first_individual, block_start)
+        last = min(last_individual, block_start + BLOCK_SIZE)
+        out[first - first_individual : last - first_individual] = numbers[
+            first - block_start : last - block_start
+        ]
+    if symmetric:
+        out = 2.0 * out - 1.0
+    return out
+
+
 @deprecated(get_latin_hypercube_draws)
 def getLatinHypercubeDraws(
     sample_size: int, number_of_draws: int, symmetric: bool = False, uniformNumbers=None
@@ -172,6 +305,8 @@ def get_halton_draws(
     base: int = 2,
     skip: int = 0,
     shuffled: bool = False,
+    out: np.ndarray | None = None,
+    generator: np.random.Generator | None = None,
 ) -> np.ndarray:
     """Generate Halton draws.
     Implementation by Cristian Arteaga, University of Nevada Las Vegas,
@@ -199,6 +334,15 @@ def get_halton_draws(
     :param shuffled: if True, each series is shuffled
     :type shuffled: bool
 
+    :param out: if not None, array of dimensions (sample_size,
+        number_of_draws) where the draws are stored. It may be a view
+        on a larger table.
+    :type out: numpy.array
+
+    :param generator: generator of the pseudo-random numbers used to
+        shuffle the series. If None, the global numpy generator is used.
+    :type generator: numpy.random.Generator
+
     :return: numpy array with the draws
     :rtype: numpy.array
 
@@ -222,51 +366,192 @@ def get_halton_draws(
             f'Invalid sample size: {sample_size} when generating draws.'
         )
     length = number_of_draws * sample_size
-    req_length = length + skip + 1
-    numbers = np.empty(req_length)
+    # The recursive construction of the sequence is faster than the
+    # calculation of each element, even on several threads.
+    numbers = _halton_sequence(length + skip + 1, base)[skip + 1 :]
+
+    if shuffled:
+        (np.random if generator is None else generator).shuffle(numbers)
+
+    if symmetric:
+        numbers = 2.0 * numbers - 1.0
+
+    numbers.shape = (sample_size, number_of_draws)
+    if out is None:
+        return numbers
+    out[...] = numbers
+    return out
+
+
+@deprecated(get_halton_draws)
+def getHaltonDraws(
+    sample_size: int,
+    number_of_draws: int,
+    symmetric: bool = False,
+    base: int = 2,
+    skip: int = 0,
+    shuffled: bool = False,
+):
+    pass
+
+
+def _halton_sequence(length: int, base: int) -> np.ndarray:
+    """First elements of the Halton sequence, including the first one,
+    which is 0. Implementation by Cristian Arteaga, University of
+    Nevada Las Vegas.
+
+    :param length: number of elements.
+    :type length: int
+
+    :param base: base of the sequence.
+    :type base: int
+
+    :return: elements of the sequence.
+    :rtype: numpy.array
+    """
+    numbers = np.empty(length)
     numbers[0] = 0
     numbers_idx = 1
     t = 1
-    while numbers_idx < req_length:
+    while numbers_idx < length:
         d = 1 / base**t
         numbers_size = numbers_idx
         i = 1
-        while i < base and numbers_idx < req_length:
-            max_numbers = min(req_length - numbers_idx, numbers_size)
+        while i < base and numbers_idx < length:
+            max_numbers = min(length - numbers_idx, numbers_size)
             numbers[numbers_idx : numbers_idx + max_numbers] = (
                 numbers[:max_numbers] + d * i
             )
             numbers_idx += max_numbers
             i += 1
         t += 1
-    numbers = numbers[skip + 1 : length + skip + 1]
+    return numbers
 
-    if shuffled:
-        np.random.shuffle(numbers)
 
-    if symmetric:
-        numbers = 2.0 * numbers - 1.0
+def _radical_inverse(first_position: int, last_position: int, base: int) -> np.ndarray:
+    """Elements of the Halton sequence in a range of positions. The
+    result is identical to the corresponding elements generated by
+    :func:`_halton_sequence`.
 
-    numbers.shape = (sample_size, number_of_draws)
+    :param first_position: position of the first element.
+    :type first_position: int
+
+    :param last_position: position following the last element.
+    :type last_position: int
+
+    :param base: base of the sequence.
+    :type base: int
+
+    :return: elements of the sequence.
+    :rtype: numpy.array
+    """
+    # The contribution of the lowest digits is read from the
+    # beginning of the sequence. The other digits are accumulated in
+    # the same order as in the recursive construction, so that the
+    # rounding errors are the same.
+    table_size = base
+    while table_size * base <= last_position - first_position:
+        table_size *= base
+    table = _halton_sequence(table_size, base)
+    positions, low_digits = np.divmod(
+        np.arange(first_position, last_position, dtype=np.int64), table_size
+    )
+    numbers = table[low_digits]
+    power = table_size * base
+    while positions.any():
+        positions, digits = np.divmod(positions, base)
+        numbers += digits * (1 / power)
+        power *= base
     return numbers
 
 
-@deprecated(get_halton_draws)
-def getHaltonDraws(
-    sample_size: int,
+def get_halton_draws_of_individuals(
+    first_individual: int,
+    last_individual: int,
     number_of_draws: int,
     symmetric: bool = False,
     base: int = 2,
     skip: int = 0,
-    shuffled: bool = False,
-):
-    pass
+    out: np.ndarray | None = None,
+    number_of_threads: int | None = None,
+) -> np.ndarray:
+    """Generate the Halton draws of a range of individuals. Each draw
+    is calculated directly from its position in the sequence, so that
+    the draws of any range of individuals can be generated without
+    generating the draws of the previous ones. The result is identical
+    to the corresponding rows of :func:`get_halton_draws`, without
+    shuffling.
+
+    :param first_individual: index of the first individual of the range.
+    :type first_individual: int
+
+    :param last_individual: index following the last individual of the
+        range.
+    :type last_individual: int
+
+    :param number_of_draws: number of draws per individual.
+    :type number_of_draws: int
+
+    :param symmetric: if True, draws from [-1: 1] are generated.
+           If False, draws from [0: 1] are generated.  Default: False
+    :type symmetric: bool
+
+    :param base: generate Halton draws for a given basis.
+            Ideally, it should be a prime number. Default: 2.
+    :type base: int
+
+    :param skip: the number of  elements of the sequence to be discarded.
+    :type skip: int
+
+    :param out: if not None, array with one row per individual of the
+        range, where the draws are stored.
+    :type out: numpy.array
+
+    :param number_of_threads: number of threads generating the chunks
+        of a large table. If None, the default of
+        :class:`concurrent.futures.ThreadPoolExecutor` is used.
+    :type number_of_threads: int
+
+    :return: numpy array with the draws, with one row per individual.
+    :rtype: numpy.array
+
+    :raise BiogemeError: if the number of draws is not positive.
+
+    :raise BiogemeError: if the range of individuals is empty.
+    """
+    if number_of_draws <= 0:
+        raise excep.BiogemeError(f'Invalid number of draws: {number_of_draws}.')
+
+    if first_individual < 0 or last_individual <= first_individual:
+        raise excep.BiogemeError(
+            f'Invalid range of individuals [{first_individual}, {last_individual}['
+            f' when generating draws.'
+        )
+    if out is None:
+        out = np.empty((last_individual - first_individual, number_of_draws))
+
+    def fill(first: int, last: int) -> None:
+        first_position = skip + 1 + (first_individual + first) * number_of_draws
+        numbers = _radical_inverse(
+            first_position,
+            first_position + (last - first) * number_of_draws,
+            base,
+        )
+        if symmetric:
+            numbers = 2.0 * numbers - 1.0
+        out[first:last] = numbers.reshape(last - first, number_of_draws)
+
+    _fill_by_chunks(
+        fill, last_individual - first_individual, number_of_draws, number_of_threads
+    )
+    return out
 
 
 def get_antithetic(
     uniform_draws: Callable[[int, int], np.ndarray],
     sample_size: int,
     number_of_draws: int,
+    generator: np.random.Generator | None = None,
 ) -> np.ndarray:
     """Returns antithetic uniform draws
 
@@ -283,6 +568,11 @@ def get_antithetic(
     :param number_of_draws: number of draws to generate.
     :type number_of_draws: int
 
+    :param generator: generator of the pseudo-random numbers, passed
+        to uniform_draws as the keyword argument "generator". If None,
+        uniform_draws is called with two arguments only.
+    :type generator: numpy.random.Generator
+
     :return: numpy array with the antithetic draws
     :rtype: numpy.array
 
@@ -301,7 +591,10 @@ def get_antithetic(
 
     """
     R = int(number_of_draws / 2.0)
-    draws = uniform_draws(sample_size, R)
+    if generator is None:
+        draws = uniform_draws(sample_size, R)
+    else:
+        draws = uniform_draws(sample_size, R, generator=generator)
     return np.concatenate((draws, 1 - draws), axis=1)
 
 
@@ -314,12 +607,143 @@ def getAntithetic(
     pass
 
 
+# Coefficients of the rational approximations of Algorithm AS241,
+# from the highest degree.
+_CENTRAL_NUMERATOR = (
+    2.5090809287301226727e03,
+    3.3430575583588128105e04,
+    6.7265770927008700853e04,
+    4.5921953931549871457e04,
+    1.3731693765509461125e04,
+    1.9715909503065514427e03,
+    1.3314166789178437745e02,
+    3.3871328727963666080e00,
+)
+_CENTRAL_DENOMINATOR = (
+    5.2264952788528545610e03,
+    2.8729085735721942674e04,
+    3.9307895800092710610e04,
+    2.1213794301586595867e04,
+    5.3941960214247511077e03,
+    6.8718700749205790830e02,
+    4.2313330701600911252e01,
+    1.0,
+)
+_INTERMEDIATE_NUMERATOR = (
+    7.74545014278341407640e-04,
+    2.27238449892691845833e-02,
+    2.41780725177450611770e-01,
+    1.27045825245236838258e00,
+    3.64784832476320460504e00,
+    5.76949722146069140550e00,
+    4.63033784615654529590e00,
+    1.42343711074968357734e00,
+)
+_INTERMEDIATE_DENOMINATOR = (
+    1.05075007164441684324e-09,
+    5.47593808499534494600e-04,
+    1.51986665636164571966e-02,
+    1.48103976427480074590e-01,
+    6.89767334985100004550e-01,
+    1.67638483018380384940e00,
+    2.05319162663775882187e00,
+    1.0,
+)
+_TAIL_NUMERATOR = (
+    2.01033439929228813265e-07,
+    2.71155556874348757815e-05,
+    1.24266094738807843860e-03,
+    2.65321895265761230930e-02,
+    2.96560571828504891230e-01,
+    1.78482653991729133580e00,
+    5.46378491116411436990e00,
+    6.65790464350110377720e00,
+)
+_TAIL_DENOMINATOR = (
+    2.04426310338993978564e-15,
+    1.42151175831644588870e-07,
+    1.84631831751005468180e-05,
+    7.86869131145613259100e-04,
+    1.48753612908506148525e-02,
+    1.36929880922735805310e-01,
+    5.99832206555887937690e-01,
+    1.0,
+)
+
+
+def _polynomial(x: np.ndarray, coefficients: tuple[float, ...]) -> np.ndarray:
+    """Evaluates a polynomial with the Horner scheme.
+
+    :param x: values of the variable.
+    :type x: numpy.array
+
+    :param coefficients: coefficients, from the highest degree.
+    :type coefficients: tuple(float)
+
+    :return: values of the polynomial.
+    :rtype: numpy.array
+    """
+    result = coefficients[0] * x + coefficients[1]
+    for coefficient in coefficients[2:]:
+        result = result * x + coefficient
+    return result
+
+
+def _wichura(uniform_numbers: np.ndarray) -> np.ndarray:
+    """Normal deviates corresponding to uniform numbers, using the
+    Algorithm AS241. Each branch of the algorithm is evaluated only on
+    the numbers that it concerns.
+
+    :param uniform_numbers: one-dimensional array of uniform numbers.
+    :type uniform_numbers: numpy.array
+
+    :return: normal deviates.
+    :rtype: numpy.array
+    """
+    q = uniform_numbers - 0.5
+    draws = np.zeros(uniform_numbers.shape)
+    central = np.flatnonzero(np.abs(uniform_numbers) <= 0.45)
+    q_central = q[central]
+    r = 0.180625e00 - q_central * q_central
+    draws[central] = (
+        q_central
+        * _polynomial(r, _CENTRAL_NUMERATOR)
+        / _polynomial(r, _CENTRAL_DENOMINATOR)
+    )
+
+    tail = np.flatnonzero(np.abs(uniform_numbers) > 0.45)
+    negative = q[tail] < 0.0
+    r = np.where(negative, uniform_numbers[tail], 1 - uniform_numbers[tail])
+    # If r is not positive, the draw is 0.
+    positive = r > 0
+    tail = tail[positive]
+    negative = negative[positive]
+    r = np.sqrt(-np.log(r[positive]))
+    tail_values = np.empty(r.shape)
+    intermediate = r <= 5.0e00
+    r_intermediate = r[intermediate] - 1.6e00
+    tail_values[intermediate] = _polynomial(
+        r_intermediate, _INTERMEDIATE_NUMERATOR
+    ) / _polynomial(r_intermediate, _INTERMEDIATE_DENOMINATOR)
+    extreme = ~intermediate
+    r_extreme = r[extreme] - 5.0e00
+    tail_values[extreme] = _polynomial(r_extreme, _TAIL_NUMERATOR) / _polynomial(
+        r_extreme, _TAIL_DENOMINATOR
+    )
+    tail_values[negative] = -tail_values[negative]
+    draws[tail] = tail_values
+    return draws
+
+
 def get_normal_wichura_draws(
     sample_size: int,
     number_of_draws: int,
     uniform_numbers: np.ndarray | None = None,
     antithetic: bool = False,
-):
+    out: np.ndarray | None = None,
+    number_of_threads: int | None = None,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
     """Generate pseudo-random numbers from a normal distribution N(0, 1)
 
     It uses the Algorithm AS241 by `Wichura (1988)`_
@@ -346,6 +770,20 @@ def get_normal_wichura_draws(
                        with their antithetic version.
     :type antithetic: bool
 
+    :param out: if not None, array of dimensions (sample_size,
+        number_of_draws) where the draws are stored. It may be a view
+        on a larger table.
+    :type out: numpy.array
+
+    :param number_of_threads: number of threads generating the chunks
+        of a large table. If None, the default of
+        :class:`concurrent.futures.ThreadPoolExecutor` is used.
+    :type number_of_threads: int
+
+    :param generator: generator of the uniform numbers, if they are not
+        provided. If None, the global numpy generator is used.
+    :type generator: numpy.random.Generator
+
     :return: numpy array with the draws
     :rtype: numpy.array
 
@@ -385,194 +823,33 @@ def get_normal_wichura_draws(
         )
     totalSize = number_of_draws * sample_size
 
-    split2 = 5.0e00
-    const1 = 0.180625e00
-    const2 = 1.6e00
-    a0 = 3.3871328727963666080e00
-    a1 = 1.3314166789178437745e02
-    a2 = 1.9715909503065514427e03
-    a3 = 1.3731693765509461125e04
-    a4 = 4.5921953931549871457e04
-    a5 = 6.7265770927008700853e04
-    a6 = 3.3430575583588128105e04
-    a7 = 2.5090809287301226727e03
-    b1 = 4.2313330701600911252e01
-    b2 = 6.8718700749205790830e02
-    b3 = 5.3941960214247511077e03
-    b4 = 2.1213794301586595867e04
-    b5 = 3.9307895800092710610e04
-    b6 = 2.8729085735721942674e04
-    b7 = 5.2264952788528545610e03
-    c0 = 1.42343711074968357734e00
-    c1 = 4.63033784615654529590e00
-    c2 = 5.76949722146069140550e00
-    c3 = 3.64784832476320460504e00
-    c4 = 1.27045825245236838258e00
-    c5 = 2.41780725177450611770e-01
-    c6 = 2.27238449892691845833e-02
-    c7 = 7.74545014278341407640e-04
-    d1 = 2.05319162663775882187e00
-    d2 = 1.67638483018380384940e00
-    d3 = 6.89767334985100004550e-01
-    d4 = 1.48103976427480074590e-01
-    d5 = 1.51986665636164571966e-02
-    d6 = 5.47593808499534494600e-04
-    d7 = 1.05075007164441684324e-09
-    e0 = 6.65790464350110377720e00
-    e1 = 5.46378491116411436990e00
-    e2 = 1.78482653991729133580e00
-    e3 = 2.96560571828504891230e-01
-    e4 = 2.65321895265761230930e-02
-    e5 = 1.24266094738807843860e-03
-    e6 = 2.71155556874348757815e-05
-    e7 = 2.01033439929228813265e-07
-    f1 = 5.99832206555887937690e-01
-    f2 = 1.36929880922735805310e-01
-    f3 = 1.48753612908506148525e-02
-    f4 = 7.86869131145613259100e-04
-    f5 = 1.84631831751005468180e-05
-    f6 = 1.42151175831644588870e-07
-    f7 = 2.04426310338993978564e-15
-
     if uniform_numbers is None:
-        uniform_numbers = np.random.uniform(size=totalSize)
+        uniform_numbers = (np.random if generator is None else generator).uniform(
+            size=totalSize
+        )
     elif uniform_numbers.size != totalSize:
         errorMsg = (
             f'A total of {totalSize} uniform draws must be '
             f'provided, and not {uniform_numbers.size}.'
         )
         raise excep.BiogemeError(errorMsg)
-    uniform_numbers.shape = (totalSize,)
+    uniform_numbers = uniform_numbers.reshape(sample_size, number_of_draws)
 
-    q = uniform_numbers - 0.5
-    draws = np.zeros(uniform_numbers.shape)
-    r = np.zeros(uniform_numbers.shape)
-    cond1 = np.abs(uniform_numbers) <= 0.45
-    r[cond1] = const1 - q[cond1] * q[cond1]
-    draws[cond1] = (
-        q[cond1]
-        * (
-            (
-                (
-                    (
-                        (((a7 * r[cond1] + a6) * r[cond1] + a5) * r[cond1] + a4)
-                        * r[cond1]
-                        + a3
-                    )
-                    * r[cond1]
-                    + a2
-                )
-                * r[cond1]
-                + a1
-            )
-            * r[cond1]
-            + a0
-        )
-        / (
-            (
-                (
-                    (
-                        (((b7 * r[cond1] + b6) * r[cond1] + b5) * r[cond1] + b4)
-                        * r[cond1]
-                        + b3
-                    )
-                    * r[cond1]
-                    + b2
-                )
-                * r[cond1]
-                + b1
-            )
-            * r[cond1]
-            + 1
-        )
-    )
-    cond2 = np.abs(uniform_numbers) > 0.45
-    cond2a = np.logical_and(cond2, q < 0.0)
-    cond2b = np.logical_and(cond2, q >= 0.0)
-    r[cond2a] = uniform_numbers[cond2a]
-    r[cond2b] = 1 - uniform_numbers[cond2b]
-    cond2c = np.logical_and(cond2, r <= 0)
-    cond2d = np.logical_and(cond2, r > 0)
-    draws[cond2c] = 0.0
-    r[cond2d] = np.sqrt(-np.log(r[cond2d]))
-    cond2d_a = np.logical_and(cond2d, r <= split2)
-    cond2d_b = np.logical_and(cond2d, r > split2)
-    r[cond2d_a] = r[cond2d_a] - const2
-    draws[cond2d_a] = (
-        (
-            (
-                (
-                    (((c7 * r[cond2d_a] + c6) * r[cond2d_a] + c5) * r[cond2d_a] + c4)
-                    * r[cond2d_a]
-                    + c3
-                )
-                * r[cond2d_a]
-                + c2
-            )
-            * r[cond2d_a]
-            + c1
-        )
-        * r[cond2d_a]
-        + c0
-    ) / (
-        (
-            (
-                (
-                    (((d7 * r[cond2d_a] + d6) * r[cond2d_a] + d5) * r[cond2d_a] + d4)
-                    * r[cond2d_a]
-                    + d3
-                )
-                * r[cond2d_a]
-                + d2
-            )
-            * r[cond2d_a]
-            + d1
+    if out is None:
+        out = np.empty(
+            (sample_size, 2 * number_of_draws if antithetic else number_of_draws)
         )
-        * r[cond2d_a]
-        + 1
-    )
-    r[cond2d_b] = r[cond2d_b] - split2
-    draws[cond2d_b] = (
-        (
-            (
-                (
-                    (((e7 * r[cond2d_b] + e6) * r[cond2d_b] + e5) * r[cond2d_b] + e4)
-                    * r[cond2d_b]
-                    + e3
-                )
-                * r[cond2d_b]
-                + e2
-            )
-            * r[cond2d_b]
-            + e1
-        )
-        * r[cond2d_b]
-        + e0
-    ) / (
-        (
-            (
-                (
-                    (((f7 * r[cond2d_b] + f6) * r[cond2d_b] + f5) * r[cond2d_b] + f4)
-                    * r[cond2d_b]
-                    + f3
-                )
-                * r[cond2d_b]
-                + f2
-            )
-            * r[cond2d_b]
-            + f1
-        )
-        * r[cond2d_b]
-        + 1
-    )
-    draws[cond2a] = -draws[cond2a]
-
-    draws.shape = (sample_size, number_of_draws)
 
-    if antithetic:
-        draws = np.concatenate((draws, -draws), axis=1)
+    def fill(first: int, last: int) -> None:
+        draws = _wichura(uniform_numbers[first:last].ravel()).reshape(
+            last - first, number_of_draws
+        )
+        out[first:last, :number_of_draws] = draws
+        if antithetic:
+            out[first:last, number_of_draws:] = -draws
 
-    return draws
+    _fill_by_chunks(fill, sample_size, number_of_draws, number_of_threads)
+    return out
 
 
 @deprecated(get_normal_wichura_draws)
@@ -583,3 +860,189 @@ def getNormalWichuraDraws(
     antithetic: bool = False,
 ):
     pass
+
+
+def _check_dimensions(
+    sample_size: int, number_of_draws: int, number_of_variables: int
+) -> None:
+    """Verifies the dimensions of a table of draws generated jointly
+    for several variables.
+
+    :param sample_size: number of individuals.
+    :type sample_size: int
+
+    :param number_of_draws: number of draws per individual.
+    :type number_of_draws: int
+
+    :param number_of_variables: number of variables.
+    :type number_of_variables: int
+
+    :raise BiogemeError: if one of the dimensions is not positive.
+    """
+    if number_of_draws <= 0:
+        raise excep.BiogemeError(f'Invalid number of draws: {number_of_draws}.')
+    if sample_size <= 0:
+        raise excep.BiogemeError(
+            f'Invalid sample size: {sample_size} when generating draws.'
+        )
+    if number_of_variables <= 0:
+        raise excep.BiogemeError(
+            f'Invalid number of variables: {number_of_variables} when '
+            f'generating draws.'
+        )
+
+
+def _default_generator() -> np.random.Generator:
+    """Generator derived from the global numpy generator, so that the
+    draws are reproducible with numpy.random.seed.
+
+    :return: the random number generator.
+    :rtype: numpy.random.Generator
+    """
+    return np.random.default_rng(np.random.randint(np.iinfo(np.int32).max))
+
+
+def get_sobol_draws(
+    sample_size: int,
+    number_of_draws: int,
+    number_of_variables: int,
+    scrambled: bool = False,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
+    """Generate Sobol draws for several variables jointly. Each
+    variable corresponds to one dimension of the sequence, so that the
+    points are low-discrepancy in the space of all the variables. The
+    consecutive points of the sequence are assigned to the draws of
+    the first individual, then of the second, and so on, as for the
+    Halton draws.
+
+    :param sample_size: number of individuals.
+    :type sample_size: int
+
+    :param number_of_draws: number of draws per individual.
+    :type number_of_draws: int
+
+    :param number_of_variables: number of variables, that is the
+        dimension of the sequence.
+    :type number_of_variables: int
+
+    :param scrambled: if True, the sequence is randomized with the
+        Owen-type scrambling (linear matrix scrambling and digital
+        shift) of :class:`scipy.stats.qmc.Sobol`. If False, the first
+        point, which is 0, is discarded.
+    :type scrambled: bool
+
+    :param generator: generator of the pseudo-random numbers used for
+        the scrambling. If None, it is derived from the global numpy
+        generator.
+    :type generator: numpy.random.Generator
+
+    :return: numpy array with the draws, of dimensions (sample_size,
+        number_of_draws, number_of_variables).
+    :rtype: numpy.array
+
+    :raise BiogemeError: if one of the dimensions is not positive.
+    """
+    _check_dimensions(sample_size, number_of_draws, number_of_variables)
+    if scrambled and generator is None:
+        generator = _default_generator()
+    sampler = qmc.Sobol(
+        d=number_of_variables,
+        scramble=scrambled,
+        seed=generator if scrambled else None,
+    )
+    with warnings.catch_warnings():
+        # The balance properties of the Sobol sequence are obtained for
+        # numbers of points that are powers of 2. The other numbers
+        # are nevertheless valid.
+        warnings.simplefilter('ignore', category=UserWarning)
+        if not scrambled:
+            sampler.fast_forward(1)
+        numbers = sampler.random(sample_size * number_of_draws)
+    return numbers.reshape(sample_size, number_of_draws, number_of_variables)
+
+
+def get_randomized_halton_draws(
+    sample_size: int,
+    number_of_draws: int,
+    number_of_variables: int,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
+    """Generate randomized Halton draws for several variables
+    jointly. Variable k uses the Halton sequence with the k-th prime
+    number as base, so that the points are low-discrepancy in the
+    space of all the variables. The sequences are randomized in two
+    ways. First, the non-zero digits of each position are
+    permuted. This breaks the correlation between the sequences with
+    large bases. Second, each sequence is shifted by a uniform random
+    number, modulo 1. The consecutive points are assigned to the
+    draws of the first individual, then of the second, and so on.
+
+    :param sample_size: number of individuals.
+    :type sample_size: int
+
+    :param number_of_draws: number of draws per individual.
+    :type number_of_draws: int
+
+    :param number_of_variables: number of variables, that is the
+        dimension of the sequence.
+    :type number_of_variables: int
+
+    :param generator: generator of the pseudo-random numbers used for
+        the randomization. If None, it is derived from the global numpy
+        generator.
+    :type generator: numpy.random.Generator
+
+    :return: numpy array with the draws, of dimensions (sample_size,
+        number_of_draws, number_of_variables).
+    :rtype: numpy.array
+
+    :raise BiogemeError: if one of the dimensions is not positive.
+    """
+    _check_dimensions(sample_size, number_of_draws, number_of_variables)
+    if generator is None:
+        generator = _default_generator()
+    total_size = sample_size * number_of_draws
+    numbers = np.empty((total_size, number_of_variables))
+    for k, base in enumerate(get_prime_numbers(number_of_variables)):
+        # The contribution of the lowest digits is read from a table
+        # with one entry per combination of these digits.
+        table_size = 1
+        while table_size * base <= min(total_size, 65536):
+            table_size *= base
+        low_positions = np.arange(table_size, dtype=np.int64)
+        table = np.zeros(table_size)
+        factor = 1.0
+        power = 1
+        while power < table_size:
+            low_positions, digits = np.divmod(low_positions, base)
+            factor /= base
+            power *= base
+            table += _digit_permutation(base, generator)[digits] * factor
+        # The first element of the sequence, which is 0, is discarded.
+        positions, low_digits = np.divmod(
+            np.arange(1, total_size + 1, dtype=np.int64), table_size
+        )
+        values = table[low_digits]
+        while positions.any():
+            positions, digits = np.divmod(positions, base)
+            factor /= base
+            values += _digit_permutation(base, generator)[digits] * factor
+        numbers[:, k] = (values + generator.random()) % 1.0
+    return numbers.reshape(sample_size, number_of_draws, number_of_variables)
+
+
+def _digit_permutation(base: int, generator: np.random.Generator) -> np.ndarray:
+    """Random permutation of the digits in a given base, where 0 is
+    unchanged, so that the trailing zeros of a number remain zeros.
+
+    :param base: base of the digits.
+    :type base: int
+
+    :param generator: generator of the pseudo-random numbers.
+    :type generator: numpy.random.Generator
+
+    :return: the image of each digit.
+    :rtype: numpy.array
+    """
+    return np.concatenate(([0], 1 + generator.permutation(base - 1)))
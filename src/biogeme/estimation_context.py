@@ -0,0 +1,313 @@
+"""C++ models shared by several models estimated on the same data
+
+:author: Michel Bierlaire
+:date: Sun Oct 18 18:21:37 2026
+
+Transferring the data to the C++ engine, and generating the draws, may
+take more time than the estimation of a small model. When many
+specifications are estimated on the same database, such as the
+configurations of a multiple expression, the BIOGEME objects can share
+an estimation context. The data, the panel map and the draws are
+transferred only when they change, and each model only sends the
+signatures of its expressions.
+
+The C++ engine is sized for a given number of parameters. Therefore,
+the context keeps one C++ model for each number of parameters, up to a
+maximum. When the maximum is reached, the least recently used one is
+released.
+
+The C++ engine identifies the nodes of the expressions by their id,
+and keeps the nodes that it has already received. As the ids are
+derived from the structure of the nodes, the nodes shared by several
+configurations are received only once, and the number of nodes kept by
+a C++ model is bounded by the number of distinct subexpressions. In
+the unlikely event that a node is sent with the id of another one, a
+new C++ model is created.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+import cythonbiogeme.cythonbiogeme as cb
+import numpy as np
+
+from biogeme.exceptions import BiogemeError
+
+if TYPE_CHECKING:
+    from biogeme.biogeme import BIOGEME
+    from biogeme.database import Database
+
+logger = logging.getLogger(__name__)
+
+MAXIMUM_NUMBER_OF_NODES = 100000
+"""Maximum number of nodes of expressions kept by a C++ model. Beyond
+that, a new C++ model is created, so that the nodes can be released."""
+
+NODE_ID = re.compile(rb'\{(\d+)\}')
+"""Identifier of a node in its signature."""
+
+
+class CppModel:
+    """C++ model, and the objects that have been transferred to it. They
+    are compared by identity, to detect a change."""
+
+    def __init__(self, number_of_free_betas: int):
+        """Constructor
+
+        :param number_of_free_betas: number of parameters to estimate.
+        :type number_of_free_betas: int
+        """
+        self.the_cpp: cb.pyBiogeme = cb.pyBiogeme(number_of_free_betas)
+        self.data: object | None = None
+        self.individual_map: object | None = None
+        self.draws: np.ndarray | None = None
+        self.missing_data: float | None = None
+        self.owner: BIOGEME | None = None
+        """Model whose expressions are currently set in the C++ model."""
+        self.number_of_threads: int | None = None
+        """Number of threads used by the current expressions."""
+        self.nodes: dict[bytes, bytes] = {}
+        """Signature of the nodes received by the C++ model, indexed
+        by their id."""
+
+    def register(self, signatures: list[bytes]) -> bool:
+        """Registers the nodes of expressions sent to the C++ model.
+
+        :param signatures: signatures of the expressions.
+        :type signatures: list(bytes)
+
+        :return: False if a node with the same id, but another content,
+            has already been sent. In that case, nothing is registered.
+        :rtype: bool
+        """
+        new_nodes = {}
+        for signature in signatures:
+            node_id = NODE_ID.search(signature).group(1)
+            if self.nodes.get(node_id, signature) != signature:
+                return False
+            new_nodes[node_id] = signature
+        self.nodes.update(new_nodes)
+        return True
+
+
+class EstimationContext:
+    """C++ models holding the data, the panel map and the draws."""
+
+    def __init__(self, database: Database, maximum_number_of_models: int = 3):
+        """Constructor
+
+        :param database: database shared by all the models using the
+            context.
+        :type database: biogeme.database.Database
+
+        :param maximum_number_of_models: maximum number of C++ models
+            kept in memory. Each of them holds a copy of the data.
+        :type maximum_number_of_models: int
+        """
+        self.database: Database = database
+        self.maximum_number_of_models: int = maximum_number_of_models
+        self.models: OrderedDict[int, CppModel] = OrderedDict()
+        """C++ models, indexed by the number of parameters. The most
+        recently used is the last one."""
+
+    def _get_model(self, number_of_free_betas: int) -> CppModel:
+        """Retrieves or creates the C++ model for a given number of
+        parameters.
+
+        :param number_of_free_betas: number of parameters to estimate.
+        :type number_of_free_betas: int
+
+        :return: the C++ model.
+        :rtype: CppModel
+        """
+        model = self.models.get(number_of_free_betas)
+        if model is None:
+            if len(self.models) >= self.maximum_number_of_models:
+                self.models.popitem(last=False)
+            model = CppModel(number_of_free_betas)
+            self.models[number_of_free_betas] = model
+        else:
+            self.models.move_to_end(number_of_free_betas)
+        return model
+
+    def transfer_data(
+        self, number_of_free_betas: int, missing_data: float
+    ) -> cb.pyBiogeme:
+        """Transfers the data and the panel map to the C++ model, if
+        they have changed since the last transfer.
+
+        :param number_of_free_betas: number of parameters to estimate.
+        :type number_of_free_betas: int
+
+        :param missing_data: value representing missing data.
+        :type missing_data: float
+
+        :return: the C++ model.
+        :rtype: cythonbiogeme.cythonbiogeme.pyBiogeme
+        """
+        model = self._get_model(number_of_free_betas)
+        panel_changed = False
+        if self.database.is_panel():
+            if model.individual_map is not self.database.individualMap:
+                model.the_cpp.setPanel(True)
+                model.the_cpp.setDataMap(self.database.individualMap)
+                model.individual_map = self.database.individualMap
+                panel_changed = True
+        if model.data is not self.database.data:
+            logger.debug('Transfer the data to the C++ model')
+            model.the_cpp.setData(self.database.data)
+            model.data = self.database.data
+            if self.database.is_panel() and not panel_changed:
+                model.the_cpp.setDataMap(self.database.individualMap)
+        if model.missing_data != missing_data:
+            model.the_cpp.setMissingData(missing_data)
+            model.missing_data = missing_data
+        return model.the_cpp
+
+    def transfer_draws(self, number_of_free_betas: int, draws: np.ndarray) -> None:
+        """Transfers the draws to the C++ model, if they have changed
+        since the last transfer.
+
+        :param number_of_free_betas: number of parameters to estimate.
+        :type number_of_free_betas: int
+
+        :param draws: draws for Monte-Carlo integration.
+        :type draws: numpy.array
+        """
+        model = self._get_model(number_of_free_betas)
+        if model.draws is not draws:
+            model.the_cpp.setDraws(draws)
+            model.draws = draws
+
+    def _prepare(self, the_biogeme: BIOGEME, signatures: list[bytes]) -> CppModel:
+        """Transfers the data and the draws of a model, and registers
+        the expressions that are about to be sent to the C++ model. If
+        they are not compatible with the expressions already sent, a
+        new C++ model is created.
+
+        :param the_biogeme: model to prepare.
+        :type the_biogeme: biogeme.biogeme.BIOGEME
+
+        :param signatures: signatures of the expressions.
+        :type signatures: list(bytes)
+
+        :return: the C++ model.
+        :rtype: CppModel
+
+        :raise BiogemeError: if the model does not use the database
+            of the context.
+        """
+        if the_biogeme.database is not self.database:
+            error_msg = (
+                f'Model {the_biogeme.modelName} does not use the database '
+                f'of the estimation context: {self.database.name}'
+            )
+            raise BiogemeError(error_msg)
+        number_of_free_betas = the_biogeme.id_manager.number_of_free_betas
+        model = self._get_model(number_of_free_betas)
+        if len(model.nodes) + len(signatures) > MAXIMUM_NUMBER_OF_NODES or (
+            not model.register(signatures)
+        ):
+            logger.debug('New C++ model for the expressions')
+            del self.models[number_of_free_betas]
+            model = self._get_model(number_of_free_betas)
+            model.register(signatures)
+        self.transfer_data(number_of_free_betas, the_biogeme.missingData)
+        if the_biogeme.monte_carlo:
+            self.transfer_draws(number_of_free_betas, the_biogeme.draws)
+        return model
+
+    def activate(self, the_biogeme: BIOGEME) -> cb.pyBiogeme:
+        """Prepares the C++ model for the calculation of the
+        loglikelihood of a model. The data, the draws and the
+        expressions are transferred, unless they are already there.
+
+        :param the_biogeme: model to activate.
+        :type the_biogeme: biogeme.biogeme.BIOGEME
+
+        :return: the C++ model.
+        :rtype: cythonbiogeme.cythonbiogeme.pyBiogeme
+
+        :raise BiogemeError: if the model does not use the database
+            of the context.
+        """
+        if the_biogeme.monte_carlo and the_biogeme.draws is None:
+            # The draws generated when needed must be stored for the
+            # estimation.
+            the_biogeme.draws = the_biogeme.database.materialize_draws()
+        number_of_free_betas = the_biogeme.id_manager.number_of_free_betas
+        number_of_threads = the_biogeme.number_of_threads
+        model = self.models.get(number_of_free_betas)
+        if (
+            model is not None
+            and model.owner is the_biogeme
+            and model.number_of_threads == number_of_threads
+        ):
+            # Only the data and the draws may have been modified since
+            # the last call.
+            the_cpp = self.transfer_data(number_of_free_betas, the_biogeme.missingData)
+            if the_biogeme.monte_carlo:
+                self.transfer_draws(number_of_free_betas, the_biogeme.draws)
+            return the_cpp
+        if the_biogeme.weight is None:
+            model = self._prepare(the_biogeme, the_biogeme.loglikeSignatures)
+            model.the_cpp.setExpressions(
+                the_biogeme.loglikeSignatures, number_of_threads
+            )
+        else:
+            model = self._prepare(
+                the_biogeme,
+                the_biogeme.loglikeSignatures + the_biogeme.weightSignatures,
+            )
+            model.the_cpp.setExpressions(
+                the_biogeme.loglikeSignatures,
+                number_of_threads,
+                the_biogeme.weightSignatures,
+            )
+        if model.owner is not None and number_of_free_betas > 0:
+            # The C++ engine keeps the dimension of the derivatives of
+            # the previous expressions. They are sized for the new ones
+            # by calculating the derivatives once. Otherwise, the
+            # calculation of the function alone fails.
+            the_gradient = np.empty(number_of_free_betas)
+            the_hessian = np.empty((number_of_free_betas, number_of_free_betas))
+            model.the_cpp.calculateLikelihoodAndDerivatives(
+                the_biogeme.id_manager.free_betas_values,
+                the_biogeme.id_manager.fixed_betas_values,
+                the_biogeme.id_manager.free_betas.indices.values(),
+                the_gradient,
+                the_hessian,
+                the_hessian,
+                False,
+                False,
+            )
+        model.owner = the_biogeme
+        model.number_of_threads = number_of_threads
+        return model.the_cpp
+
+    def prepare_simulation(
+        self, the_biogeme: BIOGEME, signatures: list[list[bytes]]
+    ) -> cb.pyBiogeme:
+        """Prepares the C++ model for the simulation of formulas.
+
+        :param the_biogeme: model containing the formulas.
+        :type the_biogeme: biogeme.biogeme.BIOGEME
+
+        :param signatures: signatures of the formulas.
+        :type signatures: list(list(bytes))
+
+        :return: the C++ model.
+        :rtype: cythonbiogeme.cythonbiogeme.pyBiogeme
+
+        :raise BiogemeError: if the model does not use the database
+            of the context.
+        """
+        model = self._prepare(
+            the_biogeme,
+            [node for signature in signatures for node in signature],
+        )
+        return model.the_cpp
@@ -7,8 +7,7 @@
 from __future__ import annotations
 
 import logging
-from itertools import chain
-from typing import TYPE_CHECKING, Callable, Iterable
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterable
 
 from biogeme.configuration import Configuration
 from biogeme.deprecated import deprecated
@@ -34,9 +33,26 @@ from .idmanager import IdManager
 from .numeric_tools import is_numeric
 from .elementary_types import TypeOfElementaryExpression
 from .calculator import calculate_function_and_derivatives
+from .signature import SignatureBuilder
 
 logger = logging.getLogger(__name__)
 
+_metadata_version = object()
+"""Version of the metadata of the expressions, such as the elementary
+expressions that they contain. The metadata cached by an expression is
+valid only if it has been calculated with the current version."""
+
+
+def invalidate_metadata() -> None:
+    """Invalidates the metadata cached by all the expressions. It must be
+    called when an expression is modified in a way that may change the
+    metadata of the expressions containing it, such as the renaming of
+    an elementary expression, the change of status of a parameter, or
+    the selection of another expression in a catalog.
+    """
+    global _metadata_version  # pylint: disable=global-statement
+    _metadata_version = object()
+
 
 class Expression:
     """This is the general arithmetic expression in biogeme.
@@ -71,41 +87,90 @@ class Expression:
         """ Central controller for the multiple expressions
         """
 
+    # Metadata cached by the expression, and the version of the
+    # metadata when it has been calculated.
+    _cache: dict[Hashable, Any] = {}
+    _cache_version: object | None = None
+
     def __iter__(self) -> SelectedExpressionsIterator:
         the_set = self.set_of_configurations()
         return SelectedExpressionsIterator(self, the_set)
 
+    def _cached(self, key: Hashable, calculate: Callable[[], Any]) -> Any:
+        """Metadata of the expression. It is calculated once, from the
+        metadata of the children, and cached until the metadata of the
+        expressions is invalidated by :func:`invalidate_metadata`.
+
+        :param key: identification of the metadata.
+        :type key: Hashable
+
+        :param calculate: function calculating the metadata.
+        :type calculate: fct()
+
+        :return: the metadata. It must not be modified.
+        """
+        if self._cache_version is not _metadata_version:
+            self._cache = {}
+            self._cache_version = _metadata_version
+        if key not in self._cache:
+            self._cache[key] = calculate()
+        return self._cache[key]
+
+    def _distinct_leaves(self) -> tuple[Expression, ...]:
+        """Expressions without children contained in the expression,
+        each of them reported once, even if it appears several times.
+
+        :return: the expressions without children.
+        """
+
+        def calculate() -> tuple[Expression, ...]:
+            leaves = {}
+            for e in self.get_children():
+                if e.get_children():
+                    leaves.update((id(leaf), leaf) for leaf in e._distinct_leaves())
+                else:
+                    leaves[id(e)] = e
+            return tuple(leaves.values())
+
+        return self._cached('distinct_leaves', calculate)
+
     def check_panel_trajectory(self) -> set[str]:
         """Set of variables defined outside of 'PanelLikelihoodTrajectory'
 
         :return: List of names of variables
         """
-        check_children = set(
-            chain.from_iterable(
-                [e.check_panel_trajectory() for e in self.get_children()]
+        return set(
+            self._cached(
+                'check_panel_trajectory',
+                lambda: set().union(
+                    *(e.check_panel_trajectory() for e in self.get_children())
+                ),
             )
         )
-        return check_children
 
     def check_draws(self) -> set[str]:
         """Set of draws defined outside of 'MonteCarlo'
 
         :return: List of names of variables
         """
-        check_children = set(
-            chain.from_iterable([e.check_draws() for e in self.get_children()])
+        return set(
+            self._cached(
+                'check_draws',
+                lambda: set().union(*(e.check_draws() for e in self.get_children())),
+            )
         )
-        return check_children
 
     def check_rv(self) -> set[str]:
         """Set of random variables defined outside of 'Integrate'
 
         :return: List of names of variables
         """
-        check_children = set(
-            chain.from_iterable([e.check_rv() for e in self.get_children()])
+        return set(
+            self._cached(
+                'check_rv',
+                lambda: set().union(*(e.check_rv() for e in self.get_children())),
+            )
         )
-        return check_children
 
     def get_status_id_manager(self) -> tuple[set[str], set[str]]:
         """Check the elementary expressions that are associated with
@@ -114,9 +179,12 @@ class Expression:
         :return: two sets of elementary expressions, those with and
             without an ID manager.
         """
+        # The ID managers are not part of the cached metadata, as they
+        # are frequently modified. Only the elementary expressions are
+        # checked.
         with_id = set()
         without_id = set()
-        for e in self.get_children():
+        for e in self._distinct_leaves():
             yes, no = e.get_status_id_manager()
             with_id.update(yes)
             without_id.update(no)
@@ -1134,13 +1202,15 @@ class Expression:
         :rtype: dict(string:biogeme.expressions.Expression)
 
         """
+
+        def calculate() -> dict[str, Elementary]:
+            result = {}
+            for e in self.children:
+                result.update(e.dict_of_elementary_expression(the_type))
+            return result
+
         return dict(
-            chain(
-                *(
-                    e.dict_of_elementary_expression(the_type).items()
-                    for e in self.children
-                )
-            )
+            self._cached(('dict_of_elementary_expression', the_type), calculate)
         )
 
     def get_elementary_expression(self, name: str) -> Elementary | None:
@@ -1153,10 +1223,15 @@ class Expression:
         :return: the expression if it exists. None otherwise.
         :rtype: biogeme.expressions.Expression
         """
-        for e in self.get_children():
-            if e.get_elementary_expression(name) is not None:
-                return e.get_elementary_expression(name)
-        return None
+
+        def calculate() -> Elementary | None:
+            for e in self.get_children():
+                the_expression = e.get_elementary_expression(name)
+                if the_expression is not None:
+                    return the_expression
+            return None
+
+        return self._cached(('get_elementary_expression', name), calculate)
 
     @deprecated(get_elementary_expression)
     def getElementaryExpression(self, name: str) -> Elementary | None:
@@ -1236,6 +1311,12 @@ class Expression:
             4. the number of children between ( )
             5. the ids of each children, preceeded by a comma.
 
+        Each node appears once, after its children. Structurally
+        identical subexpressions are represented by the same node,
+        subexpressions involving only numerical constants are replaced
+        by their value, and neutral elements of arithmetic operators are
+        removed. See :mod:`biogeme.expressions.signature`.
+
         Consider the following expression:
 
         .. math:: 2 \\beta_1  V_1 -
@@ -1260,8 +1341,6 @@ class Expression:
              b'<Times>{4780527176}(2),4780527120,4511837712',
              b'<exp>{4780527232}(1),4780527176',
              b'<Beta>{4780277264}"beta3"[1],2,0',
-             b'<Beta>{4780277656}"beta2"[0],1,1',
-             b'<Beta>{4780277152}"beta1"[0],0,0',
              b'<GreaterOrEqual>{4780527288}(2),4780277656,4780277152',
              b'<Times>{4780527344}(2),4780277264,4780527288',
              b'<Divide>{4780527400}(2),4780527232,4780527344',
@@ -1271,16 +1350,25 @@ class Expression:
         :rtype: list(string)
 
         """
-        list_of_signatures = []
-        for e in self.get_children():
-            list_of_signatures += e.get_signature()
-        mysignature = f"<{self.get_class_name()}>"
-        mysignature += f"{{{self.get_id()}}}"
-        mysignature += f"({len(self.get_children())})"
+        return SignatureBuilder().build(self)
+
+    def get_node_signature(self, canonical_ids: dict[int, int]) -> str:
+        """Signature of the expression itself, referring to its
+        children by their ids. See :meth:`get_signature`.
+
+        :param canonical_ids: for each child, indexed by its id, the id
+            of the node representing it in the signature.
+        :type canonical_ids: dict(int: int)
+
+        :return: signature of the node.
+        :rtype: str
+        """
+        signature = f"<{self.get_class_name()}>"
+        signature += f"{{{self.get_id()}}}"
+        signature += f"({len(self.get_children())})"
         for e in self.get_children():
-            mysignature += f",{e.get_id()}"
-        list_of_signatures += [mysignature.encode()]
-        return list_of_signatures
+            signature += f",{canonical_ids[e.get_id()]}"
+        return signature
 
     @deprecated(get_signature)
     def getSignature(self) -> list[bytes]:
@@ -1299,10 +1387,10 @@ class Expression:
         """
         if self.get_class_name() == t:
             return True
-        for e in self.get_children():
-            if e.embed_expression(t):
-                return True
-        return False
+        return self._cached(
+            ('embed_expression', t),
+            lambda: any(e.embed_expression(t) for e in self.get_children()),
+        )
 
     @deprecated(embed_expression)
     def embedExpression(self, t: str) -> bool:
@@ -1318,10 +1406,12 @@ class Expression:
             is used in the formula
         :rtype: int
         """
-        nbr = 0
-        for e in self.get_children():
-            nbr += e.count_panel_trajectory_expressions()
-        return nbr
+        return self._cached(
+            'count_panel_trajectory_expressions',
+            lambda: sum(
+                e.count_panel_trajectory_expressions() for e in self.get_children()
+            ),
+        )
 
     @deprecated(count_panel_trajectory_expressions)
     def countPanelTrajectoryExpressions(self) -> int:
@@ -1495,8 +1585,14 @@ class Expression:
         :return: a set of descriptions of the multiple expressions
         :rtype: set(MultipleExpressionDescription)
         """
-        all_sets = [e.set_of_multiple_expressions() for e in self.get_children()]
-        return set(chain.from_iterable(all_sets))
+        return set(
+            self._cached(
+                'set_of_multiple_expressions',
+                lambda: set().union(
+                    *(e.set_of_multiple_expressions() for e in self.get_children())
+                ),
+            )
+        )
 
     def get_id(self) -> int:
         """Retrieve the id of the expression used in the signature
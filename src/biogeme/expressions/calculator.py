@@ -8,8 +8,10 @@
 from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
+import numpy as np
 import cythonbiogeme.cythonbiogeme as ee
 from biogeme.exceptions import BiogemeError
+from .idmanager import IdManager
 
 from biogeme.function_output import (
     BiogemeFunctionOutput,
@@ -48,12 +50,13 @@ def calculate_function_and_derivatives(
     """
     the_cpp = ee.pyEvaluateOneExpression()
     if database is not None:
+        # The panel map is built first, as it may reorder the data.
+        database.build_panel_map()
         the_cpp.setData(database.data)
     if the_expression.embed_expression('PanelLikelihoodTrajectory'):
         if database is None:
             raise BiogemeError('No database has been provided')
         if database.is_panel():
-            database.build_panel_map()
             the_cpp.setDataMap(database.individualMap)
         else:
             error_msg = (
@@ -66,7 +69,7 @@ def calculate_function_and_derivatives(
     if the_expression.requires_draws():
         if database is None:
             raise BiogemeError('No database has been provided')
-        the_cpp.setDraws(database.theDraws)
+        the_cpp.setDraws(database.materialize_draws())
 
     the_cpp.setExpression(the_expression.get_signature())
     the_cpp.setFreeBetas(the_expression.id_manager.free_betas_values)
@@ -93,3 +96,74 @@ def calculate_function_and_derivatives(
     return BiogemeDisaggregateFunctionOutput(
         functions=f, gradients=gres, hessians=hres, bhhhs=bhhhres
     )
+
+
+def calculate_several_functions(
+    expressions: list[Expression],
+    database: Database,
+    number_of_draws: int = 1000,
+    number_of_threads: int = 1,
+) -> list[np.ndarray]:
+    """Calculates several expressions for each entry of the database,
+    with one pass over the data.
+
+    The expressions share the same IDs, and are evaluated together by
+    the C++ engine, as the formulas of a simulation. The IDs of the
+    expressions are restored after the calculation.
+
+    :param expressions: expressions to calculate. They must not involve
+        PanelLikelihoodTrajectory.
+    :param database: database.
+    :param number_of_draws: number of draws if needed by Monte-Carlo
+        integration.
+    :param number_of_threads: number of threads sharing the entries.
+    :return: for each expression, its value for each entry of the database.
+
+    :raise BiogemeError: if an expression is invalid, or involves
+        PanelLikelihoodTrajectory.
+    """
+    for the_expression in expressions:
+        if the_expression.embed_expression('PanelLikelihoodTrajectory'):
+            error_msg = (
+                f'Expression {the_expression} involves '
+                f'"PanelLikelihoodTrajectory". It cannot be calculated for '
+                f'each entry of the database.'
+            )
+            raise BiogemeError(error_msg)
+
+    previous_id_managers = [
+        the_expression.id_manager for the_expression in expressions
+    ]
+    for the_expression in expressions:
+        the_expression.set_id_manager(None)
+    id_manager = IdManager(expressions, database, number_of_draws)
+    try:
+        for the_expression in expressions:
+            the_expression.set_id_manager(id_manager)
+            errors, warnings = the_expression.audit(database)
+            if warnings:
+                logger.warning('\n'.join(warnings))
+            if errors:
+                error_msg = '\n'.join(errors)
+                logger.warning(error_msg)
+                raise BiogemeError(error_msg)
+
+        the_cpp = ee.pyBiogeme(id_manager.number_of_free_betas)
+        the_cpp.setMissingData(expressions[0].missingData)
+        # The panel map is built first, as it may reorder the data.
+        database.build_panel_map()
+        the_cpp.setData(database.data)
+        if id_manager.requires_draws:
+            the_cpp.setDraws(database.materialize_draws())
+        results = the_cpp.simulateSeveralFormulas(
+            [the_expression.get_signature() for the_expression in expressions],
+            id_manager.free_betas_values,
+            id_manager.fixed_betas_values,
+            database.data,
+            number_of_threads,
+            len(database.data),
+        )
+    finally:
+        for the_expression, previous in zip(expressions, previous_id_managers):
+            the_expression.set_id_manager(previous)
+    return [np.asarray(result) for result in results]
@@ -10,7 +10,7 @@ import logging
 from typing import TYPE_CHECKING
 
 from biogeme.exceptions import BiogemeError
-from .base_expressions import Expression
+from .base_expressions import Expression, invalidate_metadata
 from .elementary_types import TypeOfElementaryExpression
 from .numeric_tools import validate, MAX_VALUE
 from ..deprecated import deprecated
@@ -54,6 +54,19 @@ class Elementary(Expression):
         """
         return f"{self.name}"
 
+    @property
+    def name(self) -> str:
+        """Name of the elementary expression"""
+        return self._name
+
+    @name.setter
+    def name(self, name: str) -> None:
+        # The metadata of the expressions containing this one depends
+        # on its name.
+        if getattr(self, '_name', name) != name:
+            invalidate_metadata()
+        self._name = name
+
     def get_status_id_manager(self) -> tuple[list[str], list[str]]:
         """Check the elementary expressions that are associated with
         an ID manager.
@@ -156,13 +169,11 @@ class bioDraws(Elementary):
         self.elementaryIndex = self.id_manager.elementary_expressions.indices[self.name]
         self.drawId = self.id_manager.draws.indices[self.name]
 
-    def get_signature(self) -> list[bytes]:
-        """The signature of a string characterizing an expression.
-
-        This is designed to be communicated to C++, so that the
-        expression can be reconstructed in this environment.
+    def get_node_signature(self, canonical_ids: dict[int, int]) -> str:
+        """Signature of the node, transmitted to C++. See
+        :meth:`biogeme.expressions.Expression.get_signature`.
 
-        The list contains the following elements:
+        It contains the following elements:
 
             1. the name of the expression between < >
             2. the id of the expression between { }, preceded by a comma
@@ -170,38 +181,13 @@ class bioDraws(Elementary):
             4. the unique ID (preceded by a comma),
             5. the draw ID (preceded by a comma).
 
-        Consider the following expression:
-
-        .. math:: 2 \\beta_1  V_1 -
-           \\frac{\\exp(-\\beta_2 V_2) }{ \\beta_3  (\\beta_2 \\geq \\beta_1)}.
-
-        It is defined as::
+        :param canonical_ids: for each child, indexed by its id, the id
+            of the node representing it in the signature. Not used,
+            as the expression has no child.
+        :type canonical_ids: dict(int: int)
 
-            2 * beta1 * Variable1 - expressions.exp(-beta2*Variable2) /
-                (beta3 * (beta2 >= beta1))
-
-        And its signature is::
-
-            [b'<Numeric>{4780527008},2',
-             b'<Beta>{4780277152}"beta1"[0],0,0',
-             b'<Times>{4780526952}(2),4780527008,4780277152',
-             b'<Variable>{4511837152}"Variable1",5,2',
-             b'<Times>{4780527064}(2),4780526952,4511837152',
-             b'<Beta>{4780277656}"beta2"[0],1,1',
-             b'<UnaryMinus>{4780527120}(1),4780277656',
-             b'<Variable>{4511837712}"Variable2",6,3',
-             b'<Times>{4780527176}(2),4780527120,4511837712',
-             b'<exp>{4780527232}(1),4780527176',
-             b'<Beta>{4780277264}"beta3"[1],2,0',
-             b'<Beta>{4780277656}"beta2"[0],1,1',
-             b'<Beta>{4780277152}"beta1"[0],0,0',
-             b'<GreaterOrEqual>{4780527288}(2),4780277656,4780277152',
-             b'<Times>{4780527344}(2),4780277264,4780527288',
-             b'<Divide>{4780527400}(2),4780527232,4780527344',
-             b'<Minus>{4780527456}(2),4780527064,4780527400']
-
-        :return: list of the signatures of an expression and its children.
-        :rtype: list(string)
+        :return: signature of the node.
+        :rtype: str
 
         :raise biogeme.exceptions.BiogemeError: if no id has been defined for
             elementary expression
@@ -219,7 +205,7 @@ class bioDraws(Elementary):
         signature = f"<{self.get_class_name()}>"
         signature += f"{{{self.get_id()}}}"
         signature += f'"{self.name}",{self.elementaryIndex},{self.drawId}'
-        return [signature.encode()]
+        return signature
 
     def dict_of_elementary_expression(
         self, the_type: TypeOfElementaryExpression
@@ -315,13 +301,11 @@ class Variable(Elementary):
             list_of_errors.append(the_error)
         return list_of_errors, list_of_warnings
 
-    def get_signature(self) -> list[bytes]:
-        """The signature of a string characterizing an expression.
+    def get_node_signature(self, canonical_ids: dict[int, int]) -> str:
+        """Signature of the node, transmitted to C++. See
+        :meth:`biogeme.expressions.Expression.get_signature`.
 
-        This is designed to be communicated to C++, so that the
-        expression can be reconstructed in this environment.
-
-        The list contains the following elements:
+        It contains the following elements:
 
             1. the name of the expression between < >
             2. the id of the expression between { }
@@ -329,38 +313,13 @@ class Variable(Elementary):
             4. the unique ID, preceded by a comma.
             5. the variable ID, preceded by a comma.
 
-        Consider the following expression:
-
-        .. math:: 2 \\beta_1  V_1 -
-         \\frac{\\exp(-\\beta_2 V_2) }{ \\beta_3  (\\beta_2 \\geq \\beta_1)}.
-
-        It is defined as::
-
-            2 * beta1 * Variable1 - expressions.exp(-beta2*Variable2) /
-                (beta3 * (beta2 >= beta1))
+        :param canonical_ids: for each child, indexed by its id, the id
+            of the node representing it in the signature. Not used,
+            as the expression has no child.
+        :type canonical_ids: dict(int: int)
 
-        And its signature is::
-
-            [b'<Numeric>{4780527008},2',
-             b'<Beta>{4780277152}"beta1"[0],0,0',
-             b'<Times>{4780526952}(2),4780527008,4780277152',
-             b'<Variable>{4511837152}"Variable1",5,2',
-             b'<Times>{4780527064}(2),4780526952,4511837152',
-             b'<Beta>{4780277656}"beta2"[0],1,1',
-             b'<UnaryMinus>{4780527120}(1),4780277656',
-             b'<Variable>{4511837712}"Variable2",6,3',
-             b'<Times>{4780527176}(2),4780527120,4511837712',
-             b'<exp>{4780527232}(1),4780527176',
-             b'<Beta>{4780277264}"beta3"[1],2,0',
-             b'<Beta>{4780277656}"beta2"[0],1,1',
-             b'<Beta>{4780277152}"beta1"[0],0,0',
-             b'<GreaterOrEqual>{4780527288}(2),4780277656,4780277152',
-             b'<Times>{4780527344}(2),4780277264,4780527288',
-             b'<Divide>{4780527400}(2),4780527232,4780527344',
-             b'<Minus>{4780527456}(2),4780527064,4780527400']
-
-        :return: list of the signatures of an expression and its children.
-        :rtype: list(string)
+        :return: signature of the node.
+        :rtype: str
 
         :raise biogeme.exceptions.BiogemeError: if no id has been defined for
             elementary expression
@@ -378,7 +337,7 @@ class Variable(Elementary):
         signature = f"<{self.get_class_name()}>"
         signature += f"{{{self.get_id()}}}"
         signature += f'"{self.name}",{self.elementaryIndex},{self.variableId}'
-        return [signature.encode()]
+        return signature
 
 
 class DefineVariable(Variable):
@@ -462,13 +421,11 @@ class RandomVariable(Elementary):
             return {self.name: self}
         return {}
 
-    def get_signature(self) -> list[bytes]:
-        """The signature of a string characterizing an expression.
-
-        This is designed to be communicated to C++, so that the
-        expression can be reconstructed in this environment.
+    def get_node_signature(self, canonical_ids: dict[int, int]) -> str:
+        """Signature of the node, transmitted to C++. See
+        :meth:`biogeme.expressions.Expression.get_signature`.
 
-        The list contains the following elements:
+        It contains the following elements:
 
             1. the name of the expression between < >
             2. the id of the expression between { }
@@ -476,38 +433,13 @@ class RandomVariable(Elementary):
             4. the unique ID, preceded by a comma,
             5. the ID of the random variable.
 
-        Consider the following expression:
+        :param canonical_ids: for each child, indexed by its id, the id
+            of the node representing it in the signature. Not used,
+            as the expression has no child.
+        :type canonical_ids: dict(int: int)
 
-        .. math:: 2 \\beta_1  V_1 -
-           \\frac{\\exp(-\\beta_2 V_2) }{ \\beta_3  (\\beta_2 \\geq \\beta_1)}.
-
-        It is defined as::
-
-            2 * beta1 * Variable1 - expressions.exp(-beta2*Variable2) /
-                (beta3 * (beta2 >= beta1))
-
-        And its signature is::
-
-            [b'<Numeric>{4780527008},2',
-             b'<Beta>{4780277152}"beta1"[0],0,0',
-             b'<Times>{4780526952}(2),4780527008,4780277152',
-             b'<Variable>{4511837152}"Variable1",5,2',
-             b'<Times>{4780527064}(2),4780526952,4511837152',
-             b'<Beta>{4780277656}"beta2"[0],1,1',
-             b'<UnaryMinus>{4780527120}(1),4780277656',
-             b'<Variable>{4511837712}"Variable2",6,3',
-             b'<Times>{4780527176}(2),4780527120,4511837712',
-             b'<exp>{4780527232}(1),4780527176',
-             b'<Beta>{4780277264}"beta3"[1],2,0',
-             b'<Beta>{4780277656}"beta2"[0],1,1',
-             b'<Beta>{4780277152}"beta1"[0],0,0',
-             b'<GreaterOrEqual>{4780527288}(2),4780277656,4780277152',
-             b'<Times>{4780527344}(2),4780277264,4780527288',
-             b'<Divide>{4780527400}(2),4780527232,4780527344',
-             b'<Minus>{4780527456}(2),4780527064,4780527400']
-
-        :return: list of the signatures of an expression and its children.
-        :rtype: list(string)
+        :return: signature of the node.
+        :rtype: str
 
         :raise biogeme.exceptions.BiogemeError: if no id has been defined for
             elementary expression
@@ -526,7 +458,7 @@ class RandomVariable(Elementary):
         signature = f"<{self.get_class_name()}>"
         signature += f"{{{self.get_id()}}}"
         signature += f'"{self.name}",{self.elementaryIndex},{self.rvId}'
-        return [signature.encode()]
+        return signature
 
 
 class Beta(Elementary):
@@ -615,6 +547,20 @@ class Beta(Elementary):
             f"{self.ub}, {self.status})"
         )
 
+    @property
+    def status(self) -> int:
+        """If different from 0, the parameter is fixed to its initial
+        value."""
+        return self._status
+
+    @status.setter
+    def status(self, status: int) -> None:
+        # The free and fixed parameters reported by the expressions
+        # containing this one depend on its status.
+        if getattr(self, '_status', status) != status:
+            invalidate_metadata()
+        self._status = status
+
     def fix_betas(
         self,
         beta_values: dict[str, float],
@@ -713,13 +659,11 @@ class Beta(Elementary):
         if self.name in betas:
             self.estimated_value = betas[self.name]
 
-    def get_signature(self) -> list[bytes]:
-        """The signature of a string characterizing an expression.
+    def get_node_signature(self, canonical_ids: dict[int, int]) -> str:
+        """Signature of the node, transmitted to C++. See
+        :meth:`biogeme.expressions.Expression.get_signature`.
 
-        This is designed to be communicated to C++, so that the
-        expression can be reconstructed in this environment.
-
-        The list contains the following elements:
+        It contains the following elements:
 
             1. the name of the expression between < >
             2. the id of the expression between { }
@@ -728,39 +672,13 @@ class Beta(Elementary):
             5. the unique ID,  preceded by a comma
             6. the Beta ID,  preceded by a comma
 
+        :param canonical_ids: for each child, indexed by its id, the id
+            of the node representing it in the signature. Not used,
+            as the expression has no child.
+        :type canonical_ids: dict(int: int)
 
-        Consider the following expression:
-
-        .. math:: 2 \\beta_1  V_1 -
-           \\frac{\\exp(-\\beta_2 V_2) }{ \\beta_3  (\\beta_2 \\geq \\beta_1)}.
-
-        It is defined as::
-
-            2 * beta1 * Variable1 - expressions.exp(-beta2*Variable2) /
-                 (beta3 * (beta2 >= beta1))
-
-        And its signature is::
-
-            [b'<Numeric>{4780527008},2',
-             b'<Beta>{4780277152}"beta1"[0],0,0',
-             b'<Times>{4780526952}(2),4780527008,4780277152',
-             b'<Variable>{4511837152}"Variable1",5,2',
-             b'<Times>{4780527064}(2),4780526952,4511837152',
-             b'<Beta>{4780277656}"beta2"[0],1,1',
-             b'<UnaryMinus>{4780527120}(1),4780277656',
-             b'<Variable>{4511837712}"Variable2",6,3',
-             b'<Times>{4780527176}(2),4780527120,4511837712',
-             b'<exp>{4780527232}(1),4780527176',
-             b'<Beta>{4780277264}"beta3"[1],2,0',
-             b'<Beta>{4780277656}"beta2"[0],1,1',
-             b'<Beta>{4780277152}"beta1"[0],0,0',
-             b'<GreaterOrEqual>{4780527288}(2),4780277656,4780277152',
-             b'<Times>{4780527344}(2),4780277264,4780527288',
-             b'<Divide>{4780527400}(2),4780527232,4780527344',
-             b'<Minus>{4780527456}(2),4780527064,4780527400']
-
-        :return: list of the signatures of an expression and its children.
-        :rtype: list(string)
+        :return: signature of the node.
+        :rtype: str
 
         :raise biogeme.exceptions.BiogemeError: if no id has been defined for
             elementary expression
@@ -780,4 +698,4 @@ class Beta(Elementary):
         signature += (
             f'"{self.name}"[{self.status}],' f"{self.elementaryIndex},{self.betaId}"
         )
-        return [signature.encode()]
+        return signature
@@ -6,6 +6,7 @@
 
 from __future__ import annotations
 
+import copy
 import logging
 from typing import (
     NamedTuple,
@@ -135,6 +136,25 @@ class IdManager:
     def __eq__(self, other) -> bool:
         return self.elementary_expressions == other.elementary_expressions
 
+    def __deepcopy__(self, memo: dict) -> IdManager:
+        """Deep copy of the ID manager, typically performed when the
+        expressions using it are copied. The database, with its data
+        and its draws, is not copied: it is shared by the copies.
+
+        :param memo: objects already copied, indexed by their id.
+        :type memo: dict
+
+        :return: the copy.
+        :rtype: IdManager
+        """
+        the_copy = IdManager.__new__(IdManager)
+        memo[id(self)] = the_copy
+        for name, value in self.__dict__.items():
+            if name != 'database':
+                value = copy.deepcopy(value, memo)
+            setattr(the_copy, name, value)
+        return the_copy
+
     def draw_types(self) -> dict[str, str]:
         """Retrieve the type of draw for each draw expression"""
         return {
@@ -170,6 +190,24 @@ class IdManager:
                     list_of_errors.append(err_msg)
         return list_of_errors, list_of_warnings
 
+    def dict_of_elementary_expression(
+        self, the_type: TypeOfElementaryExpression
+    ) -> dict[str, Elementary]:
+        """Extract a dict with all elementary expressions of a specific
+        type appearing in the expressions.
+
+        :param the_type: the type of expression
+        :type  the_type: TypeOfElementaryExpression
+
+        :return: returns a dict with the elementary expressions, the
+               keys being their names.
+        :rtype: dict(string:biogeme.expressions.Expression)
+        """
+        result = {}
+        for f in self.expressions:
+            result.update(f.dict_of_elementary_expression(the_type=the_type))
+        return result
+
     def prepare(self) -> None:
         """Extract from the formulas the literals (parameters,
         variables, random variables) and decide a numbering convention.
@@ -190,12 +228,7 @@ class IdManager:
         """
 
         # Free parameters (to be estimated), sorted by alphabetical order
-        expr = {}
-        for f in self.expressions:
-            d = f.dict_of_elementary_expression(
-                the_type=TypeOfElementaryExpression.FREE_BETA
-            )
-            expr = dict(expr, **d)
+        expr = self.dict_of_elementary_expression(TypeOfElementaryExpression.FREE_BETA)
 
         self.free_betas = expressions_names_indices(expr)
 
@@ -208,30 +241,17 @@ class IdManager:
         ]
         self.number_of_free_betas = len(self.free_betas.names)
         # Fixed parameters (not to be estimated), sorted by alphabetical order.
-        expr = {}
-        for f in self.expressions:
-            d = f.dict_of_elementary_expression(
-                the_type=TypeOfElementaryExpression.FIXED_BETA
-            )
-            expr = dict(expr, **d)
+        expr = self.dict_of_elementary_expression(TypeOfElementaryExpression.FIXED_BETA)
         self.fixed_betas = expressions_names_indices(expr)
 
         # Random variables for numerical integration
-        expr = {}
-        for f in self.expressions:
-            d = f.dict_of_elementary_expression(
-                the_type=TypeOfElementaryExpression.RANDOM_VARIABLE
-            )
-            expr = dict(expr, **d)
+        expr = self.dict_of_elementary_expression(
+            TypeOfElementaryExpression.RANDOM_VARIABLE
+        )
         self.random_variables = expressions_names_indices(expr)
 
         # Draws
-        expr = {}
-        for f in self.expressions:
-            d = f.dict_of_elementary_expression(
-                the_type=TypeOfElementaryExpression.DRAWS
-            )
-            expr = dict(expr, **d)
+        expr = self.dict_of_elementary_expression(TypeOfElementaryExpression.DRAWS)
         self.draws = expressions_names_indices(expr)
 
         # Variables
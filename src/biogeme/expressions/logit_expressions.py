@@ -237,70 +237,40 @@ class LogLogit(Expression):
         s += ')'
         return s
 
-    def get_signature(self) -> list[bytes]:
-        """The signature of a string characterizing an expression.
+    def get_node_signature(self, canonical_ids: dict[int, int]) -> str:
+        """Signature of the node, transmitted to C++. See
+        :meth:`biogeme.expressions.Expression.get_signature`.
 
-        This is designed to be communicated to C++, so that the
-        expression can be reconstructed in this environment.
+        It contains the following elements:
 
-        The list contains the following elements:
-
-            1. the signatures of all the children expressions,
-            2. the name of the expression between < >
-            3. the id of the expression between { }
-            4. the number of alternatives between ( )
-            5. the id of the expression for the chosen alternative, preceeded
+            1. the name of the expression between < >
+            2. the id of the expression between { }
+            3. the number of alternatives between ( )
+            4. the id of the expression for the chosen alternative, preceeded
                by a comma.
-            6. for each alternative, separated by commas:
+            5. for each alternative, separated by commas:
 
                  a. the number of the alternative, as defined by the user,
                  b. the id of the expression for the utility,
                  c. the id of the expression for the availability condition.
 
-        Consider the following expression:
-
-        .. math:: 2 \\beta_1  V_1 -
-          \\frac{\\exp(-\\beta_2 V_2) }{ \\beta_3  (\\beta_2 \\geq \\beta_1)}.
-
-        It is defined as::
-
-            2 * beta1 * Variable1 - expressions.exp(-beta2*Variable2) /
-                (beta3 * (beta2 >= beta1))
-
-        And its signature is::
-
-            [b'<Numeric>{4780527008},2',
-             b'<Beta>{4780277152}"beta1"[0],0,0',
-             b'<Times>{4780526952}(2),4780527008,4780277152',
-             b'<Variable>{4511837152}"Variable1",5,2',
-             b'<Times>{4780527064}(2),4780526952,4511837152',
-             b'<Beta>{4780277656}"beta2"[0],1,1',
-             b'<UnaryMinus>{4780527120}(1),4780277656',
-             b'<Variable>{4511837712}"Variable2",6,3',
-             b'<Times>{4780527176}(2),4780527120,4511837712',
-             b'<exp>{4780527232}(1),4780527176',
-             b'<Beta>{4780277264}"beta3"[1],2,0',
-             b'<Beta>{4780277656}"beta2"[0],1,1',
-             b'<Beta>{4780277152}"beta1"[0],0,0',
-             b'<GreaterOrEqual>{4780527288}(2),4780277656,4780277152',
-             b'<Times>{4780527344}(2),4780277264,4780527288',
-             b'<Divide>{4780527400}(2),4780527232,4780527344',
-             b'<Minus>{4780527456}(2),4780527064,4780527400']
-
-        :return: list of the signatures of an expression and its children.
-        :rtype: list(string)
+        :param canonical_ids: for each child, indexed by its id, the id
+            of the node representing it in the signature.
+        :type canonical_ids: dict(int: int)
+
+        :return: signature of the node.
+        :rtype: str
         """
-        list_of_signatures = []
-        for e in self.get_children():
-            list_of_signatures += e.get_signature()
         signature = f'<{self.get_class_name()}>'
         signature += f'{{{self.get_id()}}}'
         signature += f'({len(self.util)})'
-        signature += f',{self.choice.get_id()}'
+        signature += f',{canonical_ids[self.choice.get_id()]}'
         for i, e in self.util.items():
-            signature += f',{i},{e.get_id()},{self.av[i].get_id()}'
-        list_of_signatures += [signature.encode()]
-        return list_of_signatures
+            signature += (
+                f',{i},{canonical_ids[e.get_id()]},'
+                f'{canonical_ids[self.av[i].get_id()]}'
+            )
+        return signature
 
 
 class _bioLogLogit(LogLogit):
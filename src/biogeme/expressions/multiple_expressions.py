@@ -163,6 +163,19 @@ class MultipleExpression(Expression, metaclass=abc.ABCMeta):
         _, expr = self.selected()
         return expr.get_signature()
 
+    def get_node_signature(self, canonical_ids: dict[int, int]) -> str:
+        """Signature of the selected expression, transmitted to C++.
+
+        :param canonical_ids: for each child, indexed by its id, the id
+            of the node representing it in the signature.
+        :type canonical_ids: dict(int: int)
+
+        :return: signature of the node.
+        :rtype: str
+        """
+        _, expr = self.selected()
+        return expr.get_node_signature(canonical_ids)
+
     def get_children(self) -> list[Expression]:
         """Retrieve the list of children
 
@@ -91,67 +91,35 @@ class ConditionalSum(Expression):
         )
         return s
 
-    def get_signature(self) -> list[bytes]:
-        """The signature of a string characterizing an expression.
+    def get_node_signature(self, canonical_ids: dict[int, int]) -> str:
+        """Signature of the node, transmitted to C++. See
+        :meth:`biogeme.expressions.Expression.get_signature`.
 
-        This is designed to be communicated to C++, so that the
-        expression can be reconstructed in this environment.
+        It contains the following elements:
 
-        The list contains the following elements:
-
-            1. the signature of the expression defining the key
-            2. the signatures of all the children expressions,
-            3. the name of the expression between < >
-            4. the id of the expression between { }
-            5. the number of elements between ( )
-            6. the id of the expression defining the key
-            7. for each element: the value of the key and the id
+            1. the name of the expression between < >
+            2. the id of the expression between { }
+            3. the number of elements between ( )
+            4. the id of the expression defining the key
+            5. for each element: the value of the key and the id
                of the expression, separated by commas.
 
-        Consider the following expression:
-
-        .. math:: 2 \\beta_1  V_1 -
-           \\frac{\\exp(-\\beta_2 V_2) }{ \\beta_3  (\\beta_2 \\geq \\beta_1)}.
-
-        It is defined as::
-
-            2 * beta1 * Variable1 - expressions.exp(-beta2*Variable2) /
-                (beta3 * (beta2 >= beta1))
-
-        And its signature is::
-
-            [b'<Numeric>{4780527008},2',
-             b'<Beta>{4780277152}"beta1"[0],0,0',
-             b'<Times>{4780526952}(2),4780527008,4780277152',
-             b'<Variable>{4511837152}"Variable1",5,2',
-             b'<Times>{4780527064}(2),4780526952,4511837152',
-             b'<Beta>{4780277656}"beta2"[0],1,1',
-             b'<UnaryMinus>{4780527120}(1),4780277656',
-             b'<Variable>{4511837712}"Variable2",6,3',
-             b'<Times>{4780527176}(2),4780527120,4511837712',
-             b'<exp>{4780527232}(1),4780527176',
-             b'<Beta>{4780277264}"beta3"[1],2,0',
-             b'<Beta>{4780277656}"beta2"[0],1,1',
-             b'<Beta>{4780277152}"beta1"[0],0,0',
-             b'<GreaterOrEqual>{4780527288}(2),4780277656,4780277152',
-             b'<Times>{4780527344}(2),4780277264,4780527288',
-             b'<Divide>{4780527400}(2),4780527232,4780527344',
-             b'<Minus>{4780527456}(2),4780527064,4780527400']
-
-        :return: list of the signatures of an expression and its children.
-        :rtype: list(string)
+        :param canonical_ids: for each child, indexed by its id, the id
+            of the node representing it in the signature.
+        :type canonical_ids: dict(int: int)
+
+        :return: signature of the node.
+        :rtype: str
         """
-        list_of_signatures = []
-        for key, expression in self.list_of_terms:
-            list_of_signatures += key.get_signature()
-            list_of_signatures += expression.get_signature()
         signature = f'<{self.get_class_name()}>'
         signature += f'{{{self.get_id()}}}'
         signature += f'({len(self.list_of_terms)})'
         for key, expression in self.list_of_terms:
-            signature += f',{key.get_id()},{expression.get_id()}'
-        list_of_signatures += [signature.encode()]
-        return list_of_signatures
+            signature += (
+                f',{canonical_ids[key.get_id()]},'
+                f'{canonical_ids[expression.get_id()]}'
+            )
+        return signature
 
 
 class bioMultSum(Expression):
@@ -280,68 +248,33 @@ class Elem(Expression):
         s += f'}}[{self.keyExpression}]'
         return s
 
-    def get_signature(self) -> list[bytes]:
-        """The signature of a string characterizing an expression.
-
-        This is designed to be communicated to C++, so that the
-        expression can be reconstructed in this environment.
+    def get_node_signature(self, canonical_ids: dict[int, int]) -> str:
+        """Signature of the node, transmitted to C++. See
+        :meth:`biogeme.expressions.Expression.get_signature`.
 
-        The list contains the following elements:
+        It contains the following elements:
 
-            1. the signature of the expression defining the key
-            2. the signatures of all the children expressions,
-            3. the name of the expression between < >
-            4. the id of the expression between { }
-            5. the number of elements between ( )
-            6. the id of the expression defining the key
-            7. for each element: the value of the key and the id
+            1. the name of the expression between < >
+            2. the id of the expression between { }
+            3. the number of elements between ( )
+            4. the id of the expression defining the key
+            5. for each element: the value of the key and the id
                of the expression, separated by commas.
 
-        Consider the following expression:
-
-        .. math:: 2 \\beta_1  V_1 -
-           \\frac{\\exp(-\\beta_2 V_2) }{ \\beta_3  (\\beta_2 \\geq \\beta_1)}.
-
-        It is defined as::
-
-            2 * beta1 * Variable1 - expressions.exp(-beta2*Variable2) /
-                (beta3 * (beta2 >= beta1))
-
-        And its signature is::
-
-            [b'<Numeric>{4780527008},2',
-             b'<Beta>{4780277152}"beta1"[0],0,0',
-             b'<Times>{4780526952}(2),4780527008,4780277152',
-             b'<Variable>{4511837152}"Variable1",5,2',
-             b'<Times>{4780527064}(2),4780526952,4511837152',
-             b'<Beta>{4780277656}"beta2"[0],1,1',
-             b'<UnaryMinus>{4780527120}(1),4780277656',
-             b'<Variable>{4511837712}"Variable2",6,3',
-             b'<Times>{4780527176}(2),4780527120,4511837712',
-             b'<exp>{4780527232}(1),4780527176',
-             b'<Beta>{4780277264}"beta3"[1],2,0',
-             b'<Beta>{4780277656}"beta2"[0],1,1',
-             b'<Beta>{4780277152}"beta1"[0],0,0',
-             b'<GreaterOrEqual>{4780527288}(2),4780277656,4780277152',
-             b'<Times>{4780527344}(2),4780277264,4780527288',
-             b'<Divide>{4780527400}(2),4780527232,4780527344',
-             b'<Minus>{4780527456}(2),4780527064,4780527400']
-
-        :return: list of the signatures of an expression and its children.
-        :rtype: list(string)
+        :param canonical_ids: for each child, indexed by its id, the id
+            of the node representing it in the signature.
+        :type canonical_ids: dict(int: int)
+
+        :return: signature of the node.
+        :rtype: str
         """
-        list_of_signatures = []
-        list_of_signatures += self.keyExpression.get_signature()
-        for i, e in self.dict_of_expressions.items():
-            list_of_signatures += e.get_signature()
         signature = f'<{self.get_class_name()}>'
         signature += f'{{{self.get_id()}}}'
         signature += f'({len(self.dict_of_expressions)})'
-        signature += f',{self.keyExpression.get_id()}'
+        signature += f',{canonical_ids[self.keyExpression.get_id()]}'
         for i, e in self.dict_of_expressions.items():
-            signature += f',{i},{e.get_id()}'
-        list_of_signatures += [signature.encode()]
-        return list_of_signatures
+            signature += f',{i},{canonical_ids[e.get_id()]}'
+        return signature
 
 
 class LinearTermTuple(NamedTuple):
@@ -432,19 +365,16 @@ class bioLinearUtility(Expression):
 
         return {}
 
-    def get_signature(self) -> list[bytes]:
-        """The signature of a string characterizing an expression.
-
-        This is designed to be communicated to C++, so that the
-        expression can be reconstructed in this environment.
+    def get_node_signature(self, canonical_ids: dict[int, int]) -> str:
+        """Signature of the node, transmitted to C++. See
+        :meth:`biogeme.expressions.Expression.get_signature`.
 
-        The list contains the following elements:
+        It contains the following elements:
 
-            1. the signatures of all the children expressions,
-            2. the name of the expression between < >
-            3. the id of the expression between { }
-            4. the number of terms in the utility ( )
-            5. for each term:
+            1. the name of the expression between < >
+            2. the id of the expression between { }
+            3. the number of terms in the utility ( )
+            4. for each term:
 
                 a. the id of the Beta parameter
                 b. the unique id of the Beta parameter
@@ -453,49 +383,19 @@ class bioLinearUtility(Expression):
                 e. the unique id of the variable
                 f. the name of the variable
 
-        Consider the following expression:
-
-        .. math:: 2 \\beta_1  V_1 -
-          \\frac{\\exp(-\\beta_2 V_2) }{ \\beta_3  (\\beta_2 \\geq \\beta_1)}.
-
-        It is defined as::
-
-            2 * beta1 * Variable1 - expressions.exp(-beta2*Variable2) /
-                (beta3 * (beta2 >= beta1))
-
-        And its signature is::
-
-            [b'<Numeric>{4780527008},2',
-             b'<Beta>{4780277152}"beta1"[0],0,0',
-             b'<Times>{4780526952}(2),4780527008,4780277152',
-             b'<Variable>{4511837152}"Variable1",5,2',
-             b'<Times>{4780527064}(2),4780526952,4511837152',
-             b'<Beta>{4780277656}"beta2"[0],1,1',
-             b'<UnaryMinus>{4780527120}(1),4780277656',
-             b'<Variable>{4511837712}"Variable2",6,3',
-             b'<Times>{4780527176}(2),4780527120,4511837712',
-             b'<exp>{4780527232}(1),4780527176',
-             b'<Beta>{4780277264}"beta3"[1],2,0',
-             b'<Beta>{4780277656}"beta2"[0],1,1',
-             b'<Beta>{4780277152}"beta1"[0],0,0',
-             b'<GreaterOrEqual>{4780527288}(2),4780277656,4780277152',
-             b'<Times>{4780527344}(2),4780277264,4780527288',
-             b'<Divide>{4780527400}(2),4780527232,4780527344',
-             b'<Minus>{4780527456}(2),4780527064,4780527400']
-
-        :return: list of the signatures of an expression and its children.
-        :rtype: list(string)
+        :param canonical_ids: for each child, indexed by its id, the id
+            of the node representing it in the signature.
+        :type canonical_ids: dict(int: int)
+
+        :return: signature of the node.
+        :rtype: str
         """
-        list_of_signatures = []
-        for e in self.get_children():
-            list_of_signatures += e.get_signature()
         signature = f'<{self.get_class_name()}>'
         signature += f'{{{self.get_id()}}}'
         signature += f'({len(self.listOfTerms)})'
         for b, v in self.listOfTerms:
             signature += (
-                f',{b.get_id()},{b.elementaryIndex},{b.name},'
-                f'{v.get_id()},{v.elementaryIndex},{v.name}'
+                f',{canonical_ids[b.get_id()]},{b.elementaryIndex},{b.name},'
+                f'{canonical_ids[v.get_id()]},{v.elementaryIndex},{v.name}'
             )
-        list_of_signatures += [signature.encode()]
-        return list_of_signatures
+        return signature
@@ -0,0 +1,280 @@
+"""Signature of an expression, communicated to the C++ engine
+
+:author: Michel Bierlaire
+:date: Mon Oct 19 20:11:37 2026
+
+The C++ engine reconstructs an expression from a list of strings, one
+for each node, where each node refers to its children by their
+ids. The expression is treated as a directed acyclic graph:
+
+    - a node shared by several parents is transmitted only once,
+    - two nodes with the same structure (same type, same parameters
+      and same children) are represented by the same node, so that a
+      subexpression built several times, such as the utility of an
+      alternative appearing in several nests, is built only once by
+      the C++ engine,
+    - the id of a node is derived from its structure, and not from the
+      Python object. Therefore, the same subexpression has the same id
+      in the signatures of different expressions, and the ids do not
+      depend on the lifetime of the expressions,
+    - a subexpression involving only numerical constants is replaced
+      by its value,
+    - the neutral elements of the arithmetic operators, such as
+      :math:`x + 0` or :math:`1 \\cdot x`, are removed.
+
+The expressions themselves are not modified.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from biogeme.exceptions import BiogemeError
+
+if TYPE_CHECKING:
+    from biogeme.expressions import Expression
+
+FOLDABLE_EXPRESSIONS = {
+    'Plus',
+    'Minus',
+    'Times',
+    'Divide',
+    'Power',
+    'bioMin',
+    'bioMax',
+    'And',
+    'Or',
+    'Equal',
+    'NotEqual',
+    'LessOrEqual',
+    'GreaterOrEqual',
+    'Less',
+    'Greater',
+    'UnaryMinus',
+    'exp',
+    'sin',
+    'cos',
+    'log',
+    'logzero',
+}
+"""Expressions replaced by their value when all their children are
+numerical constants."""
+
+NEUTRAL_ELEMENTS: dict[str, tuple[float, bool]] = {
+    'Plus': (0.0, True),
+    'Times': (1.0, True),
+    'Minus': (0.0, False),
+    'Divide': (1.0, False),
+    'Power': (1.0, False),
+}
+"""For each binary operator, its neutral element, and a boolean that is
+True if it is neutral on both sides, and False if it is neutral only on
+the right."""
+
+NODE_ID_SIZE = 7
+"""Number of bytes of the ids of the nodes, derived from their
+structure."""
+
+
+class SignatureBuilder:
+    """Builds the signature of an expression, one node at a time."""
+
+    def __init__(self) -> None:
+        self.signatures: dict[int, bytes] = {}
+        """Signature of each node, indexed by its id, each after the ones
+        of its children."""
+
+        self.children: dict[int, list[int]] = {}
+        """Ids of the children of each node of the signature."""
+
+        self.canonical_ids: dict[int, int] = {}
+        """For each node already processed, id of the node representing
+        it in the signature."""
+
+        self.values: dict[int, float] = {}
+        """Value of the nodes of the signature that are numerical
+        constants."""
+
+        self.nodes: dict[int, tuple[str, str, tuple[int, ...]]] = {}
+        """Structure of each node of the signature, indexed by its id,
+        that is, the name of the class of the node, its signature after
+        the header ``<Class>{id}``, and the ids of its children."""
+
+    def _neutral(self, expression: Expression) -> int | None:
+        """Checks if one of the two children of a binary operator is its
+        neutral element.
+
+        :param expression: expression to check.
+        :type expression: biogeme.expressions.Expression
+
+        :return: id of the node representing the other child, or None
+            if there is no neutral element.
+        :rtype: int
+        """
+        neutral = NEUTRAL_ELEMENTS.get(expression.get_class_name())
+        if neutral is None:
+            return None
+        element, both_sides = neutral
+        left, right = (
+            self.canonical_ids[child.get_id()] for child in expression.get_children()
+        )
+        if self.values.get(right) == element:
+            return left
+        if both_sides and self.values.get(left) == element:
+            return right
+        return None
+
+    def _fold(self, expression: Expression) -> float | None:
+        """Calculates the value of an expression involving only
+        numerical constants.
+
+        :param expression: expression to evaluate.
+        :type expression: biogeme.expressions.Expression
+
+        :return: the value, or None if the expression involves
+            something else than constants, or if its value is not a
+            finite real number.
+        :rtype: float
+        """
+        if expression.get_class_name() not in FOLDABLE_EXPRESSIONS:
+            return None
+        if any(
+            self.canonical_ids[child.get_id()] not in self.values
+            for child in expression.get_children()
+        ):
+            return None
+        try:
+            with np.errstate(all='ignore'):
+                value = float(expression.get_value())
+        except (ArithmeticError, TypeError, ValueError):
+            return None
+        return value if math.isfinite(value) else None
+
+    def _add(self, expression_id: int, signature: str, children: list[int]) -> int:
+        """Adds the signature of a node, unless a node with the same
+        structure has already been added. The id of the node in the
+        signature is derived from its structure.
+
+        :param expression_id: id of the node.
+        :type expression_id: int
+
+        :param signature: signature of the node, starting with the
+            name of its class and its id: ``<Class>{expression_id}``. The
+            class is the one of the signature, which may differ from the
+            class of the expression, such as for a catalog.
+        :type signature: str
+
+        :param children: ids of the children of the node.
+        :type children: list(int)
+
+        :return: id of the node representing the expression.
+        :rtype: int
+
+        :raise BiogemeError: if the signature does not start with the
+            name of the class and the id of the node, or if two nodes
+            with different structures obtain the same id.
+        """
+        class_name = signature[1 : signature.find('>')]
+        header = f'<{class_name}>{{{expression_id}}}'
+        if not signature.startswith(header):
+            error_msg = (
+                f'The signature of node {expression_id} should start with '
+                f'{header}: {signature}'
+            )
+            raise BiogemeError(error_msg)
+        rest = signature[len(header) :]
+        structure = (class_name, rest, tuple(children))
+        # The ids of the children are derived from their own structure.
+        digest = hashlib.blake2b(repr(structure).encode(), digest_size=NODE_ID_SIZE)
+        node_id = int.from_bytes(digest.digest(), 'big')
+        known = self.nodes.get(node_id)
+        if known is not None:
+            if known != structure:
+                error_msg = (
+                    f'Two nodes have the same id {node_id}: {known} and '
+                    f'{structure}'
+                )
+                raise BiogemeError(error_msg)
+            return node_id
+        self.nodes[node_id] = structure
+        self.signatures[node_id] = f'<{class_name}>{{{node_id}}}{rest}'.encode()
+        self.children[node_id] = children
+        return node_id
+
+    def _process(self, expression: Expression) -> int:
+        """Processes a node, after its children.
+
+        :param expression: node to process.
+        :type expression: biogeme.expressions.Expression
+
+        :return: id of the node representing the expression.
+        :rtype: int
+        """
+        expression_id = expression.get_id()
+        value = self._fold(expression)
+        if value is not None:
+            node_id = self._add(
+                expression_id, f'<Numeric>{{{expression_id}}},{value}', []
+            )
+            self.values[node_id] = value
+            return node_id
+        node_id = self._neutral(expression)
+        if node_id is not None:
+            return node_id
+        node_id = self._add(
+            expression_id,
+            expression.get_node_signature(self.canonical_ids),
+            [self.canonical_ids[child.get_id()] for child in expression.get_children()],
+        )
+        if expression.get_class_name() == 'Numeric':
+            self.values[node_id] = expression.get_value()
+        return node_id
+
+    def build(self, expression: Expression) -> list[bytes]:
+        """Builds the signature of an expression.
+
+        :param expression: expression to process.
+        :type expression: biogeme.expressions.Expression
+
+        :return: signatures of the nodes, the last one being the node
+            representing the expression.
+        :rtype: list(bytes)
+        """
+        # Depth-first traversal, without recursion, where each node is
+        # processed after its children.
+        stack: list[tuple[Expression, bool]] = [(expression, False)]
+        while stack:
+            current, children_processed = stack.pop()
+            if current.get_id() in self.canonical_ids:
+                continue
+            if children_processed:
+                self.canonical_ids[current.get_id()] = self._process(current)
+                continue
+            stack.append((current, True))
+            stack += [
+                (child, False)
+                for child in reversed(current.get_children())
+                if child.get_id() not in self.canonical_ids
+            ]
+        # The nodes replaced by a constant, or by one of their children,
+        # may leave nodes that are not used anymore. The node
+        # representing the expression comes after all the nodes that
+        # are used, as the C++ engine considers the last node as the
+        # expression.
+        used = set()
+        stack = [self.canonical_ids[expression.get_id()]]
+        while stack:
+            node_id = stack.pop()
+            if node_id not in used:
+                used.add(node_id)
+                stack += self.children[node_id]
+        return [
+            signature
+            for node_id, signature in self.signatures.items()
+            if node_id in used
+        ]
+
@@ -372,63 +372,31 @@ class Derive(UnaryOperator):
         # Name of the elementary expression by which the derivative is taken
         self.elementaryName = name
 
-    def get_signature(self) -> list[bytes]:
-        """The signature of a string characterizing an expression.
-
-        This is designed to be communicated to C++, so that the
-        expression can be reconstructed in this environment.
-
-        The list contains the following elements:
-
-            1. the signatures of the child expression,
-            2. the name of the expression between < >
-            3. the id of the expression between { }
-            4. the id of the child, preceded by a comma.
-
-        Consider the following expression:
-
-        .. math:: 2 \\beta_1  V_1 -
-           \\frac{\\exp(-\\beta_2 V_2) }{ \\beta_3  (\\beta_2 \\geq \\beta_1)}.
-
-        It is defined as::
-
-            2 * beta1 * Variable1 - expressions.exp(-beta2*Variable2) /
-                (beta3 * (beta2 >= beta1))
-
-        And its signature is::
-
-            [b'<Numeric>{4780527008},2',
-             b'<Beta>{4780277152}"beta1"[0],0,0',
-             b'<Times>{4780526952}(2),4780527008,4780277152',
-             b'<Variable>{4511837152}"Variable1",5,2',
-             b'<Times>{4780527064}(2),4780526952,4511837152',
-             b'<Beta>{4780277656}"beta2"[0],1,1',
-             b'<UnaryMinus>{4780527120}(1),4780277656',
-             b'<Variable>{4511837712}"Variable2",6,3',
-             b'<Times>{4780527176}(2),4780527120,4511837712',
-             b'<exp>{4780527232}(1),4780527176',
-             b'<Beta>{4780277264}"beta3"[1],2,0',
-             b'<Beta>{4780277656}"beta2"[0],1,1',
-             b'<Beta>{4780277152}"beta1"[0],0,0',
-             b'<GreaterOrEqual>{4780527288}(2),4780277656,4780277152',
-             b'<Times>{4780527344}(2),4780277264,4780527288',
-             b'<Divide>{4780527400}(2),4780527232,4780527344',
-             b'<Minus>{4780527456}(2),4780527064,4780527400']
-
-        :return: list of the signatures of an expression and its children.
-        :rtype: list(string)
+    def get_node_signature(self, canonical_ids: dict[int, int]) -> str:
+        """Signature of the node, transmitted to C++. See
+        :meth:`biogeme.expressions.Expression.get_signature`.
+
+        It contains the following elements:
+
+            1. the name of the expression between < >
+            2. the id of the expression between { }
+            3. the id of the child, preceded by a comma.
+
+        :param canonical_ids: for each child, indexed by its id, the id
+            of the node representing it in the signature.
+        :type canonical_ids: dict(int: int)
+
+        :return: signature of the node.
+        :rtype: str
         """
         elementary_index = self.id_manager.elementary_expressions.indices[
             self.elementaryName
         ]
-        list_of_signatures = []
-        list_of_signatures += self.child.get_signature()
         my_signature = f'<{self.get_class_name()}>'
         my_signature += f'{{{self.get_id()}}}'
-        my_signature += f',{self.child.get_id()}'
+        my_signature += f',{canonical_ids[self.child.get_id()]}'
         my_signature += f',{elementary_index}'
-        list_of_signatures += [my_signature.encode()]
-        return list_of_signatures
+        return my_signature
 
     def __str__(self) -> str:
         return 'Derive({self.child}, "{self.elementName}")'
@@ -476,65 +444,32 @@ class Integrate(UnaryOperator):
             list_of_errors.append(the_error)
         return list_of_errors, list_of_warnings
 
-    def get_signature(self) -> list[bytes]:
-        """The signature of a string characterizing an expression.
-
-        This is designed to be communicated to C++, so that the
-        expression can be reconstructed in this environment.
-
-        The list contains the following elements:
-
-            1. the signatures of the child expression,
-            2. the name of the expression between < >
-            3. the id of the expression between { }, preceeded by a comma
-            4. the id of the children, preceeded by a comma
-            5. the index of the randon variable, preceeded by a comma
-
-        Consider the following expression:
-
-        .. math:: 2 \\beta_1  V_1 -
-             \\frac{\\exp(-\\beta_2 V_2) }
-             { \\beta_3  (\\beta_2 \\geq \\beta_1)}.
-
-        It is defined as::
-
-            2 * beta1 * Variable1 - expressions.exp(-beta2*Variable2) /
-                 (beta3 * (beta2 >= beta1))
-
-        And its signature is::
-
-            [b'<Numeric>{4780527008},2',
-             b'<Beta>{4780277152}"beta1"[0],0,0',
-             b'<Times>{4780526952}(2),4780527008,4780277152',
-             b'<Variable>{4511837152}"Variable1",5,2',
-             b'<Times>{4780527064}(2),4780526952,4511837152',
-             b'<Beta>{4780277656}"beta2"[0],1,1',
-             b'<UnaryMinus>{4780527120}(1),4780277656',
-             b'<Variable>{4511837712}"Variable2",6,3',
-             b'<Times>{4780527176}(2),4780527120,4511837712',
-             b'<exp>{4780527232}(1),4780527176',
-             b'<Beta>{4780277264}"beta3"[1],2,0',
-             b'<Beta>{4780277656}"beta2"[0],1,1',
-             b'<Beta>{4780277152}"beta1"[0],0,0',
-             b'<GreaterOrEqual>{4780527288}(2),4780277656,4780277152',
-             b'<Times>{4780527344}(2),4780277264,4780527288',
-             b'<Divide>{4780527400}(2),4780527232,4780527344',
-             b'<Minus>{4780527456}(2),4780527064,4780527400']
-
-        :return: list of the signatures of an expression and its children.
-        :rtype: list(string)
+    def get_node_signature(self, canonical_ids: dict[int, int]) -> str:
+        """Signature of the node, transmitted to C++. See
+        :meth:`biogeme.expressions.Expression.get_signature`.
+
+        It contains the following elements:
+
+            1. the name of the expression between < >
+            2. the id of the expression between { }, preceeded by a comma
+            3. the id of the children, preceeded by a comma
+            4. the index of the randon variable, preceeded by a comma
+
+        :param canonical_ids: for each child, indexed by its id, the id
+            of the node representing it in the signature.
+        :type canonical_ids: dict(int: int)
+
+        :return: signature of the node.
+        :rtype: str
         """
         random_variable_index = self.id_manager.random_variables.indices[
             self.randomVariableName
         ]
-        list_of_signatures = []
-        list_of_signatures += self.child.get_signature()
         my_signature = f'<{self.get_class_name()}>'
         my_signature += f'{{{self.get_id()}}}'
-        my_signature += f',{self.child.get_id()}'
+        my_signature += f',{canonical_ids[self.child.get_id()]}'
         my_signature += f',{random_variable_index}'
-        list_of_signatures += [my_signature.encode()]
-        return list_of_signatures
+        return my_signature
 
     def __str__(self) -> str:
         return f'Integrate({self.child}, "{self.randomVariableName}")'
@@ -576,64 +511,31 @@ class BelongsTo(UnaryOperator):
             list_of_warnings.append(the_warning)
         return list_of_errors, list_of_warnings
 
-    def get_signature(self) -> list[bytes]:
-        """The signature of a string characterizing an expression.
-
-        This is designed to be communicated to C++, so that the
-        expression can be reconstructed in this environment.
-
-        The list contains the following elements:
-
-            1. the signatures of the child expression,
-            2. the name of the expression between < >
-            3. the id of the expression between { }, preceded by a comma
-            4. the id of the children, preceded by a comma
-            5. the index of the randon variable, preceded by a comma
-
-        Consider the following expression:
-
-        .. math:: 2 \\beta_1  V_1 -
-             \\frac{\\exp(-\\beta_2 V_2) }
-             { \\beta_3  (\\beta_2 \\geq \\beta_1)}.
-
-        It is defined as::
-
-            2 * beta1 * Variable1 - expressions.exp(-beta2*Variable2) /
-                 (beta3 * (beta2 >= beta1))
-
-        And its signature is::
-
-            [b'<Numeric>{4780527008},2',
-             b'<Beta>{4780277152}"beta1"[0],0,0',
-             b'<Times>{4780526952}(2),4780527008,4780277152',
-             b'<Variable>{4511837152}"Variable1",5,2',
-             b'<Times>{4780527064}(2),4780526952,4511837152',
-             b'<Beta>{4780277656}"beta2"[0],1,1',
-             b'<UnaryMinus>{4780527120}(1),4780277656',
-             b'<Variable>{4511837712}"Variable2",6,3',
-             b'<Times>{4780527176}(2),4780527120,4511837712',
-             b'<exp>{4780527232}(1),4780527176',
-             b'<Beta>{4780277264}"beta3"[1],2,0',
-             b'<Beta>{4780277656}"beta2"[0],1,1',
-             b'<Beta>{4780277152}"beta1"[0],0,0',
-             b'<GreaterOrEqual>{4780527288}(2),4780277656,4780277152',
-             b'<Times>{4780527344}(2),4780277264,4780527288',
-             b'<Divide>{4780527400}(2),4780527232,4780527344',
-             b'<Minus>{4780527456}(2),4780527064,4780527400']
-
-        :return: list of the signatures of an expression and its children.
-        :rtype: list(string)
+    def get_node_signature(self, canonical_ids: dict[int, int]) -> str:
+        """Signature of the node, transmitted to C++. See
+        :meth:`biogeme.expressions.Expression.get_signature`.
+
+        It contains the following elements:
+
+            1. the name of the expression between < >
+            2. the id of the expression between { }, preceded by a comma
+            3. the id of the children, preceded by a comma
+            4. the index of the randon variable, preceded by a comma
+
+        :param canonical_ids: for each child, indexed by its id, the id
+            of the node representing it in the signature.
+        :type canonical_ids: dict(int: int)
+
+        :return: signature of the node.
+        :rtype: str
         """
-        list_of_signatures = []
-        list_of_signatures += self.child.get_signature()
         signature = f'<{self.get_class_name()}>'
         signature += f'{{{self.get_id()}}}'
         signature += f'({len(self.the_set)})'
-        signature += f',{self.child.get_id()}'
+        signature += f',{canonical_ids[self.child.get_id()]}'
         for elem in self.the_set:
             signature += f',{elem}'
-        list_of_signatures += [signature.encode()]
-        return list_of_signatures
+        return signature
 
     def __str__(self) -> str:
         return f'BelongsTo({self.child}, "{self.the_set}")'
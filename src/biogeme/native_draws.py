@@ -1,3 +1,6 @@
+from __future__ import annotations
+
+from functools import partial
 from typing import NamedTuple, Callable
 
 import numpy as np
@@ -5,82 +8,313 @@ import numpy as np
 from biogeme import draws
 
 RandomNumberGenerator = Callable[[int, int], np.ndarray]
+"""Function generating the draws of the whole sample. Arguments:
+sample_size, number_of_draws. The native generators also accept the
+keyword argument "generator", the :class:`numpy.random.Generator`
+to use instead of the global one. It is ignored by the deterministic
+generators, such as Halton."""
+
+ChunkGenerator = Callable[[int, int, int], np.ndarray]
+"""Function generating the draws of the individuals in the range
+[first_individual, last_individual[. Arguments: first_individual,
+last_individual, number_of_draws. The native generators also accept
+the keyword argument "key", the seed and the identification of the
+streams of pseudo-random numbers (see
+:func:`biogeme.random_streams.get_generator`), so that the draws of an
+individual do not depend on the range. It is ignored by the
+deterministic generators, such as Halton."""
+
+JointGenerator = Callable[[int, int, int], np.ndarray]
+"""Function generating jointly the uniform draws of several variables,
+each variable being one dimension of a low-discrepancy
+sequence. Arguments: sample_size, number_of_draws,
+number_of_variables. It also accepts the keyword argument
+"generator". It returns an array of dimensions (sample_size,
+number_of_draws, number_of_variables)."""
+
+Transform = Callable[[np.ndarray], np.ndarray]
+"""Function transforming uniform draws on [0, 1] into draws of another
+distribution."""
 
 
 class RandomNumberGeneratorTuple(NamedTuple):
     generator: RandomNumberGenerator
     description: str
+    chunk_generator: ChunkGenerator | None = None
+    """If not None, the draws of any range of individuals can be
+    generated independently of the others, and do not need to be
+    stored for the whole sample."""
+    joint_generator: JointGenerator | None = None
+    """If not None, the draws of all the variables sharing the same
+    joint generator are generated together, each variable being one
+    dimension of the sequence."""
+    transform: Transform | None = None
+    """Transformation applied to the uniform draws generated by the
+    joint generator. If None, the uniform draws are used."""
+
+
+def uniform_antithetic(
+    sample_size: int,
+    number_of_draws: int,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
+    return draws.get_antithetic(
+        draws.get_uniform, sample_size, number_of_draws, generator=generator
+    )
 
 
-def uniform_antithetic(sample_size: int, number_of_draws: int) -> np.ndarray:
-    return draws.get_antithetic(draws.get_uniform, sample_size, number_of_draws)
+def halton2(
+    sample_size: int,
+    number_of_draws: int,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
+    return draws.get_halton_draws(sample_size, number_of_draws, base=2, skip=10)
 
 
-def halton2(sample_size: int, number_of_draws: int) -> np.ndarray:
-    return draws.get_halton_draws(sample_size, number_of_draws, base=2, skip=10)
+def halton2_chunk(
+    first_individual: int,
+    last_individual: int,
+    number_of_draws: int,
+    key: tuple[int, ...] = (0,),
+) -> np.ndarray:
+    return draws.get_halton_draws_of_individuals(
+        first_individual, last_individual, number_of_draws, base=2, skip=10
+    )
 
 
-def halton3(sample_size: int, number_of_draws: int) -> np.ndarray:
+def halton3(
+    sample_size: int,
+    number_of_draws: int,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
     return draws.get_halton_draws(sample_size, number_of_draws, base=3, skip=10)
 
 
-def halton5(sample_size: int, number_of_draws: int) -> np.ndarray:
+def halton3_chunk(
+    first_individual: int,
+    last_individual: int,
+    number_of_draws: int,
+    key: tuple[int, ...] = (0,),
+) -> np.ndarray:
+    return draws.get_halton_draws_of_individuals(
+        first_individual, last_individual, number_of_draws, base=3, skip=10
+    )
+
+
+def halton5(
+    sample_size: int,
+    number_of_draws: int,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
     return draws.get_halton_draws(sample_size, number_of_draws, base=5, skip=10)
 
 
-def MLHS_anti(sample_size: int, number_of_draws: int) -> np.ndarray:
+def halton5_chunk(
+    first_individual: int,
+    last_individual: int,
+    number_of_draws: int,
+    key: tuple[int, ...] = (0,),
+) -> np.ndarray:
+    return draws.get_halton_draws_of_individuals(
+        first_individual, last_individual, number_of_draws, base=5, skip=10
+    )
+
+
+def MLHS_chunk(
+    first_individual: int,
+    last_individual: int,
+    number_of_draws: int,
+    key: tuple[int, ...] = (0,),
+) -> np.ndarray:
+    return draws.get_latin_hypercube_draws_of_individuals(
+        first_individual, last_individual, number_of_draws, key
+    )
+
+
+def MLHS_anti(
+    sample_size: int,
+    number_of_draws: int,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
     return draws.get_antithetic(
-        draws.get_latin_hypercube_draws, sample_size, number_of_draws
+        draws.get_latin_hypercube_draws,
+        sample_size,
+        number_of_draws,
+        generator=generator,
     )
 
 
-def symm_uniform(sample_size: int, number_of_draws: int) -> np.ndarray:
-    return draws.get_uniform(sample_size, number_of_draws, symmetric=True)
+def MLHS_anti_chunk(
+    first_individual: int,
+    last_individual: int,
+    number_of_draws: int,
+    key: tuple[int, ...] = (0,),
+) -> np.ndarray:
+    local_draws = MLHS_chunk(
+        first_individual, last_individual, int(number_of_draws / 2), key=key
+    )
+    return np.concatenate((local_draws, 1 - local_draws), axis=1)
+
+
+def symm_uniform(
+    sample_size: int,
+    number_of_draws: int,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
+    return draws.get_uniform(
+        sample_size, number_of_draws, symmetric=True, generator=generator
+    )
 
 
-def symm_uniform_antithetic(sample_size: int, number_of_draws: int) -> np.ndarray:
+def symm_uniform_antithetic(
+    sample_size: int,
+    number_of_draws: int,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
     number_local_draws = int(number_of_draws / 2)
-    local_draws = symm_uniform(sample_size, number_local_draws)
+    local_draws = symm_uniform(sample_size, number_local_draws, generator=generator)
     return np.concatenate((local_draws, -local_draws), axis=1)
 
 
-def symm_halton2(sample_size: int, number_of_draws: int) -> np.ndarray:
+def symm_halton2(
+    sample_size: int,
+    number_of_draws: int,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
     return draws.get_halton_draws(
         sample_size, number_of_draws, symmetric=True, base=2, skip=10
     )
 
 
-def symm_halton3(sample_size: int, number_of_draws: int) -> np.ndarray:
+def symm_halton2_chunk(
+    first_individual: int,
+    last_individual: int,
+    number_of_draws: int,
+    key: tuple[int, ...] = (0,),
+) -> np.ndarray:
+    return draws.get_halton_draws_of_individuals(
+        first_individual,
+        last_individual,
+        number_of_draws,
+        symmetric=True,
+        base=2,
+        skip=10,
+    )
+
+
+def symm_halton3(
+    sample_size: int,
+    number_of_draws: int,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
     return draws.get_halton_draws(
         sample_size, number_of_draws, symmetric=True, base=3, skip=10
     )
 
 
-def symm_halton5(sample_size: int, number_of_draws: int) -> np.ndarray:
+def symm_halton3_chunk(
+    first_individual: int,
+    last_individual: int,
+    number_of_draws: int,
+    key: tuple[int, ...] = (0,),
+) -> np.ndarray:
+    return draws.get_halton_draws_of_individuals(
+        first_individual,
+        last_individual,
+        number_of_draws,
+        symmetric=True,
+        base=3,
+        skip=10,
+    )
+
+
+def symm_halton5(
+    sample_size: int,
+    number_of_draws: int,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
     return draws.get_halton_draws(
         sample_size, number_of_draws, symmetric=True, base=5, skip=10
     )
 
 
-def symm_MLHS(sample_size: int, number_of_draws: int) -> np.ndarray:
-    return draws.get_latin_hypercube_draws(sample_size, number_of_draws, symmetric=True)
+def symm_halton5_chunk(
+    first_individual: int,
+    last_individual: int,
+    number_of_draws: int,
+    key: tuple[int, ...] = (0,),
+) -> np.ndarray:
+    return draws.get_halton_draws_of_individuals(
+        first_individual,
+        last_individual,
+        number_of_draws,
+        symmetric=True,
+        base=5,
+        skip=10,
+    )
+
+
+def symm_MLHS(
+    sample_size: int,
+    number_of_draws: int,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
+    return draws.get_latin_hypercube_draws(
+        sample_size, number_of_draws, symmetric=True, generator=generator
+    )
+
+
+def symm_MLHS_chunk(
+    first_individual: int,
+    last_individual: int,
+    number_of_draws: int,
+    key: tuple[int, ...] = (0,),
+) -> np.ndarray:
+    return draws.get_latin_hypercube_draws_of_individuals(
+        first_individual, last_individual, number_of_draws, key, symmetric=True
+    )
 
 
-def symm_MLHS_anti(sample_size: int, number_of_draws: int) -> np.ndarray:
+def symm_MLHS_anti(
+    sample_size: int,
+    number_of_draws: int,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
     number_local_draws = int(number_of_draws / 2)
-    local_draws = symm_MLHS(sample_size, number_local_draws)
+    local_draws = symm_MLHS(sample_size, number_local_draws, generator=generator)
     return np.concatenate((local_draws, -local_draws), axis=1)
 
 
-def normal_antithetic(sample_size: int, number_of_draws: int) -> np.ndarray:
+def symm_MLHS_anti_chunk(
+    first_individual: int,
+    last_individual: int,
+    number_of_draws: int,
+    key: tuple[int, ...] = (0,),
+) -> np.ndarray:
+    local_draws = symm_MLHS_chunk(
+        first_individual, last_individual, int(number_of_draws / 2), key=key
+    )
+    return np.concatenate((local_draws, -local_draws), axis=1)
+
+
+def normal_antithetic(
+    sample_size: int,
+    number_of_draws: int,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
     return draws.get_normal_wichura_draws(
         sample_size=sample_size,
         number_of_draws=number_of_draws,
         antithetic=True,
+        generator=generator,
     )
 
 
-def normal_halton2(sample_size: int, number_of_draws: int) -> np.ndarray:
+def normal_halton2(
+    sample_size: int,
+    number_of_draws: int,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
     unif = draws.get_halton_draws(sample_size, number_of_draws, base=2, skip=10)
     return draws.get_normal_wichura_draws(
         sample_size,
@@ -90,7 +324,29 @@ def normal_halton2(sample_size: int, number_of_draws: int) -> np.ndarray:
     )
 
 
-def normal_halton3(sample_size: int, number_of_draws: int) -> np.ndarray:
+def normal_halton2_chunk(
+    first_individual: int,
+    last_individual: int,
+    number_of_draws: int,
+    key: tuple[int, ...] = (0,),
+) -> np.ndarray:
+    # Same sequence as normal_halton2
+    unif = draws.get_halton_draws_of_individuals(
+        first_individual, last_individual, number_of_draws, base=2, skip=10
+    )
+    return draws.get_normal_wichura_draws(
+        last_individual - first_individual,
+        number_of_draws,
+        uniform_numbers=unif,
+        antithetic=False,
+    )
+
+
+def normal_halton3(
+    sample_size: int,
+    number_of_draws: int,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
     unif = draws.get_halton_draws(sample_size, number_of_draws, base=2, skip=10)
     return draws.get_normal_wichura_draws(
         sample_size,
@@ -100,7 +356,29 @@ def normal_halton3(sample_size: int, number_of_draws: int) -> np.ndarray:
     )
 
 
-def normal_halton5(sample_size: int, number_of_draws: int) -> np.ndarray:
+def normal_halton3_chunk(
+    first_individual: int,
+    last_individual: int,
+    number_of_draws: int,
+    key: tuple[int, ...] = (0,),
+) -> np.ndarray:
+    # Same sequence as normal_halton3
+    unif = draws.get_halton_draws_of_individuals(
+        first_individual, last_individual, number_of_draws, base=2, skip=10
+    )
+    return draws.get_normal_wichura_draws(
+        last_individual - first_individual,
+        number_of_draws,
+        uniform_numbers=unif,
+        antithetic=False,
+    )
+
+
+def normal_halton5(
+    sample_size: int,
+    number_of_draws: int,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
     unif = draws.get_halton_draws(sample_size, number_of_draws, base=2, skip=10)
     return draws.get_normal_wichura_draws(
         sample_size,
@@ -110,8 +388,32 @@ def normal_halton5(sample_size: int, number_of_draws: int) -> np.ndarray:
     )
 
 
-def normal_MLHS(sample_size: int, number_of_draws: int) -> np.ndarray:
-    unif = draws.get_latin_hypercube_draws(sample_size, number_of_draws)
+def normal_halton5_chunk(
+    first_individual: int,
+    last_individual: int,
+    number_of_draws: int,
+    key: tuple[int, ...] = (0,),
+) -> np.ndarray:
+    # Same sequence as normal_halton5
+    unif = draws.get_halton_draws_of_individuals(
+        first_individual, last_individual, number_of_draws, base=2, skip=10
+    )
+    return draws.get_normal_wichura_draws(
+        last_individual - first_individual,
+        number_of_draws,
+        uniform_numbers=unif,
+        antithetic=False,
+    )
+
+
+def normal_MLHS(
+    sample_size: int,
+    number_of_draws: int,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
+    unif = draws.get_latin_hypercube_draws(
+        sample_size, number_of_draws, generator=generator
+    )
     return draws.get_normal_wichura_draws(
         sample_size,
         number_of_draws,
@@ -120,13 +422,126 @@ def normal_MLHS(sample_size: int, number_of_draws: int) -> np.ndarray:
     )
 
 
-def normal_MLHS_anti(sample_size: int, number_of_draws: int) -> np.ndarray:
-    unif = draws.get_latin_hypercube_draws(sample_size, int(number_of_draws / 2.0))
+def normal_MLHS_chunk(
+    first_individual: int,
+    last_individual: int,
+    number_of_draws: int,
+    key: tuple[int, ...] = (0,),
+) -> np.ndarray:
+    unif = MLHS_chunk(first_individual, last_individual, number_of_draws, key=key)
+    return draws.get_normal_wichura_draws(
+        last_individual - first_individual,
+        number_of_draws,
+        uniform_numbers=unif,
+        antithetic=False,
+    )
+
+
+def normal_MLHS_anti(
+    sample_size: int,
+    number_of_draws: int,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
+    unif = draws.get_latin_hypercube_draws(
+        sample_size, int(number_of_draws / 2.0), generator=generator
+    )
     return draws.get_normal_wichura_draws(
         sample_size, number_of_draws, uniform_numbers=unif, antithetic=True
     )
 
 
+def normal_MLHS_anti_chunk(
+    first_individual: int,
+    last_individual: int,
+    number_of_draws: int,
+    key: tuple[int, ...] = (0,),
+) -> np.ndarray:
+    unif = MLHS_chunk(
+        first_individual, last_individual, int(number_of_draws / 2.0), key=key
+    )
+    return draws.get_normal_wichura_draws(
+        last_individual - first_individual,
+        number_of_draws,
+        uniform_numbers=unif,
+        antithetic=True,
+    )
+
+
+def sobol(
+    sample_size: int,
+    number_of_draws: int,
+    number_of_variables: int,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
+    return draws.get_sobol_draws(sample_size, number_of_draws, number_of_variables)
+
+
+def sobol_owen(
+    sample_size: int,
+    number_of_draws: int,
+    number_of_variables: int,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
+    return draws.get_sobol_draws(
+        sample_size,
+        number_of_draws,
+        number_of_variables,
+        scrambled=True,
+        generator=generator,
+    )
+
+
+def randomized_halton(
+    sample_size: int,
+    number_of_draws: int,
+    number_of_variables: int,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
+    return draws.get_randomized_halton_draws(
+        sample_size, number_of_draws, number_of_variables, generator=generator
+    )
+
+
+def to_symmetric(uniform_numbers: np.ndarray) -> np.ndarray:
+    return 2.0 * uniform_numbers - 1.0
+
+
+def to_normal(uniform_numbers: np.ndarray) -> np.ndarray:
+    sample_size, number_of_draws = uniform_numbers.shape
+    return draws.get_normal_wichura_draws(
+        sample_size, number_of_draws, uniform_numbers=uniform_numbers
+    )
+
+
+def single_variable(
+    joint_generator: JointGenerator,
+    transform: Transform | None,
+    sample_size: int,
+    number_of_draws: int,
+    generator: np.random.Generator | None = None,
+) -> np.ndarray:
+    """Draws of one variable, generated alone by a joint generator."""
+    uniform_numbers = joint_generator(
+        sample_size, number_of_draws, 1, generator=generator
+    )[:, :, 0]
+    if transform is None:
+        return uniform_numbers
+    return transform(uniform_numbers)
+
+
+def joint_draws_tuple(
+    joint_generator: JointGenerator,
+    transform: Transform | None,
+    description: str,
+) -> RandomNumberGeneratorTuple:
+    return RandomNumberGeneratorTuple(
+        generator=partial(single_variable, joint_generator, transform),
+        description=description,
+        joint_generator=joint_generator,
+        transform=transform,
+    )
+
+
 # Dictionary containing native random number generators. Class attribute
 native_random_number_generators = {
     'UNIFORM': RandomNumberGeneratorTuple(
@@ -138,22 +553,27 @@ native_random_number_generators = {
     'UNIFORM_HALTON2': RandomNumberGeneratorTuple(
         generator=halton2,
         description='Halton draws with base 2, skipping the first 10',
+        chunk_generator=halton2_chunk,
     ),
     'UNIFORM_HALTON3': RandomNumberGeneratorTuple(
         generator=halton3,
         description='Halton draws with base 3, skipping the first 10',
+        chunk_generator=halton3_chunk,
     ),
     'UNIFORM_HALTON5': RandomNumberGeneratorTuple(
         generator=halton5,
         description='Halton draws with base 5, skipping the first 10',
+        chunk_generator=halton5_chunk,
     ),
     'UNIFORM_MLHS': RandomNumberGeneratorTuple(
         generator=draws.get_latin_hypercube_draws,
         description='Modified Latin Hypercube Sampling on [0, 1]',
+        chunk_generator=MLHS_chunk,
     ),
     'UNIFORM_MLHS_ANTI': RandomNumberGeneratorTuple(
         generator=MLHS_anti,
         description='Antithetic Modified Latin Hypercube Sampling on [0, 1]',
+        chunk_generator=MLHS_anti_chunk,
     ),
     'UNIFORMSYM': RandomNumberGeneratorTuple(
         generator=symm_uniform, description='Uniform U[-1, 1]'
@@ -165,22 +585,27 @@ native_random_number_generators = {
     'UNIFORMSYM_HALTON2': RandomNumberGeneratorTuple(
         generator=symm_halton2,
         description='Halton draws on [-1, 1] with base 2, skipping the first 10',
+        chunk_generator=symm_halton2_chunk,
     ),
     'UNIFORMSYM_HALTON3': RandomNumberGeneratorTuple(
         generator=symm_halton3,
         description='Halton draws on [-1, 1] with base 3, skipping the first 10',
+        chunk_generator=symm_halton3_chunk,
     ),
     'UNIFORMSYM_HALTON5': RandomNumberGeneratorTuple(
         generator=symm_halton5,
         description='Halton draws on [-1, 1] with base 5, skipping the first 10',
+        chunk_generator=symm_halton5_chunk,
     ),
     'UNIFORMSYM_MLHS': RandomNumberGeneratorTuple(
         generator=symm_MLHS,
         description='Modified Latin Hypercube Sampling on [-1, 1]',
+        chunk_generator=symm_MLHS_chunk,
     ),
     'UNIFORMSYM_MLHS_ANTI': RandomNumberGeneratorTuple(
         generator=symm_MLHS_anti,
         description='Antithetic Modified Latin Hypercube Sampling on [-1, 1]',
+        chunk_generator=symm_MLHS_anti_chunk,
     ),
     'NORMAL': RandomNumberGeneratorTuple(
         generator=draws.get_normal_wichura_draws, description='Normal N(0, 1) draws'
@@ -191,22 +616,61 @@ native_random_number_generators = {
     'NORMAL_HALTON2': RandomNumberGeneratorTuple(
         generator=normal_halton2,
         description='Normal draws from Halton base 2 sequence',
+        chunk_generator=normal_halton2_chunk,
     ),
     'NORMAL_HALTON3': RandomNumberGeneratorTuple(
         generator=normal_halton3,
         description='Normal draws from Halton base 3 sequence',
+        chunk_generator=normal_halton3_chunk,
     ),
     'NORMAL_HALTON5': RandomNumberGeneratorTuple(
         generator=normal_halton5,
         description='Normal draws from Halton base 5 sequence',
+        chunk_generator=normal_halton5_chunk,
     ),
     'NORMAL_MLHS': RandomNumberGeneratorTuple(
         generator=normal_MLHS,
         description='Normal draws from Modified Latin Hypercube Sampling',
+        chunk_generator=normal_MLHS_chunk,
     ),
     'NORMAL_MLHS_ANTI': RandomNumberGeneratorTuple(
         generator=normal_MLHS_anti,
         description='Antithetic normal draws from Modified Latin Hypercube Sampling',
+        chunk_generator=normal_MLHS_anti_chunk,
+    ),
+    'UNIFORM_SOBOL': joint_draws_tuple(
+        sobol, None, 'Sobol draws on [0, 1], skipping the first'
+    ),
+    'UNIFORMSYM_SOBOL': joint_draws_tuple(
+        sobol, to_symmetric, 'Sobol draws on [-1, 1], skipping the first'
+    ),
+    'NORMAL_SOBOL': joint_draws_tuple(
+        sobol, to_normal, 'Normal draws from Sobol sequence, skipping the first'
+    ),
+    'UNIFORM_SOBOL_OWEN': joint_draws_tuple(
+        sobol_owen, None, 'Scrambled Sobol draws on [0, 1]'
+    ),
+    'UNIFORMSYM_SOBOL_OWEN': joint_draws_tuple(
+        sobol_owen, to_symmetric, 'Scrambled Sobol draws on [-1, 1]'
+    ),
+    'NORMAL_SOBOL_OWEN': joint_draws_tuple(
+        sobol_owen, to_normal, 'Normal draws from scrambled Sobol sequence'
+    ),
+    'UNIFORM_HALTON_RANDOMIZED': joint_draws_tuple(
+        randomized_halton,
+        None,
+        'Randomized Halton draws on [0, 1], with one prime base per variable',
+    ),
+    'UNIFORMSYM_HALTON_RANDOMIZED': joint_draws_tuple(
+        randomized_halton,
+        to_symmetric,
+        'Randomized Halton draws on [-1, 1], with one prime base per variable',
+    ),
+    'NORMAL_HALTON_RANDOMIZED': joint_draws_tuple(
+        randomized_halton,
+        to_normal,
+        'Normal draws from randomized Halton sequences, with one prime base '
+        'per variable',
     ),
 }
 
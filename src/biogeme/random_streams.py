@@ -0,0 +1,53 @@
+"""Independent and reproducible streams of pseudo-random numbers
+
+:author: Michel Bierlaire
+:date: Sun Oct 18 21:12:40 2026
+
+Each use of pseudo-random numbers is identified by a key: the purpose
+(draws, bootstrap, split of the data...), followed by indices such as
+the replication or the individual. The generator associated with a key
+depends only on the seed and on the key. Therefore, the numbers do not
+depend on the order in which they are generated, nor on the number of
+threads or processes sharing the work.
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+import numpy as np
+
+DRAWS = 0  #: Draws for Monte-Carlo integration, one stream per variable.
+BOOTSTRAP = 1  #: Bootstrap, one stream per replication.
+SPLIT = 2  #: Split of the database for validation.
+SAMPLING_OF_ALTERNATIVES = 3  #: Choice sets, one stream per (block of) individual.
+
+
+def get_generator(seed: int, *key: int) -> np.random.Generator:
+    """Generator of pseudo-random numbers dedicated to one use.
+
+    :param seed: seed common to all the uses.
+    :type seed: int
+
+    :param key: identification of the use. Typically, the purpose,
+        followed by one or several indices.
+    :type key: int
+
+    :return: the random number generator.
+    :rtype: numpy.random.Generator
+    """
+    return np.random.default_rng(np.random.SeedSequence(entropy=seed, spawn_key=key))
+
+
+def name_key(name: str) -> int:
+    """Integer identifying a name, to be used in the key of a
+    stream. Contrarily to the built-in function hash, it does not
+    change from one Python session to the next.
+
+    :param name: name to identify.
+    :type name: str
+
+    :return: the integer.
+    :rtype: int
+    """
+    return int.from_bytes(hashlib.sha256(name.encode()).digest()[:8], 'little')
@@ -0,0 +1,197 @@
+"""Persistent storage of estimation results
+
+:author: Michel Bierlaire
+:date: Sun Oct 18 16:40:12 2026
+
+The estimation results of the specifications of a multiple expression
+are stored in a SQLite file, so that they can be reused by another
+Python process. Each result is identified by the configuration, the
+data and the expression of the model. The file can be read and written
+by several processes at the same time.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import logging
+import pickle
+import sqlite3
+import time
+from typing import TYPE_CHECKING, Iterator
+
+import pandas as pd
+
+from biogeme.expressions import IdManager
+from biogeme.results import bioResults
+
+if TYPE_CHECKING:
+    from biogeme.database import Database
+    from biogeme.expressions import Expression
+
+logger = logging.getLogger(__name__)
+
+TIMEOUT = 60
+"""Number of seconds to wait for another process to release the file."""
+
+
+def hash_of_data(database: Database) -> str:
+    """Hash of the content of a database.
+
+    :param database: database to identify.
+    :type database: biogeme.database.Database
+
+    :return: hexadecimal digest of the data.
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    digest.update(repr(database.data.columns.to_list()).encode())
+    digest.update(pd.util.hash_pandas_object(database.data, index=False).values)
+    return digest.hexdigest()
+
+
+class ResultsStore:
+    """Estimation results stored in a SQLite file."""
+
+    def __init__(self, file_name: str, database: Database, maximum_size: int = 0):
+        """Constructor
+
+        :param file_name: name of the SQLite file. It is created if it
+            does not exist.
+        :type file_name: str
+
+        :param database: database used for the estimation. The results
+            obtained with other data are ignored.
+        :type database: biogeme.database.Database
+
+        :param maximum_size: maximum number of results stored in the
+            file. The least recently used are removed first. If 0,
+            there is no limit.
+        :type maximum_size: int
+        """
+        self.file_name: str = file_name
+        self.maximum_size: int = maximum_size
+        self.database: Database = database
+        self.data_hash: str = hash_of_data(database)
+        with self._connect() as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'key TEXT PRIMARY KEY, '
+                'config_id TEXT NOT NULL, '
+                'raw_results BLOB NOT NULL, '
+                'last_access REAL NOT NULL)'
+            )
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """A new connection is opened for each operation, so that the
+        object can be used in several processes. The transaction is
+        committed, or rolled back if an exception is raised, and the
+        connection is closed."""
+        with contextlib.closing(
+            sqlite3.connect(self.file_name, timeout=TIMEOUT)
+        ) as connection, connection:
+            yield connection
+
+    def key(self, config_id: str, expression: Expression) -> str:
+        """Identifier of a result.
+
+        :param config_id: identifier of the configuration.
+        :type config_id: str
+
+        :param expression: expression of the model, configured for
+            config_id. Its IDs are set for the expression alone.
+        :type expression: biogeme.expressions.Expression
+
+        :return: identifier of the result in the file.
+        :rtype: str
+        """
+        id_manager = IdManager([expression], self.database, None)
+        expression.set_id_manager(id_manager)
+        digest = hashlib.sha256()
+        digest.update(self.data_hash.encode())
+        digest.update(config_id.encode())
+        # The ids of the nodes of the signature depend only on their
+        # structure, and the status of the parameters is part of it.
+        digest.update(b'\n'.join(expression.get_signature()))
+        # The bounds and the initial values of the parameters are not.
+        for betas in (id_manager.free_betas, id_manager.fixed_betas):
+            for name in betas.names:
+                digest.update(str(betas.expressions[name]).encode())
+        return digest.hexdigest()
+
+    def get(
+        self,
+        config_id: str,
+        expression: Expression,
+        identification_threshold: float | None = None,
+    ) -> bioResults | None:
+        """Retrieves the results of a configuration. They are unpickled
+        only if they are found.
+
+        :param config_id: identifier of the configuration.
+        :type config_id: str
+
+        :param expression: expression of the model, configured for
+            config_id.
+        :type expression: biogeme.expressions.Expression
+
+        :param identification_threshold: see
+            :class:`biogeme.results.bioResults`
+        :type identification_threshold: float
+
+        :return: the estimation results, or None if they are not available.
+        :rtype: biogeme.results.bioResults
+        """
+        the_key = self.key(config_id, expression)
+        with self._connect() as connection:
+            row = connection.execute(
+                'SELECT raw_results FROM results WHERE key = ?', (the_key,)
+            ).fetchone()
+            if row is not None:
+                connection.execute(
+                    'UPDATE results SET last_access = ? WHERE key = ?',
+                    (time.time(), the_key),
+                )
+        if row is None:
+            return None
+        logger.debug(f'Results of {config_id} read from {self.file_name}')
+        return bioResults(
+            pickle.loads(row[0]), identification_threshold=identification_threshold
+        )
+
+    def put(self, config_id: str, expression: Expression, results: bioResults) -> None:
+        """Stores the results of a configuration.
+
+        :param config_id: identifier of the configuration.
+        :type config_id: str
+
+        :param expression: expression of the model, configured for
+            config_id.
+        :type expression: biogeme.expressions.Expression
+
+        :param results: estimation results.
+        :type results: biogeme.results.bioResults
+        """
+        with self._connect() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)',
+                (
+                    self.key(config_id, expression),
+                    config_id,
+                    pickle.dumps(results.data),
+                    time.time(),
+                ),
+            )
+            if self.maximum_size > 0:
+                connection.execute(
+                    'DELETE FROM results WHERE key NOT IN ('
+                    'SELECT key FROM results ORDER BY last_access DESC LIMIT ?)',
+                    (self.maximum_size,),
+                )
+
+    def __len__(self) -> int:
+        with self._connect() as connection:
+            (size,) = connection.execute('SELECT COUNT(*) FROM results').fetchone()
+        return size
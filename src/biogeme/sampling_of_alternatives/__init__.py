@@ -7,5 +7,10 @@ from .sampling_context import (
     LOG_PROBA_COL,
 )
 from .choice_set_generation import ChoiceSetsGeneration
-from .sampling_of_alternatives import generate_segment_size, SamplingOfAlternatives
+from .sampling_of_alternatives import (
+    generate_segment_size,
+    sample_without_replacement,
+    SamplingOfAlternatives,
+)
 from .generate_model import GenerateModel
+from .long_format import LongFormatLogit, LongFormatResults
@@ -5,26 +5,53 @@
     J-1.  For MEV models, the approximation of the sum capturing the
     nests requires another sample not based on the choice.
 
+    The choice sets are sampled by blocks of individuals. Within a
+    block, the samples of all individuals are drawn at once, and the
+    attributes of the sampled alternatives are gathered with array
+    indexing.
+
+    Besides the CSV file, the merged data is stored in binary format,
+    together with a key identifying the context of the sampling. It is
+    used when the data is recycled.
+
 :author: Michel Bierlaire
 :date: Fri Oct 27 12:50:06 2023
 """
 
 import copy
+import hashlib
 import logging
 import os
+from typing import Iterator
 
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
+from biogeme.data_bundle import load_bundle, save_bundle
 from biogeme.database import Database
+from biogeme.exceptions import BiogemeError
 from biogeme.expressions import Expression, TypeOfElementaryExpression
-from .sampling_context import SamplingContext, MEV_PREFIX
+from biogeme.random_streams import SAMPLING_OF_ALTERNATIVES, get_generator
+from .sampling_context import (
+    SamplingContext,
+    StratumTuple,
+    MEV_PREFIX,
+    LOG_PROBA_COL,
+    MEV_WEIGHT,
+    CNL_PREFIX,
+)
 from .sampling_of_alternatives import SamplingOfAlternatives
 
 tqdm.pandas()
 
 logger = logging.getLogger(__name__)
 
+SAMPLING_BLOCK_SIZE = 10_000
+"""Number of individuals whose choice sets are sampled at once. If a
+seed is defined, each block has its own stream of pseudo-random
+numbers."""
+
 
 class ChoiceSetsGeneration:
     """Class in charge of generationg the choice sets for each individual."""
@@ -51,7 +78,58 @@ class ChoiceSetsGeneration:
         self.total_sample_size = context.total_sample_size
         self.second_sample_size = context.second_sample_size
         self.cnl_nests = context.cnl_nests
+        self.seed = context.seed
         self.biogeme_data = None
+        root, _ = os.path.splitext(self.biogeme_file_name)
+        self.cache_directory = f'{root}_cache'
+        """Directory where the merged data is stored in binary format."""
+
+    def cache_key(self) -> str:
+        """Key identifying the merged data. It depends on the data of the
+        individuals and of the alternatives, on the partitions and the
+        sample sizes, on the interaction variables, and on the seed.
+
+        :return: the key.
+        """
+
+        def data_hash(data: pd.DataFrame) -> str:
+            """Hash of the content of a data frame"""
+            the_hash = hashlib.sha256(repr(list(data.columns)).encode())
+            the_hash.update(pd.util.hash_pandas_object(data).to_numpy().tobytes())
+            return the_hash.hexdigest()
+
+        def strata(partition: list[StratumTuple] | None) -> list | None:
+            """Description of a partition"""
+            if partition is None:
+                return None
+            return [
+                (sorted(stratum.subset), stratum.sample_size) for stratum in partition
+            ]
+
+        alphas = (
+            {
+                alternative: self.cnl_nests.get_alpha_values(alternative)
+                for alternative in sorted(self.cnl_nests.mev_alternatives)
+            }
+            if self.cnl_nests
+            else None
+        )
+        key = (
+            data_hash(self.individuals),
+            data_hash(self.alternatives),
+            self.choice_column,
+            self.id_column,
+            strata(self.partition),
+            strata(self.second_partition),
+            alphas,
+            [
+                (variable.name, str(variable.formula))
+                for variable in self.combined_variables
+            ],
+            self.seed,
+            SAMPLING_BLOCK_SIZE,
+        )
+        return hashlib.sha256(repr(key).encode()).hexdigest()[:16]
 
     def get_attributes_from_expression(self, expression: Expression) -> set[str]:
         """Extract the names of the attributes of alternatives from an expression"""
@@ -61,6 +139,20 @@ class ChoiceSetsGeneration:
         attributes = set(self.alternatives.columns)
         return variables & attributes
 
+    def row_generator(self, individual_row: pd.Series) -> np.random.Generator | None:
+        """Generator of the pseudo-random numbers used to sample the
+        choice set of one individual.
+
+        :param individual_row: row corresponding to one individual
+
+        :return: the generator associated with the position of the
+            individual, or None if no seed has been defined.
+        """
+        if self.seed == 0:
+            return None
+        position = self.individuals.index.get_loc(individual_row.name)
+        return get_generator(self.seed, SAMPLING_OF_ALTERNATIVES, position)
+
     def process_row(self, individual_row: pd.Series) -> dict:
         """Process one row of the individual database
 
@@ -69,8 +161,11 @@ class ChoiceSetsGeneration:
         :return: a dictionary containing the data for the extended row
         """
         choice = individual_row[self.choice_column]
+        generator = self.row_generator(individual_row)
 
-        first_sample = self.sampling_of_alternatives.sample_alternatives(chosen=choice)
+        first_sample = self.sampling_of_alternatives.sample_alternatives(
+            chosen=choice, generator=generator
+        )
 
         # Create the columns
         flattened_first_series: pd.Series[float, tuple[int, str]] = first_sample.stack()
@@ -83,7 +178,9 @@ class ChoiceSetsGeneration:
         row_data.update(flattened_first_dict)
 
         if self.second_partition is not None:
-            second_sample = self.sampling_of_alternatives.sample_mev_alternatives()
+            second_sample = self.sampling_of_alternatives.sample_mev_alternatives(
+                generator=generator
+            )
 
             # Rename columns for second_sample without multi-level index
             flattened_second_series = second_sample.stack()
@@ -96,50 +193,251 @@ class ChoiceSetsGeneration:
 
         return row_data
 
+    def blocks_of_individuals(
+        self,
+    ) -> Iterator[tuple[pd.DataFrame, np.random.Generator]]:
+        """Splits the individuals into blocks, whose choice sets are
+        sampled at once.
+
+        :return: iterator on the rows of each block, together with the
+            generator of the pseudo-random numbers to use for the block.
+        """
+        if self.seed == 0:
+            # The generator is initialized from the global numpy generator.
+            generator = np.random.default_rng(
+                np.random.randint(np.iinfo(np.int32).max)
+            )
+        for block, first in enumerate(
+            tqdm(
+                range(0, len(self.individuals), SAMPLING_BLOCK_SIZE),
+                desc="Sampling choice sets...",
+            )
+        ):
+            if self.seed != 0:
+                generator = get_generator(
+                    self.seed, SAMPLING_OF_ALTERNATIVES, SAMPLING_BLOCK_SIZE, block
+                )
+            yield self.individuals.iloc[first : first + SAMPLING_BLOCK_SIZE], generator
+
+    def alpha_values(self) -> dict[str, np.ndarray]:
+        """Alpha parameters of the cross-nested logit model, in the order
+        of the data frame of alternatives.
+
+        :return: dict mapping the name of each nest with the alpha value
+            of each alternative. The value is NaN for the alternatives
+            that are not involved in the MEV model.
+        """
+        if not self.cnl_nests:
+            return {}
+        ids = self.alternatives[self.id_column]
+        mev_alternatives = self.cnl_nests.mev_alternatives
+        alphas = pd.DataFrame(
+            [
+                (
+                    self.cnl_nests.get_alpha_values(alternative_id)
+                    if alternative_id in mev_alternatives
+                    else {}
+                )
+                for alternative_id in ids
+            ]
+        )
+        return {nest: alphas[nest].to_numpy(dtype=float) for nest in alphas.columns}
+
+    def sample_block(
+        self,
+        individuals: pd.DataFrame,
+        generator: np.random.Generator,
+        alphas: dict[str, np.ndarray] | None = None,
+    ) -> pd.DataFrame:
+        """Generates the choice sets of several individuals at once. The
+        columns are the same as those generated by :meth:`process_row`.
+
+        :param individuals: rows of the individuals.
+
+        :param generator: generator of the pseudo-random numbers.
+
+        :param alphas: alpha parameters of the cross-nested logit model,
+            as generated by :meth:`alpha_values`. If None, they are
+            calculated.
+
+        :return: data frame with one row per individual.
+        """
+        positions, log_probas = self.sampling_of_alternatives.sample_choice_sets(
+            chosen=individuals[self.choice_column].to_numpy(), generator=generator
+        )
+        attributes = {
+            name: self.alternatives[name].to_numpy()
+            for name in self.alternatives.columns
+        }
+        columns = {name: individuals[name].to_numpy() for name in individuals.columns}
+        sampled = {name: values[positions] for name, values in attributes.items()}
+        for index in range(positions.shape[1]):
+            for name, values in sampled.items():
+                columns[f'{name}_{index}'] = values[:, index]
+            columns[f'{LOG_PROBA_COL}_{index}'] = log_probas[:, index]
+
+        if self.second_partition is not None:
+            if alphas is None:
+                alphas = self.alpha_values()
+            mev_positions, mev_weights = (
+                self.sampling_of_alternatives.sample_mev_choice_sets(
+                    number_of_individuals=len(individuals), generator=generator
+                )
+            )
+            sampled = {
+                name: values[mev_positions] for name, values in attributes.items()
+            }
+            sampled_alphas = {
+                nest: values[mev_positions] for nest, values in alphas.items()
+            }
+            for index, weight in enumerate(mev_weights):
+                for name, values in sampled.items():
+                    columns[f'{MEV_PREFIX}{name}_{index}'] = values[:, index]
+                columns[f'{MEV_PREFIX}{MEV_WEIGHT}_{index}'] = np.full(
+                    len(individuals), weight
+                )
+                for nest, values in sampled_alphas.items():
+                    columns[f'{MEV_PREFIX}{CNL_PREFIX}{nest}_{index}'] = values[
+                        :, index
+                    ]
+
+        return pd.DataFrame(columns, index=individuals.index)
+
+    def sample_long_block(
+        self, individuals: pd.DataFrame, generator: np.random.Generator
+    ) -> pd.DataFrame:
+        """Generates the choice sets of several individuals at once, in
+        long format.
+
+        :param individuals: rows of the individuals.
+
+        :param generator: generator of the pseudo-random numbers.
+
+        :return: data frame with one row per individual and sampled
+            alternative. The rows of each individual are consecutive,
+            and the first one corresponds to the chosen alternative.
+        """
+        positions, log_probas = self.sampling_of_alternatives.sample_choice_sets(
+            chosen=individuals[self.choice_column].to_numpy(), generator=generator
+        )
+        sample_size = positions.shape[1]
+        columns = {
+            name: np.repeat(individuals[name].to_numpy(), sample_size)
+            for name in individuals.columns
+        }
+        sampled = positions.ravel()
+        for name in self.alternatives.columns:
+            columns[name] = self.alternatives[name].to_numpy()[sampled]
+        columns[LOG_PROBA_COL] = log_probas.ravel()
+        return pd.DataFrame(columns)
+
+    def sample_long(self) -> Database:
+        """Generates a choice set for each individual, in long format:
+        one row per individual and sampled alternative, so that the
+        number of columns does not depend on the sample size. The
+        interaction variables are calculated once per row. The
+        alternatives are the same as those generated by
+        :meth:`sample_and_merge` with the same seed.
+
+        :return: database for Biogeme, to be used with
+            :class:`biogeme.sampling_of_alternatives.LongFormatLogit`.
+
+        :raise BiogemeError: if a sample of alternatives is defined for
+            MEV models, or if the individuals and the alternatives share
+            the name of a column.
+        """
+        if self.second_partition is not None:
+            error_msg = 'The long format is available only for logit models.'
+            raise BiogemeError(error_msg)
+        common = set(self.individuals.columns) & set(self.alternatives.columns)
+        if common:
+            error_msg = (
+                f'The columns {sorted(common)} appear both in the data of the '
+                f'individuals and in the data of the alternatives.'
+            )
+            raise BiogemeError(error_msg)
+        logger.info(
+            f"Generating {self.total_sample_size} alternatives for "
+            f"{self.number_of_individuals} observations, in long format"
+        )
+        biogeme_data = pd.concat(
+            [
+                self.sample_long_block(individuals, generator=generator)
+                for individuals, generator in self.blocks_of_individuals()
+            ],
+            ignore_index=True,
+        )
+        biogeme_database = Database("long_data", biogeme_data)
+        biogeme_database.define_variables(
+            {
+                new_variable.name: new_variable.formula
+                for new_variable in self.combined_variables
+            }
+        )
+        return biogeme_database
+
     def define_new_variables(self, database: Database):
-        """Create the new variables
+        """Create the new variables. They are calculated together, with
+        one pass over the data.
 
         :param database: database, in Biogeme format.
         """
-        total_iterations = len(self.combined_variables) * self.total_sample_size
-        with tqdm(
-            total=total_iterations, desc="Defining new variables..."
-        ) as progress_bar:
-            for new_variable in self.combined_variables:
-                for index in range(self.total_sample_size):
+        new_expressions = {}
+        for new_variable in self.combined_variables:
+            for index in range(self.total_sample_size):
+                copy_expression = copy.deepcopy(new_variable.formula)
+                attributes = self.get_attributes_from_expression(copy_expression)
+                copy_expression.rename_elementary(attributes, suffix=f"_{index}")
+                new_expressions[f"{new_variable.name}_{index}"] = copy_expression
+            if self.second_partition is not None:
+                for index in range(self.second_sample_size):
                     copy_expression = copy.deepcopy(new_variable.formula)
                     attributes = self.get_attributes_from_expression(copy_expression)
-                    copy_expression.rename_elementary(attributes, suffix=f"_{index}")
-                    database.define_variable(
-                        f"{new_variable.name}_{index}", copy_expression
+                    copy_expression.rename_elementary(
+                        attributes, prefix=MEV_PREFIX, suffix=f"_{index}"
                     )
-                    progress_bar.update(1)
-                if self.second_partition is not None:
-                    for index in range(self.second_sample_size):
-                        copy_expression = copy.deepcopy(new_variable.formula)
-                        attributes = self.get_attributes_from_expression(
-                            copy_expression
-                        )
-                        copy_expression.rename_elementary(
-                            attributes, prefix=MEV_PREFIX, suffix=f"_{index}"
-                        )
-                        database.define_variable(
-                            f"{MEV_PREFIX}{new_variable.name}_{index}", copy_expression
-                        )
-
-    def sample_and_merge(self, recycle: bool = False) -> Database:
+                    new_expressions[f"{MEV_PREFIX}{new_variable.name}_{index}"] = (
+                        copy_expression
+                    )
+        logger.info(f"Defining {len(new_expressions)} new variables")
+        database.define_variables(new_expressions)
+
+    def sample_and_merge(
+        self, recycle: bool = False, write_csv: bool = True
+    ) -> Database:
         """Loops on the individuals and generate a choice set for each of them
 
-        :param recycle: if True, if the data file already exisits, it is not re-created.
+        :param recycle: if True, and if the data has already been generated
+            in the same context, it is read from the binary files
+            instead of being re-created.
+
+        :param write_csv: if True, the generated data is also exported in
+            CSV format, in the file ``biogeme_file_name`` of the context.
+            It is not needed by Biogeme, and may take much more time than
+            the generation itself for large samples. Set it to False to
+            skip the export.
 
         :return: database for Biogeme
+
+        :raise BiogemeError: if a seed is defined, and the index of the
+            individuals is not unique.
         """
+        if self.seed != 0 and not self.individuals.index.is_unique:
+            error_msg = (
+                'The index of the data frame of individuals must be unique '
+                'to associate a random stream with each of them.'
+            )
+            raise BiogemeError(error_msg)
+        key = self.cache_key()
         if recycle:
-            if os.path.exists(self.biogeme_file_name):
-                biogeme_data = pd.read_csv(self.biogeme_file_name)
-                biogeme_database = Database("merged_data", biogeme_data)
-                return biogeme_database
-            warning_msg = f"File {self.biogeme_file_name} does not exist."
+            biogeme_data = load_bundle(self.cache_directory, key=key)
+            if biogeme_data is not None:
+                logger.info(f"Data read from {self.cache_directory}")
+                return Database("merged_data", biogeme_data)
+            warning_msg = (
+                f"No data generated in the same context has been found in "
+                f"{self.cache_directory}."
+            )
             logger.warning(warning_msg)
 
         size = (
@@ -151,12 +449,23 @@ class ChoiceSetsGeneration:
             f"Generating {size} alternatives for "
             f"{self.number_of_individuals} observations"
         )
-        biogeme_data = self.individuals.progress_apply(
-            self.process_row, axis=1, result_type="expand"
-        )
+        alphas = self.alpha_values() if self.second_partition is not None else None
+        blocks = [
+            self.sample_block(individuals, generator=generator, alphas=alphas)
+            for individuals, generator in self.blocks_of_individuals()
+        ]
+        biogeme_data = pd.concat(blocks)
         biogeme_database = Database("merged_data", biogeme_data)
         logger.info("Define new variables")
         self.define_new_variables(biogeme_database)
-        biogeme_data.to_csv(self.biogeme_file_name, index=False)
-        logger.info(f"File {self.biogeme_file_name} has been created.")
+        if write_csv:
+            biogeme_database.data.to_csv(self.biogeme_file_name, index=False)
+            logger.info(f"File {self.biogeme_file_name} has been created.")
+        try:
+            save_bundle(biogeme_database.data, self.cache_directory, key=key)
+        except BiogemeError as e:
+            warning_msg = f"The data cannot be stored for recycling: {e}"
+            logger.warning(warning_msg)
+        else:
+            logger.info(f"Data stored in {self.cache_directory}")
         return biogeme_database
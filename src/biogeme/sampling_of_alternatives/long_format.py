@@ -0,0 +1,312 @@
+"""Logit model estimated with samples of alternatives, with data in
+long format
+
+:author: Michel Bierlaire
+:date: Mon Oct 19 19:02:16 2026
+
+In long format, the data contains one row per individual and sampled
+alternative, as generated by
+:meth:`biogeme.sampling_of_alternatives.ChoiceSetsGeneration.sample_long`.
+The utility function is defined once, with the attributes of the
+alternatives, and evaluated by the C++ engine on each row, together
+with its derivatives. The data is transferred once to the engine. The
+terms of the logit model are then aggregated by individual. Contrarily
+to the wide format, neither the size of the expression nor the number
+of columns of the data depends on the number of sampled alternatives.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing as mp
+from typing import Any, NamedTuple
+
+import cythonbiogeme.cythonbiogeme as ee
+import numpy as np
+import pandas as pd
+from scipy import linalg
+
+from biogeme.database import Database
+from biogeme.exceptions import BiogemeError
+from biogeme.expressions import Expression
+from biogeme.function_output import BiogemeFunctionOutput
+from biogeme.negative_likelihood import NegativeLikelihood
+from biogeme.optimization import algorithms
+from .sampling_context import LOG_PROBA_COL
+
+logger = logging.getLogger(__name__)
+
+
+class LongFormatResults(NamedTuple):
+    """Results of the estimation of a logit model in long format. The
+    variance-covariance matrix is the opposite of the pseudo-inverse of
+    the second derivatives matrix of the log likelihood, as in
+    :class:`biogeme.results.bioResults`."""
+
+    betas: dict[str, float]
+    loglikelihood: float
+    convergence: bool
+    messages: dict[str, Any]
+    variance_covariance: pd.DataFrame
+    std_errors: dict[str, float]
+
+
+class LongFormatLogit:
+    """Log likelihood of a logit model with samples of alternatives, for
+    data in long format."""
+
+    def __init__(
+        self,
+        utility: Expression,
+        database: Database,
+        sample_size: int,
+        choice_column: str,
+        id_column: str,
+        number_of_threads: int = 0,
+    ):
+        """Constructor
+
+        :param utility: utility function of one alternative, involving
+            the attributes of the alternatives and of the individuals.
+        :type utility: biogeme.expressions.Expression
+
+        :param database: data in long format. The rows of each
+            individual are consecutive, and the first one corresponds to
+            the chosen alternative.
+        :type database: biogeme.database.Database
+
+        :param sample_size: number of sampled alternatives for each
+            individual, including the chosen one.
+        :type sample_size: int
+
+        :param choice_column: name of the column containing the chosen
+            alternative.
+        :type choice_column: str
+
+        :param id_column: name of the column containing the identifier
+            of the sampled alternative.
+        :type id_column: str
+
+        :param number_of_threads: number of threads sharing the rows of
+            the data. If 0, the number of available CPUs.
+        :type number_of_threads: int
+
+        :raise BiogemeError: if the number of rows is not a multiple of
+            the sample size, if a column is missing from the data, if the
+            first row of an individual does not correspond to the chosen
+            alternative, or if the utility is not valid, or involves
+            draws.
+        """
+        number_of_rows = len(database.data)
+        if sample_size <= 0 or number_of_rows % sample_size != 0:
+            error_msg = (
+                f'The number of rows of the data ({number_of_rows}) is not a '
+                f'multiple of the number of sampled alternatives ({sample_size}).'
+            )
+            raise BiogemeError(error_msg)
+        for column in (LOG_PROBA_COL, choice_column, id_column):
+            if column not in database.data.columns:
+                error_msg = f'Column {column} is missing from the data.'
+                raise BiogemeError(error_msg)
+        # The likelihood assumes that the first row of each individual
+        # is the chosen alternative.
+        first_rows = database.data.iloc[::sample_size]
+        wrong_rows = first_rows.index[
+            first_rows[choice_column].to_numpy() != first_rows[id_column].to_numpy()
+        ]
+        if len(wrong_rows) > 0:
+            error_msg = (
+                f'The first row of each individual must correspond to the '
+                f'chosen alternative. It is not the case for '
+                f'{len(wrong_rows)} individual(s), starting at row(s) '
+                f'{list(wrong_rows[:10])}.'
+            )
+            raise BiogemeError(error_msg)
+        self.utility = utility
+        self.database = database
+        self.sample_size = sample_size
+        self.number_of_individuals = number_of_rows // sample_size
+        self.log_probas = (
+            database.data[LOG_PROBA_COL]
+            .to_numpy(dtype=float)
+            .reshape(self.number_of_individuals, sample_size)
+        )
+        if self.utility.embed_expression('PanelLikelihoodTrajectory'):
+            error_msg = 'The utility cannot involve PanelLikelihoodTrajectory.'
+            raise BiogemeError(error_msg)
+        if self.utility.requires_draws() or self.utility.embed_expression(
+            'bioDraws'
+        ):
+            error_msg = 'The utility cannot involve draws.'
+            raise BiogemeError(error_msg)
+        self.utility.prepare(database, 0)
+        self.id_manager = self.utility.id_manager
+        errors, warnings = self.utility.audit(database)
+        if warnings:
+            logger.warning('\n'.join(warnings))
+        if errors:
+            error_msg = '\n'.join(errors)
+            raise BiogemeError(error_msg)
+
+        self._engine = ee.pyEvaluateOneExpression()
+        self._engine.setData(database.data)
+        self._engine.setExpression(self.utility.get_signature())
+        self._engine.setFixedBetas(self.id_manager.fixed_betas_values)
+        self._engine.setMissingData(self.utility.missingData)
+        self._engine.setNumberOfThreads(
+            mp.cpu_count() if number_of_threads == 0 else number_of_threads
+        )
+
+    def free_beta_names(self) -> list[str]:
+        """Names of the parameters to estimate.
+
+        :return: list of names.
+        :rtype: list(str)
+        """
+        return self.id_manager.free_betas.names
+
+    def calculate(
+        self, betas: np.ndarray, gradient: bool = True, hessian: bool = False
+    ) -> BiogemeFunctionOutput:
+        """Calculates the log likelihood and its derivatives.
+
+        :param betas: values of the free parameters.
+        :type betas: numpy.array
+
+        :param gradient: if True, the gradient is calculated.
+        :type gradient: bool
+
+        :param hessian: if True, the hessian is calculated.
+        :type hessian: bool
+
+        :return: the log likelihood and, if requested, its derivatives.
+        :rtype: biogeme.function_output.BiogemeFunctionOutput
+        """
+        self._engine.setFreeBetas(list(betas))
+        self._engine.calculate(
+            gradient=gradient or hessian,
+            hessian=hessian,
+            bhhh=False,
+            aggregation=False,
+        )
+        values, gradients, hessians, _ = self._engine.getResults()
+        shape = (self.number_of_individuals, self.sample_size)
+        utilities = np.asarray(values).reshape(shape) - self.log_probas
+        # The log of the sum of the exponentials is calculated by group
+        # of rows, in a numerically stable way.
+        largest = utilities.max(axis=1, keepdims=True)
+        exponentials = np.exp(utilities - largest)
+        sums = exponentials.sum(axis=1)
+        loglikelihood = float(np.sum(utilities[:, 0] - largest[:, 0] - np.log(sums)))
+        if not (gradient or hessian):
+            return BiogemeFunctionOutput(function=loglikelihood)
+
+        # Probability of each sampled alternative.
+        probas = exponentials / sums[:, None]
+        dimension = self.id_manager.number_of_free_betas
+        gradients = np.asarray(gradients).reshape(shape + (dimension,))
+        mean_gradients = np.einsum('nj,njk->nk', probas, gradients)
+        the_gradient = np.sum(gradients[:, 0, :] - mean_gradients, axis=0)
+        if not hessian:
+            return BiogemeFunctionOutput(function=loglikelihood, gradient=the_gradient)
+
+        hessians = np.asarray(hessians).reshape(shape + (dimension, dimension))
+        # Sum over the individuals of the covariance matrix of the
+        # gradients of the utilities.
+        covariance = np.einsum('nj,njk,njl->kl', probas, gradients, gradients)
+        covariance -= np.einsum('nk,nl->kl', mean_gradients, mean_gradients)
+        the_hessian = (
+            np.sum(hessians[:, 0], axis=0)
+            - np.einsum('nj,njkl->kl', probas, hessians)
+            - covariance
+        )
+        return BiogemeFunctionOutput(
+            function=loglikelihood, gradient=the_gradient, hessian=the_hessian
+        )
+
+    def create_objective_function(
+        self, parameters: dict[str, float] | None = None
+    ) -> NegativeLikelihood:
+        """Creates the function minimized by the optimization algorithms.
+
+        :param parameters: parameters of the function, such as the
+            tolerance.
+        :type parameters: dict(str: float)
+
+        :return: the negative log likelihood.
+        :rtype: biogeme.negative_likelihood.NegativeLikelihood
+        """
+
+        def like(x: np.ndarray, scaled: bool, batch: float | None) -> float:
+            """Log likelihood"""
+            return self.calculate(x, gradient=False).function
+
+        def like_derivatives(
+            x: np.ndarray,
+            scaled: bool,
+            hessian: bool,
+            bhhh: bool,
+            batch: float | None,
+        ) -> BiogemeFunctionOutput:
+            """Log likelihood and its derivatives"""
+            return self.calculate(x, gradient=True, hessian=hessian)
+
+        return NegativeLikelihood(
+            dimension=self.id_manager.number_of_free_betas,
+            like=like,
+            like_derivatives=like_derivatives,
+            parameters=parameters,
+        )
+
+    def estimate(
+        self,
+        algorithm: str = 'simple_bounds',
+        parameters: dict[str, Any] | None = None,
+    ) -> LongFormatResults:
+        """Estimates the parameters by maximum likelihood.
+
+        :param algorithm: name of the optimization algorithm, as in
+            :data:`biogeme.optimization.algorithms`.
+        :type algorithm: str
+
+        :param parameters: parameters of the optimization algorithm.
+        :type parameters: dict(str: Any)
+
+        :return: the estimated parameters, the final log likelihood, and
+            the variance-covariance matrix of the estimates.
+        :rtype: LongFormatResults
+
+        :raise BiogemeError: if the algorithm is unknown.
+        """
+        the_algorithm = algorithms.get(algorithm)
+        if the_algorithm is None:
+            error_msg = (
+                f'Unknown algorithm {algorithm}. Valid algorithms: '
+                f'{list(algorithms)}'
+            )
+            raise BiogemeError(error_msg)
+        results = the_algorithm(
+            fct=self.create_objective_function(),
+            init_betas=np.array(self.id_manager.free_betas_values),
+            bounds=self.id_manager.bounds,
+            variable_names=self.free_beta_names(),
+            parameters=parameters,
+        )
+        names = self.free_beta_names()
+        final = self.calculate(results.solution, gradient=True, hessian=True)
+        # We use the pseudo inverse in case the matrix is singular
+        variance_covariance = -linalg.pinv(np.nan_to_num(final.hessian))
+        variances = np.diag(variance_covariance)
+        std_errors = np.where(
+            variances < 0, np.finfo(float).max, np.sqrt(np.abs(variances))
+        )
+        return LongFormatResults(
+            betas=dict(zip(names, results.solution)),
+            loglikelihood=final.function,
+            convergence=results.convergence,
+            messages=results.messages,
+            variance_covariance=pd.DataFrame(
+                variance_covariance, index=names, columns=names
+            ),
+            std_errors=dict(zip(names, std_errors)),
+        )
@@ -72,6 +72,12 @@ class SamplingContext:
         for the MEV terms, the corresponding partitition is provided
         here.
 
+    :param seed: if not 0, the choice sets of each block of individuals
+        are sampled with a stream of pseudo-random numbers that depends
+        only on the seed and on the position of the block in the data
+        frame. Therefore, the sample is reproducible. If 0, the global
+        numpy generator is used.
+
     """
 
     the_partition: Partition
@@ -86,6 +92,7 @@ class SamplingContext:
     mev_partition: Optional[Partition] = None
     mev_sample_sizes: Optional[Iterable[int]] = None
     cnl_nests: Optional[NestsForCrossNestedLogit] = None
+    seed: int = 0
 
     def check_expression(self, expression: Expression) -> None:
         """Verifies if the variables contained in the expression can be found in the databases"""
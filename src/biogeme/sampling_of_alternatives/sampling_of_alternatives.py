@@ -49,6 +49,76 @@ def generate_segment_size(sample_size: int, number_of_segments: int) -> list[int
     return segment_sizes
 
 
+def sample_without_replacement(
+    population_size: int,
+    sample_size: int,
+    excluded: np.ndarray,
+    generator: np.random.Generator,
+) -> np.ndarray:
+    """Draws, for several individuals at once, a sample of distinct
+    elements of a population, each individual possibly excluding one
+    element. For the individuals excluding an element, only
+    sample_size - 1 elements are drawn, so that the sample size may be
+    equal to the size of the population.
+
+    If the sample is small compared to the population, the elements
+    are drawn with replacement, and the draws of the individuals with
+    duplicates are repeated. Otherwise, random keys are associated with
+    the elements, and the elements with the smallest keys are selected.
+
+    :param population_size: number of elements of the population,
+        numbered from 0.
+    :type population_size: int
+
+    :param sample_size: number of elements to draw for each individual.
+    :type sample_size: int
+
+    :param excluded: for each individual, the element that must not be
+        drawn, or -1 if there is none.
+    :type excluded: numpy.array
+
+    :param generator: generator of the pseudo-random numbers.
+    :type generator: numpy.random.Generator
+
+    :return: array with one row per individual, and one column per
+        element drawn. For the individuals excluding an element, the
+        last column contains -1.
+    :rtype: numpy.array
+    """
+    number_of_individuals = len(excluded)
+    has_exclusion = excluded >= 0
+    if (
+        sample_size * sample_size > 2 * population_size
+        or sample_size >= population_size - 1
+    ):
+        # The probability that a sample with replacement has no
+        # duplicate is less than exp(-1), or the population is too
+        # small to draw with replacement.
+        keys = generator.random((number_of_individuals, population_size))
+        keys[has_exclusion, excluded[has_exclusion]] = np.inf
+        result = np.argpartition(keys, sample_size - 1, axis=1)[:, :sample_size]
+        # The excluded element has the largest key. If it has been
+        # selected, it is in the last column.
+        result[has_exclusion, -1] = -1
+        return result
+    result = np.empty((number_of_individuals, sample_size), dtype=int)
+    remaining = np.arange(number_of_individuals)
+    while remaining.size:
+        draws = generator.integers(
+            0,
+            population_size - has_exclusion[remaining, None],
+            size=(remaining.size, sample_size),
+        )
+        # The excluded element is skipped.
+        draws += has_exclusion[remaining, None] & (draws >= excluded[remaining, None])
+        draws[has_exclusion[remaining], -1] = -1
+        sorted_draws = np.sort(draws, axis=1)
+        valid = ~(sorted_draws[:, 1:] == sorted_draws[:, :-1]).any(axis=1)
+        result[remaining[valid]] = draws[valid]
+        remaining = remaining[~valid]
+    return result
+
+
 class SamplingOfAlternatives:
     """Class dealing with the various methods needed to estimate
     models with samples of alternatives
@@ -68,13 +138,23 @@ class SamplingOfAlternatives:
         self.partition = context.partition
         self.second_partition = context.second_partition
         self.cnl_nests = context.cnl_nests
-
-    def sample_alternatives(self, chosen: int) -> pd.DataFrame:
+        # Positions of the alternatives in the data frame, calculated
+        # once for the vectorized sampling.
+        self._alternative_ids: pd.Index | None = None
+        self._strata_positions: list[np.ndarray] = []
+        self._mev_strata_positions: list[np.ndarray] = []
+
+    def sample_alternatives(
+        self, chosen: int, generator: np.random.Generator | None = None
+    ) -> pd.DataFrame:
         """Performing the sampling of alternatives
 
         :param chosen: ID of the chosen alternative, that must be included
             in the choice set.
 
+        :param generator: generator of the pseudo-random numbers. If
+            None, the global numpy generator is used.
+
         :return: data frame containing a sample of
             alternatives. The first one is the chosen alternative
         :raise BiogemeError: if the chosen alternative is unknown.
@@ -114,7 +194,11 @@ class SamplingOfAlternatives:
             ]
             # Perform the sampling
             sample = subset.sample(
-                n=sample_size, replace=False, axis="index", ignore_index=True
+                n=sample_size,
+                replace=False,
+                axis="index",
+                ignore_index=True,
+                random_state=generator,
             )
 
             sample[LOG_PROBA_COL] = logproba
@@ -126,10 +210,143 @@ class SamplingOfAlternatives:
         the_sample = pd.concat([chosen_alternative, the_sample], ignore_index=True)
         return the_sample
 
-    def sample_mev_alternatives(self) -> pd.DataFrame:
+    def _alternative_positions(self) -> pd.Index:
+        """Index of the IDs of the alternatives, giving their position in
+        the data frame of alternatives. The positions of the alternatives
+        of each stratum are calculated as well, the first time.
+
+        :return: the index.
+        :rtype: pandas.Index
+
+        :raise BiogemeError: if an ID appears more than once.
+        """
+        if self._alternative_ids is not None:
+            return self._alternative_ids
+        ids = pd.Index(self.alternatives[self.id_column])
+        if not ids.is_unique:
+            duplicates = list(ids[ids.duplicated()].unique())
+            error_msg = f"Duplicate alternative(s): {duplicates}"
+            raise BiogemeError(error_msg)
+        self._strata_positions = [
+            ids.get_indexer(sorted(stratum.subset)) for stratum in self.partition
+        ]
+        if self.second_partition is not None:
+            self._mev_strata_positions = [
+                ids.get_indexer(sorted(stratum.subset))
+                for stratum in self.second_partition
+            ]
+        self._alternative_ids = ids
+        return ids
+
+    def sample_choice_sets(
+        self, chosen: np.ndarray, generator: np.random.Generator
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Performs the sampling of alternatives for several individuals
+        at once. It is equivalent to calling
+        :meth:`sample_alternatives` for each individual, with other
+        pseudo-random numbers.
+
+        :param chosen: ID of the alternative chosen by each individual.
+        :type chosen: numpy.array
+
+        :param generator: generator of the pseudo-random numbers.
+        :type generator: numpy.random.Generator
+
+        :return: the positions of the sampled alternatives in the data
+            frame of alternatives, and the log of their probability to
+            be sampled. Each row corresponds to an individual, and
+            starts with the chosen alternative.
+        :rtype: tuple(numpy.array, numpy.array)
+
+        :raise BiogemeError: if a chosen alternative is unknown.
+        """
+        ids = self._alternative_positions()
+        chosen_positions = ids.get_indexer(chosen)
+        if (chosen_positions < 0).any():
+            unknown = list(pd.unique(np.asarray(chosen)[chosen_positions < 0]))
+            error_msg = f"Unknown alternative(s): {unknown}"
+            raise BiogemeError(error_msg)
+        number_of_individuals = len(chosen_positions)
+        log_proba_of_alternatives = np.full(len(ids), np.nan)
+        samples = [chosen_positions[:, None]]
+        log_probas = []
+        keep = [np.ones((number_of_individuals, 1), dtype=bool)]
+        for stratum, positions in zip(self.partition, self._strata_positions):
+            stratum_size = len(positions)
+            sample_size = stratum.sample_size
+            logproba = np.log(sample_size) - np.log(stratum_size)
+            log_proba_of_alternatives[positions] = logproba
+            rank = np.full(len(ids), -1)
+            rank[positions] = np.arange(stratum_size)
+            # The chosen alternative is excluded, and one alternative
+            # less is drawn for the individuals who chose in the stratum.
+            excluded = rank[chosen_positions]
+            sample = sample_without_replacement(
+                stratum_size, sample_size, excluded, generator
+            )
+            samples.append(positions[sample])
+            log_probas.append(np.full(sample_size, logproba))
+            stratum_keep = np.ones((number_of_individuals, sample_size), dtype=bool)
+            stratum_keep[excluded >= 0, -1] = False
+            keep.append(stratum_keep)
+        keep = np.hstack(keep)
+        number_of_columns = keep.sum(axis=1)[0] if number_of_individuals else 0
+        sampled = np.hstack(samples)[keep].reshape(
+            number_of_individuals, number_of_columns
+        )
+        all_log_probas = np.hstack(
+            [log_proba_of_alternatives[chosen_positions][:, None]]
+            + [
+                np.broadcast_to(logproba, (number_of_individuals, len(logproba)))
+                for logproba in log_probas
+            ]
+        )[keep].reshape(number_of_individuals, number_of_columns)
+        return sampled, all_log_probas
+
+    def sample_mev_choice_sets(
+        self, number_of_individuals: int, generator: np.random.Generator
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Performs the sampling of alternatives for the MEV terms, for
+        several individuals at once. It is equivalent to calling
+        :meth:`sample_mev_alternatives` for each individual, with
+        other pseudo-random numbers.
+
+        :param number_of_individuals: number of individuals.
+        :type number_of_individuals: int
+
+        :param generator: generator of the pseudo-random numbers.
+        :type generator: numpy.random.Generator
+
+        :return: the positions of the sampled alternatives in the data
+            frame of alternatives, with one row per individual, and the
+            MEV weight of each column.
+        :rtype: tuple(numpy.array, numpy.array)
+        """
+        self._alternative_positions()
+        no_exclusion = np.full(number_of_individuals, -1)
+        samples = []
+        weights = []
+        for stratum, positions in zip(
+            self.second_partition, self._mev_strata_positions
+        ):
+            sample = sample_without_replacement(
+                len(positions), stratum.sample_size, no_exclusion, generator
+            )
+            samples.append(positions[sample])
+            weights.append(
+                np.full(stratum.sample_size, len(positions) / stratum.sample_size)
+            )
+        return np.hstack(samples), np.concatenate(weights)
+
+    def sample_mev_alternatives(
+        self, generator: np.random.Generator | None = None
+    ) -> pd.DataFrame:
         """Performing the sampling of alternatives for the MEV
         terms. Here, the chosen alternative is ignored.
 
+        :param generator: generator of the pseudo-random numbers. If
+            None, the global numpy generator is used.
+
         :return: data frame containing a sample of alternatives
 
         """
@@ -143,7 +360,11 @@ class SamplingOfAlternatives:
                 self.alternatives[self.id_column].isin(stratum.subset)
             ]
             sample = subset.sample(
-                n=sample_size, replace=False, axis="index", ignore_index=True
+                n=sample_size,
+                replace=False,
+                axis="index",
+                ignore_index=True,
+                random_state=generator,
             )
             sample[MEV_WEIGHT] = mev_weight
 
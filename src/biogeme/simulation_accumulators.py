@@ -0,0 +1,315 @@
+"""Accumulators of the values simulated for several parameter vectors.
+
+:author: Michel Bierlaire
+:date: Mon Oct 19 08:35:17 2026
+
+When the formulas are simulated for many vectors of parameters, for
+instance to calculate confidence intervals, the simulated values are
+passed to accumulators, one parameter vector at a time. They update
+statistics on the values of each formula for each row of the
+database, without storing all of them, except if it is explicitly
+requested.
+
+The values associated with one parameter vector are stored in an array
+of dimensions (number of formulas, number of rows).
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from biogeme.exceptions import BiogemeError
+
+
+class SimulationAccumulator(ABC):
+    """Abstract class for the accumulators of simulated values."""
+
+    def __init__(self) -> None:
+        self.count: int = 0  #: Number of parameter vectors accumulated.
+
+    def add(self, values: np.ndarray) -> None:
+        """Accumulates the values simulated for one parameter vector.
+
+        :param values: simulated values, with one row per formula, and
+            one column per row of the database.
+        :type values: numpy.array
+
+        :raise BiogemeError: if the dimensions are inconsistent with the
+            values previously accumulated.
+        """
+        values = np.asarray(values, dtype=float)
+        if self.count > 0 and values.shape != self.shape:
+            error_msg = (
+                f'Simulated values of dimensions {values.shape} cannot be '
+                f'accumulated with values of dimensions {self.shape}.'
+            )
+            raise BiogemeError(error_msg)
+        self.shape = values.shape
+        self._add(values)
+        self.count += 1
+
+    @abstractmethod
+    def _add(self, values: np.ndarray) -> None:
+        """Updates the statistics with the values of one parameter vector.
+
+        :param values: simulated values.
+        :type values: numpy.array
+        """
+
+    def _check_not_empty(self) -> None:
+        """Verifies that values have been accumulated.
+
+        :raise BiogemeError: if no value has been accumulated.
+        """
+        if self.count == 0:
+            error_msg = 'No simulated value has been accumulated.'
+            raise BiogemeError(error_msg)
+
+
+class MomentsAccumulator(SimulationAccumulator):
+    """Mean, variance, minimum and maximum of the simulated values,
+    updated with the algorithm of Welford (1962)."""
+
+    def _add(self, values: np.ndarray) -> None:
+        if self.count == 0:
+            self._mean = values.copy()
+            self._sum_of_squares = np.zeros_like(values)
+            self._minimum = values.copy()
+            self._maximum = values.copy()
+            return
+        delta = values - self._mean
+        self._mean += delta / (self.count + 1)
+        self._sum_of_squares += delta * (values - self._mean)
+        np.minimum(self._minimum, values, out=self._minimum)
+        np.maximum(self._maximum, values, out=self._maximum)
+
+    def mean(self) -> np.ndarray:
+        """Mean of the simulated values.
+
+        :return: array with one row per formula, and one column per row
+            of the database.
+        :rtype: numpy.array
+        """
+        self._check_not_empty()
+        return self._mean
+
+    def variance(self) -> np.ndarray:
+        """Sample variance of the simulated values.
+
+        :return: array with one row per formula, and one column per row
+            of the database.
+        :rtype: numpy.array
+
+        :raise BiogemeError: if less than two parameter vectors have
+            been accumulated.
+        """
+        if self.count < 2:
+            error_msg = 'At least two values are needed to calculate a variance.'
+            raise BiogemeError(error_msg)
+        return self._sum_of_squares / (self.count - 1)
+
+    def minimum(self) -> np.ndarray:
+        """Smallest simulated values.
+
+        :return: array with one row per formula, and one column per row
+            of the database.
+        :rtype: numpy.array
+        """
+        self._check_not_empty()
+        return self._minimum
+
+    def maximum(self) -> np.ndarray:
+        """Largest simulated values.
+
+        :return: array with one row per formula, and one column per row
+            of the database.
+        :rtype: numpy.array
+        """
+        self._check_not_empty()
+        return self._maximum
+
+
+class ExactQuantilesAccumulator(SimulationAccumulator):
+    """Quantiles of the simulated values, calculated exactly. All the
+    values are stored, and the quantiles are obtained by linear
+    interpolation, as with :meth:`pandas.DataFrame.quantile`.
+    """
+
+    def __init__(self, probabilities: list[float]) -> None:
+        """Constructor
+
+        :param probabilities: probabilities of the requested quantiles.
+        :type probabilities: list(float)
+        """
+        super().__init__()
+        self.probabilities = probabilities
+        self._values: list[np.ndarray] = []
+
+    def _add(self, values: np.ndarray) -> None:
+        self._values.append(values)
+
+    def quantiles(self) -> list[np.ndarray]:
+        """Calculates the quantiles.
+
+        :return: for each probability, an array with one row per
+            formula, and one column per row of the database.
+        :rtype: list(numpy.array)
+        """
+        self._check_not_empty()
+        all_values = np.stack(self._values)
+        return list(np.quantile(all_values, self.probabilities, axis=0))
+
+
+class StreamingQuantilesAccumulator(SimulationAccumulator):
+    """Quantiles of the simulated values, estimated with the P^2
+    algorithm of Jain and Chlamtac (1985). For each quantile, only five
+    markers are stored for each formula and each row, irrespectively
+    of the number of parameter vectors. The markers are the minimum,
+    the maximum, and estimates of the quantiles of probability p/2, p
+    and (1+p)/2. As long as less than five vectors have been
+    accumulated, the quantiles are calculated exactly.
+    """
+
+    number_of_markers = 5
+
+    def __init__(self, probabilities: list[float]) -> None:
+        """Constructor
+
+        :param probabilities: probabilities of the requested quantiles.
+        :type probabilities: list(float)
+
+        :raise BiogemeError: if a probability is not in [0, 1].
+        """
+        super().__init__()
+        for probability in probabilities:
+            if not 0 <= probability <= 1:
+                error_msg = f'Invalid probability for a quantile: {probability}'
+                raise BiogemeError(error_msg)
+        self.probabilities = probabilities
+        self._first_values: list[np.ndarray] = []
+        self._heights: list[np.ndarray] = []
+        self._positions: list[np.ndarray] = []
+
+    def _add(self, values: np.ndarray) -> None:
+        if self.count < self.number_of_markers:
+            self._first_values.append(values)
+            if self.count + 1 == self.number_of_markers:
+                self._initialize()
+            return
+        for heights, positions, probability in zip(
+            self._heights, self._positions, self.probabilities
+        ):
+            self._update(heights, positions, probability, values)
+
+    def _initialize(self) -> None:
+        """Initializes the markers with the first values."""
+        first_values = np.sort(np.stack(self._first_values), axis=0)
+        self._first_values = []
+        positions = np.arange(self.number_of_markers, dtype=float).reshape(
+            (self.number_of_markers,) + (1,) * (first_values.ndim - 1)
+        )
+        for _ in self.probabilities:
+            self._heights.append(first_values.copy())
+            self._positions.append(
+                np.broadcast_to(positions, first_values.shape).copy()
+            )
+
+    def _update(
+        self,
+        heights: np.ndarray,
+        positions: np.ndarray,
+        probability: float,
+        values: np.ndarray,
+    ) -> None:
+        """Updates the markers of one quantile with new values.
+
+        :param heights: heights of the markers, updated in place.
+        :type heights: numpy.array
+
+        :param positions: positions of the markers, starting from 0,
+            updated in place.
+        :type positions: numpy.array
+
+        :param probability: probability of the quantile.
+        :type probability: float
+
+        :param values: new values.
+        :type values: numpy.array
+        """
+        # The positions of the markers above the new value are
+        # incremented.
+        for i in range(1, 4):
+            positions[i] += values < heights[i]
+        positions[4] += 1
+        np.minimum(heights[0], values, out=heights[0])
+        np.maximum(heights[4], values, out=heights[4])
+        # Desired positions, given the number of values.
+        number_of_values = self.count + 1
+        increments = (0.0, probability / 2, probability, (1 + probability) / 2, 1.0)
+        desired = [(number_of_values - 1) * increment for increment in increments]
+        for i in range(1, 4):
+            self._adjust(heights, positions, i, desired[i])
+
+    @staticmethod
+    def _adjust(
+        heights: np.ndarray, positions: np.ndarray, i: int, desired: float
+    ) -> None:
+        """Moves a marker towards its desired position, if needed.
+
+        :param heights: heights of the markers, updated in place.
+        :type heights: numpy.array
+
+        :param positions: positions of the markers, updated in place.
+        :type positions: numpy.array
+
+        :param i: index of the marker.
+        :type i: int
+
+        :param desired: desired position of the marker.
+        :type desired: float
+        """
+        difference = desired - positions[i]
+        gap_above = positions[i + 1] - positions[i]
+        gap_below = positions[i - 1] - positions[i]
+        move = ((difference >= 1) & (gap_above > 1)) | (
+            (difference <= -1) & (gap_below < -1)
+        )
+        if not move.any():
+            return
+        sign = np.where(difference >= 0, 1.0, -1.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            parabolic = heights[i] + sign / (positions[i + 1] - positions[i - 1]) * (
+                (positions[i] - positions[i - 1] + sign)
+                * (heights[i + 1] - heights[i])
+                / gap_above
+                + (gap_above - sign)
+                * (heights[i] - heights[i - 1])
+                / (positions[i] - positions[i - 1])
+            )
+            neighbor_height = np.where(sign > 0, heights[i + 1], heights[i - 1])
+            neighbor_position = np.where(sign > 0, positions[i + 1], positions[i - 1])
+            linear = heights[i] + sign * (neighbor_height - heights[i]) / (
+                neighbor_position - positions[i]
+            )
+        new_height = np.where(
+            (heights[i - 1] < parabolic) & (parabolic < heights[i + 1]),
+            parabolic,
+            linear,
+        )
+        heights[i] = np.where(move, new_height, heights[i])
+        positions[i] += np.where(move, sign, 0.0)
+
+    def quantiles(self) -> list[np.ndarray]:
+        """Estimates of the quantiles.
+
+        :return: for each probability, an array with one row per
+            formula, and one column per row of the database.
+        :rtype: list(numpy.array)
+        """
+        self._check_not_empty()
+        if self.count < self.number_of_markers:
+            all_values = np.stack(self._first_values)
+            return list(np.quantile(all_values, self.probabilities, axis=0))
+        return [heights[2].copy() for heights in self._heights]
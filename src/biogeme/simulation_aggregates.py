@@ -0,0 +1,147 @@
+"""Aggregates of simulated quantities, calculated chunk by chunk.
+
+:author: Michel Bierlaire
+:date: Mon Oct 19 10:41:08 2026
+
+Indicators such as market shares or revenues are weighted sums or
+weighted means of simulated quantities over the rows of the
+database, possibly by segment. They are updated with each chunk of
+simulated values, so that the values of all the rows never need to be
+stored.
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from biogeme.exceptions import BiogemeError
+
+TOTAL = 'total'
+"""Label of the aggregates when they are not calculated by segment."""
+
+
+class Aggregate(NamedTuple):
+    """Aggregate of a simulated quantity over the rows of the database."""
+
+    formula: str
+    """Name of the simulated formula, or of the column of the data,
+    that is aggregated."""
+
+    weight: str | None = None
+    """Name of the simulated formula, or of the column of the data,
+    containing the weight of each row. If None, all rows have weight
+    one."""
+
+    mean: bool = False
+    """If True, the weighted mean is calculated. Otherwise, the
+    weighted sum."""
+
+
+class AggregatesCalculator:
+    """Calculates aggregates of simulated quantities, chunk by chunk."""
+
+    def __init__(self, aggregates: dict[str, Aggregate], group_by: str | None = None):
+        """Constructor
+
+        :param aggregates: definition of the aggregates, indexed by
+            their names.
+        :type aggregates: dict(str: Aggregate)
+
+        :param group_by: name of the simulated formula, or of the column
+            of the data, defining the segments. If None, the aggregates
+            are calculated over all the rows.
+        :type group_by: str
+        """
+        self.aggregates = aggregates
+        self.group_by = group_by
+        self._sums: pd.DataFrame | None = None
+
+    def required_names(self) -> set[str]:
+        """Names of the formulas or columns involved in the aggregates.
+
+        :return: set of names.
+        :rtype: set(str)
+        """
+        names = {self.group_by} if self.group_by is not None else set()
+        for aggregate in self.aggregates.values():
+            names.add(aggregate.formula)
+            if aggregate.weight is not None:
+                names.add(aggregate.weight)
+        return names
+
+    @staticmethod
+    def _values(
+        name: str, simulated: pd.DataFrame, data: pd.DataFrame | None
+    ) -> np.ndarray:
+        """Values of a simulated formula, or of a column of the data.
+
+        :param name: name of the formula or the column.
+        :type name: str
+
+        :param simulated: simulated values.
+        :type simulated: pandas.DataFrame
+
+        :param data: data used for the simulation.
+        :type data: pandas.DataFrame
+
+        :return: the values.
+        :rtype: numpy.array
+
+        :raise BiogemeError: if the name is neither a formula nor a column.
+        """
+        if name in simulated.columns:
+            return simulated[name].to_numpy()
+        if data is not None and name in data.columns:
+            return data[name].to_numpy()
+        error_msg = f'{name} is neither a simulated formula nor a column of the data.'
+        raise BiogemeError(error_msg)
+
+    def add(self, simulated: pd.DataFrame, data: pd.DataFrame | None = None) -> None:
+        """Updates the aggregates with a chunk of simulated values.
+
+        :param simulated: simulated values, with one column per formula.
+        :type simulated: pandas.DataFrame
+
+        :param data: rows of the data used for the simulation, in the
+            same order.
+        :type data: pandas.DataFrame
+        """
+        columns = {}
+        for name, aggregate in self.aggregates.items():
+            values = self._values(aggregate.formula, simulated, data)
+            if aggregate.weight is None:
+                columns[(name, 'sum')] = values
+                weights = np.ones(len(values))
+            else:
+                weights = self._values(aggregate.weight, simulated, data)
+                columns[(name, 'sum')] = values * weights
+            columns[(name, 'weight')] = weights
+        frame = pd.DataFrame(columns)
+        if self.group_by is None:
+            sums = frame.sum().to_frame(TOTAL).T
+        else:
+            sums = frame.groupby(self._values(self.group_by, simulated, data)).sum()
+        self._sums = sums if self._sums is None else self._sums.add(sums, fill_value=0)
+
+    def results(self) -> pd.DataFrame:
+        """Values of the aggregates.
+
+        :return: data frame with one column per aggregate, and one row
+            per segment, or one row labeled 'total' if the aggregates
+            are not calculated by segment.
+        :rtype: pandas.DataFrame
+
+        :raise BiogemeError: if no value has been added.
+        """
+        if self._sums is None:
+            error_msg = 'No simulated value has been aggregated.'
+            raise BiogemeError(error_msg)
+        results = pd.DataFrame(index=self._sums.index)
+        for name, aggregate in self.aggregates.items():
+            results[name] = self._sums[(name, 'sum')]
+            if aggregate.mean:
+                results[name] /= self._sums[(name, 'weight')]
+        return results.sort_index()
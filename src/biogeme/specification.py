@@ -20,12 +20,14 @@ from biogeme_optimization.pareto import SetElement
 import biogeme.biogeme as bio
 import biogeme.tools.unique_ids
 from biogeme.configuration import Configuration
+from biogeme.estimation_context import EstimationContext
 from biogeme.exceptions import BiogemeError
 from biogeme.parameters import get_default_value
 from biogeme.validity import Validity
 
 if TYPE_CHECKING:
     from biogeme.results import bioResults
+    from biogeme.results_store import ResultsStore
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +37,11 @@ class Specification:
 
     database = None  #: :class:`biogeme.database.Database` object
     all_results = {}  #: dict(str: `biogeme.results.bioResults`)
+    results_store: ResultsStore | None = None
+    """Persistent storage of the results, shared by several runs. If
+    None, the results are kept in memory only."""
+    estimation_context: EstimationContext | None = None
+    """C++ model shared by the estimations of all specifications."""
     expression = None  #: :class:`biogeme.expressions.Expression` object
     """
         function that generates all the objectives:
@@ -123,14 +130,22 @@ class Specification:
                 prefix=self.generic_name
             )
 
-        if self.config_id in self.all_results:
-            results = self.all_results.get(self.config_id)
-        else:
+        results = self.all_results.get(self.config_id)
+        if results is None and self.results_store is not None:
+            self.configure_expression()
+            results = self.results_store.get(self.config_id, self.expression)
+        if results is None:
             logger.debug(f'****** Estimate {self.config_id}')
+            if (
+                Specification.estimation_context is None
+                or Specification.estimation_context.database is not self.database
+            ):
+                Specification.estimation_context = EstimationContext(self.database)
             the_biogeme = bio.BIOGEME.from_configuration(
                 config_id=self.config_id,
                 expression=self.expression,
                 database=self.database,
+                estimation_context=Specification.estimation_context,
             )
             number_of_parameters = the_biogeme.number_unknown_parameters()
 
@@ -148,6 +163,8 @@ class Specification:
             the_biogeme.generate_html = False
             the_biogeme.generate_pickle = False
             results = the_biogeme.quick_estimate()
+            if self.results_store is not None:
+                self.results_store.put(self.config_id, self.expression, results)
         self.all_results[self.config_id] = results
         if not results.algorithm_has_converged():
             self.validity = Validity(
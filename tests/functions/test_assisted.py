@@ -0,0 +1,210 @@
+"""
+Test the assisted module
+
+:author: Michel Bierlaire
+:date: Mon Oct 19 21:08:14 2026
+
+"""
+
+# Too constraining
+# pylint: disable=invalid-name
+#
+# Not needed in test
+# pylint: disable=missing-function-docstring, missing-class-docstring
+
+import math
+import multiprocessing as mp
+import os
+import random
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+
+import biogeme.biogeme as bio
+from biogeme.assisted import (
+    AssistedSpecification,
+    SpecificationContext,
+    _initialize_worker,
+    vns,
+)
+from biogeme.catalog import Catalog
+from biogeme.expressions import Variable, Beta, log
+from biogeme.specification import Specification
+from test_data import getData
+
+
+# Class attributes of Specification modified by the assisted
+# specification algorithm.
+SPECIFICATION_ATTRIBUTES = (
+    'database',
+    'results_store',
+    'estimation_context',
+    'expression',
+    'user_defined_validity_check',
+    'generic_name',
+    'pareto',
+)
+
+
+def objectives(results):
+    return [-results.data.logLike, results.data.nparam]
+
+
+class CountingExecutor(ProcessPoolExecutor):
+    """Pool of processes recording the submitted configurations."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.submitted = []
+
+    def submit(self, fn, /, *args, **kwargs):
+        self.submitted.append(args[0])
+        return super().submit(fn, *args, **kwargs)
+
+
+class TestAssisted(unittest.TestCase):
+    def setUp(self):
+        self.current_directory = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+        self.pareto_file = 'assisted.pareto'
+        self.specification_attributes = {
+            name: getattr(Specification, name)
+            for name in SPECIFICATION_ATTRIBUTES
+            if hasattr(Specification, name)
+        }
+
+    def tearDown(self):
+        os.chdir(self.current_directory)
+        self.directory.cleanup()
+        # The other tests must not be affected by the specifications
+        # estimated here.
+        Specification.all_results = {}
+        for name in SPECIFICATION_ATTRIBUTES:
+            if name in self.specification_attributes:
+                setattr(Specification, name, self.specification_attributes[name])
+            elif hasattr(Specification, name):
+                delattr(Specification, name)
+
+    def get_assisted(self, number_of_processes):
+        Variable1 = Variable('Variable1')
+        Variable2 = Variable('Variable2')
+        asc = Beta('asc', 0, None, None, 0)
+        beta1 = Beta('beta1', 0, None, None, 0)
+        beta2 = Beta('beta2', 0, None, None, 0)
+        beta3 = Beta('beta3', 0, None, None, 0)
+        first = Catalog.from_dict(
+            'first',
+            {
+                'none': 0,
+                'linear': beta1 * Variable1,
+                'quadratic': beta1 * Variable1 + beta3 * Variable1**2 / 10,
+            },
+        )
+        second = Catalog.from_dict(
+            'second',
+            {
+                'none': 0,
+                'linear': beta2 * Variable2 / 10,
+                'log': beta2 * log(Variable2),
+            },
+        )
+        likelihood = -((Variable('Choice') - asc - first - second) ** 2)
+        the_biogeme = bio.BIOGEME(getData(1), likelihood)
+        the_biogeme.modelName = 'assisted'
+        # The VNS algorithm is used instead of the enumeration.
+        the_biogeme.maximum_number_catalog_expressions = 1
+        the_biogeme.number_of_processes = number_of_processes
+        if os.path.exists(self.pareto_file):
+            os.remove(self.pareto_file)
+        Specification.all_results = {}
+        Specification.estimation_context = None
+        return AssistedSpecification(
+            biogeme_object=the_biogeme,
+            multi_objectives=objectives,
+            pareto_file_name=self.pareto_file,
+        )
+
+    def pareto_set(self, number_of_processes):
+        random.seed(12)
+        assisted = self.get_assisted(number_of_processes)
+        assisted.run()
+        return {element.element_id for element in assisted.pareto.pareto}
+
+    def test_same_pareto_set(self):
+        sequential = self.pareto_set(number_of_processes=1)
+        self.assertGreater(len(sequential), 1)
+        parallel = self.pareto_set(number_of_processes=2)
+        self.assertSetEqual(parallel, sequential)
+
+    def run_parallel_vns(self, number_of_processes):
+        random.seed(12)
+        assisted = self.get_assisted(number_of_processes)
+        Specification.pareto = assisted.pareto
+        default = Specification.default_specification()
+        number_of_specifications = (
+            assisted.biogeme_object.log_like.number_of_multiple_expressions()
+        )
+        methods = mp.get_all_start_methods()
+        with CountingExecutor(
+            max_workers=number_of_processes,
+            mp_context=mp.get_context('fork' if 'fork' in methods else None),
+            initializer=_initialize_worker,
+            initargs=(
+                SpecificationContext(
+                    expression=assisted.expression,
+                    database=assisted.database,
+                    generic_name=Specification.generic_name,
+                    results_store=None,
+                ),
+            ),
+        ) as executor:
+            with patch(
+                'biogeme.assisted.vns', wraps=vns
+            ) as the_vns, patch.object(
+                assisted, 'prepare_neighbors', wraps=assisted.prepare_neighbors
+            ) as prepare:
+                assisted._explore(
+                    executor,
+                    default,
+                    number_of_specifications,
+                    maximum_number=1,
+                )
+        # The neighbors estimated in parallel are processed by the
+        # VNS algorithm of the sequential version.
+        the_vns.assert_called_once()
+        self.assertGreater(prepare.call_count, 0)
+        self.assertIsNone(assisted.executor)
+        return assisted.pareto, executor.submitted
+
+    def test_parallel_vns(self):
+        sequential = self.pareto_set(number_of_processes=1)
+        for number_of_processes in (1, 2):
+            pareto, submitted = self.run_parallel_vns(number_of_processes)
+            self.assertSetEqual(
+                {element.element_id for element in pareto.pareto}, sequential
+            )
+            # Each configuration is estimated only once.
+            self.assertEqual(len(submitted), len(set(submitted)))
+            self.assertGreater(len(submitted), 1)
+
+    def test_too_many_parameters(self):
+        # Only the specifications with at most 3 parameters are
+        # estimated.
+        with patch('biogeme.specification.get_default_value', return_value=3):
+            pareto, submitted = self.run_parallel_vns(number_of_processes=2)
+        self.assertEqual(len(submitted), len(set(submitted)))
+        invalid = {
+            element.element_id: element.objectives for element in pareto.invalid
+        }
+        self.assertIn('first:quadratic;second:linear', invalid)
+        self.assertTrue(
+            all(math.isinf(value) for value in invalid['first:quadratic;second:log'])
+        )
+        for element in pareto.considered:
+            self.assertLessEqual(element.objectives[1], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,9 +18,11 @@ Test the biogeme module
 import biogeme.biogeme_logging as blog
 
 import os
+import tempfile
 import unittest
 import random as rnd
 import numpy as np
+import pandas as pd
 import biogeme.biogeme as bio
 from biogeme.catalog import Catalog
 import biogeme.exceptions as excep
@@ -32,8 +34,15 @@ from biogeme.expressions import (
     RandomVariable,
     PanelLikelihoodTrajectory,
     Numeric,
+    exp,
+    log,
 )
 from biogeme.function_output import FunctionOutput
+from biogeme.simulation_accumulators import (
+    ExactQuantilesAccumulator,
+    MomentsAccumulator,
+)
+from biogeme.simulation_aggregates import Aggregate, AggregatesCalculator
 from test_data import getData, getPanelData
 
 logger = blog.get_screen_logger(level=blog.INFO)
@@ -517,6 +526,47 @@ class TestBiogeme(unittest.TestCase):
         )
         s = myPanelBiogeme.simulate(results.get_beta_values())
 
+    def test_simulate_generated_draws(self):
+        beta1 = Beta('beta1', 0.5, None, None, 0)
+        error = beta1 * Variable('Variable1') * bioDraws(
+            'x', 'NORMAL_HALTON3'
+        ) + bioDraws('y', 'UNIFORMSYM_HALTON5')
+        with tempfile.TemporaryDirectory() as directory:
+            parameter_files = {}
+            for generated in ('False', 'True'):
+                parameter_files[generated] = os.path.join(
+                    directory, f'biogeme_{generated}.toml'
+                )
+                with open(parameter_files[generated], 'w', encoding='utf-8') as f:
+                    print('[MonteCarlo]', file=f)
+                    print('number_of_draws = 50', file=f)
+                    print(f'generated_draws = "{generated}"', file=f)
+            for panel in (False, True):
+                trajectory = (
+                    PanelLikelihoodTrajectory(exp(-error * error))
+                    if panel
+                    else exp(-error * error)
+                )
+                formulas = {'log_like': log(MonteCarlo(trajectory))}
+                database = getPanelData(1) if panel else getData(1)
+                expected = bio.BIOGEME(
+                    database, formulas, parameter_file=parameter_files['False']
+                ).simulate({'beta1': 0.3})
+                database = getPanelData(1) if panel else getData(1)
+                my_biogeme = bio.BIOGEME(
+                    database, formulas, parameter_file=parameter_files['True']
+                )
+                self.assertIsNone(my_biogeme.draws)
+                my_biogeme.biogeme_parameters.set_value(
+                    name='draws_chunk_size', value=1, section='MonteCarlo'
+                )
+                s = my_biogeme.simulate({'beta1': 0.3})
+                pd.testing.assert_frame_equal(s, expected)
+                # The estimation requires the draws to be stored.
+                loglike = my_biogeme.calculate_likelihood([0.3], scaled=False)
+                self.assertIsNotNone(my_biogeme.draws)
+                self.assertAlmostEqual(loglike, expected['log_like'].sum())
+
     def test_changeInitValues(self):
         my_biogeme = self.get_biogeme_instance()
         my_biogeme.change_init_values({'beta2': -100, 'beta1': 3.14156})
@@ -534,6 +584,221 @@ class TestBiogeme(unittest.TestCase):
         self.assertLessEqual(left.loc[0, 'log_like'], s.loc[0, 'log_like'])
         self.assertGreaterEqual(right.loc[0, 'log_like'], s.loc[0, 'log_like'])
 
+    def test_simulate_chunks(self):
+        my_biogeme = self.get_biogeme_instance()
+        beta_values = {'beta1': 0.5, 'beta2': 1.0}
+        expected = my_biogeme.simulate(beta_values)
+        data = my_biogeme.database.data
+        # The columns that are not involved in the formulas are not needed.
+        chunks = [
+            data.iloc[:2][['Variable2', 'Variable1']],
+            data.iloc[2:][['Variable1', 'Variable2', 'Choice']],
+        ]
+        aggregates = AggregatesCalculator(
+            {'total': Aggregate(formula='simul', weight='Variable2')}
+        )
+        result = pd.concat(
+            my_biogeme.simulate_chunks(beta_values, chunks, aggregates=aggregates)
+        )
+        pd.testing.assert_frame_equal(result, expected)
+        self.assertAlmostEqual(
+            aggregates.results().loc['total', 'total'],
+            (expected['simul'] * data['Variable2']).sum(),
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            input_file = os.path.join(directory, 'data.csv')
+            output_file = os.path.join(directory, 'simulated.csv')
+            data.to_csv(input_file, index=False)
+            my_biogeme.biogeme_parameters.set_value(
+                name='simulation_chunk_size', value=2, section='Simulation'
+            )
+            rows = my_biogeme.simulate_to_file(beta_values, input_file, output_file)
+            self.assertEqual(rows, len(data))
+            result = pd.read_csv(output_file, index_col=0)
+            np.testing.assert_allclose(result.to_numpy(), expected.to_numpy())
+        with self.assertRaises(excep.BiogemeError):
+            _ = list(my_biogeme.simulate_chunks(beta_values, [data[['Variable1']]]))
+        with self.assertRaises(excep.BiogemeError):
+            _ = self.get_panel_instance().simulate_chunks(beta_values, chunks)
+
+    def test_simulate_aggregates(self):
+        my_biogeme = self.get_biogeme_instance()
+        beta_values = {'beta1': 0.5, 'beta2': 1.0}
+        simulated = my_biogeme.simulate(beta_values)
+        data = my_biogeme.database.data
+        aggregates = {
+            'sum': Aggregate(formula='simul', weight='Variable2'),
+            'mean': Aggregate(formula='simul', weight='Variable2', mean=True),
+        }
+        # Several chunks of rows are simulated.
+        my_biogeme.biogeme_parameters.set_value(
+            name='simulation_chunk_size', value=2, section='Simulation'
+        )
+        result = my_biogeme.simulate(
+            beta_values, aggregates=aggregates, group_by='Person'
+        )
+        weighted = simulated['simul'] * data['Variable2']
+        expected_sum = weighted.groupby(data['Person']).sum()
+        expected_mean = expected_sum / data['Variable2'].groupby(data['Person']).sum()
+        np.testing.assert_allclose(result['sum'], expected_sum)
+        np.testing.assert_allclose(result['mean'], expected_mean)
+        total = my_biogeme.simulate(beta_values, aggregates=aggregates)
+        self.assertAlmostEqual(total.loc['total', 'sum'], weighted.sum())
+        with self.assertRaises(excep.BiogemeError):
+            _ = my_biogeme.simulate(
+                beta_values, aggregates={'wrong': Aggregate(formula='unknown')}
+            )
+        # For panel data, the values are simulated for each individual.
+        panel_biogeme = bio.BIOGEME(
+            getPanelData(1),
+            {
+                'Simul': MonteCarlo(
+                    PanelLikelihoodTrajectory(bioDraws('test', 'NORMAL'))
+                )
+            },
+        )
+        expected = panel_biogeme.simulate({})['Simul'].sum()
+        result = panel_biogeme.simulate(
+            {}, aggregates={'total': Aggregate(formula='Simul')}
+        )
+        self.assertAlmostEqual(result.loc['total', 'total'], expected)
+
+    def test_simulate_scenarios(self):
+        Variable1 = Variable('Variable1')
+        Variable2 = Variable('Variable2')
+        beta1 = Beta('beta1', -1.0, -3, 3, 0)
+        factor = Beta('factor', 1.0, None, None, 1)
+        formulas = {'simul': beta1 * Variable1 * factor + Variable2}
+        my_biogeme = bio.BIOGEME(getData(1), formulas)
+        beta_values = {'beta1': 0.5}
+        scenarios = pd.DataFrame({'factor': [1.0, 2.0, 3.0]}, index=['a', 'b', 'c'])
+        result = my_biogeme.simulate_scenarios(beta_values, scenarios)
+        nominal = my_biogeme.simulate(beta_values)
+        data = my_biogeme.database.data
+        for label, value in zip(scenarios.index, scenarios['factor']):
+            np.testing.assert_allclose(
+                result.loc[label, 'simul'],
+                0.5 * data['Variable1'] * value + data['Variable2'],
+            )
+        # Overrides of columns are reverted for the next scenarios.
+        scenarios = [{'Variable2': 10.0}, {'factor': 2.0}, {}]
+        result = my_biogeme.simulate_scenarios(
+            beta_values,
+            scenarios,
+            aggregates={'total': Aggregate(formula='simul', weight='Variable2')},
+        )
+        self.assertAlmostEqual(
+            result.loc[(0, 'total'), 'total'],
+            ((0.5 * data['Variable1'] + 10) * 10).sum(),
+        )
+        self.assertAlmostEqual(
+            result.loc[(1, 'total'), 'total'],
+            ((data['Variable1'] + data['Variable2']) * data['Variable2']).sum(),
+        )
+        self.assertAlmostEqual(
+            result.loc[(2, 'total'), 'total'],
+            (nominal['simul'] * data['Variable2']).sum(),
+        )
+        # The data of the database is not modified.
+        pd.testing.assert_frame_equal(my_biogeme.simulate(beta_values), nominal)
+        with self.assertRaises(excep.BiogemeError):
+            _ = my_biogeme.simulate_scenarios(beta_values, [{'beta1': 1.0}])
+        with self.assertRaises(excep.BiogemeError):
+            _ = my_biogeme.simulate_scenarios(beta_values, [])
+
+    def test_simulate_scenarios_intervals(self):
+        Variable1 = Variable('Variable1')
+        Variable2 = Variable('Variable2')
+        beta1 = Beta('beta1', -1.0, -3, 3, 0)
+        factor = Beta('factor', 1.0, None, None, 1)
+        formulas = {'simul': beta1 * Variable1 * factor + Variable2}
+        my_biogeme = bio.BIOGEME(getData(1), formulas)
+        beta_values = {'beta1': 0.5}
+        beta_draws = [{'beta1': value} for value in np.linspace(0.0, 1.0, 11)]
+        scenarios = [{}, {'factor': 2.0}]
+        result, left, right = my_biogeme.simulate_scenarios(
+            beta_values, scenarios, beta_draws=beta_draws, interval_size=0.8
+        )
+        pd.testing.assert_frame_equal(
+            result.loc[0], my_biogeme.simulate(beta_values), check_names=False
+        )
+        expected_left, expected_right = my_biogeme.confidence_intervals(
+            beta_draws, 0.8
+        )
+        pd.testing.assert_frame_equal(left.loc[0], expected_left, check_names=False)
+        pd.testing.assert_frame_equal(
+            right.loc[0], expected_right, check_names=False
+        )
+        data = my_biogeme.database.data
+        np.testing.assert_allclose(
+            right.loc[1, 'simul'] - left.loc[1, 'simul'],
+            2 * 0.8 * data['Variable1'].abs(),
+        )
+        # The aggregates are calculated from the bounds of each row.
+        _, left_total, right_total = my_biogeme.simulate_scenarios(
+            beta_values,
+            scenarios,
+            aggregates={'total': Aggregate(formula='simul', weight='Variable2')},
+            beta_draws=beta_draws,
+            interval_size=0.8,
+        )
+        for bounds, total in ((left, left_total), (right, right_total)):
+            for label in (0, 1):
+                self.assertAlmostEqual(
+                    total.loc[(label, 'total'), 'total'],
+                    (bounds.loc[label, 'simul'] * data['Variable2']).sum(),
+                )
+        # The draws generated for Monte-Carlo integration are not stored.
+        with tempfile.TemporaryDirectory() as directory:
+            parameter_file = os.path.join(directory, 'biogeme.toml')
+            with open(parameter_file, 'w', encoding='utf-8') as f:
+                print('[MonteCarlo]', file=f)
+                print('generated_draws = "True"', file=f)
+            simul = MonteCarlo(beta1 * Variable1 * bioDraws('d', 'NORMAL_HALTON3'))
+            mc_biogeme = bio.BIOGEME(
+                getData(1), {'simul': simul}, parameter_file=parameter_file
+            )
+            _ = mc_biogeme.simulate_scenarios(
+                beta_values, [{}], beta_draws=beta_draws
+            )
+        self.assertIsNone(mc_biogeme.draws)
+
+    def test_simulate_batch(self):
+        my_biogeme = self.get_biogeme_instance()
+        vectors = [{'beta1': -1.0, 'beta2': 2.0}, {'beta1': 0.5, 'beta2': 1.0}]
+        expected = [my_biogeme.simulate(b) for b in vectors]
+        moments = MomentsAccumulator()
+        quantiles = ExactQuantilesAccumulator([0.0, 1.0])
+        my_biogeme.simulate_batch(
+            np.array([[-1.0, 2.0], [0.5, 1.0]]), [moments, quantiles]
+        )
+        self.assertEqual(moments.count, 2)
+        mean = (expected[0] + expected[1]) / 2
+        np.testing.assert_allclose(moments.mean(), mean.to_numpy().T)
+        lower, upper = quantiles.quantiles()
+        np.testing.assert_allclose(lower, np.minimum(*expected).to_numpy().T)
+        np.testing.assert_allclose(upper, np.maximum(*expected).to_numpy().T)
+        with self.assertRaises(excep.BiogemeError):
+            my_biogeme.simulate_batch(np.zeros((2, 3)), [moments])
+
+    def test_confidence_intervals_streaming(self):
+        my_biogeme = self.get_biogeme_instance()
+        vectors = [
+            {'beta1': beta1, 'beta2': beta2}
+            for beta1, beta2 in np.random.normal(size=(50, 2))
+        ]
+        left, right = my_biogeme.confidence_intervals(vectors)
+        # The values are not stored: the quantiles are estimated.
+        my_biogeme.biogeme_parameters.set_value(
+            name='max_stored_simulated_values', value=10, section='Simulation'
+        )
+        approximate_left, approximate_right = my_biogeme.confidence_intervals(
+            vectors
+        )
+        self.assertListEqual(list(approximate_left.columns), list(left.columns))
+        pd.testing.assert_index_equal(approximate_right.index, right.index)
+        self.assertTrue((approximate_left <= approximate_right).all().all())
+
     def test_validate(self):
         my_data = getData(1)
         my_biogeme = self.get_biogeme_instance()
@@ -546,10 +811,11 @@ class TestBiogeme(unittest.TestCase):
 
         b = self.get_panel_instance()
         results = b.estimate()
-        panel_data = getPanelData(1)
-        validation_data = panel_data.split(slices=2)
-        with self.assertRaises(excep.BiogemeError):
-            validation_results = b.validate(results, validation_data)
+        validation_data = b.database.split(slices=2)
+        validation_results = b.validate(results, validation_data)
+        # Each individual belongs to one validation set.
+        individuals = pd.concat(validation_results).index
+        self.assertListEqual(sorted(individuals), [1, 2])
 
     def test_optimize(self):
         # Here, we test only the special cases, as it has been called
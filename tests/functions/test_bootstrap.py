@@ -0,0 +1,139 @@
+"""
+Test the bootstrap module
+
+:author: Michel Bierlaire
+:date: Sun Oct 18 10:02:17 2026
+
+"""
+
+# Too constraining
+# pylint: disable=invalid-name
+#
+# Not needed in test
+# pylint: disable=missing-function-docstring, missing-class-docstring
+
+import os
+import unittest
+from unittest.mock import patch
+
+import cythonbiogeme.cythonbiogeme as cb
+import numpy as np
+
+import biogeme.biogeme as bio
+from biogeme.bootstrap import (
+    BootstrapRunner,
+    BootstrapWorker,
+    replication_generator,
+)
+from biogeme.expressions import Variable, Beta
+from test_data import getData, getPanelData
+
+
+class TestBootstrap(unittest.TestCase):
+    def get_biogeme(self, panel=False, weight=None):
+        Variable1 = Variable('Variable1')
+        Variable2 = Variable('Variable2')
+        beta1 = Beta('beta1', -1.0, -3, 3, 0)
+        beta2 = Beta('beta2', 2.0, -3, 10, 0)
+        likelihood = -((beta1 * Variable1 - 1) ** 2) - (beta2 * Variable2 - 3) ** 2
+        data = getPanelData(1) if panel else getData(1)
+        formulas = {'log_like': likelihood}
+        if weight is not None:
+            formulas['weight'] = weight
+        my_biogeme = bio.BIOGEME(data, formulas)
+        my_biogeme.modelName = 'bootstrapExample'
+        my_biogeme.number_of_threads = 1
+        my_biogeme.seed_param = 12
+        my_biogeme.bootstrap_samples = 6
+        my_biogeme._set_function_parameters()
+        my_biogeme._set_algorithm_parameters()
+        return my_biogeme
+
+    def test_replication_generator(self):
+        first = replication_generator(12, 3).integers(0, 1000, 5)
+        second = replication_generator(12, 3).integers(0, 1000, 5)
+        other = replication_generator(12, 4).integers(0, 1000, 5)
+        np.testing.assert_array_equal(first, second)
+        self.assertFalse(np.array_equal(first, other))
+
+    def test_parallel_is_reproducible(self):
+        for panel in (False, True):
+            my_biogeme = self.get_biogeme(panel=panel)
+            start = np.array(my_biogeme.id_manager.free_betas_values)
+            serial = BootstrapRunner(my_biogeme, start).run()
+            my_biogeme.number_of_processes = 2
+            parallel = BootstrapRunner(my_biogeme, start).run()
+            self.assertTupleEqual(serial.shape, (6, 2))
+            np.testing.assert_allclose(serial, parallel)
+
+    def test_resampled_observations(self):
+        for weight in (None, Variable('Variable2')):
+            my_biogeme = self.get_biogeme(weight=weight)
+            start = np.array(my_biogeme.id_manager.free_betas_values)
+            runner = BootstrapRunner(my_biogeme, start)
+            worker = BootstrapWorker(runner.context)
+            size = my_biogeme.database.get_number_of_observations()
+            draws = replication_generator(12, 0).integers(0, size, size)
+            weights = (
+                np.ones(size)
+                if weight is None
+                else my_biogeme.database.data['Variable2'].to_numpy()
+            )
+            x = np.array([0.5, 1.5])
+            data = my_biogeme.database.data
+            terms = -((x[0] * data['Variable1'].to_numpy() - 1) ** 2) - (
+                x[1] * data['Variable2'].to_numpy() - 3
+            ) ** 2
+            self.assertAlmostEqual(
+                worker.calculate_likelihood(x, scaled=False), np.sum(terms * weights)
+            )
+            worker.replication(0)
+            self.assertAlmostEqual(
+                worker.calculate_likelihood(x, scaled=False),
+                np.sum(terms[draws] * weights[draws]),
+            )
+            worker.reset_sample()
+            self.assertAlmostEqual(
+                worker.calculate_likelihood(x, scaled=False), np.sum(terms * weights)
+            )
+
+    def test_data_transferred_once(self):
+        calls = []
+
+        class CountingBiogeme(cb.pyBiogeme):
+            def setData(self, data):
+                calls.append(len(data))
+                super().setData(data)
+
+        for panel in (False, True):
+            my_biogeme = self.get_biogeme(panel=panel)
+            start = np.array(my_biogeme.id_manager.free_betas_values)
+            runner = BootstrapRunner(my_biogeme, start)
+            calls.clear()
+            with patch('biogeme.bootstrap.cb.pyBiogeme', CountingBiogeme):
+                _ = runner.run()
+            self.assertListEqual(calls, [len(my_biogeme.database.data)])
+
+    def test_resume(self):
+        my_biogeme = self.get_biogeme()
+        start = np.array(my_biogeme.id_manager.free_betas_values)
+        expected = BootstrapRunner(my_biogeme, start).run()
+        file_name = '__bootstrapExample.boot'
+        # Simulate an interrupted run, where only two replications
+        # have been performed.
+        with open(file_name, 'w', encoding='utf-8') as f:
+            print('\t'.join(['12', 'beta1', 'beta2']), file=f)
+            print('\t'.join(['0'] + [repr(v) for v in expected[0]]), file=f)
+            print('\t'.join(['1', '1000.0', '1000.0']), file=f)
+        resumed = BootstrapRunner(my_biogeme, start, file_name=file_name)
+        self.assertSetEqual(resumed.completed, {0, 1})
+        results = resumed.run()
+        np.testing.assert_allclose(results[0], expected[0])
+        # Saved replications are not recalculated
+        np.testing.assert_allclose(results[1], [1000.0, 1000.0])
+        np.testing.assert_allclose(results[2:], expected[2:])
+        self.assertFalse(os.path.exists(file_name))
+
+
+if __name__ == '__main__':
+    unittest.main()
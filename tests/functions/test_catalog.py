@@ -104,6 +104,24 @@ class TestCatalog(unittest.TestCase):
         selected_expression = self.catalog.selected_expression()
         self.assertEqual(selected_expression, self.expression1)
 
+    def test_selection_and_metadata(self):
+        # The metadata cached by the expressions containing a catalog
+        # depends on the selected expression.
+        catalog = Catalog.from_dict(
+            'products',
+            {
+                'first': self.expression1 * Variable('x'),
+                'third': self.expression3 * Variable('x'),
+            },
+        )
+        expression = Variable('y') + catalog
+        self.assertSetEqual(expression.get_status_id_manager()[1], {'y', 'x', 'expr1'})
+        self.assertIs(expression.get_elementary_expression('expr1'), self.expression1)
+        catalog.controlled_by.set_index(1)
+        self.assertSetEqual(expression.get_status_id_manager()[1], {'y', 'x', 'expr3'})
+        self.assertIsNone(expression.get_elementary_expression('expr1'))
+        self.assertIs(expression.get_elementary_expression('expr3'), self.expression3)
+
     def test_selected_name(self):
         selected_name = self.catalog.selected_name()
         self.assertEqual(selected_name, 'expression1')
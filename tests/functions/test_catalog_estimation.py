@@ -0,0 +1,151 @@
+"""
+Test the catalog_estimation module
+
+:author: Michel Bierlaire
+:date: Sun Oct 18 14:52:33 2026
+
+"""
+
+# Too constraining
+# pylint: disable=invalid-name
+#
+# Not needed in test
+# pylint: disable=missing-function-docstring, missing-class-docstring
+
+import multiprocessing as mp
+import os
+import pickle
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import biogeme.biogeme as bio
+import biogeme.catalog_estimation as ce
+from biogeme.catalog import Catalog
+from biogeme.catalog_estimation import CatalogRunner, ConfigurationToEstimate
+from biogeme.expressions import Variable, Beta
+from test_data import getData
+
+
+def estimate_in_worker(configuration):
+    """Estimates a configuration in a worker process, and reports the
+    number of nodes kept by the C++ models of the worker."""
+    ce._run_estimation(configuration)
+    return sum(len(model.nodes) for model in ce._estimation_context.models.values())
+
+
+class TestCatalogEstimation(unittest.TestCase):
+    def setUp(self):
+        # The estimations write their files in a temporary directory.
+        self.current_directory = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+
+    def tearDown(self):
+        os.chdir(self.current_directory)
+        self.directory.cleanup()
+
+    def get_biogeme(self):
+        Variable1 = Variable('Variable1')
+        Variable2 = Variable('Variable2')
+        beta1 = Beta('beta1', -1.0, -3, 3, 0)
+        beta2 = Beta('beta2', 2.0, -3, 10, 0)
+        catalog = Catalog.from_dict(
+            catalog_name='the_catalog',
+            dict_of_expressions={
+                'linear': beta2 * Variable2,
+                'scaled': beta2 * Variable2 / 10,
+            },
+        )
+        likelihood = -((beta1 * Variable1 - 1) ** 2) - (catalog - 3) ** 2
+        my_biogeme = bio.BIOGEME(getData(1), likelihood)
+        my_biogeme.modelName = 'catalogExample'
+        my_biogeme.generate_html = False
+        my_biogeme.generate_pickle = False
+        return my_biogeme
+
+    def get_configurations(self):
+        return [
+            ConfigurationToEstimate(
+                config_id=f'the_catalog:{name}', model_name=f'catalogExample_{name}'
+            )
+            for name in ('linear', 'scaled')
+        ]
+
+    def test_parallel(self):
+        my_biogeme = self.get_biogeme()
+        serial = CatalogRunner(
+            my_biogeme, self.get_configurations(), quick_estimate=True
+        ).run()
+        my_biogeme.number_of_processes = 2
+        parallel = CatalogRunner(
+            my_biogeme, self.get_configurations(), quick_estimate=True
+        ).run()
+        self.assertListEqual(list(serial), ['the_catalog:linear', 'the_catalog:scaled'])
+        self.assertListEqual(list(parallel), list(serial))
+        for config_id, results in serial.items():
+            self.assertEqual(
+                results.data.modelName, parallel[config_id].data.modelName
+            )
+            np.testing.assert_allclose(
+                list(results.get_beta_values().values()),
+                list(parallel[config_id].get_beta_values().values()),
+            )
+        self.assertAlmostEqual(
+            10 * serial['the_catalog:linear'].get_beta_values()['beta2'],
+            serial['the_catalog:scaled'].get_beta_values()['beta2'],
+            places=4,
+        )
+
+    def test_worker_bounded_nodes(self):
+        runner = CatalogRunner(
+            self.get_biogeme(), self.get_configurations(), quick_estimate=True
+        )
+        methods = mp.get_all_start_methods()
+        context = mp.get_context('fork' if 'fork' in methods else None)
+        # A single worker estimates all the configurations, twice.
+        with ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=context,
+            initializer=ce._initialize_worker,
+            initargs=(runner.context,),
+        ) as executor:
+            number_of_nodes = [
+                executor.submit(estimate_in_worker, configuration).result()
+                for configuration in self.get_configurations() * 2
+            ]
+        self.assertListEqual(number_of_nodes[2:], number_of_nodes[1:2] * 2)
+
+    def test_resume(self):
+        my_biogeme = self.get_biogeme()
+        expected = CatalogRunner(
+            my_biogeme, self.get_configurations(), quick_estimate=True
+        ).run()
+        file_name = '__catalogExample.catalog'
+        # Simulate an interrupted run, where only one configuration
+        # has been estimated.
+        saved = expected['the_catalog:scaled']
+        with open(file_name, 'wb') as f:
+            pickle.dump(('the_catalog:scaled', saved.data), f)
+        resumed = CatalogRunner(
+            my_biogeme,
+            self.get_configurations(),
+            quick_estimate=True,
+            file_name=file_name,
+        )
+        self.assertListEqual(list(resumed.results), ['the_catalog:scaled'])
+        results = resumed.run()
+        self.assertListEqual(
+            list(results), ['the_catalog:linear', 'the_catalog:scaled']
+        )
+        np.testing.assert_allclose(
+            list(results['the_catalog:linear'].get_beta_values().values()),
+            list(expected['the_catalog:linear'].get_beta_values().values()),
+        )
+        self.assertFalse(os.path.exists(file_name))
+
+
+if __name__ == '__main__':
+    unittest.main()
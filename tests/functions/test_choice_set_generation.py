@@ -1,6 +1,7 @@
 import os
 import unittest
 import tempfile
+import numpy as np
 import pandas as pd
 from biogeme.exceptions import BiogemeError
 from biogeme.partition import Partition
@@ -12,6 +13,7 @@ from biogeme.sampling_of_alternatives import (
     CrossVariableTuple,
     ChoiceSetsGeneration,
     MEV_PREFIX,
+    sample_without_replacement,
 )
 from biogeme.expressions import Variable
 from biogeme.database import Database
@@ -60,6 +62,8 @@ class TestChoiceSetsGeneration(unittest.TestCase):
         self.assertIn('age', processed_data)
 
     def test_sample_and_merge(self):
+        _ = self.choice_set_generator.sample_and_merge(recycle=False, write_csv=False)
+        self.assertFalse(os.path.exists(self.test_file))
         the_database = self.choice_set_generator.sample_and_merge(recycle=False)
         self.assertTrue(os.path.exists(self.test_file))
 
@@ -72,6 +76,136 @@ class TestChoiceSetsGeneration(unittest.TestCase):
         self.assertListEqual(sorted(expected_columns), sorted(df.columns))
         os.remove(self.test_file)  # cleanup
 
+    def test_column_not_stored(self):
+        # A column name that is not a string is accepted by the database,
+        # but not by the binary cache.
+        individuals = self.individuals.copy()
+        individuals[2024] = [1, 2, 3]
+        self.choice_set_generator.individuals = individuals
+        with self.assertLogs(
+            'biogeme.sampling_of_alternatives.choice_set_generation', level='WARNING'
+        ):
+            the_database = self.choice_set_generator.sample_and_merge(
+                write_csv=False
+            )
+        self.assertListEqual(list(the_database.data[2024]), [1, 2, 3])
+        # String columns are rejected by the database.
+        self.choice_set_generator.individuals = self.individuals.assign(
+            city=['Lausanne', 'Geneva', 'Bern']
+        )
+        with self.assertRaises(BiogemeError):
+            _ = self.choice_set_generator.sample_and_merge(write_csv=False)
+
+    def test_seed(self):
+        self.choice_set_generator.seed = 12
+        row = self.individuals.iloc[2]
+        first = self.choice_set_generator.process_row(row)
+        # The choice set of an individual does not depend on the others
+        _ = self.choice_set_generator.process_row(self.individuals.iloc[1])
+        second = self.choice_set_generator.process_row(row)
+        self.assertDictEqual(first, second)
+        self.choice_set_generator.individuals = self.individuals.set_index(
+            pd.Index([0, 0, 1])
+        )
+        with self.assertRaises(BiogemeError):
+            _ = self.choice_set_generator.sample_and_merge()
+
+    def test_sample_block(self):
+        generator = np.random.default_rng(3)
+        individuals = pd.DataFrame({'choice': [1, 2, 3, 4] * 50, 'age': 30})
+        block = self.choice_set_generator.sample_block(individuals, generator)
+        expected_columns = list(
+            self.choice_set_generator.process_row(individuals.iloc[0]).keys()
+        )
+        self.assertListEqual(list(block.columns), expected_columns)
+        # The chosen alternative comes first, and the others are sampled
+        # in the other stratum.
+        np.testing.assert_array_equal(block['alt_id_0'], individuals['choice'])
+        self.assertTrue(
+            ((block['alt_id_0'] <= 2) == (block['alt_id_1'] >= 3)).all()
+        )
+        np.testing.assert_array_equal(block['cost_1'], 10 * block['alt_id_1'])
+        np.testing.assert_allclose(block['_log_proba_0'], np.log(0.5))
+        self.assertTrue(block['MEV_alt_id_0'].isin([1, 3]).all())
+        self.assertTrue(block['MEV_alt_id_1'].isin([2, 4]).all())
+        np.testing.assert_allclose(block['MEV__mev_weight_0'], 2.0)
+        # Both alternatives of the other stratum are sampled.
+        self.assertSetEqual(set(block['alt_id_1']), {1, 2, 3, 4})
+        with self.assertRaises(BiogemeError):
+            _ = self.choice_set_generator.sample_block(
+                pd.DataFrame({'choice': [5]}), generator
+            )
+
+    def test_sample_without_replacement(self):
+        generator = np.random.default_rng(4)
+        excluded = np.array([-1, 0, 5, 9] * 250)
+        has_exclusion = excluded >= 0
+        for sample_size in (3, 9, 10):
+            sample = sample_without_replacement(10, sample_size, excluded, generator)
+            self.assertTupleEqual(sample.shape, (1000, sample_size))
+            # One element less is drawn when an element is excluded.
+            np.testing.assert_array_equal(sample[has_exclusion, -1], -1)
+            for drawn, excluded_element in (
+                (sample[has_exclusion, :-1], excluded[has_exclusion]),
+                (sample[~has_exclusion], excluded[~has_exclusion]),
+            ):
+                self.assertTrue(((drawn >= 0) & (drawn < 10)).all())
+                self.assertFalse((drawn == excluded_element[:, None]).any())
+                sorted_sample = np.sort(drawn, axis=1)
+                self.assertFalse(
+                    (sorted_sample[:, 1:] == sorted_sample[:, :-1]).any()
+                )
+
+    def test_sample_whole_population(self):
+        generator = np.random.default_rng(4)
+        sample = sample_without_replacement(2, 2, np.array([1, 0, -1]), generator)
+        np.testing.assert_array_equal(sample[:2], [[0, -1], [1, -1]])
+        self.assertListEqual(sorted(sample[2]), [0, 1])
+        sample = sample_without_replacement(1, 1, np.array([0, -1]), generator)
+        np.testing.assert_array_equal(sample, [[-1], [0]])
+
+    def test_sample_whole_strata(self):
+        context = SamplingContext(
+            the_partition=Partition([{1, 2}, {3, 4}]),
+            sample_sizes=[2, 2],
+            individuals=self.individuals,
+            choice_column='choice',
+            alternatives=pd.DataFrame({'alt_id': [1, 2, 3, 4], 'cost': 1}),
+            biogeme_file_name=self.test_file,
+            id_column='alt_id',
+            utility_function=Variable('choice'),
+            combined_variables=[],
+        )
+        generator = np.random.default_rng(3)
+        individuals = pd.DataFrame({'choice': [1, 2, 3, 4] * 5, 'age': 30})
+        block = ChoiceSetsGeneration(context).sample_block(individuals, generator)
+        alternatives = block[[f'alt_id_{i}' for i in range(4)]].to_numpy()
+        np.testing.assert_array_equal(alternatives[:, 0], individuals['choice'])
+        np.testing.assert_array_equal(
+            np.sort(alternatives, axis=1), [[1, 2, 3, 4]] * 20
+        )
+
+    def test_seed_sample_and_merge(self):
+        self.choice_set_generator.seed = 12
+        first = self.choice_set_generator.sample_and_merge().data
+        np.random.seed(1)
+        second = self.choice_set_generator.sample_and_merge().data
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_recycle(self):
+        self.choice_set_generator.seed = 12
+        first = self.choice_set_generator.sample_and_merge().data
+        recycled = self.choice_set_generator.sample_and_merge(recycle=True).data
+        pd.testing.assert_frame_equal(first, recycled)
+        key = self.choice_set_generator.cache_key()
+        # Another seed defines another context.
+        self.choice_set_generator.seed = 13
+        self.assertNotEqual(self.choice_set_generator.cache_key(), key)
+        with self.assertLogs(
+            'biogeme.sampling_of_alternatives.choice_set_generation', level='WARNING'
+        ):
+            _ = self.choice_set_generator.sample_and_merge(recycle=True)
+
     def test_define_new_variables(self):
         # Create a dummy database
         biogeme_data = pd.DataFrame({'var1': [1, 2, 3], 'var2': [4, 5, 6]})
@@ -0,0 +1,117 @@
+"""
+Test the cross_validation module
+
+:author: Michel Bierlaire
+:date: Mon Oct 19 15:40:12 2026
+
+"""
+
+# Too constraining
+# pylint: disable=invalid-name
+#
+# Not needed in test
+# pylint: disable=missing-function-docstring, missing-class-docstring
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import biogeme.biogeme as bio
+import biogeme.database as db
+from biogeme.cross_validation import CrossValidationRunner, LOGLIKELIHOOD
+from biogeme.exceptions import BiogemeError
+from biogeme.expressions import Variable, Beta, PanelLikelihoodTrajectory, exp, log
+from test_data import getData, getPanelData
+
+
+class TestCrossValidation(unittest.TestCase):
+    def get_formulas(self, panel=False):
+        Variable1 = Variable('Variable1')
+        Variable2 = Variable('Variable2')
+        beta1 = Beta('beta1', -1.0, -3, 3, 0)
+        beta2 = Beta('beta2', 2.0, -3, 10, 0)
+        likelihood = -((beta1 * Variable1 - 1) ** 2) - (beta2 * Variable2 - 3) ** 2
+        if panel:
+            likelihood = log(PanelLikelihoodTrajectory(exp(likelihood)))
+        return {'log_like': likelihood}
+
+    def get_biogeme(self, database, panel=False):
+        my_biogeme = bio.BIOGEME(database, self.get_formulas(panel))
+        my_biogeme.number_of_threads = 1
+        my_biogeme.generate_html = False
+        my_biogeme.generate_pickle = False
+        my_biogeme.save_iterations = False
+        my_biogeme._set_function_parameters()
+        my_biogeme._set_algorithm_parameters()
+        return my_biogeme
+
+    def expected(self, sets, panel):
+        """Out-of-sample log likelihood obtained by estimating the model
+        on a new database."""
+        estimation = db.Database('estimation', sets.estimation.copy())
+        validation = db.Database('validation', sets.validation.copy())
+        if panel:
+            estimation.panel('Person')
+            validation.panel('Person')
+        results = self.get_biogeme(estimation, panel).estimate()
+        return self.get_biogeme(validation, panel).simulate(results.get_beta_values())
+
+    def test_folds(self):
+        for panel in (False, True):
+            database = getPanelData(1) if panel else getData(1)
+            my_biogeme = self.get_biogeme(database, panel)
+            my_biogeme._prepare_database_for_formula()
+            start = np.array(my_biogeme.id_manager.free_betas_values)
+            validation_data = database.split(
+                slices=2, generator=np.random.default_rng(2)
+            )
+            serial = CrossValidationRunner(my_biogeme, start, validation_data).run()
+            # The positions of the rows define the same folds.
+            indices = database.split_indices(
+                slices=2, generator=np.random.default_rng(2)
+            )
+            from_indices = CrossValidationRunner(my_biogeme, start, indices).run()
+            my_biogeme.number_of_processes = 2
+            parallel = CrossValidationRunner(my_biogeme, start, validation_data).run()
+            for sets, result, other, another in zip(
+                validation_data, serial, parallel, from_indices
+            ):
+                expected = self.expected(sets, panel)
+                np.testing.assert_allclose(
+                    result[LOGLIKELIHOOD].to_numpy(),
+                    expected['log_like'].to_numpy(),
+                    rtol=1.0e-5,
+                )
+                pd.testing.assert_frame_equal(result, other)
+                pd.testing.assert_frame_equal(result, another)
+                if not panel:
+                    pd.testing.assert_index_equal(result.index, sets.validation.index)
+
+    def test_errors(self):
+        database = getPanelData(1)
+        my_biogeme = self.get_biogeme(database, panel=True)
+        my_biogeme._prepare_database_for_formula()
+        start = np.array(my_biogeme.id_manager.free_betas_values)
+        data = database.data
+        # The rows of individual 1 are split between the two sets.
+        wrong = db.EstimationValidation(
+            estimation=data.iloc[1:], validation=data.iloc[:1]
+        )
+        with self.assertRaises(BiogemeError):
+            CrossValidationRunner(my_biogeme, start, [wrong])
+        database = getData(1)
+        my_biogeme = self.get_biogeme(database)
+        other = pd.DataFrame({'Variable1': [1.0]}, index=[100])
+        wrong = db.EstimationValidation(estimation=database.data, validation=other)
+        with self.assertRaises(BiogemeError):
+            CrossValidationRunner(my_biogeme, start, [wrong])
+        wrong = db.EstimationValidationIndices(
+            estimation=np.array([0, 1]), validation=np.array([5])
+        )
+        with self.assertRaises(BiogemeError):
+            CrossValidationRunner(my_biogeme, start, [wrong])
+
+
+if __name__ == '__main__':
+    unittest.main()
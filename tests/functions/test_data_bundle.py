@@ -0,0 +1,67 @@
+"""
+Test the data_bundle module
+
+:author: Michel Bierlaire
+:date: Mon Oct 19 18:05:10 2026
+
+"""
+
+# Not needed in test
+# pylint: disable=missing-function-docstring, missing-class-docstring
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from biogeme.data_bundle import MANIFEST, load_bundle, save_bundle
+from biogeme.exceptions import BiogemeError
+
+
+class TestDataBundle(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame(
+            {
+                'x': [1, 2, 3],
+                'y': [0.5, 1.5, 2.5],
+                'z': np.array([4, 5, 6], dtype=np.int32),
+                'w': [0.1, 0.2, 0.3],
+                'b': [True, False, True],
+            },
+            index=pd.Index([10, 20, 30], name='id'),
+        )
+
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            save_bundle(self.data, directory, key='abc')
+            result = load_bundle(directory, key='abc')
+            pd.testing.assert_frame_equal(result, self.data)
+            # The columns are mapped in memory, and can be modified
+            # without modifying the files.
+            self.assertFalse(result['y'].to_numpy().flags.owndata)
+            result.loc[10, 'y'] = 100.0
+            pd.testing.assert_frame_equal(
+                load_bundle(directory, key='abc'), self.data
+            )
+            self.assertIsNone(load_bundle(directory, key='other'))
+            # A new bundle replaces the previous one.
+            other = self.data[['y']].reset_index(drop=True)
+            save_bundle(other, directory)
+            pd.testing.assert_frame_equal(load_bundle(directory), other)
+            self.assertListEqual(
+                sorted(os.listdir(directory)), sorted([MANIFEST, 'block_0.npy'])
+            )
+        self.assertIsNone(load_bundle('not_a_directory'))
+
+    def test_errors(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(BiogemeError):
+                save_bundle(pd.DataFrame({'x': ['a', 'b']}), directory)
+            with self.assertRaises(BiogemeError):
+                save_bundle(pd.DataFrame({0: [1.0, 2.0]}), directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+"""
+Test the data_chunks module
+
+:author: Michel Bierlaire
+:date: Mon Oct 19 11:34:12 2026
+
+"""
+
+# Not needed in test
+# pylint: disable=missing-function-docstring, missing-class-docstring
+
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from biogeme.data_chunks import ChunkWriter, is_parquet, read_chunks
+from biogeme.exceptions import BiogemeError
+
+
+class TestDataChunks(unittest.TestCase):
+    def test_is_parquet(self):
+        self.assertTrue(is_parquet('data.parquet'))
+        self.assertTrue(is_parquet('data.PQ'))
+        self.assertFalse(is_parquet('data.csv'))
+
+    def test_csv(self):
+        data = pd.DataFrame({'x': range(7), 'y': [0.5 * i for i in range(7)]})
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'data.dat')
+            data.to_csv(file_name, sep='\t', index=False)
+            chunks = list(read_chunks(file_name, chunk_size=3, separator='\t'))
+            self.assertListEqual([len(chunk) for chunk in chunks], [3, 3, 1])
+            pd.testing.assert_frame_equal(pd.concat(chunks), data)
+            output_file = os.path.join(directory, 'output.csv')
+            with ChunkWriter(output_file) as writer:
+                for chunk in chunks:
+                    writer.write(chunk)
+            self.assertEqual(writer.number_of_rows, 7)
+            pd.testing.assert_frame_equal(pd.read_csv(output_file, index_col=0), data)
+        with self.assertRaises(BiogemeError):
+            _ = list(read_chunks('not_a_file.csv', chunk_size=3))
+
+
+if __name__ == '__main__':
+    unittest.main()
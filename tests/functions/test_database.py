@@ -16,6 +16,7 @@ Test the database module
 # pylint: disable=missing-function-docstring, missing-class-docstring
 
 import os
+import tempfile
 import unittest
 from pathlib import Path
 
@@ -23,9 +24,21 @@ import numpy as np
 import pandas as pd
 
 import biogeme.database as db
+import biogeme.draws as draws
 import biogeme.exceptions as excep
-from biogeme.expressions import Variable, bioDraws, TypeOfElementaryExpression
-from biogeme.native_draws import description_of_native_draws
+from biogeme.expressions import (
+    Variable,
+    Beta,
+    bioDraws,
+    log,
+    PanelLikelihoodTrajectory,
+    TypeOfElementaryExpression,
+)
+from biogeme.native_draws import (
+    description_of_native_draws,
+    native_random_number_generators,
+)
+from biogeme.random_streams import DRAWS, get_generator, name_key
 from biogeme.segmentation import DiscreteSegmentationTuple
 from test_data import (
     getData,
@@ -168,6 +181,43 @@ class TestDatabase(unittest.TestCase):
         with self.assertRaises(excep.BiogemeError):
             result = database.define_variable('NewVariable', expression)
 
+    def test_add_columns(self):
+        beta = Beta('beta', 2, None, None, 1)
+        expressions = {
+            'Product': self.Variable2 * self.Variable1,
+            'Scaled': beta * self.Variable1 + 1,
+            'Log': log(self.Variable2),
+        }
+        result = self.myData1.add_columns(expressions)
+        self.assertListEqual(list(result.columns), ['Product', 'Scaled', 'Log'])
+        self.assertListEqual(
+            self.myData1.data['Product'].tolist(), [10, 40, 90, 160, 250]
+        )
+        for name, expression in expressions.items():
+            np.testing.assert_allclose(
+                self.myData1.data[name],
+                expression.get_value_c(database=self.myData1, prepare_ids=True),
+            )
+        self.assertIn('Scaled', self.myData1.variables)
+        with self.assertRaises(ValueError):
+            _ = self.myData1.add_columns({'Variable1': self.Variable1})
+        with self.assertRaises(excep.BiogemeError):
+            _ = self.myPanelData.add_columns(
+                {'Trajectory': PanelLikelihoodTrajectory(self.Variable1)}
+            )
+        database = getData(1)
+        database.data = database.data[0:0]
+        with self.assertRaises(excep.BiogemeError):
+            _ = database.add_columns(expressions)
+
+    def test_define_variables(self):
+        result = self.myData1.define_variables(
+            {'NewVariable': self.Variable2 * self.Variable1}
+        )
+        self.assertEqual(result['NewVariable'].name, 'NewVariable')
+        theList = self.myData1.data['NewVariable'].tolist()
+        self.assertListEqual(theList, [10, 40, 90, 160, 250])
+
     def test_count(self):
         c = self.myData1.count('Person', 1)
         self.assertEqual(c, 3)
@@ -260,6 +310,141 @@ class TestDatabase(unittest.TestCase):
                 {'NORMAL': (logNormalDraws, 'Designed to generate an error')}
             )
 
+    def test_draws_cache(self):
+        types = {'d1': 'NORMAL', 'd2': 'UNIFORM'}
+        the_draws = self.myData1.generate_draws(types, ['d1', 'd2'], 10)
+        # Same types and dimensions: the draws are not generated again
+        self.assertIs(self.myData1.generate_draws(types, ['d1', 'd2'], 10), the_draws)
+        other_draws = self.myData1.generate_draws(types, ['d1', 'd2'], 20)
+        self.assertTupleEqual(other_draws.shape, (5, 20, 2))
+        self.myData1.seed = 1
+        self.assertIsNot(
+            self.myData1.generate_draws(types, ['d1', 'd2'], 20), other_draws
+        )
+
+    def test_draws_file(self):
+        types = {'d1': 'NORMAL_HALTON2', 'd2': 'UNIFORM'}
+        with tempfile.TemporaryDirectory() as directory:
+            self.myData1.seed = 10
+            self.myData1.draws_directory = directory
+            the_draws = self.myData1.generate_draws(types, ['d1', 'd2'], 10)
+            self.assertIsInstance(the_draws, np.memmap)
+            self.assertEqual(len(os.listdir(directory)), 1)
+            # Another run reads the draws from the file
+            other_data = getData(1)
+            other_data.seed = 10
+            other_data.draws_directory = directory
+            read_draws = other_data.generate_draws(types, ['d1', 'd2'], 10)
+            np.testing.assert_array_equal(read_draws, the_draws)
+            del the_draws, read_draws
+            self.myData1.theDraws = other_data.theDraws = None
+
+    def test_draws_storage(self):
+        types = {'d1': 'NORMAL', 'd2': 'UNIFORM_MLHS'}
+        self.myData1.draws_dtype = np.float32
+        with tempfile.TemporaryDirectory() as directory:
+            self.myData1.draws_directory = directory
+            the_draws = self.myData1.generate_draws(types, ['d1', 'd2'], 10)
+            self.assertIsInstance(the_draws, np.memmap)
+            self.assertEqual(the_draws.dtype, np.float32)
+            self.assertTupleEqual(the_draws.shape, (5, 10, 2))
+            # Without seed, the draws are not kept for the next runs.
+            self.assertListEqual(os.listdir(directory), [])
+            del the_draws
+            self.myData1.theDraws = None
+
+    def test_generated_draws(self):
+        types = {'d1': 'NORMAL_HALTON2', 'd2': 'UNIFORMSYM_HALTON3'}
+        self.myData1.generated_draws = True
+        self.assertIsNone(self.myData1.generate_draws(types, ['d1', 'd2'], 10))
+        self.assertIsNone(self.myData1.theDraws)
+        chunk = self.myData1.draws_of_individuals(1, 4)
+        self.assertTupleEqual(chunk.shape, (3, 10, 2))
+        the_draws = self.myData1.materialize_draws()
+        np.testing.assert_array_equal(the_draws[1:4], chunk)
+        # Same draws as the stored ones
+        other_data = getData(1)
+        stored_draws = other_data.generate_draws(types, ['d1', 'd2'], 10)
+        np.testing.assert_array_equal(stored_draws, the_draws)
+        # Modified Latin Hypercube draws
+        types = {
+            'd1': 'NORMAL_MLHS_ANTI',
+            'd2': 'UNIFORMSYM_MLHS',
+            'd3': 'UNIFORM_MLHS_ANTI',
+        }
+        self.myData1.seed = 12
+        self.assertIsNone(self.myData1.generate_draws(types, ['d1', 'd2', 'd3'], 10))
+        chunk = self.myData1.draws_of_individuals(1, 4)
+        the_draws = self.myData1.materialize_draws()
+        np.testing.assert_array_equal(the_draws[1:4], chunk)
+        np.testing.assert_allclose(the_draws[:, :5, 2] + the_draws[:, 5:, 2], 1)
+        self.assertTrue(np.all(np.abs(the_draws[:, :, 1]) <= 1))
+        # The draws depend only on the seed and on the name.
+        other_data = getData(1)
+        other_data.generated_draws = True
+        other_data.seed = 12
+        other_data.generate_draws({'d3': 'UNIFORM_MLHS_ANTI'}, ['d3'], 10)
+        np.testing.assert_array_equal(
+            other_data.materialize_draws()[:, :, 0], the_draws[:, :, 2]
+        )
+        self.myData1.seed = 0
+        # Pseudo-random draws are always stored
+        types = {'d1': 'NORMAL_HALTON2', 'd2': 'UNIFORM'}
+        the_draws = self.myData1.generate_draws(types, ['d1', 'd2'], 10)
+        self.assertTupleEqual(the_draws.shape, (5, 10, 2))
+        with self.assertRaises(excep.BiogemeError):
+            _ = getData(1).draws_of_individuals(0, 1)
+
+    def test_draws_streams(self):
+        types = {'d1': 'NORMAL_MLHS', 'd2': 'UNIFORM', 'd3': 'UNIFORM_HALTON2'}
+        self.myData1.seed = 12
+        the_draws = self.myData1.generate_draws(types, ['d1', 'd2', 'd3'], 10)
+        # The draws of a variable do not depend on the other variables,
+        # nor on the state of the global generator.
+        np.random.uniform(size=100)
+        other_data = getData(1)
+        other_data.seed = 12
+        other_draws = other_data.generate_draws(types, ['d2', 'd1'], 10)
+        np.testing.assert_array_equal(other_draws[:, :, 0], the_draws[:, :, 1])
+        np.testing.assert_array_equal(other_draws[:, :, 1], the_draws[:, :, 0])
+        other_data.seed = 13
+        other_draws = other_data.generate_draws(types, ['d2', 'd1'], 10)
+        self.assertFalse(np.array_equal(other_draws[:, :, 0], the_draws[:, :, 1]))
+
+    def test_joint_draws(self):
+        types = {
+            'd1': 'NORMAL_SOBOL_OWEN',
+            'd2': 'UNIFORM',
+            'd3': 'UNIFORMSYM_SOBOL_OWEN',
+            'd4': 'UNIFORM_HALTON_RANDOMIZED',
+        }
+        self.myData1.seed = 12
+        the_draws = self.myData1.generate_draws(types, ['d1', 'd2', 'd3', 'd4'], 8)
+        self.assertTupleEqual(the_draws.shape, (5, 8, 4))
+        self.assertTrue(np.min(the_draws[:, :, 3]) >= 0)
+        # d1 and d3 are two dimensions of the same scrambled sequence
+        uniform_numbers = draws.get_sobol_draws(
+            5,
+            8,
+            2,
+            scrambled=True,
+            generator=get_generator(12, DRAWS, name_key('d1,d3')),
+        )
+        np.testing.assert_array_equal(
+            the_draws[:, :, 2], 2.0 * uniform_numbers[:, :, 1] - 1.0
+        )
+        np.testing.assert_array_equal(
+            the_draws[:, :, 0],
+            draws.get_normal_wichura_draws(
+                5, 8, uniform_numbers=uniform_numbers[:, :, 0]
+            ),
+        )
+        # A single variable can be generated as well
+        the_draws = self.myData1.generate_draws(types, ['d1'], 8)
+        self.assertTupleEqual(the_draws.shape, (5, 8, 1))
+        the_draws = native_random_number_generators['NORMAL_SOBOL'].generator(5, 8)
+        self.assertTupleEqual(the_draws.shape, (5, 8))
+
     def test_sampleWithReplacement(self):
         res1 = self.myData1.sample_with_replacement()
         res2 = self.myData1.sample_with_replacement(12)
@@ -280,6 +465,32 @@ class TestDatabase(unittest.TestCase):
         with self.assertRaises(excep.BiogemeError):
             wrong_panel.panel('Person')
 
+    def test_build_panel_map(self):
+        self.myPanelData.panel('Person')
+        np.testing.assert_array_equal(self.myPanelData.individual_starts, [0, 3])
+        np.testing.assert_array_equal(self.myPanelData.individual_ends, [2, 4])
+        self.assertListEqual(list(self.myPanelData.individualMap.index), [1, 2])
+        # The map is not rebuilt if the data has not changed
+        the_map = self.myPanelData.individualMap
+        self.myPanelData.build_panel_map()
+        self.assertIs(self.myPanelData.individualMap, the_map)
+        # Removing observations invalidates the map
+        self.myPanelData.remove(Variable('Exclude'))
+        self.myPanelData.build_panel_map()
+        np.testing.assert_array_equal(self.myPanelData.individual_starts, [0, 2])
+        np.testing.assert_array_equal(self.myPanelData.individual_ends, [1, 2])
+
+        unsorted_data = pd.DataFrame(
+            {'Person': [2, 2, 1, 3, 3, 3], 'Variable': [1, 2, 3, 4, 5, 6]}
+        )
+        unsorted_database = db.Database('unsorted', unsorted_data)
+        unsorted_database.panel('Person')
+        self.assertListEqual(
+            list(unsorted_database.data['Variable']), [3, 1, 2, 4, 5, 6]
+        )
+        np.testing.assert_array_equal(unsorted_database.individual_starts, [0, 1, 3])
+        np.testing.assert_array_equal(unsorted_database.individual_ends, [0, 2, 5])
+
     def test_panelDraws(self):
         randomDraws1 = bioDraws('randomDraws1', 'NORMAL')
         randomDraws2 = bioDraws('randomDraws2', 'UNIFORMSYM')
@@ -419,6 +630,47 @@ class TestDatabase(unittest.TestCase):
         result = self.myPanelData.split(2)
         self.assertEqual(len(result), 2)
 
+    def test_split_indices(self):
+        database = db.Database(
+            'test',
+            pd.DataFrame({'userID': [1, 1, 2, 2, 2, 3, 4, 4, 5], 'obsID': range(9)}),
+        )
+        for groups in (None, 'userID'):
+            indices = database.split_indices(
+                3, groups=groups, generator=np.random.default_rng(4)
+            )
+            sets = database.split(3, groups=groups, generator=np.random.default_rng(4))
+            validation = np.concatenate([i.validation for i in indices])
+            np.testing.assert_array_equal(np.sort(validation), np.arange(9))
+            for one, other in zip(indices, sets):
+                self.assertEqual(len(one.estimation) + len(one.validation), 9)
+                pd.testing.assert_frame_equal(
+                    database.data.iloc[one.estimation], other.estimation
+                )
+                pd.testing.assert_frame_equal(
+                    database.data.iloc[one.validation], other.validation
+                )
+                if groups is not None:
+                    self.assertTrue(
+                        set(database.data['userID'].iloc[one.estimation]).isdisjoint(
+                            database.data['userID'].iloc[one.validation]
+                        )
+                    )
+        with self.assertRaises(excep.BiogemeError):
+            database.split_indices(1)
+
+    def test_split_streams(self):
+        database = db.Database('test', pd.DataFrame({'obsID': list(range(25))}))
+        database.seed = 12
+        first = database.split(5)
+        np.random.uniform(size=100)
+        second = database.split(5)
+        for one, other in zip(first, second):
+            pd.testing.assert_frame_equal(one.validation, other.validation)
+        generator = np.random.default_rng(1)
+        result = database.split(5, generator=generator)
+        self.assertEqual(len(result), 5)
+
 
 class TestVerifySegmentation(unittest.TestCase):
     def setUp(self):
@@ -15,6 +15,7 @@ Test the draws module
 # pylint: disable=missing-function-docstring, missing-class-docstring
 
 import unittest
+from unittest import mock
 import biogeme.draws as dr
 import numpy as np
 import biogeme.exceptions as excep
@@ -234,6 +235,41 @@ class test_draws(unittest.TestCase):
         with self.assertRaises(excep.BiogemeError):
             halton = dr.get_halton_draws(sample_size=-1, number_of_draws=100, base=3)
 
+    def test_halton_of_individuals(self):
+        for base in (2, 3, 5):
+            halton = dr.get_halton_draws(
+                sample_size=20, number_of_draws=7, base=base, skip=10, symmetric=True
+            )
+            chunk = dr.get_halton_draws_of_individuals(
+                5, 12, number_of_draws=7, base=base, skip=10, symmetric=True
+            )
+            np.testing.assert_array_equal(chunk, halton[5:12])
+        with self.assertRaises(excep.BiogemeError):
+            _ = dr.get_halton_draws_of_individuals(3, 3, number_of_draws=10)
+
+    def test_latin_hypercube_of_individuals(self):
+        # The blocks of individuals are smaller than the ranges.
+        with mock.patch.object(dr, 'BLOCK_SIZE', 4):
+            draws = dr.get_latin_hypercube_draws_of_individuals(
+                0, 20, number_of_draws=7, key=(12, 0)
+            )
+            chunk = dr.get_latin_hypercube_draws_of_individuals(
+                5, 12, number_of_draws=7, key=(12, 0)
+            )
+        np.testing.assert_array_equal(chunk, draws[5:12])
+        # The draws of each individual are stratified.
+        for row in draws:
+            np.testing.assert_array_equal(np.sort(np.floor(row * 7)), np.arange(7))
+        other = dr.get_latin_hypercube_draws_of_individuals(
+            5, 12, number_of_draws=7, key=(13, 0), symmetric=True
+        )
+        self.assertTrue(np.all(np.abs(other) <= 1))
+        self.assertFalse(np.allclose(other, 2 * chunk - 1))
+        with self.assertRaises(excep.BiogemeError):
+            _ = dr.get_latin_hypercube_draws_of_individuals(
+                3, 3, number_of_draws=10, key=(12, 0)
+            )
+
     def test_antithetic(self):
         draws = dr.get_antithetic(
             dr.get_halton_draws, sample_size=1, number_of_draws=10
@@ -269,6 +305,93 @@ class test_draws(unittest.TestCase):
                 sample_size=3, number_of_draws=10, uniform_numbers=uniform_numbers
             )
 
+    def test_normal_quantiles(self):
+        uniform_numbers = np.array([[0.1, 0.25, 0.5, 0.75, 0.9]])
+        draws = dr.get_normal_wichura_draws(
+            sample_size=1, number_of_draws=5, uniform_numbers=uniform_numbers
+        )
+        expected = [-1.2815516, -0.6744898, 0, 0.6744898, 1.2815516]
+        np.testing.assert_allclose(draws[0], expected, atol=1.0e-6)
+
+    def test_chunks(self):
+        uniform_numbers = np.random.uniform(size=(50, 8))
+        expected = dr.get_normal_wichura_draws(
+            sample_size=50,
+            number_of_draws=16,
+            uniform_numbers=uniform_numbers,
+            antithetic=True,
+        )
+        halton = dr.get_halton_draws(sample_size=50, number_of_draws=16, base=3)
+        table = np.empty((50, 16, 3))
+        # The tables are split in chunks of two individuals, generated
+        # by several threads, and stored in a view on a larger table.
+        with mock.patch.object(dr, 'CHUNK_SIZE', 32):
+            dr.get_normal_wichura_draws(
+                sample_size=50,
+                number_of_draws=16,
+                uniform_numbers=uniform_numbers,
+                antithetic=True,
+                out=table[:, :, 0],
+                number_of_threads=4,
+            )
+            dr.get_halton_draws_of_individuals(
+                0, 50, number_of_draws=16, base=3, out=table[:, :, 1]
+            )
+        dr.get_halton_draws(
+            sample_size=50, number_of_draws=16, base=3, out=table[:, :, 2]
+        )
+        np.testing.assert_array_equal(table[:, :, 0], expected)
+        np.testing.assert_array_equal(table[:, :, 1], halton)
+        np.testing.assert_array_equal(table[:, :, 2], halton)
+
+    def test_sobol(self):
+        draws = dr.get_sobol_draws(
+            sample_size=2, number_of_draws=4, number_of_variables=2
+        )
+        self.assertTupleEqual(draws.shape, (2, 4, 2))
+        # The first point, which is 0, is skipped.
+        np.testing.assert_array_equal(draws[0, :3, 0], [0.5, 0.75, 0.25])
+        np.testing.assert_array_equal(draws[0, :3, 1], [0.5, 0.25, 0.75])
+        draws = dr.get_sobol_draws(
+            sample_size=5,
+            number_of_draws=10,
+            number_of_variables=3,
+            scrambled=True,
+            generator=np.random.default_rng(12),
+        )
+        other_draws = dr.get_sobol_draws(
+            sample_size=5,
+            number_of_draws=10,
+            number_of_variables=3,
+            scrambled=True,
+            generator=np.random.default_rng(12),
+        )
+        np.testing.assert_array_equal(draws, other_draws)
+        self.assertTrue(np.min(draws) > 0)
+        self.assertTrue(np.max(draws) < 1)
+        with self.assertRaises(excep.BiogemeError):
+            _ = dr.get_sobol_draws(
+                sample_size=5, number_of_draws=10, number_of_variables=0
+            )
+
+    def test_randomized_halton(self):
+        draws = dr.get_randomized_halton_draws(
+            sample_size=3, number_of_draws=10, number_of_variables=4
+        )
+        self.assertTupleEqual(draws.shape, (3, 10, 4))
+        self.assertTrue(np.min(draws) >= 0)
+        self.assertTrue(np.max(draws) < 1)
+        # Each dimension is a shifted permutation of the Halton
+        # sequence in its base: the first p-1 points are distinct
+        # multiples of 1/p, shifted by the same number.
+        for k, base in enumerate([2, 3, 5, 7]):
+            points = draws.reshape(-1, 4)[: base - 1, k]
+            self.assertEqual(len(set(np.floor(points * base))), base - 1)
+        with self.assertRaises(excep.BiogemeError):
+            _ = dr.get_randomized_halton_draws(
+                sample_size=-3, number_of_draws=10, number_of_variables=4
+            )
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,173 @@
+"""
+Test the estimation_context module
+
+:author: Michel Bierlaire
+:date: Sun Oct 18 18:58:02 2026
+
+"""
+
+# Too constraining
+# pylint: disable=invalid-name
+#
+# Not needed in test
+# pylint: disable=missing-function-docstring, missing-class-docstring
+
+import copy
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import biogeme.biogeme as bio
+import biogeme.exceptions as excep
+from biogeme.catalog import Catalog
+from biogeme.catalog_estimation import (
+    CatalogContext,
+    ConfigurationToEstimate,
+    estimate_configuration,
+)
+from biogeme.estimation_context import EstimationContext
+from biogeme.expressions import Variable, Beta, bioDraws, MonteCarlo, log
+from test_data import getData
+
+
+class TestEstimationContext(unittest.TestCase):
+    def setUp(self):
+        # The estimations write their files in a temporary directory.
+        self.current_directory = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+        self.database = getData(1)
+        Variable1 = Variable('Variable1')
+        Variable2 = Variable('Variable2')
+        beta1 = Beta('beta1', 0.5, None, None, 0)
+        beta2 = Beta('beta2', 0.2, None, None, 0)
+        beta3 = Beta('beta3', 0.1, None, None, 0)
+        self.first = -((beta1 * Variable1 + beta2 * Variable2 + beta3 - 1) ** 2)
+        utility = (
+            beta1 * Variable1 + beta2 * Variable2 + beta3 * bioDraws('d', 'NORMAL')
+        )
+        self.second = log(MonteCarlo(1 / (1 + utility**2)))
+        self.third = -((beta1 * Variable1 - 1) ** 2)
+
+    def tearDown(self):
+        os.chdir(self.current_directory)
+        self.directory.cleanup()
+
+    def get_biogeme(self, formula, estimation_context=None):
+        the_biogeme = bio.BIOGEME(
+            self.database, formula, estimation_context=estimation_context
+        )
+        the_biogeme.number_of_threads = 1
+        return the_biogeme
+
+    def test_shared_model(self):
+        x = np.array([0.3, 0.4, 0.5])
+        first_alone = self.get_biogeme(self.first)
+        expected_first = first_alone.calculate_likelihood(x, scaled=False)
+        second_alone = self.get_biogeme(self.second)
+        expected_second = second_alone.calculate_likelihood(x, scaled=False)
+
+        context = EstimationContext(self.database)
+        first = self.get_biogeme(self.first, context)
+        second = self.get_biogeme(self.second, context)
+        self.assertIs(first.theC, second.theC)
+        self.assertIs(context.models[3].owner, second)
+        # The nodes common to both models, such as beta1 * Variable1,
+        # are received only once.
+        self.assertLess(
+            len(context.models[3].nodes),
+            len(first.loglikeSignatures) + len(second.loglikeSignatures),
+        )
+        # The expressions and the draws are swapped when needed.
+        self.assertAlmostEqual(
+            first.calculate_likelihood(x, scaled=False), expected_first
+        )
+        self.assertIs(context.models[3].owner, first)
+        _ = first.calculate_likelihood_and_derivatives(x, scaled=False, hessian=True)
+        # Same draws as the model estimated alone
+        second.draws = second_alone.draws
+        self.assertAlmostEqual(
+            second.calculate_likelihood(x, scaled=False), expected_second
+        )
+        self.assertIs(context.models[3].owner, second)
+
+    def test_conflicting_nodes(self):
+        context = EstimationContext(self.database)
+        first = self.get_biogeme(self.first, context)
+        the_cpp = first.theC
+        # Another node with the same id has been received.
+        model = context.models[3]
+        node_id = next(iter(model.nodes))
+        model.nodes[node_id] = b'<Numeric>{' + node_id + b'},1.0'
+        second = self.get_biogeme(self.second, context)
+        self.assertIsNot(second.theC, the_cpp)
+
+    def test_number_of_parameters(self):
+        context = EstimationContext(self.database, maximum_number_of_models=1)
+        first = self.get_biogeme(self.first, context)
+        third = self.get_biogeme(self.third, context)
+        # The C++ engine is sized by the number of parameters
+        self.assertIsNot(first.theC, third.theC)
+        self.assertListEqual(list(context.models), [1])
+        expected_third = self.get_biogeme(self.third).calculate_likelihood(
+            np.array([0.3]), scaled=False
+        )
+        self.assertAlmostEqual(
+            third.calculate_likelihood(np.array([0.3]), scaled=False), expected_third
+        )
+
+    def test_copies_share_database(self):
+        beta1 = Beta('beta1', 0.5, None, None, 0)
+        catalog = Catalog.from_dict(
+            'the_catalog',
+            {'linear': beta1 * Variable('Variable1'), 'constant': beta1},
+        )
+        formula = -((catalog - 1) ** 2)
+        the_biogeme = self.get_biogeme(formula)
+        copied = copy.deepcopy(formula)
+        self.assertIs(copied.id_manager.database, self.database)
+        self.assertIsNot(copied.id_manager, the_biogeme.id_manager)
+        self.assertIsNot(copied.id_manager.expressions[0], formula)
+
+    def test_bounded_nodes(self):
+        beta1 = Beta('beta1', 0.5, None, None, 0)
+        catalog = Catalog.from_dict(
+            'the_catalog',
+            {'linear': beta1 * Variable('Variable1'), 'constant': beta1},
+        )
+        formula = -((catalog - 1) ** 2)
+        context = EstimationContext(self.database)
+        catalog_context = CatalogContext(
+            expression=formula,
+            database=self.database,
+            quick_estimate=True,
+            recycle=False,
+            run_bootstrap=False,
+            generate_html=False,
+            generate_pickle=False,
+            number_of_threads=1,
+        )
+        number_of_nodes = []
+        for name in ('linear', 'constant', 'linear', 'constant'):
+            estimate_configuration(
+                catalog_context,
+                ConfigurationToEstimate(
+                    config_id=f'the_catalog:{name}', model_name=name
+                ),
+                context,
+            )
+            number_of_nodes.append(len(context.models[1].nodes))
+        # The nodes of the configurations already estimated are not
+        # received again.
+        self.assertListEqual(number_of_nodes[2:], number_of_nodes[1:2] * 2)
+
+    def test_other_database(self):
+        context = EstimationContext(getData(1))
+        with self.assertRaises(excep.BiogemeError):
+            _ = self.get_biogeme(self.first, context)
+
+
+if __name__ == '__main__':
+    unittest.main()
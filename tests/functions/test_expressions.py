@@ -606,7 +606,9 @@ class test_expressions(unittest.TestCase):
         ) / (self.beta3 * (self.beta2 >= self.beta1))
         expr2.set_id_manager(IdManager([expr2], self.myData, 0))
         s = expr2.get_signature()
-        self.assertEqual(len(s), 17)
+        # beta1 and beta2 appear twice in the expression, but once in
+        # the signature.
+        self.assertEqual(len(s), 15)
 
     def test_embedExpression(self):
         expr2 = 2 * self.beta1 * self.Variable1 - ex.exp(
@@ -658,6 +660,42 @@ class test_expressions(unittest.TestCase):
         c4 = expr4.count_panel_trajectory_expressions()
         self.assertEqual(c4, 2)
 
+    def test_cached_metadata(self):
+        expr = self.beta1 * self.Variable1 + ex.exp(self.beta2 * self.Variable1)
+        free = expr.set_of_elementary_expression(TypeOfElementaryExpression.FREE_BETA)
+        self.assertSetEqual(free, {'beta1', 'beta2'})
+        # The cached results cannot be modified by the caller.
+        free.add('beta3')
+        self.assertNotIn(
+            'beta3',
+            expr.set_of_elementary_expression(TypeOfElementaryExpression.FREE_BETA),
+        )
+        self.beta2.status = 1
+        self.assertSetEqual(
+            expr.set_of_elementary_expression(TypeOfElementaryExpression.FREE_BETA),
+            {'beta1'},
+        )
+        expr.rename_elementary(['beta1'], prefix='new_')
+        self.assertSetEqual(
+            expr.set_of_elementary_expression(TypeOfElementaryExpression.FREE_BETA),
+            {'new_beta1'},
+        )
+        self.assertIs(expr.get_elementary_expression('new_beta1'), self.beta1)
+        self.assertIsNone(expr.get_elementary_expression('beta1'))
+        expr.fix_betas({'new_beta1': 1}, suffix='_fixed')
+        self.assertSetEqual(
+            expr.set_of_elementary_expression(TypeOfElementaryExpression.FIXED_BETA),
+            {'beta2', 'new_beta1_fixed'},
+        )
+        self.assertFalse(expr.embed_expression('bioDraws'))
+        self.assertSetEqual(expr.check_draws(), set())
+        # Expressions are not modified by the construction of another
+        # expression containing them.
+        bigger = expr * self.xi1
+        self.assertTrue(bigger.embed_expression('bioDraws'))
+        self.assertSetEqual(bigger.check_draws(), {'xi1'})
+        self.assertFalse(expr.embed_expression('bioDraws'))
+
     def test_ids_multiple_formulas(self):
         expr1 = 2 * self.beta1 - ex.exp(-self.beta2) / (
             self.beta2 * (self.beta3 >= self.beta4)
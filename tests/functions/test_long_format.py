@@ -0,0 +1,171 @@
+"""
+Test the long_format module
+
+:author: Michel Bierlaire
+:date: Mon Oct 19 19:40:55 2026
+
+"""
+
+# Not needed in test
+# pylint: disable=missing-function-docstring, missing-class-docstring
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from biogeme.database import Database
+from biogeme.exceptions import BiogemeError
+from biogeme.expressions import Beta, MonteCarlo, Variable, bioDraws, log
+from biogeme.partition import Partition
+from biogeme.sampling_of_alternatives import (
+    ChoiceSetsGeneration,
+    CrossVariableTuple,
+    GenerateModel,
+    LongFormatLogit,
+    SamplingContext,
+)
+
+
+class TestLongFormat(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        number_of_alternatives = 20
+        self.individuals = pd.DataFrame(
+            {
+                'choice': rng.integers(1, number_of_alternatives + 1, 50),
+                'income': rng.random(50),
+            }
+        )
+        alternatives = pd.DataFrame(
+            {
+                'alt_id': np.arange(1, number_of_alternatives + 1),
+                'cost': rng.random(number_of_alternatives),
+                'quality': rng.random(number_of_alternatives),
+            }
+        )
+        self.beta_cost = Beta('beta_cost', -1.0, None, None, 0)
+        self.beta_quality = Beta('beta_quality', 0.5, None, None, 0)
+        utility = self.beta_cost * Variable('cost') + self.beta_quality * Variable(
+            'cost_income'
+        )
+        self.test_file = os.path.join(tempfile.mkdtemp(), 'test_file.csv')
+        self.context = SamplingContext(
+            the_partition=Partition(
+                [set(range(1, 11)), set(range(11, number_of_alternatives + 1))]
+            ),
+            sample_sizes=[3, 4],
+            individuals=self.individuals,
+            choice_column='choice',
+            alternatives=alternatives,
+            biogeme_file_name=self.test_file,
+            id_column='alt_id',
+            utility_function=utility,
+            combined_variables=[
+                CrossVariableTuple(
+                    name='cost_income', formula=Variable('cost') * Variable('income')
+                )
+            ],
+            seed=10,
+        )
+
+    def test_same_as_wide(self):
+        generation = ChoiceSetsGeneration(self.context)
+        long_database = generation.sample_long()
+        self.assertEqual(len(long_database.data), 50 * 7)
+        wide_database = generation.sample_and_merge()
+        # The same alternatives are sampled in both formats.
+        np.testing.assert_array_equal(
+            long_database.data['alt_id'].to_numpy().reshape(50, 7),
+            wide_database.data[[f'alt_id_{i}' for i in range(7)]].to_numpy(),
+        )
+        wide_logit = GenerateModel(self.context).get_logit()
+        long_logit = LongFormatLogit(
+            self.context.utility_function,
+            long_database,
+            sample_size=7,
+            choice_column='choice',
+            id_column='alt_id',
+        )
+        betas = np.array([-0.7, 1.2])
+        long_output = long_logit.calculate(betas, hessian=True)
+        wide_function = wide_logit.create_function(database=wide_database)
+        wide_output = wide_function(betas)
+        np.testing.assert_allclose(long_output.function, wide_output.function)
+        np.testing.assert_allclose(long_output.gradient, wide_output.gradient)
+        np.testing.assert_allclose(long_output.hessian, wide_output.hessian)
+        results = long_logit.estimate()
+        self.assertTrue(results.convergence)
+        estimates = np.array(list(results.betas.values()))
+        final = long_logit.calculate(estimates)
+        # Stopping criterion of the algorithm.
+        relative_gradient = np.max(
+            np.abs(final.gradient) * np.maximum(np.abs(estimates), 1)
+        ) / max(abs(final.function), 1)
+        self.assertLess(relative_gradient, 1.0e-5)
+        self.assertAlmostEqual(final.function, results.loglikelihood)
+        wide_final = wide_function(estimates)
+        expected = -np.linalg.inv(wide_final.hessian)
+        np.testing.assert_allclose(results.variance_covariance.to_numpy(), expected)
+        self.assertListEqual(
+            list(results.variance_covariance.columns), ['beta_cost', 'beta_quality']
+        )
+        np.testing.assert_allclose(
+            list(results.std_errors.values()), np.sqrt(np.diag(expected))
+        )
+        with self.assertRaises(BiogemeError):
+            _ = long_logit.estimate(algorithm='unknown')
+
+    def test_errors(self):
+        generation = ChoiceSetsGeneration(self.context)
+        long_database = generation.sample_long()
+        with self.assertRaises(BiogemeError):
+            _ = LongFormatLogit(
+                self.context.utility_function,
+                long_database,
+                sample_size=8,
+                choice_column='choice',
+                id_column='alt_id',
+            )
+        with self.assertRaises(BiogemeError):
+            _ = LongFormatLogit(
+                self.context.utility_function,
+                long_database,
+                sample_size=7,
+                choice_column='chosen',
+                id_column='alt_id',
+            )
+        # The chosen alternative is not in the first row of the second
+        # individual.
+        swapped = long_database.data.copy()
+        swapped.iloc[[7, 8]] = swapped.iloc[[8, 7]].to_numpy()
+        with self.assertRaisesRegex(BiogemeError, r'starting at row\(s\) \[7\]'):
+            _ = LongFormatLogit(
+                self.context.utility_function,
+                Database('swapped', swapped),
+                sample_size=7,
+                choice_column='choice',
+                id_column='alt_id',
+            )
+        # Utilities requiring draws
+        for utility in (
+            self.context.utility_function + bioDraws('error', 'NORMAL'),
+            log(MonteCarlo(self.context.utility_function * bioDraws('b', 'NORMAL'))),
+        ):
+            with self.assertRaisesRegex(BiogemeError, 'draws'):
+                _ = LongFormatLogit(
+                    utility,
+                    long_database,
+                    sample_size=7,
+                    choice_column='choice',
+                    id_column='alt_id',
+                )
+        generation.individuals = self.individuals.assign(cost=1.0)
+        with self.assertRaises(BiogemeError):
+            _ = generation.sample_long()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Test the results_store module
+
+:author: Michel Bierlaire
+:date: Sun Oct 18 17:05:48 2026
+
+"""
+
+# Too constraining
+# pylint: disable=invalid-name
+#
+# Not needed in test
+# pylint: disable=missing-function-docstring, missing-class-docstring
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+import biogeme.biogeme as bio
+from biogeme.catalog import Catalog
+from biogeme.configuration import Configuration
+from biogeme.expressions import Variable, Beta
+from biogeme.results_store import ResultsStore
+from test_data import getData
+
+
+class TestResultsStore(unittest.TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.temporary_directory.name, 'results.db')
+        beta1 = Beta('beta1', -1.0, -3, 3, 0)
+        beta2 = Beta('beta2', 2.0, -3, 10, 0)
+        catalog = Catalog.from_dict(
+            catalog_name='the_catalog',
+            dict_of_expressions={
+                'linear': beta2 * Variable('Variable2'),
+                'scaled': beta2 * Variable('Variable2') / 10,
+            },
+        )
+        self.expression = -((beta1 * Variable('Variable1') - 1) ** 2) - (
+            (catalog - 3) ** 2
+        )
+        self.database = getData(1)
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def estimate(self, config_id):
+        self.expression.configure_catalogs(Configuration.from_string(config_id))
+        the_biogeme = bio.BIOGEME(self.database, self.expression)
+        the_biogeme.generate_html = False
+        the_biogeme.generate_pickle = False
+        return the_biogeme.quick_estimate()
+
+    def test_put_get(self):
+        store = ResultsStore(self.file_name, self.database)
+        config_id = 'the_catalog:linear'
+        self.assertIsNone(store.get(config_id, self.expression))
+        results = self.estimate(config_id)
+        store.put(config_id, self.expression, results)
+        # Another object, as it would be created by another process.
+        other_store = ResultsStore(self.file_name, self.database)
+        read_results = other_store.get(config_id, self.expression)
+        self.assertAlmostEqual(read_results.data.logLike, results.data.logLike)
+        self.assertDictEqual(read_results.get_beta_values(), results.get_beta_values())
+        # The expression is part of the key
+        self.expression.configure_catalogs(
+            Configuration.from_string('the_catalog:scaled')
+        )
+        self.assertIsNone(other_store.get(config_id, self.expression))
+        # The data is part of the key
+        other_data = ResultsStore(self.file_name, getData(2))
+        self.expression.configure_catalogs(Configuration.from_string(config_id))
+        self.assertIsNone(other_data.get(config_id, self.expression))
+
+    def test_key(self):
+        store = ResultsStore(self.file_name, self.database)
+        config_id = 'the_catalog:linear'
+        self.expression.configure_catalogs(Configuration.from_string(config_id))
+        key = store.key(config_id, self.expression)
+
+        def expression(beta1):
+            return -((beta1 * Variable('Variable1') - 1) ** 2) - (
+                (Beta('beta2', 2.0, -3, 10, 0) * Variable('Variable2') - 3) ** 2
+            )
+
+        # Same expression, built again.
+        self.assertEqual(
+            store.key(config_id, expression(Beta('beta1', -1.0, -3, 3, 0))), key
+        )
+        # Other bounds, initial value or status
+        for beta1 in (
+            Beta('beta1', -1.0, -2, 3, 0),
+            Beta('beta1', -1.0, None, 3, 0),
+            Beta('beta1', 0.0, -3, 3, 0),
+            Beta('beta1', -1.0, -3, 3, 1),
+        ):
+            self.assertNotEqual(store.key(config_id, expression(beta1)), key)
+
+    def test_connections_closed(self):
+        connections = []
+        sqlite_connect = sqlite3.connect
+
+        def connect(*args, **kwargs):
+            connection = sqlite_connect(*args, **kwargs)
+            connections.append(connection)
+            return connection
+
+        with mock.patch('biogeme.results_store.sqlite3.connect', connect):
+            store = ResultsStore(self.file_name, self.database)
+            _ = store.get('the_catalog:linear', self.expression)
+            _ = len(store)
+            with mock.patch('pickle.dumps', side_effect=RuntimeError):
+                with self.assertRaises(RuntimeError):
+                    store.put('the_catalog:linear', self.expression, mock.Mock())
+        self.assertEqual(len(connections), 4)
+        for connection in connections:
+            with self.assertRaises(sqlite3.ProgrammingError):
+                connection.execute('SELECT 1')
+
+    def test_maximum_size(self):
+        store = ResultsStore(self.file_name, self.database, maximum_size=1)
+        for config_id in ('the_catalog:linear', 'the_catalog:scaled'):
+            store.put(config_id, self.expression, self.estimate(config_id))
+        self.assertEqual(len(store), 1)
+        self.assertIsNotNone(store.get('the_catalog:scaled', self.expression))
+
+
+if __name__ == '__main__':
+    unittest.main()
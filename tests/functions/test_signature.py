@@ -0,0 +1,125 @@
+"""
+Test the signature module
+
+:author: Michel Bierlaire
+:date: Mon Oct 19 20:47:05 2026
+
+"""
+
+# Too constraining
+# pylint: disable=invalid-name
+#
+# Not needed in test
+# pylint: disable=missing-function-docstring, missing-class-docstring
+
+import unittest
+
+import numpy as np
+
+import biogeme.expressions as ex
+from biogeme import models
+from biogeme.exceptions import BiogemeError
+from biogeme.expressions import IdManager
+from test_data import getData
+
+
+class TestSignature(unittest.TestCase):
+    def setUp(self):
+        self.data = getData(1)
+        self.beta1 = ex.Beta('beta1', 0.5, None, None, 0)
+        self.beta2 = ex.Beta('beta2', -0.2, None, None, 0)
+        self.Variable1 = ex.Variable('Variable1')
+        self.Variable2 = ex.Variable('Variable2')
+
+    def signature(self, expression):
+        expression.set_id_manager(IdManager([expression], self.data, 0))
+        return expression.get_signature()
+
+    @staticmethod
+    def types(signatures):
+        return [signature[: signature.index(b'{')] for signature in signatures]
+
+    def test_shared_nodes(self):
+        # The same utility is built twice, as separate objects.
+        utility = ex.exp(self.beta1 * self.Variable1)
+        other = ex.exp(ex.Beta('beta1', 0.5, None, None, 0) * self.Variable1)
+        expression = utility + utility * other
+        signatures = self.signature(expression)
+        self.assertEqual(len(signatures), len(set(signatures)))
+        # beta1, Variable1, Times, exp, Times, Plus
+        self.assertEqual(len(signatures), 6)
+        self.assertTrue(signatures[-1].startswith(b'<Plus>'))
+
+    def test_constants(self):
+        expression = (ex.Numeric(2) * 3 + self.beta1 * self.Variable1) * 1 + 0
+        signatures = self.signature(expression)
+        self.assertIn(b',6.0', signatures[0])
+        self.assertEqual(
+            self.types(signatures),
+            [b'<Numeric>', b'<Beta>', b'<Variable>', b'<Times>', b'<Plus>'],
+        )
+        # Expressions that cannot be evaluated are not replaced.
+        signatures = self.signature(ex.Numeric(1) / 0 + ex.log(0))
+        self.assertEqual(
+            self.types(signatures),
+            [b'<Numeric>', b'<Numeric>', b'<Divide>', b'<log>', b'<Plus>'],
+        )
+
+    def test_root(self):
+        # The expression is represented by a node that is not the last
+        # one to be processed.
+        expression = self.beta1 * self.Variable1 + 0
+        signatures = self.signature(expression)
+        self.assertTrue(signatures[-1].startswith(b'<Times>'))
+
+    def test_header(self):
+        class Wrong(ex.exp):
+            def get_node_signature(self, canonical_ids):
+                signature = super().get_node_signature(canonical_ids)
+                return signature.replace(f'{{{self.get_id()}}}', '')
+
+        # Nodes are merged only if they are of the same class.
+        expression = ex.exp(self.Variable1) + ex.log(self.Variable1)
+        self.assertEqual(len(self.signature(expression)), 4)
+        with self.assertRaises(BiogemeError):
+            _ = self.signature(Wrong(self.Variable1))
+
+    def test_ids(self):
+        # The ids depend on the structure of the nodes, not on the
+        # objects representing them.
+        first = self.signature(ex.exp(self.beta1 * self.Variable1))
+        second = self.signature(
+            ex.log(ex.exp(ex.Beta('beta1', 0.5, None, None, 0) * self.Variable1))
+        )
+        self.assertListEqual(second[:-1], first)
+        self.assertNotIn(str(self.beta1.get_id()).encode(), first[0])
+        # The status of the parameter is part of the structure.
+        other = self.signature(
+            ex.exp(ex.Beta('beta1', 0.5, None, None, 1) * self.Variable1)
+        )
+        self.assertNotEqual(other[-1], first[-1])
+
+    def test_values(self):
+        V = {
+            1: self.beta1 * self.Variable1,
+            2: self.beta2 * self.Variable2 * 1,
+            3: ex.Numeric(0),
+        }
+        av = {1: 1, 2: ex.Numeric(0) + 1, 3: 1}
+        expression = models.loglogit(V, av, 1) + ex.exp(
+            self.beta1 * self.Variable1
+        ) * ex.exp(self.beta1 * self.Variable1)
+        values = expression.get_value_c(database=self.data, prepare_ids=True)
+        x1 = self.data.data['Variable1'].to_numpy()
+        x2 = self.data.data['Variable2'].to_numpy()
+        utilities = np.column_stack((0.5 * x1, -0.2 * x2, np.zeros_like(x1)))
+        expected = (
+            utilities[:, 0]
+            - np.log(np.exp(utilities).sum(axis=1))
+            + np.exp(0.5 * x1) ** 2
+        )
+        np.testing.assert_allclose(values, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Test the simulation_accumulators module
+
+:author: Michel Bierlaire
+:date: Mon Oct 19 09:02:44 2026
+
+"""
+
+# Not needed in test
+# pylint: disable=missing-function-docstring, missing-class-docstring
+
+import unittest
+
+import numpy as np
+
+from biogeme.exceptions import BiogemeError
+from biogeme.simulation_accumulators import (
+    ExactQuantilesAccumulator,
+    MomentsAccumulator,
+    StreamingQuantilesAccumulator,
+)
+
+
+class TestSimulationAccumulators(unittest.TestCase):
+    def setUp(self):
+        generator = np.random.default_rng(90267)
+        # 500 parameter vectors, 2 formulas, 40 rows
+        self.values = generator.normal(size=(500, 2, 40)) * np.arange(1, 41)
+
+    def test_moments(self):
+        accumulator = MomentsAccumulator()
+        with self.assertRaises(BiogemeError):
+            accumulator.mean()
+        for values in self.values:
+            accumulator.add(values)
+        self.assertEqual(accumulator.count, 500)
+        np.testing.assert_allclose(accumulator.mean(), self.values.mean(axis=0))
+        np.testing.assert_allclose(
+            accumulator.variance(), self.values.var(axis=0, ddof=1)
+        )
+        np.testing.assert_array_equal(accumulator.minimum(), self.values.min(axis=0))
+        np.testing.assert_array_equal(accumulator.maximum(), self.values.max(axis=0))
+        with self.assertRaises(BiogemeError):
+            accumulator.add(np.zeros((3, 40)))
+
+    def test_exact_quantiles(self):
+        accumulator = ExactQuantilesAccumulator([0.05, 0.95])
+        for values in self.values:
+            accumulator.add(values)
+        left, right = accumulator.quantiles()
+        np.testing.assert_allclose(left, np.quantile(self.values, 0.05, axis=0))
+        np.testing.assert_allclose(right, np.quantile(self.values, 0.95, axis=0))
+
+    def test_streaming_quantiles(self):
+        with self.assertRaises(BiogemeError):
+            _ = StreamingQuantilesAccumulator([1.5])
+        accumulator = StreamingQuantilesAccumulator([0.05, 0.5, 0.95])
+        for values in self.values[:3]:
+            accumulator.add(values)
+        # With less than five values, the quantiles are exact.
+        np.testing.assert_allclose(
+            accumulator.quantiles()[1], np.median(self.values[:3], axis=0)
+        )
+        for values in self.values[3:]:
+            accumulator.add(values)
+        scale = np.arange(1, 41)
+        for estimate, probability in zip(accumulator.quantiles(), [0.05, 0.5, 0.95]):
+            exact = np.quantile(self.values, probability, axis=0)
+            error = np.abs(estimate - exact) / scale
+            self.assertLess(np.median(error), 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
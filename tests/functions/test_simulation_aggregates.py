@@ -0,0 +1,70 @@
+"""
+Test the simulation_aggregates module
+
+:author: Michel Bierlaire
+:date: Mon Oct 19 11:20:37 2026
+
+"""
+
+# Not needed in test
+# pylint: disable=missing-function-docstring, missing-class-docstring
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from biogeme.exceptions import BiogemeError
+from biogeme.simulation_aggregates import TOTAL, Aggregate, AggregatesCalculator
+
+
+class TestSimulationAggregates(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame(
+            {'segment': [1, 2, 1, 2, 2], 'weight': [1.0, 2.0, 1.0, 0.5, 0.5]}
+        )
+        self.simulated = pd.DataFrame(
+            {'prob': [0.2, 0.4, 0.6, 0.8, 1.0], 'revenue': [1.0, 2.0, 3.0, 4.0, 5.0]}
+        )
+        self.aggregates = {
+            'share': Aggregate(formula='prob', weight='weight', mean=True),
+            'revenue': Aggregate(formula='revenue'),
+            'count': Aggregate(formula='prob', mean=True),
+        }
+
+    def test_total(self):
+        calculator = AggregatesCalculator(self.aggregates)
+        with self.assertRaises(BiogemeError):
+            calculator.results()
+        # Two chunks
+        calculator.add(self.simulated.iloc[:2], self.data.iloc[:2])
+        calculator.add(self.simulated.iloc[2:], self.data.iloc[2:])
+        results = calculator.results()
+        weights = self.data['weight']
+        self.assertAlmostEqual(
+            results.loc[TOTAL, 'share'],
+            (self.simulated['prob'] * weights).sum() / weights.sum(),
+        )
+        self.assertAlmostEqual(results.loc[TOTAL, 'revenue'], 15.0)
+        self.assertAlmostEqual(results.loc[TOTAL, 'count'], 0.6)
+
+    def test_segments(self):
+        calculator = AggregatesCalculator(self.aggregates, group_by='segment')
+        self.assertSetEqual(
+            calculator.required_names(), {'segment', 'prob', 'weight', 'revenue'}
+        )
+        calculator.add(self.simulated.iloc[:1], self.data.iloc[:1])
+        calculator.add(self.simulated.iloc[1:], self.data.iloc[1:])
+        results = calculator.results()
+        self.assertListEqual(list(results.index), [1, 2])
+        np.testing.assert_allclose(results['revenue'], [4.0, 11.0])
+        np.testing.assert_allclose(results['share'], [0.4, (0.8 + 0.4 + 0.5) / 3])
+
+    def test_unknown_name(self):
+        calculator = AggregatesCalculator({'x': Aggregate(formula='unknown')})
+        with self.assertRaises(BiogemeError):
+            calculator.add(self.simulated, self.data)
+
+
+if __name__ == '__main__':
+    unittest.main()
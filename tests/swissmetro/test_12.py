@@ -78,7 +78,7 @@ class test_12(unittest.TestCase):
         biogeme.generate_html = False
         biogeme.generate_pickle = False
         results = biogeme.estimate()
-        self.assertAlmostEqual(results.data.logLike, -4845.98507664922, 2)
+        self.assertAlmostEqual(results.data.logLike, -4694.787276917712, 2)
 
 
 if __name__ == '__main__':
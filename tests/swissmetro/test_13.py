@@ -82,7 +82,7 @@ class test_13(unittest.TestCase):
         biogeme.generate_html = False
         biogeme.generate_pickle = False
         results = biogeme.estimate()
-        self.assertAlmostEqual(results.data.logLike, -4634.307424865441, 2)
+        self.assertAlmostEqual(results.data.logLike, -4585.603144608808, 2)
 
 
 if __name__ == '__main__':
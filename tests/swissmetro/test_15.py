@@ -95,7 +95,7 @@ class test_15(unittest.TestCase):
         biogeme.generate_html = False
         biogeme.generate_pickle = False
         results = biogeme.estimate()
-        self.assertAlmostEqual(results.data.logLike, -4074.4822049451564, 2)
+        self.assertAlmostEqual(results.data.logLike, -4149.536050052962, 2)
 
 
 if __name__ == '__main__':
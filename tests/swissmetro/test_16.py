@@ -131,7 +131,7 @@ class test_16(unittest.TestCase):
         biogeme.generate_html = False
         biogeme.generate_pickle = False
         results = biogeme.estimate()
-        self.assertAlmostEqual(results.data.logLike, -4071.8391253004647, 2)
+        self.assertAlmostEqual(results.data.logLike, -4137.536058138876, 2)
 
 
 if __name__ == '__main__':
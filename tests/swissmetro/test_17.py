@@ -80,7 +80,7 @@ class test_17(unittest.TestCase):
         biogeme.generate_html = False
         biogeme.generate_pickle = False
         results = biogeme.estimate()
-        self.assertAlmostEqual(results.data.logLike, -5316.3758171905365, 2)
+        self.assertAlmostEqual(results.data.logLike, -5323.754125446925, 2)
 
 
 if __name__ == '__main__':
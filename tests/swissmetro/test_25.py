@@ -93,7 +93,7 @@ class test_25(unittest.TestCase):
         biogeme.generate_html = False
         biogeme.generate_pickle = False
         results = biogeme.estimate()
-        self.assertAlmostEqual(results.data.logLike, -5312.7204284279305, 2)
+        self.assertAlmostEqual(results.data.logLike, -5309.388409766513, 2)
 
 
 if __name__ == '__main__':
@@ -102,7 +102,7 @@ class test_26(unittest.TestCase):
         biogeme.generate_html = False
         biogeme.generate_pickle = False
         results = biogeme.estimate()
-        self.assertAlmostEqual(results.data.logLike, -4601.85730376285, 2)
+        self.assertAlmostEqual(results.data.logLike, -4536.7702376991765, 2)
 
 
 if __name__ == '__main__':